@@ -0,0 +1,130 @@
+"""Benchmark the linear-time indicator scanner against the regex extractors.
+
+Times :func:`valkyrie_tools.commons.extract_indicators` (backed by
+:func:`valkyrie_tools.scanner.scan`) and the regex based ``extract_urls``,
+``extract_emails``, ``extract_ip_addrs`` and ``extract_domains`` that the
+commands used to run one after the other.  Besides a realistic log sample,
+each pathological input is a single long token of the kind found in base64
+blobs, hex dumps and minified code, on which the regexes backtrack.
+
+The regex extractors grow polynomially on the pathological inputs, so keep
+``--size`` small when comparing; the scanner alone can be timed on much
+larger sizes with ``--scanner-only``.
+
+Usage::
+
+    python benchmarks/indicator_scanner.py [--size N] [--rounds N]
+                                           [--scanner-only]
+"""
+
+import argparse
+import sys
+from timeit import default_timer
+from typing import Any, Callable, Dict, List, Optional
+
+from valkyrie_tools.commons import (
+    extract_domains,
+    extract_emails,
+    extract_indicators,
+    extract_ip_addrs,
+    extract_urls,
+)
+
+LOG_LINES = (
+    "Jan  1 00:00:01 gw sshd[311]: Failed password for root from "
+    "203.0.113.5 port 52211 ssh2",
+    '10.1.2.3 - - [01/Jan/2024:00:00:02] "GET /index.html HTTP/1.1" 200 '
+    '512 "https://www.example.com/start?ref=1" "Mozilla/5.0"',
+    "postfix/smtp: to=<bob+news@mail.example.org>, relay=mx.example.org"
+    "[198.51.100.7]:25, status=sent",
+    "dns query api.internal.example.net AAAA -> 2001:db8:85a3::8a2e:370:7334",
+    "worker 7 finished batch 1812 in 0.412s with 0 errors",
+)
+
+
+def pathological_inputs(size: int) -> Dict[str, str]:
+    """Build single-token inputs of about ``size`` characters.
+
+    Args:
+        size (int): Approximate length of every input.
+
+    Returns:
+        Dict[str, str]: Inputs keyed by name.
+    """
+    return {
+        "log sample": "\n".join(LOG_LINES * max(1, size // 400)),
+        "plain words": ("worker finished batch in time " * size)[:size],
+        "base64 blob": ("QUJDRA+/" * size)[:size],
+        "letters": "a" * size,
+        "dotted labels": "a." * (size // 2),
+        "hex dump": "de:ad:be:ef:" * (size // 12),
+        "dotted digits": "1.2." * (size // 4),
+        "url prefix": "http://" + "a." * (size // 2),
+        "at signs": "a@" * (size // 2),
+    }
+
+
+def regex_extract(text: str) -> List[Any]:
+    """Extract every kind with the regex based extractors.
+
+    Args:
+        text (str): Input text.
+
+    Returns:
+        List[Any]: Concatenated matches.
+    """
+    return [
+        *extract_urls(text),
+        *extract_emails(text),
+        *extract_ip_addrs(text),
+        *extract_domains(text),
+    ]
+
+
+def run(extract: Callable[[str], Any], text: str, rounds: int) -> float:
+    """Time ``extract`` over ``text``.
+
+    Args:
+        extract (Callable[[str], Any]): Extractor to time.
+        text (str): Input text.
+        rounds (int): Number of calls.
+
+    Returns:
+        float: Mean seconds per call.
+    """
+    start = default_timer()
+    for _ in range(rounds):
+        extract(text)
+    return (default_timer() - start) / rounds
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark and print a comparison.
+
+    Args:
+        argv (Optional[List[str]]): Command line arguments.  Defaults to
+            ``sys.argv[1:]``.
+
+    Returns:
+        int: Exit status.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--scanner-only", action="store_true")
+    args = parser.parse_args(argv)
+
+    print("input size: ~%d characters, %d rounds" % (args.size, args.rounds))
+    print("%-14s %14s %14s" % ("input", "regex ms", "scanner ms"))
+    for name, text in pathological_inputs(args.size).items():
+        scanner = run(extract_indicators, text, args.rounds)
+        if args.scanner_only:
+            regex = "-"
+        else:
+            regex = "%.2f" % (run(regex_extract, text, args.rounds) * 1e3)
+        print("%-14s %14s %14.2f" % (name, regex, scanner * 1e3))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
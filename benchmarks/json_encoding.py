@@ -0,0 +1,104 @@
+"""Benchmark the JSON encoders behind ``--json`` output.
+
+Times the previous ``json.dumps(data, indent=2, default=str)`` call against
+:func:`valkyrie_tools.jsonenc.dumps` with every available backend, indented
+and compact, on synthetic ``whobe``-style records holding WHOIS dates, IP
+addresses and nested lists.
+
+Usage::
+
+    python benchmarks/json_encoding.py [--records N] [--rounds N]
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from timeit import default_timer
+from typing import Any, Callable, Dict, List, Optional
+
+from valkyrie_tools.ipaddr import IPAddr
+from valkyrie_tools.jsonenc import BACKENDS, dumps
+
+
+def make_records(count: int) -> List[Dict[str, Any]]:
+    """Build ``count`` domain WHOIS style result dicts.
+
+    Args:
+        count (int): Number of records.
+
+    Returns:
+        List[Dict[str, Any]]: Records shaped like ``whobe --json`` entries.
+    """
+    created = datetime(1995, 8, 14, 4, tzinfo=timezone.utc)
+    return [
+        {
+            "input": "host%d.example.com" % i,
+            "type": "domain",
+            "registrar": "Example Registrar, Inc.",
+            "creation_date": created + timedelta(days=i),
+            "expiration_date": [created + timedelta(days=i + 3650)],
+            "updated_date": created + timedelta(days=i, seconds=i),
+            "name_servers": ["ns%d.example.net" % n for n in range(4)],
+            "emails": ["abuse@example.com", "hostmaster@example.com"],
+            "addresses": [
+                IPAddr.parse("192.0.2.%d" % (i % 256)),
+                IPAddr.parse("2001:db8::%x" % i),
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+def run(encode: Callable[[Any], str], data: Any, rounds: int) -> float:
+    """Time ``encode`` over ``data``.
+
+    Args:
+        encode (Callable[[Any], str]): Encoder to time.
+        data (Any): Value to encode.
+        rounds (int): Number of calls.
+
+    Returns:
+        float: Mean seconds per call.
+    """
+    start = default_timer()
+    for _ in range(rounds):
+        encode(data)
+    return (default_timer() - start) / rounds
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark and print a comparison.
+
+    Args:
+        argv (Optional[List[str]]): Command line arguments.  Defaults to
+            ``sys.argv[1:]``.
+
+    Returns:
+        int: Exit status.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    data = make_records(args.records)
+    encoders: Dict[str, Callable[[Any], str]] = {
+        "json default=str": lambda d: json.dumps(d, indent=2, default=str),
+    }
+    for backend in BACKENDS:
+        for compact in (False, True):
+            name = "%s%s" % (backend, " compact" if compact else "")
+            encoders[name] = lambda d, b=backend, c=compact: dumps(
+                d, compact=c, backend=b
+            )
+
+    print("%d records, %d rounds" % (args.records, args.rounds))
+    print("%-18s %10s" % ("encoder", "ms"))
+    for name, encode in encoders.items():
+        print("%-18s %10.2f" % (name, run(encode, data, args.rounds) * 1e3))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
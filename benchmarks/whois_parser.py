@@ -0,0 +1,123 @@
+"""Benchmark the compiled-template WHOIS parser against python-whois.
+
+Parses every stored raw response of a corpus directory with
+:meth:`whois.parser.WhoisEntry.load` (the parser behind
+:func:`valkyrie_tools.whois.get_whois`) and with
+:func:`valkyrie_tools.whois.parse_whois_text`, then converts each record with
+:func:`valkyrie_tools.whobe.domain_whois_to_dict` as ``whobe`` does.
+
+Corpus files are named ``<domain>.txt`` and hold one raw response each.  The
+default corpus is the one used by the test suite; point ``--corpus`` at a
+directory of responses saved from production for representative numbers.
+
+Usage::
+
+    python benchmarks/whois_parser.py [--corpus DIR] [--rounds N]
+"""
+
+import argparse
+import os
+import sys
+from timeit import default_timer
+from typing import Any, Callable, List, Optional, Tuple
+
+import whois  # type: ignore[import-untyped]
+
+from valkyrie_tools.whobe import domain_whois_to_dict
+from valkyrie_tools.whois import parse_whois_text
+
+DEFAULT_CORPUS = os.path.join(
+    os.path.dirname(__file__), os.pardir, "tests", "data", "whois"
+)
+
+
+def load_corpus(path: str) -> List[Tuple[str, str]]:
+    """Read every ``<domain>.txt`` response in ``path``.
+
+    Args:
+        path (str): Corpus directory.
+
+    Returns:
+        List[Tuple[str, str]]: ``(domain, text)`` pairs.
+    """
+    corpus = []
+    for name in sorted(os.listdir(path)):
+        if name.endswith(".txt"):
+            with open(os.path.join(path, name), encoding="utf-8") as f:
+                corpus.append((name[: -len(".txt")], f.read()))
+    return corpus
+
+
+def python_whois(domain: str, text: str) -> Optional[Any]:
+    """Parse a response with python-whois.
+
+    Args:
+        domain (str): Queried domain name.
+        text (str): Raw response.
+
+    Returns:
+        Optional[Any]: Parsed record, or None for a "no match" answer.
+    """
+    try:
+        return whois.parser.WhoisEntry.load(domain, text)
+    except whois.parser.PywhoisError:
+        return None
+
+
+def run(
+    parse: Callable[[str, str], Any],
+    corpus: List[Tuple[str, str]],
+    rounds: int,
+) -> float:
+    """Time parsing and converting the corpus ``rounds`` times.
+
+    Args:
+        parse (Callable[[str, str], Any]): Parser taking ``(domain, text)``.
+        corpus (List[Tuple[str, str]]): ``(domain, text)`` pairs.
+        rounds (int): Number of passes over the corpus.
+
+    Returns:
+        float: Mean seconds per record.
+    """
+    start = default_timer()
+    for _ in range(rounds):
+        for domain, text in corpus:
+            domain_whois_to_dict(domain, parse(domain, text))
+    return (default_timer() - start) / (rounds * len(corpus))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark and print a comparison.
+
+    Args:
+        argv (Optional[List[str]]): Command line arguments.  Defaults to
+            ``sys.argv[1:]``.
+
+    Returns:
+        int: Exit status.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        print("No responses found in %s" % args.corpus, file=sys.stderr)
+        return 1
+
+    baseline = run(python_whois, corpus, args.rounds)
+    fast = run(
+        lambda domain, text: parse_whois_text(text, domain),
+        corpus,
+        args.rounds,
+    )
+    print("records: %d x %d rounds" % (len(corpus), args.rounds))
+    print("python-whois:      %8.1f us/record" % (baseline * 1e6))
+    print("parse_whois_text:  %8.1f us/record" % (fast * 1e6))
+    print("speed-up:          %8.1fx" % (baseline / fast))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
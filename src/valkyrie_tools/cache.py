@@ -2,55 +2,407 @@
 
 Provides two caching strategies via the :class:`Cache` decorator class:
 
-* **Memoize** (:meth:`Cache.memoize`) - a simple dict-backed cache that stores
-  every unique argument tuple indefinitely (no size limit, no expiry).
-* **TTL cache** (:meth:`Cache.ttl_cache`) - wraps :func:`functools.lru_cache`
-  with a time-based hash so that results expire automatically after a
-  configurable number of seconds.
+* **Memoize** (:meth:`Cache.memoize`) - a least-recently-used cache, bounded
+  by size, whose results never expire.
+* **TTL cache** (:meth:`Cache.ttl_cache`) - a least-recently-used cache backed
+  by :class:`TTLCache`, in which every result expires ``ttl`` seconds after
+  it was computed and may be served stale while it is refreshed in the
+  background.
+
+Both decorators are thread-safe and single-flight: while a result is being
+computed, concurrent calls with the same arguments wait for it through a
+:class:`SingleFlight` instead of computing it again.
 
 A package-level singleton (:data:`cache`) is available for convenience so that
 individual modules do not need to instantiate :class:`Cache` themselves.
 """
 
-from functools import lru_cache, update_wrapper
-from math import floor
-from time import time
-from typing import Any, Callable, Dict, Generator, Tuple, TypeVar
+import sys
+import threading
+from collections import OrderedDict
+from functools import update_wrapper
+from time import monotonic
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    overload,
+)
 
 _F = TypeVar("_F", bound=Callable[..., Any])
 
+_KWARGS_MARK = object()
+"""Separates positional from keyword arguments in cache keys."""
 
-def _ttl_hash_gen(seconds: int) -> Generator[int, None, None]:
-    """Generates a hash value based on the elapsed time.
 
-    Since the start of the generator, divided by the specified number of seconds.
+def _make_key(
+    args: Tuple[Any, ...], kwargs: Dict[str, Any], typed: bool = False
+) -> Hashable:
+    """Build a cache key from call arguments, like :func:`functools.lru_cache`.
 
     Args:
-        seconds (int): The number of seconds to divide the elapsed time by.
+        args (Tuple[Any, ...]): Positional arguments.
+        kwargs (Dict[str, Any]): Keyword arguments.
+        typed (bool): Whether arguments of different types are cached
+            separately. Defaults to False.
+
+    Returns:
+        Hashable: The key.
+    """
+    key: Tuple[Any, ...] = args
+    if kwargs:
+        key += (_KWARGS_MARK,) + tuple(kwargs.items())
+    if typed:
+        key += tuple(type(arg) for arg in args)
+        key += tuple(type(value) for value in kwargs.values())
+    return key
+
+
+def approx_sizeof(value: Any) -> int:
+    """Estimate the memory held by ``value`` and the builtin containers in it.
+
+    Lists, tuples, sets and dicts are followed recursively (each object is
+    counted once); any other object counts for :func:`sys.getsizeof`.
+
+    Args:
+        value (Any): Value to measure.
+
+    Returns:
+        int: Approximate size in bytes.
+
+    Example:
+        >>> from valkyrie_tools.cache import approx_sizeof
+        >>> approx_sizeof(["a" * 1000]) > 1000
+        True
+    """
+    seen: Set[int] = set()
+    total = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return total
+
+
+class _Entry(NamedTuple):
+    """A cached value with its expiry time and approximate size."""
+
+    value: Any
+    expires: float
+    size: int
+
+
+class TTLCache:
+    """A least-recently-used cache whose entries expire individually.
+
+    Every entry expires ``ttl`` seconds after it was stored and is then
+    kept, as a stale entry, for ``stale_ttl`` more seconds.  Once full (by
+    ``maxsize`` entries or, when set, ``max_bytes`` as measured by
+    :func:`approx_sizeof`), the least recently used entries are evicted.
+    Lookups, insertions and evictions are O(1); expired entries are purged
+    in expiry order, which is insertion order as every entry has the same
+    lifetime, so they do not occupy the cache until evicted.  All methods
+    are thread-safe.
+
+    Args:
+        maxsize (Optional[int]): Maximum number of entries, or ``None``
+            for no limit. Defaults to 128.
+        ttl (Optional[float]): Lifetime of an entry in seconds, or ``None``
+            for entries that never expire. Defaults to None.
+        stale_ttl (float): Seconds an expired entry may still be served
+            while it is refreshed. Defaults to 0.
+        max_bytes (Optional[int]): Maximum approximate size of all values,
+            or ``None`` for no limit. Defaults to None.
+        timer (Optional[Callable[[], float]]): Clock used for expiry.
+            Defaults to :func:`time.monotonic`.
+
+    Example:
+        >>> from valkyrie_tools.cache import TTLCache
+        >>> now = [0.0]
+        >>> store = TTLCache(maxsize=2, ttl=10, stale_ttl=5, timer=lambda: now[0])
+        >>> store.set("a", 1)
+        >>> store.lookup("a")
+        (1, False)
+        >>> now[0] = 12
+        >>> store.lookup("a")  # expired, but still within the stale window
+        (1, True)
+        >>> now[0] = 16
+        >>> store.lookup("a") is None
+        True
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = 128,
+        ttl: Optional[float] = None,
+        stale_ttl: float = 0,
+        max_bytes: Optional[int] = None,
+        timer: Optional[Callable[[], float]] = None,
+    ) -> None:
+        """Initialise an empty cache."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_bytes = max_bytes
+        self.timer = timer or monotonic
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._expiry: "OrderedDict[Hashable, None]" = OrderedDict()
+        self._refreshing: Set[Hashable] = set()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        """Return the number of entries, including stale ones."""
+        return len(self._entries)
+
+    def _discard(self, key: Hashable) -> None:
+        """Remove ``key`` if present. The lock must be held."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+            del self._expiry[key]
+
+    def _purge(self, now: float) -> None:
+        """Remove entries past their stale window. The lock must be held."""
+        while self._expiry:
+            key = next(iter(self._expiry))
+            if self._entries[key].expires + self.stale_ttl > now:
+                break
+            self._discard(key)
+
+    def lookup(self, key: Hashable) -> Optional[Tuple[Any, bool]]:
+        """Look ``key`` up, marking it as recently used.
+
+        Args:
+            key (Hashable): Cache key.
+
+        Returns:
+            Optional[Tuple[Any, bool]]: The value and whether it is stale,
+            or ``None`` if ``key`` is not cached.
+        """
+        with self._lock:
+            now = self.timer()
+            self._purge(now)
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry.value, entry.expires <= now
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store ``value`` under ``key``, evicting old entries if needed.
 
-    Yields:
-        int: The hash value generated based on the elapsed time.
+        A value larger than ``max_bytes`` on its own is not stored.
+
+        Args:
+            key (Hashable): Cache key.
+            value (Any): Value to store.
+        """
+        size = approx_sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            now = self.timer()
+            self._refreshing.discard(key)
+            self._discard(key)
+            self._purge(now)
+            if self.maxsize == 0 or (
+                self.max_bytes is not None and size > self.max_bytes
+            ):
+                return
+            expires = float("inf") if self.ttl is None else now + self.ttl
+            self._entries[key] = _Entry(value, expires, size)
+            self._expiry[key] = None
+            self._bytes += size
+            while (
+                self.maxsize is not None and len(self._entries) > self.maxsize
+            ) or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                self._discard(next(iter(self._entries)))
+
+    def claim_refresh(self, key: Hashable) -> bool:
+        """Claim the refresh of a stale entry.
+
+        Args:
+            key (Hashable): Cache key.
+
+        Returns:
+            bool: True for the first caller until :meth:`set` or
+            :meth:`release_refresh` is called for ``key``.
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def release_refresh(self, key: Hashable) -> None:
+        """Give up a refresh claimed with :meth:`claim_refresh`.
+
+        Args:
+            key (Hashable): Cache key.
+        """
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._expiry.clear()
+            self._refreshing.clear()
+            self._bytes = 0
+
+
+class _Call:
+    """A computation in flight, which other callers can wait on."""
+
+    def __init__(self) -> None:
+        """Initialise an unfinished call."""
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Deduplicates concurrent computations of the same key.
+
+    The first caller of :meth:`do` for a key runs the computation; callers
+    arriving while it runs wait for it and share its result or exception.
+
+    Example:
+        >>> from valkyrie_tools.cache import SingleFlight
+        >>> flight = SingleFlight()
+        >>> flight.do("key", lambda: 42)
+        42
     """
-    start_time = time()
-    while True:
-        yield floor((time() - start_time) / seconds)
+
+    def __init__(self) -> None:
+        """Initialise with no calls in flight."""
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Return ``fn()``, sharing one call among concurrent callers of ``key``.
+
+        Args:
+            key (Hashable): Key identifying the computation.
+            fn (Callable[[], Any]): The computation.
+
+        Returns:
+            Any: The result of ``fn``.
+
+        Raises:
+            BaseException: Whatever ``fn`` raised, in every waiting caller.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value
+
+
+def _cached_call(
+    store: TTLCache,
+    flight: SingleFlight,
+    key: Hashable,
+    compute: Callable[[], Any],
+) -> Any:
+    """Compute and store a missing result once, however many threads ask.
+
+    Args:
+        store (TTLCache): Cache to fill.
+        flight (SingleFlight): In-flight computations of ``store``.
+        key (Hashable): Cache key.
+        compute (Callable[[], Any]): Computes the result.
+
+    Returns:
+        Any: The result, possibly stored by another thread meanwhile.
+    """
+
+    def load() -> Any:
+        """Compute and store the result unless it has just been stored.
+
+        Returns:
+            Any: The result.
+        """
+        found = store.lookup(key)
+        if found is not None:
+            return found[0]
+        value = compute()
+        store.set(key, value)
+        return value
+
+    return flight.do(key, load)
 
 
 class Cache:
     """A decorator class for caching function results."""
 
+    @overload
     @staticmethod
-    def memoize(fn: _F) -> _F:
+    def memoize(fn: _F) -> _F: ...  # noqa: E704
+
+    @overload
+    @staticmethod
+    def memoize(  # noqa: E704
+        *, maxsize: Optional[int] = ..., typed: bool = ...
+    ) -> Callable[[_F], _F]: ...
+
+    @staticmethod
+    def memoize(
+        fn: Optional[_F] = None,
+        *,
+        maxsize: Optional[int] = 128,
+        typed: bool = False,
+    ) -> Any:
         """Decorator for caching function results.
 
         Memoize decorator that caches the return value of a function
-        based on its arguments.
+        based on its positional and keyword arguments, evicting the least
+        recently used results beyond ``maxsize``.  Concurrent calls with
+        the same arguments share a single computation.  May be used bare
+        (``@cache.memoize``) or with arguments.
 
         Args:
-            fn (_F): The function to be memoized.
+            fn (Optional[_F]): The function to be memoized, when used bare.
+            maxsize (Optional[int]): The maximum number of results to keep,
+                or ``None`` for no limit. Defaults to 128.
+            typed (bool): Whether to differentiate between
+                arguments of different types. Defaults to False.
 
         Returns:
-            _F: The memoized function.
+            Any: The memoized function, or a decorator producing it when
+            ``fn`` is not given.  The memoized function also exposes a
+            ``clear_cache()`` method.
 
         Example:
             >>> from valkyrie_tools.cache import Cache
@@ -67,41 +419,79 @@ class Cache:
             >>> call_count[0]  # only called once
             1
         """
-        memo: Dict[Tuple[Any, ...], Any] = {}
 
-        def wrapper(*args: Any) -> Any:
-            """A wrapper that caches the result of the function."""
-            if args in memo:
-                return memo[args]
-            else:
-                rv = fn(*args)
-                memo[args] = rv
-                return rv
+        def decorator(func: _F) -> _F:
+            """Memoize ``func``.
+
+            Args:
+                func (_F): The function to be memoized.
+
+            Returns:
+                _F: The memoized function.
+            """
+            store = TTLCache(maxsize)
+            flight = SingleFlight()
+
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                """A wrapper that caches the result of the function.
+
+                Args:
+                    *args: Variable length argument list.
+                    **kwargs: Arbitrary keyword arguments.
+
+                Returns:
+                    Any: The result of ``func``.
+                """
+                key = _make_key(args, kwargs, typed)
+                found = store.lookup(key)
+                if found is not None:
+                    return found[0]
+                return _cached_call(
+                    store, flight, key, lambda: func(*args, **kwargs)
+                )
+
+            wrapper.clear_cache = store.clear  # type: ignore[attr-defined]
 
-        return wrapper  # type: ignore[return-value]  # wrapper erases _F bound
+            return update_wrapper(wrapper, func)  # type: ignore[return-value]  # noqa: B950
+
+        if fn is None:
+            return decorator
+        return decorator(fn)
 
     @staticmethod
     def ttl_cache(
-        maxsize: int = 128, typed: bool = False, ttl: int = -1
+        maxsize: Optional[int] = 128,
+        typed: bool = False,
+        ttl: int = -1,
+        stale_ttl: float = 0,
+        max_bytes: Optional[int] = None,
     ) -> Callable[[_F], _F]:
         """Decorator that adds TTL caching functionality to a function.
 
-        Wraps :func:`functools.lru_cache` with a time-based hash so that
-        cached results expire after ``ttl`` seconds.
+        Results are kept in a :class:`TTLCache`: each one expires ``ttl``
+        seconds after it was computed, so entries do not all expire at
+        once, and the least recently used ones are evicted when the cache
+        is full.  Concurrent calls missing the same result share a single
+        computation.  Within ``stale_ttl`` seconds after expiry, a call returns
+        the stale result at once and refreshes it on a background thread.
 
         Args:
-            maxsize (int): The maximum number of function calls to
-                cache. Defaults to 128.
+            maxsize (Optional[int]): The maximum number of function calls to
+                cache, or ``None`` for no limit. Defaults to 128.
             typed (bool): Whether to differentiate between
                 arguments of different types. Defaults to False.
             ttl (int): The time-to-live (in seconds) for the cached
-                function results. Defaults to -1, which means no expiration
-                (effectively ``65536`` seconds).
+                function results. Defaults to -1, which means no expiration.
+            stale_ttl (float): Seconds during which an expired result is
+                still returned while it is refreshed. Defaults to 0.
+            max_bytes (Optional[int]): Approximate limit on the memory held
+                by cached results (see :func:`approx_sizeof`), or ``None``
+                for no limit. Defaults to None.
 
         Returns:
             Callable: The decorated function.  The returned wrapper also
             exposes a ``clear_cache()`` method to manually invalidate the
-            underlying ``lru_cache``.
+            cache.
 
         Example:
             >>> from valkyrie_tools.cache import Cache
@@ -115,11 +505,6 @@ class Cache:
             'data:x'
             >>> fetch_data.clear_cache()  # invalidate manually if needed
         """
-        # Any ttl that's 0 or less, set to max.
-        if ttl <= 0:
-            ttl = 65536  # pragma: no cover
-
-        hash_gen = _ttl_hash_gen(ttl)
 
         def wrapper(func: _F) -> _F:
             """A decorator that adds caching functionality to a function.
@@ -130,41 +515,56 @@ class Cache:
             Returns:
                 _F: The decorated function.
             """
+            store = TTLCache(
+                maxsize,
+                ttl if ttl > 0 else None,
+                stale_ttl,
+                max_bytes,
+            )
+            flight = SingleFlight()
 
-            @lru_cache(maxsize, typed)
-            def ttl_func(ttl_hash: int, *args: Any, **kwargs: Any) -> Any:
-                """Caches the result of 'func' function based on the arguments.
+            def refresh(key: Hashable, args: Any, kwargs: Any) -> None:
+                """Recompute a stale result, keeping it if that fails.
 
                 Args:
-                    ttl_hash (int): Hash used to identify the cached result.
-                    *args: Positional arguments passed to the 'func' function.
-                    **kwargs: Keyword arguments passed to the 'func' function.
-
-                Returns:
-                    The result of the 'func' function.
+                    key (Hashable): Cache key of the call.
+                    args (Any): Positional arguments of the call.
+                    kwargs (Any): Keyword arguments of the call.
                 """
-                return func(*args, **kwargs)
+                try:
+                    value = func(*args, **kwargs)
+                except Exception:
+                    store.release_refresh(key)
+                else:
+                    store.set(key, value)
 
             def wrapped(*args: Any, **kwargs: Any) -> Any:
-                """A wrapper that generates a hash value and calls the ttl_func.
-
-                This function is a wrapper that generates a hash value and
-                calls the ttl_func with the generated hash value, along with
-                the provided arguments and keyword arguments.
+                """Return the cached result of ``func``, computing it if needed.
 
                 Args:
                     *args: Variable length argument list.
                     **kwargs: Arbitrary keyword arguments.
 
                 Returns:
-                    Any: The result returned by ttl_func.
+                    Any: The result of ``func``.
                 """
-                th = next(hash_gen)
-                return ttl_func(th, *args, **kwargs)
+                key = _make_key(args, kwargs, typed)
+                found = store.lookup(key)
+                if found is None:
+                    return _cached_call(
+                        store, flight, key, lambda: func(*args, **kwargs)
+                    )
+
+                value, stale = found
+                if stale and store.claim_refresh(key):
+                    threading.Thread(
+                        target=refresh, args=(key, args, kwargs), daemon=True
+                    ).start()
+                return value
 
             def clear_cache() -> None:
-                """Clears the cache used by the ttl_func."""
-                ttl_func.cache_clear()
+                """Clears the cache used by the wrapped function."""
+                store.clear()
 
             wrapped.clear_cache = clear_cache  # type: ignore[attr-defined]  # noqa: B950
 
@@ -2,20 +2,53 @@
 
 Provides the :func:`common_options` Click decorator (which wires up
 ``--interactive``, ``--json``, and a variadic ``values`` argument for every
-command), input-handling helpers (:func:`parse_input_methods`,
-:func:`handle_file_input`, :func:`parse_json_stdin`, :func:`emit_json`),
-and a family of regex-based extraction functions for domains, IP addresses,
-e-mail addresses, and URLs.
+command), input-handling helpers (:func:`iter_input_lines`,
+:func:`iter_extract`, :func:`parse_input_methods`,
+:func:`handle_file_input`, :func:`parse_json_stdin`,
+:func:`iter_json_stdin`), output helpers
+(:func:`emit_json`, :func:`emit_json_stream`), a bounded concurrent
+executor (:func:`map_concurrent`), a single-pass indicator extractor
+(:func:`extract_indicators`) and a family of regex-based extraction
+functions for domains, IP addresses, e-mail addresses, and URLs.
 """
 
 from __future__ import annotations
 
+import fnmatch
+import glob
 import json
+import mmap
 import os
 import re
+import stat
 import sys
-from functools import wraps
-from typing import Any, Callable, List, Optional, Tuple, Union  # noqa: F401
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from functools import partial, wraps
+from itertools import chain
+from typing import (  # noqa: F401
+    IO,
+    Any,
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
 
 import click
 from art import text2art  # type: ignore[import-untyped]  # no stubs available
@@ -23,19 +56,45 @@ from art import text2art  # type: ignore[import-untyped]  # no stubs available
 from .constants import (
     DOMAIN_REGEX,
     EMAIL_ADDR_REGEX,
+    INDICATOR_KINDS,
+    INPUT_CHUNK_SIZE,
+    INPUT_PREFETCH_SIZE,
+    INPUT_READ_WORKERS,
     INTERACTIVE_MODE_PROMPT,
     IPV4_REGEX,
     IPV6_REGEX,
     URL_REGEX,
 )
-from .files import is_binary_file
+from .files import compression_format, is_binary_file, open_compressed
+from .ipaddr import IPAddr
+from .jsonenc import dumps
+from .scanner import ScanText, scan
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+_H = TypeVar("_H", bound=Hashable)
 
 __all__ = [
     "common_options",
     "emit_json",
+    "emit_json_stream",
+    "map_concurrent",
     "parse_json_stdin",
+    "iter_json_values",
+    "iter_json_stdin",
     "print_version",
     "parse_input_methods",
+    "iter_input_lines",
+    "iter_input_paths",
+    "read_lines",
+    "MappedChunk",
+    "iter_mapped_chunks",
+    "iter_extract",
+    "peek_iter",
+    "Indicator",
+    "extract_indicators",
+    "extract_hosts",
+    "indicator_key",
     "extract_domains",
     "extract_ipv4_addrs",
     "extract_ipv6_addrs",
@@ -58,6 +117,11 @@ def common_options(
     -V, --version: Show version and exit.
     -vvv, --verbose: Enable verbose mode.
     -i, --interactive: Enable interactive mode.
+    -j, --json: Output results as a JSON array.
+    --jsonl: Output results as newline-delimited JSON (implies ``--json``).
+    --jobs: Number of indicator extraction processes.
+    --exclude: Patterns to skip in input directories and globs.
+    --max-file-size: Size limit for files in input directories and globs.
 
     Args:
         cmd_type (Callable): Click command decorator factory (e.g. click.command).
@@ -88,6 +152,35 @@ def common_options(
             help="Output results as JSON.",
             default=False,
         )
+        @click.option(
+            "--jsonl",
+            "output_jsonl",
+            is_flag=True,
+            help="Output results as newline-delimited JSON, one per line.",
+            default=False,
+        )
+        @click.option(
+            "--jobs",
+            type=click.IntRange(min=1),
+            default=1,
+            show_default=True,
+            help="Extract indicators from the input on N processes.",
+        )
+        @click.option(
+            "--exclude",
+            metavar="PATTERN",
+            multiple=True,
+            help="Skip files and directories matching PATTERN when reading "
+            "directories and globs.",
+        )
+        @click.option(
+            "--max-file-size",
+            type=click.IntRange(min=0),
+            metavar="BYTES",
+            default=None,
+            help="Skip files larger than BYTES when reading directories and "
+            "globs.",
+        )
         @click.option(
             "-I",
             "--interactive",
@@ -101,6 +194,8 @@ def common_options(
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
             """Ensure decorated function's metadata is preserved."""
+            if kwargs.get("output_jsonl"):
+                kwargs["output_json"] = True
             return func(*args, **kwargs)
 
         return wrapper
@@ -145,19 +240,143 @@ def print_version(version: str) -> Callable[..., None]:
     return echo_version
 
 
-def emit_json(data: list[Any] | Any) -> None:
+def emit_json(data: list[Any] | Any, compact: bool = False) -> None:
     """Serialise ``data`` to JSON and print it to stdout.
 
-    Uses ``default=str`` so that non-serialisable values (e.g.
-    :class:`datetime.datetime` objects from WHOIS results) are coerced to
-    their string representation rather than raising a :class:`TypeError`.
+    Encoded with :func:`~valkyrie_tools.jsonenc.dumps`, which uses orjson
+    when it is installed.  Dates and times (e.g. from WHOIS results) are
+    written as ISO 8601 strings, IP addresses and dataclasses natively, and
+    any other non-serialisable value as its string representation rather
+    than raising a :class:`TypeError`.
 
     Args:
         data (Union[List[Any], Any]): JSON-serialisable value (typically a
             list of dicts for tool commands, or a plain dict for single-item
             config sub-commands) to serialise and print.
+        compact (bool): Whether to print without indentation, for machine
+            consumers.  Defaults to False.
     """
-    click.echo(json.dumps(data, indent=2, default=str))
+    click.echo(dumps(data, compact=compact))
+
+
+def emit_json_stream(
+    items: Iterable[Any], jsonl: bool = False, compact: bool = False
+) -> None:
+    """Serialise ``items`` as a JSON array, printing each element when ready.
+
+    Produces exactly the same text as ``emit_json(list(items), compact)`` but
+    writes (and flushes) every element as soon as the iterable yields it, so
+    results from slow lookups appear immediately instead of after the whole
+    run.
+
+    With ``jsonl`` the items are written as newline-delimited JSON instead:
+    one compact document per line and no enclosing array, so a consumer
+    can process each result as it arrives without buffering the output.
+
+    Args:
+        items (Iterable[Any]): JSON-serialisable values, typically result
+            dicts produced lazily by a command.
+        jsonl (bool): Whether to write NDJSON lines instead of an array.
+            Defaults to False.
+        compact (bool): Whether to write the array without indentation.
+            Defaults to False.
+    """
+    if jsonl:
+        for item in items:
+            click.echo(dumps(item, compact=True))
+        return
+
+    first = True
+    for item in items:
+        text = dumps(item, compact=compact)
+        if compact:
+            click.echo("[" + text if first else "," + text, nl=False)
+        else:
+            text = "  " + text.replace("\n", "\n  ")
+            click.echo("[\n" + text if first else ",\n" + text, nl=False)
+        first = False
+
+    if first:
+        click.echo("[]")
+    else:
+        click.echo("]" if compact else "\n]")
+
+
+def map_concurrent(
+    func: Callable[[_T], _R],
+    items: Iterable[_T],
+    workers: int = 1,
+    ordered: bool = True,
+    processes: bool = False,
+) -> Iterator[_R]:
+    """Apply ``func`` to ``items`` on a bounded thread or process pool.
+
+    Results are yielded as soon as they are available: in input order when
+    ``ordered`` is ``True``, otherwise in completion order.  At most
+    ``workers`` calls run at once and only ``2 * workers`` items are
+    submitted ahead of the consumer, so memory stays bounded for long inputs.
+    With ``workers`` of ``1`` or less, ``func`` is simply called in the
+    current thread.  Exceptions raised by ``func`` propagate to the consumer,
+    so callers wanting per-item errors should catch them inside ``func``.
+    With ``processes``, CPU-bound work runs on a process pool instead, so
+    ``func``, the items and the results must be picklable.
+
+    Args:
+        func (Callable[[_T], _R]): Function to apply to each item.
+        items (Iterable[_T]): Items to process.
+        workers (int): Maximum number of concurrent calls. Defaults to 1.
+        ordered (bool): Whether to yield results in input order.
+            Defaults to True.
+        processes (bool): Whether to use a process pool instead of a
+            thread pool. Defaults to False.
+
+    Yields:
+        _R: The result of ``func`` for each item.
+
+    Example:
+        >>> from valkyrie_tools.commons import map_concurrent
+        >>> list(map_concurrent(lambda x: x * 2, [1, 2, 3], workers=2))
+        [2, 4, 6]
+    """
+    if workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    source = iter(items)
+    window = workers * 2
+    pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    executor: Executor
+    with pool(max_workers=workers) as executor:
+        queue: deque[Future[_R]] = deque()
+        pending: set[Future[_R]] = set()
+
+        def submit() -> bool:
+            """Submit the next item, returning False once exhausted."""
+            for item in source:
+                future = executor.submit(func, item)
+                queue.append(future)
+                pending.add(future)
+                return True
+            return False
+
+        while len(queue) < window and submit():
+            pass
+
+        while pending:
+            if ordered:
+                done = [queue.popleft()]
+                pending.discard(done[0])
+            else:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                done = list(finished)
+                pending.difference_update(done)
+                for future in done:
+                    queue.remove(future)
+
+            for future in done:
+                submit()
+                yield future.result()
 
 
 def parse_json_stdin(
@@ -205,6 +424,150 @@ def parse_json_stdin(
         raise click.UsageError(str(exc)) from exc
 
 
+def _decode_json(
+    decoder: json.JSONDecoder, buffer: str, pos: int, final: bool
+) -> tuple[Any, int]:
+    """Decode the JSON value at ``pos``, unless it may be incomplete.
+
+    Args:
+        decoder (json.JSONDecoder): Decoder to use.
+        buffer (str): Text read so far.
+        pos (int): Offset of the value in ``buffer``.
+        final (bool): Whether the end of the input has been reached.
+
+    Returns:
+        Tuple[Any, int]: The value and the offset just past it, or
+        ``(None, -1)`` when more input is needed first.
+    """
+    try:
+        value, end = decoder.raw_decode(buffer, pos)
+    except json.JSONDecodeError:
+        if final:
+            raise
+        return None, -1
+
+    # A number at the very end of the buffer may continue on the next read.
+    if end == len(buffer) and not final:
+        return None, -1
+    return value, end
+
+
+def _json_delimiter(state: str, char: str, buffer: str, pos: int) -> str:
+    """Return the array state that follows the delimiter ``char``.
+
+    Args:
+        state (str): ``"top"`` between top-level values, ``"open"`` after
+            ``[``, ``"item"`` after ``,`` and ``"next"`` after an element.
+        char (str): One of ``[``, ``,`` and ``]``.
+        buffer (str): Text read so far, for error reporting.
+        pos (int): Offset of ``char`` in ``buffer``.
+
+    Returns:
+        str: The state after ``char``.
+
+    Raises:
+        JSONDecodeError: If ``char`` is not allowed in ``state``.
+    """
+    if char == "[" and state == "top":
+        return "open"
+    if char == "]" and state in ("open", "next"):
+        return "top"
+    if char == "," and state == "next":
+        return "item"
+    raise json.JSONDecodeError("Unexpected %r" % char, buffer, pos)
+
+
+def iter_json_values(
+    stream: IO[str], size: int = INPUT_CHUNK_SIZE
+) -> Iterator[Any]:
+    r"""Decode the JSON values of ``stream`` one at a time, as they arrive.
+
+    Accepts newline-delimited JSON (or any whitespace-separated sequence
+    of values) as well as top-level arrays, whose elements are yielded one
+    by one instead of the array itself.  The stream is read a line (of at
+    most ``size`` characters) at a time and a value is yielded as soon as
+    it is complete, so a command reading the output of another one can
+    start on the first result while the upstream command is still
+    running.  Only the value being decoded is held in memory.
+
+    Args:
+        stream (IO[str]): Text stream, e.g. ``sys.stdin``.
+        size (int): Maximum number of characters read at once.  Defaults
+            to :data:`~valkyrie_tools.constants.INPUT_CHUNK_SIZE`.
+
+    Yields:
+        Any: Each top-level value, or each element of a top-level array.
+
+    Raises:
+        JSONDecodeError: If the stream is not valid JSON.
+
+    Example:
+        >>> import io
+        >>> from valkyrie_tools.commons import iter_json_values
+        >>> list(iter_json_values(io.StringIO('{"a": 1}\n[2, [3]]\n"x"')))
+        [{'a': 1}, 2, [3], 'x']
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, state, final = "", 0, "top", False
+    while True:
+        while buffer[pos : pos + 1] in (" ", "\t", "\r", "\n"):
+            pos += 1
+        char = buffer[pos : pos + 1]
+        if char in (",", "]") or (char == "[" and state == "top"):
+            state = _json_delimiter(state, char, buffer, pos)
+            pos += 1
+            continue
+        if char and state == "next":
+            raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+        if char:
+            value, end = _decode_json(decoder, buffer, pos, final)
+            if end >= 0:
+                yield value
+                pos, state = end, "top" if state == "top" else "next"
+                continue
+        elif final:
+            if state != "top":
+                raise json.JSONDecodeError("Unterminated array", buffer, pos)
+            return
+
+        line = stream.readline(size)
+        buffer, pos, final = buffer[pos:] + line, 0, line == ""
+
+
+def iter_json_stdin(
+    stream: IO[str],
+    extractor: Callable[[list[Any]], tuple[str, ...]],
+) -> Iterator[str]:
+    """Stream targets from upstream valkyrie-tools JSON on ``stream``.
+
+    The incremental counterpart of :func:`parse_json_stdin`: the input is
+    decoded with :func:`iter_json_values`, so both the ``--json`` array
+    and the ``--jsonl`` lines of an upstream command are accepted, and
+    ``extractor`` is called on every object as soon as it has been read.
+
+    Args:
+        stream (IO[str]): Text stream, e.g. ``sys.stdin``.
+        extractor (Callable[[List[Any]], Tuple[str, ...]]): Per-command
+            function that maps decoded JSON objects to string targets.
+
+    Yields:
+        str: Extracted string values for the command to process.
+
+    Raises:
+        UsageError: If the input is not valid JSON or ``extractor`` raises
+            a :class:`ValueError` for an unrecognised upstream schema.
+    """
+    try:
+        for value in iter_json_values(stream):
+            yield from extractor([value])
+    except json.JSONDecodeError as exc:
+        raise click.UsageError(
+            "Piped input is not valid JSON. Use --json on the upstream command."
+        ) from exc
+    except ValueError as exc:
+        raise click.UsageError(str(exc)) from exc
+
+
 def handle_file_input(
     file_path: str,
 ) -> str | None:
@@ -212,7 +575,9 @@ def handle_file_input(
 
     Performs safety checks before reading: binary files and directories are
     rejected with an :class:`OSError`.  Only plain text files (as detected by
-    :func:`~valkyrie_tools.files.is_binary_file`) are read and returned.
+    :func:`~valkyrie_tools.files.is_binary_file`) and compressed text files
+    (see :func:`~valkyrie_tools.files.open_compressed`) are read and
+    returned.
 
     Args:
         file_path (str): Path to the file to read.
@@ -228,8 +593,13 @@ def handle_file_input(
     """
     value = None
 
+    # Decompress archives, which would otherwise look binary.
+    if compression_format(file_path) is not None:
+        with open_compressed(file_path) as file:
+            value = file.read().strip()
+
     # Safely avoid binary files.
-    if is_binary_file(file_path) is True:
+    elif is_binary_file(file_path) is True:
         raise OSError("Binary file provided, not a text file.")
     # Avoid directories.
     elif os.path.isdir(file_path) is True:
@@ -265,6 +635,9 @@ def parse_input_methods(
     array to a tuple of string targets; if ``json_extractor`` is ``None`` the
     raw text falls through to normal processing.
 
+    Every input is read into memory in full; the commands use the streaming
+    :func:`iter_input_lines` instead.
+
     Args:
         values (Tuple[str, ...]): Positional arguments.
         interactive (bool): Whether to enable interactive mode.
@@ -333,112 +706,957 @@ def parse_input_methods(
     return args
 
 
+def read_lines(stream: IO[str], size: int = INPUT_CHUNK_SIZE) -> Iterator[str]:
+    r"""Yield the lines of ``stream`` lazily, without line endings.
+
+    At most ``size`` characters are read at a time.  A longer line is split
+    at its last space or tab and the remainder carried over to the next
+    read, so no indicator is cut in half and memory stays bounded even for
+    inputs without line breaks.
+
+    Args:
+        stream (IO[str]): Text stream, e.g. an open file or ``sys.stdin``.
+        size (int): Maximum number of characters read at once.  Defaults
+            to :data:`~valkyrie_tools.constants.INPUT_CHUNK_SIZE`.
+
+    Yields:
+        str: Successive lines (or whitespace-bounded pieces of long lines).
+
+    Example:
+        >>> import io
+        >>> from valkyrie_tools.commons import read_lines
+        >>> list(read_lines(io.StringIO("a b\r\nc d e\n"), size=3))
+        ['a', 'b', 'c', 'd e']
+    """
+    carry = ""
+    while True:
+        chunk = stream.readline(size)
+        if not chunk:
+            break
+        text = carry + chunk
+        carry = ""
+        if chunk.endswith("\n"):
+            yield text.rstrip("\r\n")
+            continue
+        cut = max(text.rfind(" "), text.rfind("\t"))
+        if cut <= 0:
+            yield text
+        else:
+            carry = text[cut + 1 :]
+            yield text[:cut]
+    if carry:
+        yield carry
+
+
+class MappedChunk(NamedTuple):
+    """A window of a memory-mapped input file.
+
+    Produced by :func:`iter_mapped_chunks` and accepted by
+    :func:`extract_indicators` and :func:`extract_hosts` in place of a line
+    of text, so file contents are scanned in place and only the matched
+    spans are ever decoded.
+
+    A window is pickled as its path and offsets only, so it can be sent to
+    a worker process (see :func:`iter_extract`), which maps the file itself
+    and shares its pages with every other process through the page cache.
+
+    Attributes:
+        buffer (mmap.mmap): Read-only mapping of the whole file.
+        start (int): Byte offset where the window starts.
+        end (int): Byte offset just past the window.
+        path (str): Path of the mapped file.
+    """
+
+    buffer: mmap.mmap
+    start: int
+    end: int
+    path: str = ""
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle the window as its path and offsets, not its contents."""
+        return (_map_chunk, (self.path, self.start, self.end))
+
+
+_MAPPED_FILES: dict[str, mmap.mmap] = {}
+"""Files mapped by :func:`_map_chunk`, kept open for the process lifetime."""
+
+
+def _map_chunk(path: str, start: int, end: int) -> MappedChunk:
+    """Rebuild a pickled :class:`MappedChunk`, mapping each file only once.
+
+    Args:
+        path (str): Path of the mapped file.
+        start (int): Byte offset where the window starts.
+        end (int): Byte offset just past the window.
+
+    Returns:
+        MappedChunk: The window over this process's mapping of ``path``.
+    """
+    buffer = _MAPPED_FILES.get(path)
+    if buffer is None:
+        with open(path, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        _MAPPED_FILES[path] = buffer
+    return MappedChunk(buffer, start, end, path)
+
+
+def iter_mapped_chunks(
+    path: str, size: int = INPUT_CHUNK_SIZE
+) -> Iterator[MappedChunk]:
+    """Memory-map a file and yield it in windows of at most ``size`` bytes.
+
+    Windows end after a line break where possible, otherwise after a space
+    or tab, so no indicator is cut in half.  No window is copied: each is
+    just a pair of offsets into the mapping, which stays valid until the
+    next window is requested.
+
+    Args:
+        path (str): Path of a regular file.
+        size (int): Maximum window size in bytes.  Defaults to
+            :data:`~valkyrie_tools.constants.INPUT_CHUNK_SIZE`.
+
+    Yields:
+        MappedChunk: Consecutive windows covering the file.
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            for start, end in _iter_windows(buffer, size):
+                yield MappedChunk(buffer, start, end, path)
+
+
+def _iter_windows(buffer: ScanText, size: int) -> Iterator[tuple[int, int]]:
+    """Cut ``buffer`` into windows of at most ``size`` items.
+
+    Windows end after a line break where possible, otherwise after a space
+    or tab.
+
+    Args:
+        buffer (ScanText): Text, bytes or memory map.
+        size (int): Maximum window size.
+
+    Yields:
+        Tuple[int, int]: Start and end offsets of consecutive windows.
+    """
+    breaks: tuple[Any, ...] = ("\n", " ", "\t")
+    if not isinstance(buffer, str):
+        breaks = (b"\n", b" ", b"\t")
+    newline, space, tab = breaks
+    start, total = 0, len(buffer)
+    while start < total:
+        end = min(start + size, total)
+        if end < total:
+            cut = buffer.rfind(newline, start, end)
+            if cut < 0:
+                cut = max(
+                    buffer.rfind(space, start, end),
+                    buffer.rfind(tab, start, end),
+                )
+            if cut > start:
+                end = cut + 1
+        yield start, end
+        start = end
+
+
+def _is_excluded(path: str, exclude: tuple[str, ...]) -> bool:
+    """Check a path against ``exclude`` glob patterns.
+
+    Args:
+        path (str): Path, relative to the directory being walked.
+        exclude (Tuple[str, ...]): :mod:`fnmatch` patterns matched against
+            the base name and against the whole relative path.
+
+    Returns:
+        bool: True if any pattern matches.
+    """
+    name = os.path.basename(path)
+    path = path.replace(os.sep, "/")
+    return any(
+        fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(path, pattern)
+        for pattern in exclude
+    )
+
+
+def iter_input_paths(
+    value: str, exclude: tuple[str, ...] = ()
+) -> Iterator[str]:
+    """Yield the files below a directory or matching a glob pattern.
+
+    Nothing is listed up front: directories are walked lazily, in sorted
+    order and without following symbolic links, and glob patterns (``**``
+    matches any number of directories) are expanded as they are consumed.
+    Directories matched by a pattern are walked too.  Files and
+    directories matching one of the ``exclude`` patterns are skipped, and
+    excluded directories are not descended into.  Every file is yielded
+    once, however many times it is reached.
+
+    Args:
+        value (str): Directory path or glob pattern.
+        exclude (Tuple[str, ...]): :mod:`fnmatch` patterns, such as
+            ``"*.pcap"`` or ``".git"``, of files and directories to skip.
+            Defaults to none.
+
+    Yields:
+        str: Paths of the files found.
+    """
+    seen: set[str] = set()
+    if os.path.isdir(value):
+        tops: Iterator[str] = iter([value])
+    else:
+        tops = glob.iglob(value, recursive=True)
+    for top in tops:
+        if os.path.isdir(top):
+            found: Iterator[str] = _walk_files(top, exclude)
+        elif _is_excluded(top, exclude):
+            continue
+        else:
+            found = iter([top])
+        for path in found:
+            real = os.path.realpath(path)
+            if real not in seen:
+                seen.add(real)
+                yield path
+
+
+def _walk_files(top: str, exclude: tuple[str, ...]) -> Iterator[str]:
+    """Walk a directory tree lazily, in sorted order.
+
+    Args:
+        top (str): Directory to walk.
+        exclude (Tuple[str, ...]): Patterns of files and directories to skip.
+
+    Yields:
+        str: Paths of the files found.
+    """
+    for root, dirs, files in os.walk(top):
+        relative = os.path.relpath(root, top)
+        dirs[:] = sorted(
+            name
+            for name in dirs
+            if not _is_excluded(os.path.join(relative, name), exclude)
+        )
+        for name in sorted(files):
+            if not _is_excluded(os.path.join(relative, name), exclude):
+                yield os.path.join(root, name)
+
+
+def _read_input_file(
+    path: str, max_size: int | None = None
+) -> tuple[str, list[str] | None]:
+    """Read a file found in an input directory or glob.
+
+    Runs on a reader thread.  Files that cannot be inspected, are not
+    regular files, are larger than ``max_size`` or are binary are skipped.
+    Files of at most :data:`~valkyrie_tools.constants.INPUT_PREFETCH_SIZE`
+    bytes are read (and decompressed) whole; larger ones are left to the
+    consumer to stream.
+
+    Args:
+        path (str): File path.
+        max_size (Optional[int]): Size limit in bytes, or ``None`` for no
+            limit.  Defaults to ``None``.
+
+    Returns:
+        Tuple[str, Optional[List[str]]]: ``path`` and its text cut into
+        windows of at most :data:`~valkyrie_tools.constants.INPUT_CHUNK_SIZE`
+        characters, an empty list if the file is skipped, or ``None`` if it
+        is too large to read ahead.
+    """
+    try:
+        info = os.stat(path)
+        if not stat.S_ISREG(info.st_mode) or (
+            max_size is not None and info.st_size > max_size
+        ):
+            return path, []
+        compressed = compression_format(path) is not None
+        if not compressed and is_binary_file(path):
+            return path, []
+        if info.st_size > INPUT_PREFETCH_SIZE:
+            return path, None
+        if compressed:
+            with open_compressed(path) as file:
+                text = file.read()
+        else:
+            with open(path, encoding="utf-8", errors="replace") as file:
+                text = file.read()
+    except OSError:
+        return path, []
+
+    windows = _iter_windows(text, INPUT_CHUNK_SIZE)
+    return path, [text[start:end] for start, end in windows]
+
+
+def _iter_tree_lines(
+    paths: Iterable[str],
+    max_size: int | None = None,
+    workers: int = INPUT_READ_WORKERS,
+) -> Iterator[str | MappedChunk]:
+    """Read many files on a bounded pool of reader threads.
+
+    Files are yielded in the order of ``paths`` while the next ones are
+    read (and decompressed, which releases the GIL) in the background.
+
+    Args:
+        paths (Iterable[str]): File paths, e.g. from
+            :func:`iter_input_paths`.
+        max_size (Optional[int]): Size limit in bytes, or ``None`` for no
+            limit.  Defaults to ``None``.
+        workers (int): Number of reader threads.  Defaults to
+            :data:`~valkyrie_tools.constants.INPUT_READ_WORKERS`.
+
+    Yields:
+        Union[str, MappedChunk]: Windows of every file read.
+    """
+    read = partial(_read_input_file, max_size=max_size)
+    for path, windows in map_concurrent(read, paths, workers=workers):
+        if windows is None:
+            yield from _iter_value_lines(path)
+        else:
+            yield from windows
+
+
+def _iter_value_lines(
+    value: str,
+    exclude: tuple[str, ...] = (),
+    max_file_size: int | None = None,
+    workers: int = INPUT_READ_WORKERS,
+) -> Iterator[str | MappedChunk]:
+    """Yield the lines of a command-line value or of the file(s) it names.
+
+    Regular files are checked like :func:`handle_file_input` does and then
+    memory-mapped with :func:`iter_mapped_chunks` instead of being decoded.
+    Compressed files (gzip, bzip2, xz or Zstandard, recognised by their
+    magic bytes) are decompressed line by line as they are read.
+    Other existing paths that are not directories, such as ``/dev/stdin``,
+    ``/dev/fd/N`` or a named pipe, are streamed as they are written.
+    Directories, and glob patterns matching at least one path, are
+    expanded with :func:`iter_input_paths` and their files read on
+    ``workers`` threads; binary files found that way are skipped.
+
+    Args:
+        value (str): Command-line value, path or glob pattern.
+        exclude (Tuple[str, ...]): Patterns of files and directories to
+            skip in directories and globs.  Defaults to none.
+        max_file_size (Optional[int]): Size limit in bytes for files in
+            directories and globs, or ``None`` for no limit.
+        workers (int): Number of threads reading files in directories and
+            globs.  Defaults to
+            :data:`~valkyrie_tools.constants.INPUT_READ_WORKERS`.
+
+    Yields:
+        Union[str, MappedChunk]: Lines of a stream or of ``value`` itself,
+        or windows of the files read.
+
+    Raises:
+        OSError: If ``value`` names a binary file.
+    """
+    expand = os.path.isdir(value) or (
+        not os.path.exists(value)
+        and any(char in value for char in "*?[")
+        and next(glob.iglob(value, recursive=True), None) is not None
+    )
+    if expand:
+        paths = iter_input_paths(value, exclude)
+        yield from _iter_tree_lines(paths, max_file_size, workers)
+        return
+    if not os.path.exists(value):
+        yield from value.splitlines()
+        return
+    if os.path.isfile(value):
+        if compression_format(value) is not None:
+            with open_compressed(value) as file:
+                yield from read_lines(file)
+            return
+        if is_binary_file(value):
+            raise OSError("Binary file provided, not a text file.")
+        yield from iter_mapped_chunks(value)
+        return
+    with open(value, encoding="utf-8", errors="replace") as file:
+        yield from read_lines(file)
+
+
+def iter_input_lines(
+    values: tuple[str, ...],
+    interactive: bool,
+    ctx: click.Context,
+    output_json: bool = False,
+    json_extractor: Callable[[list[Any]], tuple[str, ...]] | None = None,
+    exclude: tuple[str, ...] = (),
+    max_file_size: int | None = None,
+    workers: int = INPUT_READ_WORKERS,
+) -> Iterator[str | MappedChunk]:
+    """Stream input lines from arguments, files, descriptors and stdin.
+
+    The streaming counterpart of :func:`parse_input_methods`, with the same
+    sources in the same order: the positional ``values`` (each one a file
+    path, directory, glob pattern, ``/dev/fd/N`` descriptor path, or
+    literal text), then stdin when
+    it is piped or in interactive mode.  Nothing is read ahead, so a
+    command can start its lookups on the first line of a multi-gigabyte
+    input while the rest is still being read.  Blank lines are skipped.
+    Regular files are not decoded at all: they are memory-mapped and
+    yielded as :class:`MappedChunk` windows, which the extractors scan as
+    bytes.  Compressed files are inflated as they are read, without
+    temporary files.  Directories and glob patterns are walked lazily and
+    their files read on a bounded pool of ``workers`` threads, honouring
+    the ``exclude`` patterns and ``max_file_size``.
+
+    Piped JSON from another valkyrie-tools command (``output_json`` with a
+    ``json_extractor``) is decoded object by object with
+    :func:`iter_json_stdin`, and yields the extracted targets.
+
+    Args:
+        values (Tuple[str, ...]): Positional arguments.
+        interactive (bool): Whether to enable interactive mode.
+        ctx (click.Context): Click context.
+        output_json (bool): Whether JSON output mode is active.
+            Defaults to ``False``.
+        json_extractor (Optional[Callable]): Per-command function that maps a
+            decoded JSON array to a tuple of string targets.
+            Defaults to ``None``.
+        exclude (Tuple[str, ...]): :mod:`fnmatch` patterns of files and
+            directories to skip in directories and globs.  Defaults to none.
+        max_file_size (Optional[int]): Size limit in bytes for files in
+            directories and globs, or ``None`` for no limit.
+        workers (int): Number of threads reading files in directories and
+            globs.  Defaults to
+            :data:`~valkyrie_tools.constants.INPUT_READ_WORKERS`.
+
+    Yields:
+        Union[str, MappedChunk]: Non-blank input lines and file windows.
+    """
+    read_stdin = interactive
+    if interactive is True:
+        click.echo(text2art(ctx.command.name))
+        click.echo(INTERACTIVE_MODE_PROMPT)
+    elif sys.stdin.isatty() is False:
+        values = tuple(v for v in values if v != "-")
+        read_stdin = True
+        if output_json and json_extractor is not None:
+            targets = peek_iter(iter_json_stdin(sys.stdin, json_extractor))
+            if targets is not None:
+                yield from targets
+                return
+            read_stdin = False
+
+    sources = chain.from_iterable(
+        _iter_value_lines(v, exclude, max_file_size, workers) for v in values
+    )
+    if read_stdin:
+        sources = chain(sources, read_lines(sys.stdin))
+    for line in sources:
+        if isinstance(line, MappedChunk) or line.strip() != "":
+            yield line
+
+
+def peek_iter(items: Iterable[_T]) -> Iterator[_T] | None:
+    """Check whether an iterable is empty without losing its first item.
+
+    Args:
+        items (Iterable[_T]): Possibly lazy iterable.
+
+    Returns:
+        Optional[Iterator[_T]]: Iterator over all of ``items``, or ``None``
+        if there are none.
+
+    Example:
+        >>> from valkyrie_tools.commons import peek_iter
+        >>> list(peek_iter(iter([1, 2])))
+        [1, 2]
+        >>> peek_iter(iter([])) is None
+        True
+    """
+    source = iter(items)
+    for first in source:
+        return chain((first,), source)
+    return None
+
+
+def _iter_batches(
+    lines: Iterable[_T], size: int = INPUT_CHUNK_SIZE
+) -> Iterator[list[_T]]:
+    """Group input lines into batches worth sending to a worker process.
+
+    Every :class:`MappedChunk` is a batch of its own; consecutive text lines
+    are grouped until they hold about ``size`` characters.
+
+    Args:
+        lines (Iterable[_T]): Input lines and file windows.
+        size (int): Characters of text lines per batch.  Defaults to
+            :data:`~valkyrie_tools.constants.INPUT_CHUNK_SIZE`.
+
+    Yields:
+        List[_T]: Batches in input order.
+    """
+    batch: list[_T] = []
+    length = 0
+    for line in lines:
+        if isinstance(line, MappedChunk):
+            if batch:
+                yield batch
+                batch, length = [], 0
+            yield [line]
+            continue
+        batch.append(line)
+        length += len(line) if isinstance(line, str) else 1
+        if length >= size:
+            yield batch
+            batch, length = [], 0
+    if batch:
+        yield batch
+
+
+def _extract_batch(
+    extract: Callable[[_T], Iterable[_H]], batch: list[_T]
+) -> list[_H]:
+    """Run an extractor over a batch of lines in a worker process.
+
+    Args:
+        extract (Callable[[_T], Iterable[_H]]): Extractor for one line.
+        batch (List[_T]): Lines and file windows.
+
+    Returns:
+        List[_H]: Matches of the whole batch, in order.
+    """
+    return [match for line in batch for match in extract(line)]
+
+
+def iter_extract(
+    lines: Iterable[_T],
+    extract: Callable[[_T], Iterable[_H]],
+    unique: bool = True,
+    jobs: int = 1,
+) -> Iterator[_H]:
+    """Run an extractor over each line, yielding matches as they are found.
+
+    With ``jobs`` greater than one, the lines are grouped into batches
+    (each :class:`MappedChunk` window of a file on its own) and extracted on
+    a pool of ``jobs`` processes.  Windows travel to the workers as offsets
+    into a file every worker maps itself, so file contents are never
+    pickled.  The per-batch matches are merged in input order and
+    deduplicated globally, so the output is the same as with one job.
+    ``extract`` must then be picklable, e.g. a module-level function.
+
+    Args:
+        lines (Iterable[_T]): Input lines, e.g. from
+            :func:`iter_input_lines`.
+        extract (Callable[[_T], Iterable[_H]]): Function returning the
+            matches of one line, e.g. :func:`extract_domains`.
+        unique (bool): Whether to skip matches already yielded.
+            Defaults to True.
+        jobs (int): Number of extraction processes. Defaults to 1.
+
+    Yields:
+        _H: Matches in input order.
+
+    Example:
+        >>> from valkyrie_tools.commons import extract_domains, iter_extract
+        >>> list(iter_extract(["a.com b.org", "a.com c.net"], extract_domains))
+        ['a.com', 'b.org', 'c.net']
+    """
+    results: Iterable[Iterable[_H]]
+    if jobs > 1:
+        results = map_concurrent(
+            partial(_extract_batch, extract),
+            _iter_batches(lines),
+            workers=jobs,
+            processes=True,
+        )
+    else:
+        results = map(extract, lines)
+
+    seen: set[_H] = set()
+    for matches in results:
+        for match in matches:
+            if unique:
+                if match in seen:
+                    continue
+                seen.add(match)
+            yield match
+
+
+class Indicator(NamedTuple):
+    """An indicator found by :func:`extract_indicators`.
+
+    Attributes:
+        kind (str): One of :data:`~valkyrie_tools.constants.INDICATOR_KINDS`.
+        value (str): Matched text.
+        start (int): Offset of the first character in the scanned text.
+        end (int): Offset just past the last character.
+    """
+
+    kind: str
+    value: str
+    start: int
+    end: int
+
+
+def _span_text(buffer: ScanText, start: int, end: int) -> str:
+    """Return a matched span of scanned text, decoding it if needed.
+
+    Args:
+        buffer (ScanText): Scanned text or buffer.
+        start (int): Offset of the span.
+        end (int): Offset just past the span.
+
+    Returns:
+        str: The span as text.
+    """
+    span = buffer[start:end]
+    if isinstance(span, str):
+        return span
+    return span.decode("utf-8", errors="replace")
+
+
+def extract_indicators(
+    text: str | MappedChunk,
+    kinds: Iterable[str] = INDICATOR_KINDS,
+    unique: bool = False,
+    normalize: bool = False,
+) -> list[Indicator]:
+    """Extract typed indicators from text in a single scan.
+
+    The text is tokenized once by :func:`~valkyrie_tools.scanner.scan`,
+    which runs in linear time even on adversarial input, and overlapping
+    candidates are resolved in the same pass: a domain inside a URL or
+    e-mail address, or an IPv4 address inside an IPv6 one, is not reported
+    a second time, and a file name in a URL path is not mistaken for a
+    domain.  When the containing kind was not requested, its embedded host
+    is reported instead, with its own position, so requesting only
+    ``"domain"`` still yields the host of every URL.  Unlike the regex
+    based ``extract_*`` functions, a URL ends at whitespace, quotes,
+    brackets, commas and semicolons.
+
+    A :class:`MappedChunk` is scanned in place as bytes; only the matched
+    spans are decoded, and positions are byte offsets into the file.
+
+    Args:
+        text (Union[str, MappedChunk]): Text, or file window, to extract
+            indicators from.
+        kinds (Iterable[str]): Indicator kinds to report.  Defaults to all
+            of them.
+        unique (bool): Whether to skip indicators whose kind and value were
+            already reported.  Defaults to False.
+        normalize (bool): Whether ``unique`` compares the
+            :func:`indicator_key` of each value. Defaults to False.
+
+    Returns:
+        List[Indicator]: Indicators in order of appearance.
+
+    Raises:
+        ValueError: If ``kinds`` contains an unknown kind.
+
+    Example:
+        >>> from valkyrie_tools.commons import extract_indicators
+        >>> text = "see https://example.com/a.html or ::ffff:10.0.0.1"
+        >>> for found in extract_indicators(text):
+        ...     print(found.kind, found.value, found.start)
+        url https://example.com/a.html 4
+        ipv6 ::ffff:10.0.0.1 34
+        >>> [i.value for i in extract_indicators(text, kinds=["domain"])]
+        ['example.com']
+    """
+    wanted = frozenset(kinds)
+    unknown = wanted.difference(INDICATOR_KINDS)
+    if unknown:
+        raise ValueError("Unknown indicator kind: %s" % ", ".join(unknown))
+
+    buffer: ScanText
+    if isinstance(text, MappedChunk):
+        buffer, bounds = text.buffer, (text.start, text.end)
+    else:
+        buffer, bounds = text, (0, len(text))
+
+    found: list[Indicator] = []
+    seen: set[tuple[str, str]] = set()
+    for match in scan(buffer, *bounds):
+        if match.kind in wanted:
+            kind, start, end = match.kind, match.start, match.end
+        elif match.host_kind in wanted:
+            kind, start, end = match.host_kind, match.host_start, match.host_end
+        else:
+            continue
+        indicator = Indicator(kind, _span_text(buffer, start, end), start, end)
+
+        if unique:
+            value = indicator.value
+            if normalize:
+                value = indicator_key(indicator.kind, value)
+            if (indicator.kind, value) in seen:
+                continue
+            seen.add((indicator.kind, value))
+        found.append(indicator)
+
+    return found
+
+
+def extract_hosts(
+    text: str | MappedChunk,
+    unique: bool = False,
+    kinds: Iterable[str] = ("ipv4", "ipv6", "domain"),
+) -> list[str | IPAddr]:
+    """Extract IP addresses and domains from text, in order of appearance.
+
+    Uses :func:`extract_indicators`, so hosts inside URLs and e-mail
+    addresses are included but not their paths or local parts.  IP
+    addresses are parsed into :class:`~valkyrie_tools.ipaddr.IPAddr` values
+    and matches that are not valid addresses are dropped.
+
+    Args:
+        text (Union[str, MappedChunk]): Text, or file window, to extract
+            hosts from.
+        unique (bool): Whether to return unique hosts only.
+            Defaults to False.
+        kinds (Iterable[str]): Host kinds to extract, any of ``"ipv4"``,
+            ``"ipv6"`` and ``"domain"``.  Defaults to all three.
+
+    Returns:
+        List[Union[str, IPAddr]]: Domains and parsed IP addresses.
+
+    Example:
+        >>> from valkyrie_tools.commons import extract_hosts
+        >>> extract_hosts("mail bob@example.org from 10.0.0.1")
+        ['example.org', IPAddr('10.0.0.1')]
+    """
+    hosts: list[str | IPAddr] = []
+    seen: set[str | IPAddr] = set()
+    for found in extract_indicators(text, kinds):
+        host = (
+            found.value if found.kind == "domain" else IPAddr.parse(found.value)
+        )
+        if host is None or (unique and host in seen):
+            continue
+        seen.add(host)
+        hosts.append(host)
+    return hosts
+
+
+def indicator_key(kind: str, value: str) -> str:
+    """Return the key under which an indicator is deduplicated.
+
+    Domains are case-folded, valid IPv6 addresses are written in their
+    canonical compressed form and e-mail addresses get a case-folded
+    domain.  Other values are returned unchanged.
+
+    Args:
+        kind (str): Indicator kind, one of
+            :data:`~valkyrie_tools.constants.INDICATOR_KINDS`.
+        value (str): Matched text.
+
+    Returns:
+        str: Normalized key.
+
+    Example:
+        >>> from valkyrie_tools.commons import indicator_key
+        >>> indicator_key("domain", "WWW.Example.COM")
+        'www.example.com'
+        >>> indicator_key("ipv6", "2001:0DB8:0000:0000:0000:0000:0000:0001")
+        '2001:db8::1'
+    """
+    if kind == "domain":
+        return value.casefold()
+    if kind == "ipv6":
+        ip = IPAddr.parse(value)
+        return value.casefold() if ip is None else str(ip)
+    if kind == "email":
+        local, _, domain = value.rpartition("@")
+        return local + "@" + domain.casefold()
+    return value
+
+
 # Regex extract functions
 def _extract_regex(
-    regex: re.Pattern[str], text: str, key: str | None, unique: bool = False
+    regex: re.Pattern[str],
+    text: str,
+    key: str | None,
+    unique: bool = False,
+    normalize: bool = False,
 ) -> list[str]:
     """Extract regex matches from text.
 
+    Uniqueness is tracked with a set, so deduplicating stays linear in the
+    number of matches while keeping the order of first appearance.
+
     Args:
         regex (re.Pattern): Regex pattern to use.
         text (str): Text to extract regex matches from.
-        key (str, optional): Key to extract from regex match.
+        key (str, optional): Key to extract from regex match, which is also
+            the indicator kind passed to :func:`indicator_key`.
             Defaults to None.
         unique (bool): Whether to return unique matches only.
             Defaults to False.
+        normalize (bool): Whether ``unique`` compares the
+            :func:`indicator_key` of each match instead of its exact text.
+            Defaults to False.
 
     Returns:
         List[str]: List of matches.
     """
     matches = []
+    seen: set[str] = set()
     for text_match in regex.finditer(text):
         match = text_match.group(key) if key else text_match.group()
-        if unique and match in matches:
-            continue
+        if unique:
+            seen_key = indicator_key(key, match) if normalize and key else match
+            if seen_key in seen:
+                continue
+            seen.add(seen_key)
 
         matches.append(match)
 
     return matches
 
 
-def extract_domains(text: str, unique: bool = False) -> list[str]:
+def extract_domains(
+    text: str, unique: bool = False, normalize: bool = False
+) -> list[str]:
     """Extract domains from text.
 
     Args:
         text (str): Text to extract domains from.
         unique (bool): Whether to return unique domains only.
             Defaults to False.
+        normalize (bool): Whether ``unique`` compares normalized values
+            (see :func:`indicator_key`). Defaults to False.
 
     Returns:
         List[str]: List of domains.
     """
-    return _extract_regex(DOMAIN_REGEX, text, "domain", unique)
+    return _extract_regex(DOMAIN_REGEX, text, "domain", unique, normalize)
 
 
-def extract_ipv4_addrs(text: str, unique: bool = False) -> list[str]:
+def extract_ipv4_addrs(
+    text: str, unique: bool = False, normalize: bool = False
+) -> list[str]:
     """Extract IPv4 addresses from text.
 
     Args:
         text (str): Text to extract IPv4 addresses from.
         unique (bool): Whether to return unique IPv4 addresses only.
             Defaults to False.
+        normalize (bool): Whether ``unique`` compares normalized values
+            (see :func:`indicator_key`). Defaults to False.
 
     Returns:
         List[str]: List of IPv4 addresses.
     """
-    return _extract_regex(IPV4_REGEX, text, "ipv4", unique)
+    return _extract_regex(IPV4_REGEX, text, "ipv4", unique, normalize)
 
 
-def extract_ipv6_addrs(text: str, unique: bool = False) -> list[str]:
+def extract_ipv6_addrs(
+    text: str, unique: bool = False, normalize: bool = False
+) -> list[str]:
     """Extract IPv6 addresses from text.
 
     Args:
         text (str): Text to extract IPv6 addresses from.
         unique (bool): Whether to return unique IPv6 addresses only.
             Defaults to False.
+        normalize (bool): Whether ``unique`` compares normalized values
+            (see :func:`indicator_key`). Defaults to False.
 
     Returns:
         List[str]: List of IPv6 addresses.
     """
-    return _extract_regex(IPV6_REGEX, text, "ipv6", unique)
-
-
-def extract_ip_addrs(text: str, unique: bool = False) -> list[str]:
+    return _extract_regex(IPV6_REGEX, text, "ipv6", unique, normalize)
+
+
+@overload
+def extract_ip_addrs(  # noqa: E704
+    text: str,
+    unique: bool = ...,
+    parsed: Literal[False] = ...,
+    normalize: bool = ...,
+) -> list[str]: ...
+
+
+@overload
+def extract_ip_addrs(  # noqa: E704
+    text: str,
+    unique: bool = ...,
+    *,
+    parsed: Literal[True],
+    normalize: bool = ...,
+) -> list[IPAddr]: ...
+
+
+def extract_ip_addrs(
+    text: str,
+    unique: bool = False,
+    parsed: bool = False,
+    normalize: bool = False,
+) -> list[str] | list[IPAddr]:
     """Extract IPv4 and IPv6 addresses from text.
 
+    When ``parsed`` is ``True`` every match is parsed exactly once into an
+    :class:`~valkyrie_tools.ipaddr.IPAddr`; regex matches that are not valid
+    addresses are dropped, and ``unique`` compares parsed values so that
+    different spellings of the same IPv6 address collapse into one entry.
+    The returned values can be passed straight to the
+    :mod:`~valkyrie_tools.ipaddr` and :mod:`~valkyrie_tools.dns` helpers
+    without being re-parsed.
+
     Args:
         text (str): Text to extract IPv4 and IPv6 addresses from.
         unique (bool): Whether to return unique IPv4 and IPv6
             addresses only. Defaults to False.
+        parsed (bool): Whether to return parsed
+            :class:`~valkyrie_tools.ipaddr.IPAddr` values instead of strings.
+            Defaults to False.
+        normalize (bool): Whether ``unique`` compares canonical IPv6
+            addresses when returning strings. Defaults to False.
 
     Returns:
-        List[str]: List of IPv4 and IPv6 addresses.
+        Union[List[str], List[IPAddr]]: List of IPv4 and IPv6 addresses.
     """
-    return extract_ipv4_addrs(text, unique) + extract_ipv6_addrs(text, unique)
+    addrs = extract_ipv4_addrs(text, unique) + extract_ipv6_addrs(
+        text, unique, normalize
+    )
+    if parsed is False:
+        return addrs
+
+    ips: list[IPAddr] = []
+    seen: set[IPAddr] = set()
+    for addr in addrs:
+        ip = IPAddr.parse(addr)
+        if ip is None or (unique and ip in seen):
+            continue
+        seen.add(ip)
+        ips.append(ip)
+    return ips
 
 
-def extract_emails(text: str, unique: bool = False) -> list[str]:
+def extract_emails(
+    text: str, unique: bool = False, normalize: bool = False
+) -> list[str]:
     """Extract email addresses from text.
 
     Args:
         text (str): Text to extract email addresses from.
         unique (bool): Whether to return unique email addresses only.
             Defaults to False.
+        normalize (bool): Whether ``unique`` compares normalized values
+            (see :func:`indicator_key`). Defaults to False.
 
     Returns:
         List[str]: List of email addresses.
     """
-    return _extract_regex(EMAIL_ADDR_REGEX, text, "email", unique)
+    return _extract_regex(EMAIL_ADDR_REGEX, text, "email", unique, normalize)
 
 
-def extract_urls(text: str, unique: bool = False) -> list[str]:
+def extract_urls(
+    text: str, unique: bool = False, normalize: bool = False
+) -> list[str]:
     """Extract URLs from text.
 
     Args:
         text (str): Text to extract URLs from.
         unique (bool): Whether to return unique URLs only. Defaults to False.
+        normalize (bool): Whether ``unique`` compares normalized values
+            (see :func:`indicator_key`). Defaults to False.
 
     Returns:
         List[str]: List of URLs.
     """
-    return _extract_regex(URL_REGEX, text, "url", unique)
+    return _extract_regex(URL_REGEX, text, "url", unique, normalize)
@@ -28,6 +28,10 @@ __all__ = [
     "EMAIL_ADDR_REGEX",
     "URL_REGEX_TEXT",
     "URL_REGEX",
+    "INDICATOR_KINDS",
+    "INPUT_CHUNK_SIZE",
+    "INPUT_READ_WORKERS",
+    "INPUT_PREFETCH_SIZE",
 ]
 
 # Errors
@@ -153,6 +157,21 @@ Fastly, Cloudflare, and Akamai.
 """
 DEFAULT_REQUEST_TIMEOUT = 15
 """Default timeout in seconds for outgoing HTTP requests."""
+INPUT_CHUNK_SIZE = 1 << 20
+"""Maximum number of characters read from an input stream at once.
+
+Longer lines are split at their last whitespace, so memory use stays bounded
+even for inputs without line breaks.
+"""
+INPUT_READ_WORKERS = 4
+"""Number of threads reading the files found in input directories and globs."""
+INPUT_PREFETCH_SIZE = 4 << 20
+"""Largest input file, in bytes on disk, read ahead whole by a reader thread.
+
+Larger files are streamed by the consumer instead, so memory use stays
+bounded by the number of reader threads times this size (before
+decompression).
+"""
 
 # Regex Patterns
 DOMAIN_REGEX_TEXT = (
@@ -243,3 +262,10 @@ Named groups: ``url`` (full URL), ``protocol``, ``username``, ``password``,
 """
 URL_REGEX = re.compile(URL_REGEX_TEXT, re.I | re.M)
 """Compiled pattern for :data:`URL_REGEX_TEXT`."""
+
+INDICATOR_KINDS = ("url", "email", "ipv6", "ipv4", "domain")
+"""Indicator kinds reported by :func:`~valkyrie_tools.commons.extract_indicators`.
+
+Listed from the outermost to the innermost: a URL can hold any of the others,
+an e-mail address a domain and an IPv6 address an IPv4 address.
+"""
@@ -1,7 +1,7 @@
 """Module for DNS lookups."""
 
 import re
-from typing import List, Tuple
+from typing import List, Tuple, Union
 
 import dns.exception
 import dns.inet
@@ -14,7 +14,7 @@ import dns.tsig
 import dns.tsigkeyring
 import dns.update
 
-from .ipaddr import is_valid_ip_addr
+from .ipaddr import IPAddr, is_valid_ip_addr, to_ip_addr
 
 Timeout = dns.resolver.Timeout
 DEFAULT_NAMESERVERS = [
@@ -83,11 +83,12 @@ def is_valid_record_type(record_type: str) -> bool:
         return False
 
 
-def get_rdns_record(ipaddr: str) -> List[Tuple[str, str]]:
+def get_rdns_record(ipaddr: Union[str, IPAddr]) -> List[Tuple[str, str]]:
     """Get reverse DNS record for an IP address.
 
     Args:
-        ipaddr (str): IP address to get reverse DNS record for.
+        ipaddr (Union[str, IPAddr]): IP address to get reverse DNS record
+            for.
 
     Returns:
         list: List of reverse DNS records.
@@ -95,7 +96,8 @@ def get_rdns_record(ipaddr: str) -> List[Tuple[str, str]]:
     Raises:
         ValueError: If the IP address is invalid.
     """
-    if is_valid_ip_addr(ipaddr) is False:
+    ip = to_ip_addr(ipaddr)
+    if ip is None:
         raise ValueError(f"Invalid IP address: {ipaddr}")
 
     # Configure DNS resolver with default name servers
@@ -105,7 +107,7 @@ def get_rdns_record(ipaddr: str) -> List[Tuple[str, str]]:
 
     try:
         # Retrieve reverse DNS records for the IP address
-        records = resolver.resolve(dns.reversename.from_address(ipaddr), "PTR")
+        records = resolver.resolve(ip.reverse_pointer, "PTR")
         return [(record.rdtype.name, record.to_text()) for record in records]
     except (
         dns.exception.SyntaxError,
@@ -116,14 +118,15 @@ def get_rdns_record(ipaddr: str) -> List[Tuple[str, str]]:
 
 
 def get_dns_record(
-    domain: str,
+    domain: Union[str, IPAddr],
     record_type: str,
     nameservers: List[str] = DEFAULT_NAMESERVERS,
 ) -> List[Tuple[str, str]]:
     """Get DNS record for a domain.
 
     Args:
-        domain (str): Domain to get DNS record for.
+        domain (Union[str, IPAddr]): Domain (or, for ``PTR`` lookups, IP
+            address) to get DNS record for.
         record_type (str): Record type to get.
         nameservers (list[str], optional): List of name servers to use.
 
@@ -155,7 +158,7 @@ def get_dns_record(
     else:
         try:
             # Retrieve DNS records for the domain
-            records = resolver.resolve(domain, record_type)  # noqa: B950
+            records = resolver.resolve(str(domain), record_type)  # noqa: B950
             for record in records:
                 type_name = record.rdtype.name
                 value = record.to_text()
@@ -177,12 +180,13 @@ def get_dns_record(
 
 
 def get_dns_records(
-    domain: str, record_types: List[str] = DEFAULT_RECORD_TYPES
+    domain: Union[str, IPAddr], record_types: List[str] = DEFAULT_RECORD_TYPES
 ) -> List[Tuple[str, str]]:
     """Get DNS records for a domain.
 
     Args:
-        domain (str): Domain to get DNS records for.
+        domain (Union[str, IPAddr]): Domain or IP address to get DNS records
+            for.
         record_types (List[str], optional): List of record types to get.
             Defaults to DEFAULT_RECORD_TYPES.
 
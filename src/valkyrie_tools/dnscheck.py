@@ -1,19 +1,21 @@
 """DNS lookup command-line script."""
 
 import sys
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 import click
 
 from .commons import (
     common_options,
-    emit_json,
-    extract_domains,
-    extract_ip_addrs,
-    parse_input_methods,
+    emit_json_stream,
+    extract_hosts,
+    iter_extract,
+    iter_input_lines,
+    peek_iter,
 )
 from .constants import HELP_SHORT_TEXT, NO_ARGS_TEXT
 from .dns import DEFAULT_RECORD_TYPES, RECORD_TYPES, get_dns_records
+from .ipaddr import IPAddr
 
 
 def json_extractor_dnscheck(data: List[Any]) -> Tuple[str, ...]:
@@ -103,6 +105,10 @@ def cli(
     values: Tuple[str, ...],
     interactive: bool,
     output_json: bool,
+    output_jsonl: bool,
+    jobs: int,
+    exclude: Tuple[str, ...],
+    max_file_size: Optional[int],
     record_types: List[str],
 ) -> None:  # noqa: C901
     """Check DNS records for domains and IP addresses.
@@ -124,47 +130,62 @@ def cli(
             interactive mode.
         output_json (bool): When ``True``, emits results as a JSON array
             instead of human-readable text.
+        output_jsonl (bool): When ``True``, emits results as newline-delimited
+            JSON instead, one object per line.
+        jobs (int): Number of processes extracting indicators from the
+            input.
+        exclude (Tuple[str, ...]): Patterns of files and directories to skip
+            in input directories and globs.
+        max_file_size (Optional[int]): Size limit in bytes for files in
+            input directories and globs.
         record_types (List[str]): DNS record types to query (e.g. ``"A"``,
             ``"MX"``).  Defaults to
             :data:`~valkyrie_tools.dns.DEFAULT_RECORD_TYPES`.
     """
-    args = parse_input_methods(
-        values,
-        interactive,
-        ctx,
-        output_json=output_json,
-        json_extractor=json_extractor_dnscheck,
+    lines = peek_iter(
+        iter_input_lines(
+            values,
+            interactive,
+            ctx,
+            output_json=output_json,
+            json_extractor=json_extractor_dnscheck,
+            exclude=exclude,
+            max_file_size=max_file_size,
+        )
     )
 
-    if len(args) == 0:
+    if lines is None:
         if output_json:
-            emit_json([])
+            emit_json_stream([], jsonl=output_jsonl)
             sys.exit(0)
         click.echo("Error: %s" % NO_ARGS_TEXT, err=True)
         click.echo(HELP_SHORT_TEXT.format(name=ctx.command.name), err=True)
         sys.exit(1)
 
-    ip_addrs = extract_ip_addrs("\n".join(args), unique=True)
-    domains = extract_domains("\n".join(args), unique=True)
-    targets = list(set(ip_addrs + domains))  # type: List[str]
+    targets: Iterator[Union[str, IPAddr]] = iter_extract(
+        lines, extract_hosts, jobs=jobs
+    )
 
     if output_json:
-        json_results: List[Dict[str, Any]] = []
-        for arg in targets:
-            dns_records = get_dns_records(arg, record_types=record_types)
-            json_results.append(build_dns_result(arg, dns_records))
-        emit_json(json_results)
+        emit_json_stream(
+            (
+                build_dns_result(
+                    str(arg), get_dns_records(arg, record_types=record_types)
+                )
+                for arg in targets
+            ),
+            jsonl=output_jsonl,
+        )
         return
 
-    for a in range(len(targets)):
-        arg = targets[a]
-        results = get_dns_records(arg, record_types=record_types)
-        print_results(arg, results)
-
-        # Print trailing newline
-        if a < len(targets) - 1:  # pragma: no cover
+    for a, arg in enumerate(targets):
+        # Print a newline between entries
+        if a > 0:
             click.echo()
 
+        results = get_dns_records(arg, record_types=record_types)
+        print_results(str(arg), results)
+
 
 if __name__ == "__main__":  # pragma: no cover
     cli()
@@ -1,15 +1,50 @@
 """File utilities."""
 
+import bz2
+import gzip
+import importlib
+import io
+import lzma
 import os
-from typing import Optional, Union
+from typing import IO, Optional, Union
+
+from appdirs import user_cache_dir  # type: ignore[import-untyped]
 
 __all__ = [
+    "get_cache_dir",
     "path_exists",
     "is_binary_file",
+    "compression_format",
+    "open_compressed",
     "is_file_descriptor",
     "read_file",
 ]
 
+CACHE_APP_NAME = "valkyrie-tools"
+"""Application name used for the per-user cache directory."""
+
+COMPRESSION_MAGIC = {
+    "gzip": b"\x1f\x8b",
+    "bzip2": b"BZh",
+    "xz": b"\xfd7zXZ\x00",
+    "zstd": b"\x28\xb5\x2f\xfd",
+}
+"""Leading bytes of each compressed file format recognised on input."""
+
+
+def get_cache_dir() -> str:
+    """Return the per-user cache directory, creating it if needed.
+
+    Used for data that can be re-downloaded at any time, such as RDAP
+    bootstrap registries.
+
+    Returns:
+        str: Absolute path of the cache directory.
+    """
+    path = user_cache_dir(CACHE_APP_NAME)
+    os.makedirs(path, exist_ok=True)
+    return str(path)
+
 
 def path_exists(path: str) -> bool:
     """Check if a filesystem path exists.
@@ -50,6 +85,88 @@ def is_binary_file(path: str) -> bool:
         return False
 
 
+def compression_format(path: str) -> Optional[str]:
+    """Detect a compressed file from its leading magic bytes.
+
+    The file name is not looked at, so renamed or extension-less archives
+    are recognised too.
+
+    Args:
+        path (str): File path.
+
+    Returns:
+        Optional[str]: A key of :data:`COMPRESSION_MAGIC`, or ``None`` if
+        the file is not compressed or cannot be read.
+    """
+    try:
+        with open(path, "rb") as f:
+            head = f.read(6)
+    except OSError:
+        return None
+
+    for name, magic in COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def _open_zstd(path: str) -> IO[str]:
+    """Open a Zstandard file as a text stream.
+
+    Args:
+        path (str): File path.
+
+    Returns:
+        IO[str]: Text stream of the decompressed contents.
+
+    Raises:
+        OSError: If the optional ``zstandard`` package is not installed.
+    """
+    try:
+        zstandard = importlib.import_module("zstandard")
+    except ImportError as exc:
+        raise OSError(
+            "Reading Zstandard files requires the 'zstandard' package."
+        ) from exc
+
+    reader = zstandard.ZstdDecompressor().stream_reader(
+        open(path, "rb"), read_across_frames=True, closefd=True
+    )
+    return io.TextIOWrapper(reader, encoding="utf-8", errors="replace")
+
+
+def open_compressed(path: str) -> IO[str]:
+    """Open a compressed file as a text stream, decompressing as it is read.
+
+    Nothing is decompressed up front or written to disk: data is inflated
+    as the stream is read, so it can be fed straight to
+    :func:`~valkyrie_tools.commons.read_lines`.  Concatenated members or
+    frames are read one after the other.  Invalid UTF-8 is replaced
+    rather than raising.  Zstandard needs the optional ``zstandard``
+    package.
+
+    Args:
+        path (str): Path of a gzip, bzip2, xz or Zstandard file.
+
+    Returns:
+        IO[str]: Text stream of the decompressed contents.
+
+    Raises:
+        OSError: If ``path`` is not a recognised compressed file.
+    """
+    name = compression_format(path)
+    if name is None:
+        raise OSError("Not a compressed file. %s" % path)
+
+    if name == "gzip":
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    if name == "bzip2":
+        return bz2.open(path, "rt", encoding="utf-8", errors="replace")
+    if name == "xz":
+        return lzma.open(path, "rt", encoding="utf-8", errors="replace")
+    return _open_zstd(path)
+
+
 def is_file_descriptor(path: Union[str, int]) -> bool:
     """Check if arg is a file descriptor.
 
@@ -1,7 +1,9 @@
 """Httpr module for handling http requests and responses."""
 
 import re
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from time import sleep
 from typing import Any, Dict, List, Optional, Union, cast
 from urllib.parse import urljoin, urlparse, urlunparse  # noqa:F401
 
@@ -50,6 +52,14 @@ DEFAULT_REQUEST_HEADERS = {
 META_REDIRECT_REGEX = re.compile(
     "<meta[^>]*?url=(.*?)[\"']", re.IGNORECASE
 )  # noqa: F841
+TOO_MANY_REQUESTS_STATUS = 429
+"""HTTP status code returned by rate-limited APIs (``Too Many Requests``)."""
+DEFAULT_MAX_RETRIES = 3
+"""Default number of retries :func:`get_with_retry` makes after a 429."""
+DEFAULT_BACKOFF = 1.0
+"""Base delay in seconds for exponential back-off in :func:`get_with_retry`."""
+MAX_BACKOFF = 60.0
+"""Upper bound in seconds for any single wait in :func:`get_with_retry`."""
 
 
 def filter_headers(
@@ -107,6 +117,86 @@ def get_http_version_text(raw_version: int) -> str:
     return "HTTP/%s" % tls_version
 
 
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a ``Retry-After`` header value into a delay in seconds.
+
+    Args:
+        value (Optional[str]): Header value, either a number of seconds or
+            an HTTP-date.
+
+    Returns:
+        Optional[float]: Non-negative delay in seconds, or ``None`` if the
+        header is missing or cannot be parsed.
+
+    Example:
+        >>> from valkyrie_tools.httpr import parse_retry_after
+        >>> parse_retry_after("120")
+        120.0
+        >>> parse_retry_after("soon") is None
+        True
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def get_with_retry(
+    url: str,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+    session: Optional[requests.Session] = None,
+    **kwargs: Any,
+) -> Response:
+    """Send a GET request, backing off and retrying on HTTP 429.
+
+    When the server answers ``429 Too Many Requests`` the request is retried
+    up to ``max_retries`` times.  The wait honours the response's
+    ``Retry-After`` header when present and otherwise doubles from
+    ``backoff`` seconds on every attempt; either way it is capped at
+    :data:`MAX_BACKOFF`.  Any other response (including the final 429) is
+    returned unchanged so that callers can use
+    :meth:`requests.Response.raise_for_status` as usual.
+
+    Args:
+        url (str): The URL to request.
+        max_retries (int): Maximum number of retries after a 429.
+            Defaults to :data:`DEFAULT_MAX_RETRIES`.
+        backoff (float): Base delay in seconds for exponential back-off.
+            Defaults to :data:`DEFAULT_BACKOFF`.
+        session (Optional[requests.Session]): Session to send the request
+            through, reusing its pooled connections.  Defaults to None,
+            which uses :func:`requests.get`.
+        **kwargs: Additional keyword arguments forwarded to
+            :func:`requests.get` (e.g. ``timeout``, ``headers``).
+
+    Returns:
+        Response: The last response received.
+    """
+    get = requests.get if session is None else session.get
+    attempt = 0
+    while True:
+        r = get(url, **kwargs)
+        if r.status_code != TOO_MANY_REQUESTS_STATUS or attempt >= max_retries:
+            return r
+
+        delay = parse_retry_after(r.headers.get("Retry-After"))
+        if delay is None:
+            delay = backoff * 2**attempt
+        sleep(min(delay, MAX_BACKOFF))
+        attempt += 1
+
+
 def build_full_url(url: str, next_url: str) -> Optional[str]:
     """Builds a full URL from a relative URL.
 
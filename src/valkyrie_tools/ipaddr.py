@@ -1,11 +1,13 @@
 """IP address utilities for valkyrie-tools.
 
-Provides validators (:func:`is_ipv4_addr`, :func:`is_ipv6_addr`,
+Provides the parse-once :class:`IPAddr` value type (see :func:`to_ip_addr`),
+validators (:func:`is_ipv4_addr`, :func:`is_ipv6_addr`,
 :func:`is_valid_ip_addr`, :func:`is_private_ip`, :func:`is_ip_in_cidr`) and
 lookup helpers that query external sources for IP reputation data:
 
 * **Tor** - :func:`get_tor_node_ip_addrs` / :func:`is_ip_tor_node`
-* **ipinfo.io** - :func:`get_ip_info` (geolocation / ASN metadata)
+* **ipinfo.io** - :func:`get_ip_info` (geolocation / ASN metadata) and
+  :func:`get_ip_prefix_info` (ASN / org / country shared per announced prefix)
 * **AWS** - :func:`get_aws_ip_ranges` / :func:`is_aws_ip_addr`
 * **Cloudflare** - :func:`get_cloudflare_ip_ranges` / :func:`is_cloudflare_ip_addr`
 * **Fastly** - :func:`get_fastly_ip_ranges` / :func:`is_fastly_ip_addr`
@@ -15,12 +17,16 @@ Results from the remote endpoints are TTL-cached for 3600 seconds using
 """
 
 import ipaddress
-from typing import Any, Dict, List, Optional, cast
+import threading
+from functools import lru_cache
+from time import monotonic
+from typing import Any, Dict, List, Optional, Tuple, Union, cast
 
 import requests
 
 from .cache import cache
 from .constants import DEFAULT_REQUEST_TIMEOUT
+from .httpr import get_with_retry
 
 # Global constants
 PRIVATE_IP_CIDR_RANGES = [
@@ -41,12 +47,26 @@ Includes:
 
 Used by :func:`is_private_ip` to short-circuit lookups for non-public IPs.
 """
+_PRIVATE_NETWORKS = [
+    (net.version, int(net.network_address), int(net.netmask))
+    for net in map(ipaddress.ip_network, PRIVATE_IP_CIDR_RANGES)
+]
 TOR_PROJECT_NODE_ENDPOINT = (
     "https://check.torproject.org/cgi-bin/TorBulkExitList.py"
 )
 """URL of the Tor Project's bulk exit-node list (plain text, one IP per line)."""
 IPINFO_API_ENDPOINT = "https://ipinfo.io/%s/json"
 """ipinfo.io JSON API endpoint template.  ``%s`` is replaced with the IP address."""
+IPINFO_PREFIX_FIELDS = ("asn", "org", "country")
+"""ipinfo.io fields that are identical for every address in an announced prefix.
+
+:func:`get_ip_prefix_info` caches these per prefix and shares them with sibling
+addresses instead of querying ipinfo.io again.
+"""
+DEFAULT_PREFIX_LENGTHS = {4: 24, 6: 48}
+"""Prefix length assumed per IP version when ipinfo.io does not report the
+announced route (``asn.route``) for an address.
+"""
 # https://docs.aws.amazon.com/vpc/latest/userguide/aws-ip-ranges.html#aws-ip-download
 AWS_IP_RANGES_ENDPOINT = "https://ip-ranges.amazonaws.com/ip-ranges.json"
 """URL of the AWS public IP ranges JSON file."""
@@ -62,11 +82,183 @@ FASTLY_IP_RANGES_ENDPOINT = "https://api.fastly.com/public-ip-list"
 """Fastly public IP list API endpoint (returns JSON)."""
 
 
-def is_ipv4_addr(ipaddr: str) -> bool:
+class IPAddr:
+    """Compact, hashable IP address parsed exactly once.
+
+    Stores the address as an integer plus its family (``4`` or ``6``) so that
+    validation, classification and CIDR membership checks can be performed
+    with integer arithmetic instead of re-parsing the text with
+    :func:`ipaddress.ip_address` at every step.  Use :meth:`parse` (or
+    :func:`to_ip_addr`) to build one from text; ``str()`` returns the
+    canonical (compressed) representation.
+
+    Attributes:
+        value (int): Integer value of the address.
+        version (int): IP version, either ``4`` or ``6``.
+
+    Example:
+        >>> from valkyrie_tools.ipaddr import IPAddr
+        >>> ip = IPAddr.parse("192.168.1.1")
+        >>> ip.version, int(ip)
+        (4, 3232235777)
+        >>> str(ip)
+        '192.168.1.1'
+        >>> IPAddr.parse("not an ip") is None
+        True
+    """
+
+    __slots__ = ("value", "version")
+
+    def __init__(self, value: int, version: int) -> None:
+        """Initialize the IPAddr object.
+
+        Args:
+            value (int): Integer value of the address.
+            version (int): IP version, either ``4`` or ``6``.
+        """
+        self.value = value
+        self.version = version
+
+    @classmethod
+    def parse(cls, text: str) -> Optional["IPAddr"]:
+        """Parse an IPv4 or IPv6 address string.
+
+        Args:
+            text (str): IP address to parse.
+
+        Returns:
+            Optional[IPAddr]: The parsed address, or ``None`` if ``text`` is
+            not a string or not a valid IPv4/IPv6 address.
+        """
+        if not isinstance(text, str):
+            return None  # type: ignore[unreachable]  # noqa: B950
+        try:
+            ip = ipaddress.ip_address(text)
+        except ValueError:
+            return None
+        return cls(int(ip), ip.version)
+
+    @property
+    def is_ipv4(self) -> bool:
+        """bool: True if the address is an IPv4 address."""
+        return self.version == 4
+
+    @property
+    def is_ipv6(self) -> bool:
+        """bool: True if the address is an IPv6 address."""
+        return self.version == 6
+
+    @property
+    def is_private(self) -> bool:
+        """bool: True if the address is in :data:`PRIVATE_IP_CIDR_RANGES`."""
+        return any(self.in_network(net) for net in _PRIVATE_NETWORKS)
+
+    @property
+    def reverse_pointer(self) -> str:
+        """str: Reverse DNS name (``in-addr.arpa`` / ``ip6.arpa``)."""
+        return self.ip_address().reverse_pointer
+
+    def ip_address(
+        self,
+    ) -> Union[ipaddress.IPv4Address, ipaddress.IPv6Address]:
+        """Convert to a standard library :mod:`ipaddress` object.
+
+        Returns:
+            Union[IPv4Address, IPv6Address]: Equivalent address object.
+        """
+        if self.version == 4:
+            return ipaddress.IPv4Address(self.value)
+        return ipaddress.IPv6Address(self.value)
+
+    def in_network(self, network: "_Network") -> bool:
+        """Check if the address falls within a parsed network.
+
+        Args:
+            network (Tuple[int, int, int]): ``(version, network, netmask)``
+                tuple as returned by :func:`parse_network`.
+
+        Returns:
+            bool: True if the address is inside ``network``.
+        """
+        version, net, mask = network
+        return self.version == version and self.value & mask == net
+
+    def __int__(self) -> int:
+        """Return the integer value of the address."""
+        return self.value
+
+    def __str__(self) -> str:
+        """Return the canonical text form of the address."""
+        return str(self.ip_address())
+
+    def __repr__(self) -> str:
+        """Return a developer-friendly representation."""
+        return f"IPAddr({str(self)!r})"
+
+    def __hash__(self) -> int:
+        """Hash on the ``(version, value)`` pair."""
+        return hash((self.version, self.value))
+
+    def __eq__(self, other: object) -> bool:
+        """Compare two addresses by family and value."""
+        if not isinstance(other, IPAddr):
+            return NotImplemented
+        return self.version == other.version and self.value == other.value
+
+    def __lt__(self, other: "IPAddr") -> bool:
+        """Order addresses by family, then value."""
+        return (self.version, self.value) < (other.version, other.value)
+
+
+_Network = Tuple[int, int, int]
+"""Parsed network: ``(version, network_address_int, netmask_int)``."""
+
+
+@lru_cache(maxsize=4096)
+def parse_network(cidr: str) -> Optional[_Network]:
+    """Parse a CIDR string into an integer ``(version, network, netmask)``.
+
+    Results are memoized, so repeated checks against the same CIDR (e.g.
+    :func:`is_ip_in_cidr` in a loop) skip the parse.  Provider range lists,
+    which can be larger than the memo, are indexed once per download
+    instead (see :func:`_provider_index`).
+
+    Args:
+        cidr (str): CIDR notation (e.g. ``"10.0.0.0/8"``).
+
+    Returns:
+        Optional[Tuple[int, int, int]]: The parsed network, or ``None`` if
+        ``cidr`` is not a valid network.
+    """
+    try:
+        net = ipaddress.ip_network(cidr)
+    except (ValueError, TypeError):
+        return None
+    return (net.version, int(net.network_address), int(net.netmask))
+
+
+def to_ip_addr(ipaddr: Union[str, IPAddr]) -> Optional[IPAddr]:
+    """Coerce a string or :class:`IPAddr` into an :class:`IPAddr`.
+
+    Already-parsed values are returned unchanged, so helpers that accept
+    either form only ever parse a given address once.
+
+    Args:
+        ipaddr (Union[str, IPAddr]): IP address text or parsed value.
+
+    Returns:
+        Optional[IPAddr]: The parsed address, or ``None`` if invalid.
+    """
+    if isinstance(ipaddr, IPAddr):
+        return ipaddr
+    return IPAddr.parse(ipaddr)
+
+
+def is_ipv4_addr(ipaddr: Union[str, IPAddr]) -> bool:
     """Check if a given ip addr is a valid ipv4 addr.
 
     Args:
-        ipaddr (str): IP address to check.
+        ipaddr (Union[str, IPAddr]): IP address to check.
 
     Returns:
         bool: True if ipaddr is a valid ipv4 addr.
@@ -78,20 +270,15 @@ def is_ipv4_addr(ipaddr: str) -> bool:
         >>> is_ipv4_addr("::1")
         False
     """
-    try:
-        if not isinstance(ipaddr, str):
-            return False  # type: ignore[unreachable]  # noqa: B950
-        ip = ipaddress.ip_address(ipaddr)
-        return isinstance(ip, ipaddress.IPv4Address)
-    except ValueError:
-        return False
+    ip = to_ip_addr(ipaddr)
+    return ip is not None and ip.is_ipv4
 
 
-def is_ipv6_addr(ipaddr: str) -> bool:
+def is_ipv6_addr(ipaddr: Union[str, IPAddr]) -> bool:
     """Check if a given ip addr is a valid ipv6 addr.
 
     Args:
-        ipaddr (str): IP address to check.
+        ipaddr (Union[str, IPAddr]): IP address to check.
 
     Returns:
         bool: True if ipaddr is a valid ipv6 addr.
@@ -103,48 +290,33 @@ def is_ipv6_addr(ipaddr: str) -> bool:
         >>> is_ipv6_addr("192.168.1.1")
         False
     """
-    try:
-        if not isinstance(ipaddr, str):
-            return False  # type: ignore[unreachable]  # noqa: B950
-        ip = ipaddress.ip_address(ipaddr)
-        return isinstance(ip, ipaddress.IPv6Address)
-    except ValueError:
-        return False
+    ip = to_ip_addr(ipaddr)
+    return ip is not None and ip.is_ipv6
 
 
-def is_valid_ip_addr(ipaddr: str) -> bool:
+def is_valid_ip_addr(ipaddr: Union[str, IPAddr]) -> bool:
     """Check if a given ip addr is a valid ipv4 or ipv6 addr.
 
     Args:
-        ipaddr (str): IP address to check.
+        ipaddr (Union[str, IPAddr]): IP address to check.
 
     Returns:
         bool: True if ipaddr is a valid ipv4 or ipv6 addr.
     """
-    return any(
-        [
-            is_ipv4_addr(ipaddr),
-            is_ipv6_addr(ipaddr),
-        ]
-    )
+    return to_ip_addr(ipaddr) is not None
 
 
-def is_private_ip(ipaddr: str) -> bool:
+def is_private_ip(ipaddr: Union[str, IPAddr]) -> bool:
     """Check if ip addr is a private addr.
 
     Args:
-        ipaddr (str): IP address to check.
+        ipaddr (Union[str, IPAddr]): IP address to check.
 
     Returns:
         bool: True if ipaddr is a private addr.
     """
-    try:
-        ip = ipaddress.ip_address(ipaddr)
-        return any(
-            ip in ipaddress.ip_network(cidr) for cidr in PRIVATE_IP_CIDR_RANGES
-        )
-    except ValueError:
-        return False
+    ip = to_ip_addr(ipaddr)
+    return ip is not None and ip.is_private
 
 
 def get_net_size(cidr: str) -> int:
@@ -159,11 +331,11 @@ def get_net_size(cidr: str) -> int:
     return int(cidr.split("/")[1])
 
 
-def is_ip_in_cidr(ipaddr: str, cidr: str) -> bool:
+def is_ip_in_cidr(ipaddr: Union[str, IPAddr], cidr: str) -> bool:
     """Check if ip addr is in cidr range.
 
     Args:
-        ipaddr (str): IP address to check.
+        ipaddr (Union[str, IPAddr]): IP address to check.
         cidr (str): CIDR range to check.
 
     Returns:
@@ -176,11 +348,150 @@ def is_ip_in_cidr(ipaddr: str, cidr: str) -> bool:
         >>> is_ip_in_cidr("8.8.8.8", "10.0.0.0/8")
         False
     """
-    try:
-        ip = ipaddress.ip_address(ipaddr)
-        return ip in ipaddress.ip_network(cidr)
-    except ValueError:
+    ip = to_ip_addr(ipaddr)
+    network = parse_network(cidr)
+    if ip is None or network is None:
         return False
+    return ip.in_network(network)
+
+
+class PrefixIndex:
+    """Thread-safe longest-prefix-match index mapping networks to values.
+
+    Values are stored per ``(version, prefix length)`` in a dict keyed by the
+    integer network address, so a lookup costs one dict probe per distinct
+    prefix length that has been inserted (longest first), independent of the
+    number of cached networks.  Entries optionally expire ``ttl`` seconds
+    after insertion.
+
+    Example:
+        >>> from valkyrie_tools.ipaddr import PrefixIndex
+        >>> index = PrefixIndex()
+        >>> index.insert("192.0.2.0/24", "doc-net")
+        True
+        >>> index.lookup("192.0.2.77")
+        'doc-net'
+        >>> index.lookup("198.51.100.1") is None
+        True
+    """
+
+    def __init__(self, ttl: Optional[float] = None) -> None:
+        """Initialize the PrefixIndex object.
+
+        Args:
+            ttl (Optional[float]): Seconds before an inserted entry expires.
+                Defaults to None, which means entries never expire.
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._tables: Dict[Tuple[int, int], Dict[int, Tuple[float, Any]]] = {}
+        self._lengths: Dict[int, List[int]] = {4: [], 6: []}
+
+    def insert(self, cidr: str, value: Any) -> bool:
+        """Store ``value`` for every address inside ``cidr``.
+
+        Args:
+            cidr (str): Network in CIDR notation.
+            value (Any): Value to associate with the network.
+
+        Returns:
+            bool: True if stored, False if ``cidr`` is not a valid network.
+        """
+        network = parse_network(cidr)
+        if network is None:
+            return False
+
+        version, net, mask = network
+        prefixlen = bin(mask).count("1")
+        expires = float("inf") if self.ttl is None else monotonic() + self.ttl
+        with self._lock:
+            table = self._tables.setdefault((version, prefixlen), {})
+            table[net] = (expires, value)
+            if prefixlen not in self._lengths[version]:
+                self._lengths[version].append(prefixlen)
+                self._lengths[version].sort(reverse=True)
+        return True
+
+    def lookup(self, ipaddr: Union[str, IPAddr]) -> Optional[Any]:
+        """Find the value of the most specific network containing ``ipaddr``.
+
+        Args:
+            ipaddr (Union[str, IPAddr]): IP address to look up.
+
+        Returns:
+            Optional[Any]: The stored value, or ``None`` if no unexpired
+            network contains the address.
+        """
+        ip = to_ip_addr(ipaddr)
+        if ip is None:
+            return None
+
+        bits = 32 if ip.version == 4 else 128
+        now = monotonic()
+        with self._lock:
+            for prefixlen in self._lengths[ip.version]:
+                table = self._tables[(ip.version, prefixlen)]
+                net = ip.value >> (bits - prefixlen) << (bits - prefixlen)
+                entry = table.get(net)
+                if entry is None:
+                    continue
+                if entry[0] <= now:
+                    del table[net]
+                    continue
+                return entry[1]
+        return None
+
+    def clear(self) -> None:
+        """Remove every cached network."""
+        with self._lock:
+            self._tables.clear()
+            self._lengths = {4: [], 6: []}
+
+    def __len__(self) -> int:
+        """Return the number of cached networks (including expired ones)."""
+        with self._lock:
+            return sum(len(table) for table in self._tables.values())
+
+
+_provider_indexes: Dict[str, Tuple[List[Any], PrefixIndex]] = {}
+_provider_indexes_lock = threading.Lock()
+
+
+def _provider_index(provider: str, ranges: List[Any]) -> PrefixIndex:
+    """Index a provider's published ranges, once per downloaded list.
+
+    The index is kept next to the list it was built from and rebuilt only
+    when the TTL-cached download returns a different list, so each CIDR is
+    parsed once per download rather than on every check.
+
+    Args:
+        provider (str): Name the index is kept under, e.g. ``"aws"``.
+        ranges (List[Any]): CIDR strings, or dicts with a ``"prefix"`` key
+            as returned by :func:`get_aws_ip_ranges`.
+
+    Returns:
+        PrefixIndex: Index mapping every range to ``True``.
+    """
+    with _provider_indexes_lock:
+        indexed = _provider_indexes.get(provider)
+    if indexed is not None and indexed[0] is ranges:
+        return indexed[1]
+
+    index = PrefixIndex()
+    for cidr in ranges:
+        if isinstance(cidr, dict):
+            cidr = cidr.get("prefix")
+        if isinstance(cidr, str):
+            index.insert(cidr, True)
+    with _provider_indexes_lock:
+        _provider_indexes[provider] = (ranges, index)
+    return index
+
+
+ip_info_prefix_cache = PrefixIndex(ttl=3600)
+"""Per-prefix cache of :data:`IPINFO_PREFIX_FIELDS` used by
+:func:`get_ip_prefix_info`.  Entries expire after 3600 seconds.
+"""
 
 
 @cache.ttl_cache(maxsize=128, ttl=3600)
@@ -201,11 +512,11 @@ def get_tor_node_ip_addrs() -> List[str]:
     return [line for line in r.text.splitlines() if line != ""]
 
 
-def is_ip_tor_node(ipaddr: str, cached: bool = True) -> bool:
+def is_ip_tor_node(ipaddr: Union[str, IPAddr], cached: bool = True) -> bool:
     """Check if ip addr is a tor node.
 
     Args:
-        ipaddr (str): IP address to check.
+        ipaddr (Union[str, IPAddr]): IP address to check.
         cached (bool): When ``True`` (the default), the previously cached list
             of Tor exit-node addresses is reused.  Pass ``False`` to force a
             fresh fetch from the Tor Project endpoint.
@@ -217,18 +528,21 @@ def is_ip_tor_node(ipaddr: str, cached: bool = True) -> bool:
         get_tor_node_ip_addrs.clear_cache()  # type: ignore[attr-defined]  # noqa: B950
 
     nodes = get_tor_node_ip_addrs()
-    return ipaddr in nodes
+    return str(ipaddr) in nodes
 
 
-def get_ip_info(ipaddr: str) -> Optional[Dict[str, Any]]:
+def get_ip_info(ipaddr: Union[str, IPAddr]) -> Optional[Dict[str, Any]]:
     """Get geolocation and network metadata for an IP address.
 
     Queries the ipinfo.io JSON API.  Only valid IP addresses (as determined
     by :func:`is_valid_ip_addr`) are looked up; invalid input returns
-    ``None`` immediately without making a network request.
+    ``None`` immediately without making a network request.  Rate-limited
+    (HTTP 429) responses are retried with back-off, honouring
+    ``Retry-After`` (see :func:`~valkyrie_tools.httpr.get_with_retry`).
 
     Args:
-        ipaddr (str): A valid IPv4 or IPv6 address string.
+        ipaddr (Union[str, IPAddr]): A valid IPv4 or IPv6 address string,
+            or an already-parsed :class:`IPAddr`.
 
     Returns:
         Optional[Dict[str, Any]]: A dictionary of IP metadata (keys include
@@ -237,8 +551,8 @@ def get_ip_info(ipaddr: str) -> Optional[Dict[str, Any]]:
         ``ipaddr`` is not a valid IP address.
     """
     if is_valid_ip_addr(ipaddr):
-        r = requests.get(
-            IPINFO_API_ENDPOINT % ipaddr, timeout=DEFAULT_REQUEST_TIMEOUT
+        r = get_with_retry(
+            IPINFO_API_ENDPOINT % str(ipaddr), timeout=DEFAULT_REQUEST_TIMEOUT
         )
         r.raise_for_status()
         return cast(Dict[str, Any], r.json())
@@ -246,6 +560,72 @@ def get_ip_info(ipaddr: str) -> Optional[Dict[str, Any]]:
     return None
 
 
+def _announced_prefix(ip: IPAddr, ipinfo: Dict[str, Any]) -> str:
+    """Determine the prefix that an ipinfo.io record applies to.
+
+    Uses the announced route (``asn.route``) when ipinfo.io includes it and it
+    contains ``ip``; otherwise falls back to :data:`DEFAULT_PREFIX_LENGTHS`.
+
+    Args:
+        ip (IPAddr): The address that was looked up.
+        ipinfo (Dict[str, Any]): The ipinfo.io response for ``ip``.
+
+    Returns:
+        str: Prefix in CIDR notation.
+    """
+    asn = ipinfo.get("asn")
+    route = asn.get("route") if isinstance(asn, dict) else None
+    if isinstance(route, str) and is_ip_in_cidr(ip, route):
+        return route
+
+    network = ipaddress.ip_network(
+        f"{ip}/{DEFAULT_PREFIX_LENGTHS[ip.version]}", strict=False
+    )
+    return str(network)
+
+
+def get_ip_prefix_info(
+    ipaddr: Union[str, IPAddr], cached: bool = True
+) -> Optional[Dict[str, Any]]:
+    """Get ASN / org / country metadata shared by an address's prefix.
+
+    The first address looked up in a prefix is queried with
+    :func:`get_ip_info`; the :data:`IPINFO_PREFIX_FIELDS` of the response are
+    stored in :data:`ip_info_prefix_cache` under the announced prefix (or the
+    :data:`DEFAULT_PREFIX_LENGTHS` fallback).  Every later address inside that
+    prefix is answered from the cache without a network request.  Per-address
+    fields such as ``hostname`` are deliberately not included.
+
+    Args:
+        ipaddr (Union[str, IPAddr]): A valid IPv4 or IPv6 address.
+        cached (bool): When ``False``, ignore any cached prefix record and
+            query ipinfo.io again.  Defaults to True.
+
+    Returns:
+        Optional[Dict[str, Any]]: A dict with ``ip``, ``prefix`` and the
+        available :data:`IPINFO_PREFIX_FIELDS`, or ``None`` if ``ipaddr`` is
+        invalid or ipinfo.io returned no data.
+    """
+    ip = to_ip_addr(ipaddr)
+    if ip is None:
+        return None
+
+    record = ip_info_prefix_cache.lookup(ip) if cached else None
+    if record is None:
+        ipinfo = get_ip_info(ip)
+        if ipinfo is None:
+            return None
+
+        prefix = _announced_prefix(ip, ipinfo)
+        record = {k: ipinfo[k] for k in IPINFO_PREFIX_FIELDS if k in ipinfo}
+        record["prefix"] = prefix
+        ip_info_prefix_cache.insert(prefix, record)
+
+    info: Dict[str, Any] = {"ip": str(ip)}
+    info.update(record)
+    return info
+
+
 @cache.ttl_cache(maxsize=128, ttl=3600)
 def get_aws_ip_ranges() -> List[Any]:
     """Get the public IP ranges published by AWS.
@@ -280,22 +660,20 @@ def get_aws_ip_ranges() -> List[Any]:
         return []
 
 
-def is_aws_ip_addr(ipaddr: str) -> bool:
+def is_aws_ip_addr(ipaddr: Union[str, IPAddr]) -> bool:
     """Check if ip addr is an AWS ip.
 
     Args:
-        ipaddr (str): IP address to check.
+        ipaddr (Union[str, IPAddr]): IP address to check.
 
     Returns:
         bool: True if ipaddr is an AWS ip.
     """
-    try:
-        ip = ipaddress.ip_address(ipaddr)
-        return any(  # pragma: no cover
-            ip in ipaddress.ip_network(cidr) for cidr in get_aws_ip_ranges()
-        )
-    except ValueError:
+    ip = to_ip_addr(ipaddr)
+    if ip is None:
         return False
+    index = _provider_index("aws", get_aws_ip_ranges())
+    return index.lookup(ip) is not None
 
 
 def get_cloudflare_range(endpoint: str) -> Optional[List[str]]:
@@ -349,23 +727,20 @@ def get_cloudflare_ip_ranges() -> List[str]:
     return ip_ranges
 
 
-def is_cloudflare_ip_addr(ipaddr: str) -> bool:
+def is_cloudflare_ip_addr(ipaddr: Union[str, IPAddr]) -> bool:
     """Check if ip addr is a cloudflare ip.
 
     Args:
-        ipaddr (str): IP address to check.
+        ipaddr (Union[str, IPAddr]): IP address to check.
 
     Returns:
         bool: True if ipaddr is a Cloudflare ip.
     """
-    try:
-        ip = ipaddress.ip_address(ipaddr)
-        return any(  # pragma: no cover
-            ip in ipaddress.ip_network(cidr)
-            for cidr in get_cloudflare_ip_ranges()
-        )
-    except ValueError:
+    ip = to_ip_addr(ipaddr)
+    if ip is None:
         return False
+    index = _provider_index("cloudflare", get_cloudflare_ip_ranges())
+    return index.lookup(ip) is not None
 
 
 @cache.ttl_cache(maxsize=128, ttl=3600)
@@ -373,7 +748,8 @@ def get_fastly_ip_ranges() -> List[str]:
     """Get the public IP ranges published by Fastly.
 
     Fetches the Fastly public IP list JSON from
-    :data:`FASTLY_IP_RANGES_ENDPOINT`.  Results are TTL-cached for 3600
+    :data:`FASTLY_IP_RANGES_ENDPOINT` and flattens its ``addresses`` (IPv4)
+    and ``ipv6_addresses`` lists into one.  Results are TTL-cached for 3600
     seconds (1 hour).
 
     Returns:
@@ -387,24 +763,26 @@ def get_fastly_ip_ranges() -> List[str]:
         )
         r.raise_for_status()
         result = r.json()
-        return [subnet for subnet in result.values()]
+        return [
+            subnet
+            for key in ("addresses", "ipv6_addresses")
+            for subnet in result.get(key, [])
+        ]
     except requests.exceptions.HTTPError:
         return []
 
 
-def is_fastly_ip_addr(ipaddr: str) -> bool:
+def is_fastly_ip_addr(ipaddr: Union[str, IPAddr]) -> bool:
     """Check if ip addr is a fastly ip.
 
     Args:
-        ipaddr (str): IP address to check.
+        ipaddr (Union[str, IPAddr]): IP address to check.
 
     Returns:
         bool: True if ipaddr is a fastly ip.
     """
-    try:
-        ip = ipaddress.ip_address(ipaddr)
-        return any(  # pragma: no cover
-            ip in ipaddress.ip_network(cidr) for cidr in get_fastly_ip_ranges()
-        )
-    except ValueError:
+    ip = to_ip_addr(ipaddr)
+    if ip is None:
         return False
+    index = _provider_index("fastly", get_fastly_ip_ranges())
+    return index.lookup(ip) is not None
@@ -2,65 +2,157 @@
 
 Queries ipinfo.io for geolocation and ASN metadata for one or more public IPv4
 or IPv6 addresses.  Private addresses are detected locally and skipped without
-making a network request.
+making a network request.  With ``--share-prefix``, addresses in the same
+announced prefix share a single ipinfo.io lookup, and ``--workers`` runs
+lookups concurrently while streaming each result as soon as it is ready.
 """
 
 import sys
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import click
+import dns.exception
+import requests
 
 from .commons import (
+    MappedChunk,
     common_options,
-    emit_json,
-    extract_ip_addrs,
-    parse_input_methods,
+    emit_json_stream,
+    extract_hosts,
+    iter_extract,
+    iter_input_lines,
+    map_concurrent,
+    peek_iter,
 )
 from .constants import HELP_SHORT_TEXT, NO_ARGS_TEXT
-from .ipaddr import get_ip_info, is_private_ip
+from .dns import get_rdns_record
+from .ipaddr import IPAddr, get_ip_info, get_ip_prefix_info, is_private_ip
 
 PRIVATE_IP_SKIP_MESSAGE = "Skipped, private ip address."
 """Message printed when an IP address falls within
 :data:`~valkyrie_tools.ipaddr.PRIVATE_IP_CIDR_RANGES`.
 """  # pragma: no cover
+NO_DATA_MESSAGE = "No data returned."
+"""Error recorded when ipinfo.io returns no data for an address."""  # pragma: no cover
 
 
-def _build_ip_json_entry(ipaddr: str) -> Dict[str, Any]:
+def _extract_ips(line: Union[str, MappedChunk]) -> List[IPAddr]:
+    """Extract the valid IPv4 and IPv6 addresses of one input line.
+
+    Args:
+        line (Union[str, MappedChunk]): Input line or file window.
+
+    Returns:
+        List[IPAddr]: Parsed addresses in order of appearance.
+    """
+    hosts = extract_hosts(line, kinds=("ipv4", "ipv6"))
+    return [host for host in hosts if isinstance(host, IPAddr)]
+
+
+def _get_hostname(ipaddr: Union[str, IPAddr]) -> Optional[str]:
+    """Resolve the PTR hostname of an IP address.
+
+    Args:
+        ipaddr (Union[str, IPAddr]): The IP address to resolve.
+
+    Returns:
+        Optional[str]: The first PTR name without its trailing dot, or
+        ``None`` if there is no PTR record or the lookup fails.
+    """
+    try:
+        records = get_rdns_record(ipaddr)
+    except (ValueError, dns.exception.DNSException):
+        return None
+
+    return records[0][1].rstrip(".") if records else None
+
+
+def _lookup_ip(
+    ipaddr: Union[str, IPAddr],
+    share_prefix: bool = False,
+    hostname: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """Look up metadata for one IP address.
+
+    Args:
+        ipaddr (Union[str, IPAddr]): The IP address to look up.
+        share_prefix (bool): When ``True``, use
+            :func:`~valkyrie_tools.ipaddr.get_ip_prefix_info` so addresses in
+            an already-seen prefix are answered from cache.  Defaults to
+            False.
+        hostname (bool): When ``True`` and ``share_prefix`` is set, add the
+            address's PTR ``hostname``.  Defaults to False.
+
+    Returns:
+        Optional[Dict[str, Any]]: The metadata dict, or ``None`` when no data
+        was returned.
+    """
+    if share_prefix is False:
+        return get_ip_info(ipaddr)
+
+    info = get_ip_prefix_info(ipaddr)
+    if info is not None and hostname is True:
+        info["hostname"] = _get_hostname(ipaddr)
+    return info
+
+
+def _build_ip_json_entry(
+    ipaddr: Union[str, IPAddr],
+    share_prefix: bool = False,
+    hostname: bool = False,
+) -> Dict[str, Any]:
     """Build a single JSON result entry for one IP address.
 
     Args:
-        ipaddr (str): The IP address to look up.
+        ipaddr (Union[str, IPAddr]): The IP address to look up.
+        share_prefix (bool): Share prefix-level results between addresses.
+            Defaults to False.
+        hostname (bool): Resolve per-address hostnames when sharing prefix
+            results.  Defaults to False.
 
     Returns:
         Dict[str, Any]: A dict with an ``"input"`` key and either full
-        ipinfo data or an ``"error"`` key.
+        ipinfo data or an ``"error"`` key.  Request failures (including
+        exhausted 429 retries) are reported as an ``"error"`` entry rather
+        than raised, so one failing address never aborts the whole run.
     """
     if is_private_ip(ipaddr):
-        return {"input": ipaddr, "error": PRIVATE_IP_SKIP_MESSAGE}
+        return {"input": str(ipaddr), "error": PRIVATE_IP_SKIP_MESSAGE}
+
+    try:
+        ipinfo = _lookup_ip(ipaddr, share_prefix, hostname)
+    except requests.exceptions.RequestException as exc:
+        return {"input": str(ipaddr), "error": str(exc)}
 
-    ipinfo = get_ip_info(ipaddr)
     if ipinfo is None:
-        return {"input": ipaddr, "error": "No data returned."}
+        return {"input": str(ipaddr), "error": NO_DATA_MESSAGE}
 
-    entry: Dict[str, Any] = {"input": ipaddr}
+    entry: Dict[str, Any] = {"input": str(ipaddr)}
     entry.update(ipinfo)
     return entry
 
 
-def _print_ip_text(ipaddr: str) -> None:
-    """Print human-readable ipinfo output for one IP address.
+def _print_ip_text(entry: Dict[str, Any]) -> None:
+    """Print human-readable ipinfo output for one result entry.
 
     Args:
-        ipaddr (str): The IP address to look up and print.
+        entry (Dict[str, Any]): Result entry built by
+            :func:`_build_ip_json_entry`.
     """
-    click.echo(f"> {ipaddr}".format(ipaddr))
+    click.echo(f"> {entry['input']}")
 
-    if is_private_ip(ipaddr):
+    error = entry.get("error")
+    if error == PRIVATE_IP_SKIP_MESSAGE:
         click.echo("  %s" % PRIVATE_IP_SKIP_MESSAGE)
         return
+    elif error == NO_DATA_MESSAGE:
+        return
+    elif error is not None:
+        click.echo("  %s" % error, err=True)
+        return
 
-    ipinfo = get_ip_info(ipaddr)
-    if ipinfo is None:
+    ipinfo = {k: v for k, v in entry.items() if k != "input"}
+    if len(ipinfo) == 0:
         return
 
     key_width = max([len(k) for k in ipinfo.keys()]) + 1
@@ -107,12 +199,53 @@ def json_extractor_ipcheck(data: List[Any]) -> Tuple[str, ...]:
     description="Get ip address info.",
     version="0.1.0",
 )
+@click.option(
+    "-p",
+    "--share-prefix",
+    "share_prefix",
+    is_flag=True,
+    help="Share ASN/org/country lookups across addresses in the same prefix.",
+    default=False,
+)
+@click.option(
+    "-H",
+    "--hostname",
+    "hostname",
+    is_flag=True,
+    help="With --share-prefix, also resolve each address's PTR hostname.",
+    default=False,
+)
+@click.option(
+    "-w",
+    "--workers",
+    "workers",
+    type=click.IntRange(min=1),
+    help="Number of concurrent lookups.",
+    default=1,
+    show_default=True,
+)
+@click.option(
+    "-u",
+    "--unordered",
+    "unordered",
+    is_flag=True,
+    help="Print results as they complete instead of in input order.",
+    default=False,
+)
 @click.pass_context
 def cli(
     ctx: click.Context,
     values: Tuple[str, ...],
     interactive: bool,
     output_json: bool,
+    output_jsonl: bool,
+    jobs: int,
+    exclude: Tuple[str, ...],
+    max_file_size: Optional[int],
+    share_prefix: bool,
+    hostname: bool,
+    workers: int,
+    unordered: bool,
 ) -> None:
     """Look up geolocation and ASN metadata for IP addresses.
 
@@ -124,6 +257,18 @@ def cli(
     * Public addresses are queried against the ipinfo.io JSON API and the
       returned key/value pairs are printed in aligned columns.
 
+    With ``-p`` / ``--share-prefix``, only the ASN, org and country are
+    reported and they are looked up once per announced prefix; every other
+    address in that prefix reuses the cached record.  Add ``-H`` /
+    ``--hostname`` to also resolve each address's PTR hostname.
+
+    Use ``-w`` / ``--workers`` to run several lookups at once.  Each result
+    is printed as soon as it is ready: in input order by default, or in
+    completion order with ``-u`` / ``--unordered``.  Rate-limited (HTTP 429)
+    responses are retried honouring ``Retry-After``, and an address whose
+    lookup still fails is reported with an error instead of aborting the
+    run.
+
     When ``--json`` is active, results are emitted as a JSON array.  Each
     entry contains either the full ipinfo dict (plus an ``"input"`` key) or
     an ``"error"`` key for addresses that could not be resolved.  Piped JSON
@@ -139,39 +284,62 @@ def cli(
             in interactive mode.
         output_json (bool): When ``True``, emits results as a JSON array
             instead of human-readable text.
+        output_jsonl (bool): When ``True``, emits results as newline-delimited
+            JSON instead, one object per line.
+        jobs (int): Number of processes extracting indicators from the
+            input.
+        exclude (Tuple[str, ...]): Patterns of files and directories to skip
+            in input directories and globs.
+        max_file_size (Optional[int]): Size limit in bytes for files in
+            input directories and globs.
+        share_prefix (bool): When ``True``, shares prefix-level results
+            between addresses in the same prefix.
+        hostname (bool): When ``True`` (with ``share_prefix``), resolves the
+            PTR hostname of every address.
+        workers (int): Maximum number of concurrent lookups.
+        unordered (bool): When ``True``, emits results in completion order
+            rather than input order.
     """
-    values = parse_input_methods(
-        values,
-        interactive,
-        ctx,
-        output_json=output_json,
-        json_extractor=json_extractor_ipcheck,
+    lines = peek_iter(
+        iter_input_lines(
+            values,
+            interactive,
+            ctx,
+            output_json=output_json,
+            json_extractor=json_extractor_ipcheck,
+            exclude=exclude,
+            max_file_size=max_file_size,
+        )
     )
 
-    if len(values) == 0:
+    if lines is None:
         if output_json:
-            emit_json([])
+            emit_json_stream([], jsonl=output_jsonl)
             sys.exit(0)
         click.echo("Error: %s" % NO_ARGS_TEXT, err=True)
         click.echo(HELP_SHORT_TEXT.format(name=ctx.command.name), err=True)
         sys.exit(1)
 
-    args = extract_ip_addrs("\n".join(values), unique=True)
+    args = iter_extract(lines, _extract_ips, jobs=jobs)
+
+    results = map_concurrent(
+        lambda ipaddr: _build_ip_json_entry(ipaddr, share_prefix, hostname),
+        args,
+        workers=workers,
+        ordered=not unordered,
+    )
 
     if output_json:
-        results: List[Dict[str, Any]] = [
-            _build_ip_json_entry(ipaddr) for ipaddr in args
-        ]
-        emit_json(results)
+        emit_json_stream(results, jsonl=output_jsonl)
         return
 
-    for a in range(len(args)):
-        _print_ip_text(args[a])
-
-        # Print trailing newline
-        if a < len(args) - 1:
+    for a, entry in enumerate(results):
+        # Print a newline between entries
+        if a > 0:
             click.echo()
 
+        _print_ip_text(entry)
+
 
 if __name__ == "__main__":  # pragma: no cover
     cli()
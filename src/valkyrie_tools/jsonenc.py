@@ -0,0 +1,136 @@
+"""JSON encoding for command output.
+
+:func:`dumps` serialises results with `orjson <https://github.com/ijl/orjson>`_
+when it is installed and with the standard library :mod:`json` module
+otherwise.  Both backends produce the same text: dates and times as ISO 8601
+strings, IP addresses as their canonical string, dataclasses as objects and
+any other unsupported value as its :class:`str`, either indented by two
+spaces (as the ``--json`` output always has been) or compact.
+"""
+
+import dataclasses
+import ipaddress
+import json
+from datetime import date, time
+from typing import Any, Optional
+
+from .ipaddr import IPAddr
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+__all__ = ["BACKENDS", "BACKEND", "json_default", "dumps"]
+
+BACKENDS = ("orjson", "json") if orjson is not None else ("json",)
+"""Available encoder backends, fastest first."""
+
+BACKEND = BACKENDS[0]
+"""Backend used by :func:`dumps` unless another one is requested."""
+
+_IP_TYPES = (
+    IPAddr,
+    ipaddress.IPv4Address,
+    ipaddress.IPv6Address,
+    ipaddress.IPv4Network,
+    ipaddress.IPv6Network,
+)
+
+
+def json_default(value: Any) -> Any:
+    """Convert a value the encoders do not support natively.
+
+    Args:
+        value (Any): Value to convert.
+
+    Returns:
+        Any: A JSON-serialisable stand-in for ``value``.
+
+    Example:
+        >>> import datetime
+        >>> from valkyrie_tools.jsonenc import json_default
+        >>> json_default(datetime.date(2024, 1, 2))
+        '2024-01-02'
+        >>> json_default({1, 2})
+        '{1, 2}'
+    """
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, _IP_TYPES):
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {
+            field.name: getattr(value, field.name)
+            for field in dataclasses.fields(value)
+        }
+    return str(value)
+
+
+def _stdlib_dumps(data: Any, compact: bool) -> str:
+    """Serialise ``data`` with the standard library encoder.
+
+    Args:
+        data (Any): Value to serialise.
+        compact (bool): Whether to omit indentation and spaces.
+
+    Returns:
+        str: JSON text.
+    """
+    if compact:
+        return json.dumps(
+            data,
+            default=json_default,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+    return json.dumps(data, default=json_default, ensure_ascii=False, indent=2)
+
+
+def dumps(
+    data: Any, compact: bool = False, backend: Optional[str] = None
+) -> str:
+    """Serialise ``data`` to JSON text.
+
+    Values outside the range orjson supports (such as integers wider than
+    64 bits) fall back to the standard library encoder.
+
+    Args:
+        data (Any): Value to serialise.
+        compact (bool): Whether to omit indentation and spaces, e.g. for
+            newline-delimited output.  Defaults to False.
+        backend (Optional[str]): One of :data:`BACKENDS`.  Defaults to
+            :data:`BACKEND`.
+
+    Returns:
+        str: JSON text, without a trailing newline.
+
+    Raises:
+        ValueError: If ``backend`` is not available.
+
+    Example:
+        >>> import datetime
+        >>> from valkyrie_tools.jsonenc import dumps
+        >>> when = datetime.datetime(2024, 1, 2, 3, 4, 5)
+        >>> print(dumps({"input": "example.com", "date": when}, compact=True))
+        {"input":"example.com","date":"2024-01-02T03:04:05"}
+        >>> print(dumps([1], backend="json"))
+        [
+          1
+        ]
+    """
+    backend = backend or BACKEND
+    if backend not in BACKENDS:
+        raise ValueError("Unavailable JSON backend: %r" % backend)
+
+    if backend == "orjson":
+        option = orjson.OPT_NON_STR_KEYS
+        if not compact:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(
+                data, default=json_default, option=option
+            ).decode()
+        except orjson.JSONEncodeError:
+            pass
+    return _stdlib_dumps(data, compact)
@@ -0,0 +1,273 @@
+"""Public Suffix List lookups.
+
+Maps host names to their registrable domain (eTLD+1), e.g.
+``www.example.co.uk`` -> ``example.co.uk``, using a trie compiled from the
+`Public Suffix List <https://publicsuffix.org/>`_.  A copy of the list ships
+with the package; :func:`refresh_public_suffix_list` installs a newer one in
+the per-user cache directory, from a URL or from a local file when offline.
+"""
+
+import os
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+import requests
+
+from .constants import DEFAULT_REQUEST_TIMEOUT
+from .files import get_cache_dir
+
+__all__ = [
+    "PublicSuffixList",
+    "get_public_suffix_list",
+    "refresh_public_suffix_list",
+    "registered_domain",
+]
+
+PUBLIC_SUFFIX_LIST_URL = "https://publicsuffix.org/list/public_suffix_list.dat"
+"""Canonical download location of the Public Suffix List."""
+PUBLIC_SUFFIX_LIST_FILE = "public_suffix_list.dat"
+"""File name of the list, both bundled and in the user cache directory."""
+BUNDLED_PUBLIC_SUFFIX_LIST = os.path.join(
+    os.path.dirname(__file__), "data", PUBLIC_SUFFIX_LIST_FILE
+)
+"""Path of the copy of the list shipped with the package."""
+PRIVATE_SECTION_MARKER = "===BEGIN PRIVATE DOMAINS==="
+"""Comment marking the start of the privately operated suffixes."""
+
+_RULE = "\0rule"
+_EXCEPTION = "\0exception"
+
+_default_list: Optional["PublicSuffixList"] = None
+_default_lock = threading.Lock()
+
+
+class PublicSuffixList:
+    """A Public Suffix List compiled into a label trie.
+
+    Rules are stored right to left (``co.uk`` becomes ``uk`` -> ``co``), so a
+    lookup walks at most one trie node per label of the queried name.  The
+    standard wildcard (``*.ck``) and exception (``!www.ck``) rules are
+    supported, and names under an unlisted TLD fall back to the implicit
+    ``*`` rule.
+
+    Only the ICANN section is used by default: privately operated suffixes
+    such as ``github.io`` are not delegated by a registry, so WHOIS and RDAP
+    servers only know the domain above them.
+
+    Attributes:
+        root (Dict[str, Any]): Trie root, label to child node.
+
+    Example:
+        >>> from valkyrie_tools.publicsuffix import PublicSuffixList
+        >>> psl = PublicSuffixList(["uk", "co.uk", "*.ck", "!www.ck"])
+        >>> psl.registered_domain("mail.example.co.uk")
+        'example.co.uk'
+        >>> psl.registered_domain("a.b.foo.ck")
+        'b.foo.ck'
+        >>> psl.registered_domain("www.ck")
+        'www.ck'
+        >>> psl.registered_domain("co.uk") is None
+        True
+    """
+
+    def __init__(
+        self, lines: Iterable[str], include_private: bool = False
+    ) -> None:
+        """Initialize the PublicSuffixList object.
+
+        Args:
+            lines (Iterable[str]): Lines of a list in the official format.
+            include_private (bool): Whether to also apply the rules of the
+                PRIVATE section.  Defaults to False.
+        """
+        self.root: Dict[str, Any] = {}
+        for line in lines:
+            line = line.strip()
+            if PRIVATE_SECTION_MARKER in line and not include_private:
+                break
+            if not line or line.startswith("//"):
+                continue
+            self._add_rule(line.split()[0])
+
+    @classmethod
+    def from_file(
+        cls, path: str, include_private: bool = False
+    ) -> "PublicSuffixList":
+        """Compile a list stored on disk.
+
+        Args:
+            path (str): Path of a ``public_suffix_list.dat`` file.
+            include_private (bool): Whether to also apply the rules of the
+                PRIVATE section.  Defaults to False.
+
+        Returns:
+            PublicSuffixList: The compiled list.
+        """
+        with open(path, encoding="utf-8") as f:
+            return cls(f, include_private=include_private)
+
+    def _add_rule(self, rule: str) -> None:
+        """Insert a single rule into the trie.
+
+        Args:
+            rule (str): Rule text, optionally prefixed with ``!``.
+        """
+        exception = rule.startswith("!")
+        node = self.root
+        for label in reversed(rule.lstrip("!").lower().split(".")):
+            node = node.setdefault(_to_ascii(label), {})
+        node[_EXCEPTION if exception else _RULE] = True
+
+    def public_suffix_length(self, labels: Iterable[str]) -> int:
+        """Count how many trailing labels form the public suffix.
+
+        Args:
+            labels (Iterable[str]): Lowercase labels, right to left.
+
+        Returns:
+            int: Number of labels in the matching public suffix (at least
+            one, per the implicit ``*`` rule).
+        """
+        length = 1
+        node: Optional[Dict[str, Any]] = self.root
+        for depth, label in enumerate(labels, start=1):
+            if node is None:
+                break
+            exact = node.get(label)
+            if exact is not None and exact.get(_EXCEPTION):
+                return depth - 1
+            wildcard = node.get("*")
+            if wildcard is not None or (exact is not None and exact.get(_RULE)):
+                length = depth
+            node = exact if exact is not None else wildcard
+        return length
+
+    def public_suffix(self, domain: str) -> str:
+        """Return the public suffix of ``domain``.
+
+        Args:
+            domain (str): Host name.
+
+        Returns:
+            str: Public suffix, e.g. ``"co.uk"``.
+        """
+        labels = domain.lower().rstrip(".").split(".")
+        length = self.public_suffix_length(reversed(labels))
+        return ".".join(labels[-length:])
+
+    def registered_domain(self, domain: str) -> Optional[str]:
+        """Return the registrable domain (eTLD+1) of ``domain``.
+
+        Args:
+            domain (str): Host name.
+
+        Returns:
+            Optional[str]: Lowercased registrable domain, or None when
+            ``domain`` is itself a public suffix.
+        """
+        labels = domain.lower().rstrip(".").split(".")
+        length = self.public_suffix_length(reversed(labels))
+        if length >= len(labels):
+            return None
+        return ".".join(labels[-length - 1 :])
+
+
+def _to_ascii(label: str) -> str:
+    """Convert an internationalised label to its punycode form.
+
+    Args:
+        label (str): Rule label.
+
+    Returns:
+        str: ASCII label, or ``label`` unchanged if it cannot be encoded.
+    """
+    if label.isascii():
+        return label
+    try:
+        return label.encode("idna").decode("ascii")
+    except UnicodeError:
+        return label
+
+
+def _cached_list_path() -> str:
+    """Return the path of the user's refreshed copy of the list.
+
+    Returns:
+        str: Path inside the per-user cache directory.
+    """
+    return os.path.join(get_cache_dir(), PUBLIC_SUFFIX_LIST_FILE)
+
+
+def get_public_suffix_list() -> PublicSuffixList:
+    """Return the shared compiled list, building it on first use.
+
+    A copy installed by :func:`refresh_public_suffix_list` takes precedence
+    over the bundled one.
+
+    Returns:
+        PublicSuffixList: The compiled list.
+    """
+    global _default_list
+    with _default_lock:
+        if _default_list is None:
+            path = _cached_list_path()
+            if not os.path.isfile(path):
+                path = BUNDLED_PUBLIC_SUFFIX_LIST
+            _default_list = PublicSuffixList.from_file(path)
+        return _default_list
+
+
+def refresh_public_suffix_list(source: Optional[str] = None) -> str:
+    """Install a newer Public Suffix List for subsequent lookups.
+
+    Args:
+        source (Optional[str]): URL to download the list from, or path of a
+            local copy (for offline hosts).  Defaults to
+            :data:`PUBLIC_SUFFIX_LIST_URL`.
+
+    Returns:
+        str: Path of the installed list.
+
+    Raises:
+        ValueError: If ``source`` does not contain any suffix rules.
+    """
+    global _default_list
+    source = source or PUBLIC_SUFFIX_LIST_URL
+    if os.path.isfile(source):
+        with open(source, encoding="utf-8") as f:
+            text = f.read()
+    else:
+        r = requests.get(source, timeout=DEFAULT_REQUEST_TIMEOUT)
+        r.raise_for_status()
+        text = r.text
+
+    psl = PublicSuffixList(text.splitlines())
+    if not psl.root:
+        raise ValueError("No public suffix rules found in %s" % source)
+
+    path = _cached_list_path()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    with _default_lock:
+        _default_list = psl
+    return path
+
+
+def registered_domain(domain: str) -> Optional[str]:
+    """Return the registrable domain (eTLD+1) of ``domain``.
+
+    Args:
+        domain (str): Host name.
+
+    Returns:
+        Optional[str]: Lowercased registrable domain, or None when
+        ``domain`` is itself a public suffix.
+
+    Example:
+        >>> from valkyrie_tools.publicsuffix import registered_domain
+        >>> registered_domain("www.Example.COM")
+        'example.com'
+        >>> registered_domain("static.example.co.uk")
+        'example.co.uk'
+    """
+    return get_public_suffix_list().registered_domain(domain)
@@ -0,0 +1,612 @@
+"""RDAP lookups for IP addresses and domains.
+
+RDAP (Registration Data Access Protocol, RFC 9082/9083) is the structured,
+HTTP-based successor of port-43 WHOIS.  Queries are routed straight to the
+authoritative server using the IANA bootstrap registries (RFC 9224), which
+are cached in the per-user cache directory and refreshed with conditional
+requests.  All queries share one pooled :class:`requests.Session`.
+
+Responses are converted into the same dict shapes returned by
+:func:`~valkyrie_tools.whois.get_ip_whois` and
+:func:`~valkyrie_tools.whois.get_whois`, so the output helpers in
+:mod:`valkyrie_tools.whobe` work unchanged with either backend.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from time import monotonic, time
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .constants import DEFAULT_REQUEST_TIMEOUT
+from .files import get_cache_dir
+from .httpr import get_with_retry
+from .ipaddr import IPAddr, PrefixIndex, to_ip_addr
+
+__all__ = [
+    "RDAPBootstrap",
+    "get_bootstrap",
+    "get_session",
+    "rdap_query",
+    "get_ip_rdap",
+    "get_domain_rdap",
+    "ip_rdap_to_whois",
+    "domain_rdap_to_whois",
+]
+
+IANA_BOOTSTRAP_URL = "https://data.iana.org/rdap/%s.json"
+"""IANA bootstrap registry URL template; ``%s`` is the registry kind."""
+BOOTSTRAP_KINDS = ("dns", "ipv4", "ipv6")
+"""Bootstrap registries used for domain, IPv4 and IPv6 queries."""
+BOOTSTRAP_MAX_AGE = 86400
+"""Seconds a cached bootstrap registry is used before it is revalidated."""
+BOOTSTRAP_RETRY_DELAY = 30.0
+"""Seconds before a registry that could neither be read from the cache nor
+downloaded is fetched again.
+"""
+RDAP_POOL_SIZE = 16
+"""Maximum number of pooled connections kept per RDAP host."""
+RDAP_HEADERS = {"Accept": "application/rdap+json, application/json"}
+"""Request headers sent with every RDAP query."""
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_bootstraps: Dict[str, "RDAPBootstrap"] = {}
+_bootstraps_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Return the shared RDAP HTTP session, creating it on first use.
+
+    The session keeps up to :data:`RDAP_POOL_SIZE` keep-alive connections per
+    host, so consecutive queries to the same registry skip the TCP and TLS
+    handshakes.
+
+    Returns:
+        requests.Session: Pooled session.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=RDAP_POOL_SIZE, pool_maxsize=RDAP_POOL_SIZE
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update(RDAP_HEADERS)
+            _session = session
+        return _session
+
+
+class RDAPBootstrap:
+    """A cached IANA RDAP bootstrap registry.
+
+    The registry is loaded lazily on the first :meth:`server_for` call.  A
+    cached copy younger than ``max_age`` is used as is; an older one is
+    revalidated with ``If-None-Match`` / ``If-Modified-Since`` so that an
+    unchanged registry costs a single ``304`` response.  If the refresh fails
+    the stale copy keeps being used; without one, the download is attempted
+    again by lookups made :data:`BOOTSTRAP_RETRY_DELAY` seconds later.
+
+    Attributes:
+        kind (str): Registry kind, one of :data:`BOOTSTRAP_KINDS`.
+        url (str): Registry URL.
+        path (str): Cache file path.
+        max_age (float): Seconds before the cached copy is revalidated.
+
+    Example:
+        >>> from valkyrie_tools.rdap import RDAPBootstrap
+        >>> bootstrap = RDAPBootstrap("dns", path="/tmp/rdap-dns.json")
+        >>> bootstrap.load_services(
+        ...     [[["com"], ["https://rdap.verisign.com/com/v1/"]]]
+        ... )
+        >>> bootstrap.server_for("www.example.com")
+        'https://rdap.verisign.com/com/v1/'
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        url: Optional[str] = None,
+        path: Optional[str] = None,
+        max_age: float = BOOTSTRAP_MAX_AGE,
+    ) -> None:
+        """Initialize the RDAPBootstrap object.
+
+        Args:
+            kind (str): Registry kind, one of :data:`BOOTSTRAP_KINDS`.
+            url (Optional[str]): Registry URL.  Defaults to the IANA URL
+                for ``kind``.
+            path (Optional[str]): Cache file path.  Defaults to
+                ``rdap-<kind>.json`` in the per-user cache directory.
+            max_age (float): Seconds before the cached copy is revalidated.
+                Defaults to :data:`BOOTSTRAP_MAX_AGE`.
+        """
+        self.kind = kind
+        self.url = url or IANA_BOOTSTRAP_URL % kind
+        self.path = path or os.path.join(get_cache_dir(), f"rdap-{kind}.json")
+        self.max_age = max_age
+        self._loaded = False
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self._domains: Dict[str, str] = {}
+        self._networks = PrefixIndex()
+
+    def _read_cache(self) -> Optional[Dict[str, Any]]:
+        """Read the cached registry file.
+
+        Returns:
+            Optional[Dict[str, Any]]: Cached entry with ``data``, ``etag``
+            and ``last_modified`` keys, or None if missing or unreadable.
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return cached if isinstance(cached, dict) else None
+
+    def refresh(self, cached: Optional[Dict[str, Any]] = None) -> bool:
+        """Fetch the registry, revalidating the cached copy if there is one.
+
+        Args:
+            cached (Optional[Dict[str, Any]]): Current cache entry whose
+                validators are sent with the request.  Defaults to None.
+
+        Returns:
+            bool: True if the cache file is now up to date, False if the
+            registry could not be fetched.
+        """
+        headers = {}
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        try:
+            r = get_with_retry(
+                self.url,
+                session=get_session(),
+                headers=headers,
+                timeout=DEFAULT_REQUEST_TIMEOUT,
+            )
+            if r.status_code == 304 and cached is not None:
+                os.utime(self.path)
+                self.load_services(cached.get("data", {}).get("services", []))
+                return True
+            r.raise_for_status()
+            data = r.json()
+        except (requests.exceptions.RequestException, ValueError, OSError):
+            return False
+
+        entry = {
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+            "data": data,
+        }
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+        except OSError:  # pragma: no cover
+            pass
+        self.load_services(data.get("services", []))
+        return True
+
+    def load(self) -> None:
+        """Load the registry from cache, refreshing it when stale.
+
+        The registry only counts as loaded once services were read from the
+        cache or downloaded; otherwise the next attempt is delayed by
+        :data:`BOOTSTRAP_RETRY_DELAY` seconds.
+        """
+        cached = self._read_cache()
+        try:
+            fresh = time() - os.path.getmtime(self.path) < self.max_age
+        except OSError:
+            fresh = False
+
+        if cached is None or not fresh:
+            if self.refresh(cached):
+                return
+        if cached is not None:
+            self.load_services(cached.get("data", {}).get("services", []))
+        else:
+            self._retry_at = monotonic() + BOOTSTRAP_RETRY_DELAY
+
+    def load_services(self, services: List[Any]) -> None:
+        """Index the ``services`` array of a bootstrap registry.
+
+        Args:
+            services (List[Any]): ``[[entries, urls], ...]`` pairs as found
+                in the registry JSON.
+        """
+        domains: Dict[str, str] = {}
+        networks = PrefixIndex()
+        for service in services:
+            if not isinstance(service, list) or len(service) < 2:
+                continue
+            entries, urls = service[0], service[1]
+            url = _pick_url(urls)
+            if url is None:
+                continue
+            for entry in entries:
+                if self.kind == "dns":
+                    domains[str(entry).lower().rstrip(".")] = url
+                else:
+                    networks.insert(str(entry), url)
+
+        self._domains = domains
+        self._networks = networks
+        self._loaded = True
+
+    def server_for(self, query: Union[str, IPAddr]) -> Optional[str]:
+        """Return the RDAP base URL responsible for ``query``.
+
+        Domains are matched on their longest registered suffix; addresses on
+        the longest matching prefix.
+
+        Args:
+            query (Union[str, IPAddr]): Domain name or IP address.
+
+        Returns:
+            Optional[str]: Base URL ending in ``/``, or None if no server is
+            registered for ``query``.
+        """
+        with self._lock:
+            if not self._loaded and monotonic() >= self._retry_at:
+                self.load()
+
+        if self.kind != "dns":
+            url = self._networks.lookup(query)
+            return str(url) if url is not None else None
+
+        labels = str(query).lower().rstrip(".").split(".")
+        for i in range(len(labels)):
+            url = self._domains.get(".".join(labels[i:]))
+            if url is not None:
+                return url
+        return None
+
+
+def _pick_url(urls: List[Any]) -> Optional[str]:
+    """Choose the base URL to use from a bootstrap service entry.
+
+    Args:
+        urls (List[Any]): Candidate base URLs.
+
+    Returns:
+        Optional[str]: The first HTTPS URL (falling back to the first URL),
+        normalised to end in ``/``, or None if ``urls`` is empty.
+    """
+    candidates = [str(url) for url in urls]
+    if not candidates:
+        return None
+    https = [url for url in candidates if url.startswith("https://")]
+    url = (https or candidates)[0]
+    return url if url.endswith("/") else url + "/"
+
+
+def get_bootstrap(kind: str) -> RDAPBootstrap:
+    """Return the shared bootstrap registry of the given kind.
+
+    Args:
+        kind (str): Registry kind, one of :data:`BOOTSTRAP_KINDS`.
+
+    Returns:
+        RDAPBootstrap: Registry instance, shared across threads.
+    """
+    with _bootstraps_lock:
+        if kind not in _bootstraps:
+            _bootstraps[kind] = RDAPBootstrap(kind)
+        return _bootstraps[kind]
+
+
+def rdap_query(url: str) -> Optional[Dict[str, Any]]:
+    """Fetch and decode a single RDAP response.
+
+    Args:
+        url (str): Full RDAP query URL.
+
+    Returns:
+        Optional[Dict[str, Any]]: Decoded response object, or None if the
+        server had no record or the request failed.
+    """
+    try:
+        r = get_with_retry(
+            url, session=get_session(), timeout=DEFAULT_REQUEST_TIMEOUT
+        )
+        r.raise_for_status()
+        data = r.json()
+    except (requests.exceptions.RequestException, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _vcard(entity: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """Group an entity's jCard properties by name.
+
+    Args:
+        entity (Dict[str, Any]): RDAP entity object.
+
+    Returns:
+        Dict[str, List[Any]]: Property name to list of ``(params, value)``
+        pairs.
+    """
+    props: Dict[str, List[Any]] = {}
+    vcard = entity.get("vcardArray")
+    if not isinstance(vcard, list) or len(vcard) < 2:
+        return props
+    for prop in vcard[1]:
+        if isinstance(prop, list) and len(prop) >= 4:
+            props.setdefault(str(prop[0]), []).append((prop[1], prop[3]))
+    return props
+
+
+def _vcard_text(props: Dict[str, List[Any]], name: str) -> Optional[str]:
+    """Return the first text value of a jCard property.
+
+    Args:
+        props (Dict[str, List[Any]]): Output of :func:`_vcard`.
+        name (str): Property name, e.g. ``"fn"``.
+
+    Returns:
+        Optional[str]: Property value, or None if absent or empty.
+    """
+    for _, value in props.get(name, []):
+        if isinstance(value, list):
+            value = " ".join(str(v) for v in value if v)
+        if value:
+            return str(value)
+    return None
+
+
+def _vcard_address(props: Dict[str, List[Any]]) -> Dict[str, Optional[str]]:
+    """Extract the postal address of a jCard.
+
+    Args:
+        props (Dict[str, List[Any]]): Output of :func:`_vcard`.
+
+    Returns:
+        Dict[str, Optional[str]]: ``address``, ``city``, ``state``,
+        ``postal_code`` and ``country`` values (None when unknown).
+    """
+    address: Dict[str, Optional[str]] = dict.fromkeys(
+        ("address", "city", "state", "postal_code", "country")
+    )
+    for params, value in props.get("adr", []):
+        label = params.get("label") if isinstance(params, dict) else None
+        if isinstance(value, list) and len(value) >= 7 and any(value):
+            street = value[2]
+            if isinstance(street, list):
+                street = " ".join(str(s) for s in street if s)
+            address.update(
+                address=str(street) if street else label,
+                city=str(value[3]) or None,
+                state=str(value[4]) or None,
+                postal_code=str(value[5]) or None,
+                country=str(value[6]) or None,
+            )
+        elif label:
+            address["address"] = str(label).replace("\n", " ")
+        break
+    return address
+
+
+def _walk_entities(obj: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield every entity of an RDAP object, including nested ones.
+
+    Args:
+        obj (Dict[str, Any]): RDAP object.
+
+    Yields:
+        Dict[str, Any]: Entity objects, depth first.
+    """
+    for entity in obj.get("entities", []) or []:
+        if isinstance(entity, dict):
+            yield entity
+            yield from _walk_entities(entity)
+
+
+def _entity_with_role(
+    obj: Dict[str, Any], role: str
+) -> Optional[Dict[str, Any]]:
+    """Return the first entity of ``obj`` having ``role``.
+
+    Args:
+        obj (Dict[str, Any]): RDAP object.
+        role (str): Entity role, e.g. ``"registrant"``.
+
+    Returns:
+        Optional[Dict[str, Any]]: Matching entity, or None.
+    """
+    for entity in _walk_entities(obj):
+        if role in (entity.get("roles") or []):
+            return entity
+    return None
+
+
+def _emails(obj: Dict[str, Any]) -> List[str]:
+    """Collect the unique e-mail addresses of all entities of ``obj``.
+
+    Args:
+        obj (Dict[str, Any]): RDAP object.
+
+    Returns:
+        List[str]: E-mail addresses in order of appearance.
+    """
+    emails: Dict[str, None] = {}
+    for entity in _walk_entities(obj):
+        for _, value in _vcard(entity).get("email", []):
+            if value:
+                emails.setdefault(str(value), None)
+    return list(emails)
+
+
+def _parse_date(value: Any) -> Optional[datetime]:
+    """Parse an RDAP event date.
+
+    Args:
+        value (Any): RFC 3339 timestamp.
+
+    Returns:
+        Optional[datetime]: Parsed timestamp, or None if unparseable.
+    """
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def ip_rdap_to_whois(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert an RDAP IP network response to the IP WHOIS dict shape.
+
+    Produces the keys :func:`~valkyrie_tools.whobe.ip_whois_to_dict`
+    consumes.  RDAP network objects carry no BGP data, so ``asn`` is only
+    set when the registry includes origin AS numbers (ARIN's
+    ``arin_originas0`` extension) and ``asn_cidr`` is the network's CIDR.
+
+    Args:
+        data (Dict[str, Any]): RDAP ``ip network`` object.
+
+    Returns:
+        Dict[str, Any]: Dict with ``asn``, ``asn_country_code``,
+        ``asn_cidr`` and a single-element ``nets`` list.
+
+    Example:
+        >>> from valkyrie_tools.rdap import ip_rdap_to_whois
+        >>> whois = ip_rdap_to_whois({
+        ...     "handle": "NET-8-8-8-0-1",
+        ...     "name": "GOGL",
+        ...     "startAddress": "8.8.8.0",
+        ...     "endAddress": "8.8.8.255",
+        ...     "cidr0_cidrs": [{"v4prefix": "8.8.8.0", "length": 24}],
+        ... })
+        >>> whois["asn_cidr"], whois["nets"][0]["range"]
+        ('8.8.8.0/24', '8.8.8.0 - 8.8.8.255')
+    """
+    cidrs = [
+        "%s/%s" % (c.get("v4prefix") or c.get("v6prefix"), c.get("length"))
+        for c in data.get("cidr0_cidrs", []) or []
+        if isinstance(c, dict)
+    ]
+    cidr = ", ".join(cidrs) or None
+
+    origin = data.get("arin_originas0_originautnums") or []
+    registrant = _entity_with_role(data, "registrant") or {}
+    address = _vcard_address(_vcard(registrant))
+    country = data.get("country") or address["country"]
+
+    start, end = data.get("startAddress"), data.get("endAddress")
+    net = {
+        "name": data.get("name"),
+        "handle": data.get("handle"),
+        "cidr": cidr,
+        "range": f"{start} - {end}" if start and end else None,
+        "description": _vcard_text(_vcard(registrant), "fn"),
+        "address": address["address"],
+        "city": address["city"],
+        "state": address["state"],
+        "country": country,
+        "postal_code": address["postal_code"],
+        "emails": _emails(data),
+    }
+    return {
+        "asn": str(origin[0]) if origin else None,
+        "asn_country_code": country,
+        "asn_cidr": cidrs[0] if cidrs else None,
+        "query": data.get("startAddress"),
+        "nets": [net],
+    }
+
+
+def domain_rdap_to_whois(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert an RDAP domain response to the domain WHOIS dict shape.
+
+    Produces the keys :func:`~valkyrie_tools.whobe.domain_whois_to_dict`
+    consumes, taking contact details from the ``registrant`` entity.
+
+    Args:
+        data (Dict[str, Any]): RDAP ``domain`` object.
+
+    Returns:
+        Dict[str, Any]: Domain WHOIS fields.
+    """
+    events = {
+        e.get("eventAction"): _parse_date(e.get("eventDate"))
+        for e in data.get("events", []) or []
+        if isinstance(e, dict)
+    }
+    registrar = _entity_with_role(data, "registrar") or {}
+    registrant = _vcard(_entity_with_role(data, "registrant") or {})
+    address = _vcard_address(registrant)
+    name_servers = [
+        str(ns.get("ldhName")).lower()
+        for ns in data.get("nameservers", []) or []
+        if isinstance(ns, dict) and ns.get("ldhName")
+    ]
+    ldh_name = data.get("ldhName")
+
+    return {
+        "domain_name": ldh_name.lower() if ldh_name else None,
+        "registrar": _vcard_text(_vcard(registrar), "fn"),
+        "org": _vcard_text(registrant, "org"),
+        "emails": _emails(data),
+        "name": _vcard_text(registrant, "fn"),
+        "address": address["address"],
+        "city": address["city"],
+        "state": address["state"],
+        "country": address["country"],
+        "registrant_postal_code": address["postal_code"],
+        "creation_date": events.get("registration"),
+        "expiration_date": events.get("expiration"),
+        "updated_date": events.get("last changed"),
+        "name_servers": name_servers,
+        "status": data.get("status") or [],
+    }
+
+
+def get_ip_rdap(ipaddr: Union[str, IPAddr]) -> Optional[Dict[str, Any]]:
+    """Look up an IP address over RDAP.
+
+    Args:
+        ipaddr (Union[str, IPAddr]): IP address to query.
+
+    Returns:
+        Optional[Dict[str, Any]]: Result of :func:`ip_rdap_to_whois`, or
+        None if the address is invalid, unregistered or the query failed.
+    """
+    ip = to_ip_addr(ipaddr)
+    if ip is None:
+        return None
+
+    server = get_bootstrap(f"ipv{ip.version}").server_for(ip)
+    if server is None:
+        return None
+
+    data = rdap_query(f"{server}ip/{ip}")
+    return ip_rdap_to_whois(data) if data is not None else None
+
+
+def get_domain_rdap(domain: str) -> Optional[Dict[str, Any]]:
+    """Look up a domain over RDAP.
+
+    Args:
+        domain (str): Domain name to query.
+
+    Returns:
+        Optional[Dict[str, Any]]: Result of :func:`domain_rdap_to_whois`,
+        or None if no RDAP server serves the TLD or the query failed.
+    """
+    domain = domain.lower().rstrip(".")
+    server = get_bootstrap("dns").server_for(domain)
+    if server is None:
+        return None
+
+    data = rdap_query(f"{server}domain/{domain}")
+    return domain_rdap_to_whois(data) if data is not None else None
@@ -0,0 +1,510 @@
+"""Linear-time indicator tokenizer.
+
+The patterns in :mod:`~valkyrie_tools.constants` nest repeated groups, so on
+long runs of letters, digits and dots (base64 blobs, hex dumps, minified
+JavaScript) they backtrack and take polynomial time: a single 2,000
+character word keeps the e-mail pattern busy for tens of seconds.
+
+:func:`scan` finds the same kinds of indicators without backtracking.  The
+text is cut into candidate tokens with a single character-class pattern,
+and each token is split with :meth:`str.find` and short forward or backward
+walks over character sets that stop at the next separator.  Candidates are
+then validated with plain label and octet checks, and IPv6 addresses are
+parsed once with :meth:`~valkyrie_tools.ipaddr.IPAddr.parse`.  Every
+character is visited a bounded number of times, so scanning stays linear in
+the size of the input whatever it contains.
+
+Most of a typical log holds no indicator at all, so two literal
+pre-filters keep the per-token work for the few places that may: a window
+with no ``.``, ``:`` or ``@`` (found with :meth:`str.find` or
+:meth:`bytes.find`) is skipped outright, and the token pattern only
+matches words holding one of them before their last character.  Every
+indicator needs such an anchor: a dot in domains and IPv4 addresses
+(between two digits), a colon in IPv6 addresses and ``://``, an ``@`` in
+e-mail addresses.
+"""
+
+import mmap
+import re
+from typing import Any, Iterator, List, NamedTuple, Optional, Union
+
+from .ipaddr import IPAddr
+
+__all__ = [
+    "ScanMatch",
+    "ScanText",
+    "scan",
+    "host_kind",
+]
+
+ScanText = Union[str, bytes, bytearray, mmap.mmap]
+"""Text accepted by :func:`scan`: a string, or bytes in any ASCII-compatible
+encoding, including a memory-mapped file."""
+
+
+class _Syntax(NamedTuple):
+    """Patterns and literals for scanning either ``str`` or ``bytes``."""
+
+    token: "re.Pattern[Any]"
+    host_run: "re.Pattern[Any]"
+    authority_end: "re.Pattern[Any]"
+    uri_end: "re.Pattern[Any]"
+    empty: Any
+    dot: Any
+    hyphen: Any
+    colon: Any
+    at: Any
+    sep: Any
+    anchors: Any
+
+
+# Words that hold an anchor (".", ":" or "@") before their last character.
+# The look-behind only lets a match start at the beginning of a word, so a
+# word without anchors costs one failed attempt instead of one per
+# character.
+_DELIMITERS = r"\s\"'<>()\[\]{}|\\^`,;"
+_TOKEN = r"(?<![^%s])[^%s.:@]*[.:@](?=[^%s])[^%s]*" % ((_DELIMITERS,) * 4)
+_HOST_RUN = r"[A-Za-z0-9.:-]+"  # Maximal runs of host characters.
+_AUTHORITY_END = r"[/?#]"  # End of "user:password@host:port" in a URL.
+_URI_END = r"[?#]"  # End of the reported URL (query and fragment).
+
+_STR_SYNTAX = _Syntax(
+    token=re.compile(_TOKEN),
+    host_run=re.compile(_HOST_RUN),
+    authority_end=re.compile(_AUTHORITY_END),
+    uri_end=re.compile(_URI_END),
+    empty="",
+    dot=".",
+    hyphen="-",
+    colon=":",
+    at="@",
+    sep="://",
+    anchors=(".", ":", "@"),
+)
+_BYTES_SYNTAX = _Syntax(
+    token=re.compile(_TOKEN.encode()),
+    host_run=re.compile(_HOST_RUN.encode()),
+    authority_end=re.compile(_AUTHORITY_END.encode()),
+    uri_end=re.compile(_URI_END.encode()),
+    empty=b"",
+    dot=b".",
+    hyphen=b"-",
+    colon=b":",
+    at=b"@",
+    sep=b"://",
+    anchors=(b".", b":", b"@"),
+)
+
+
+def _charset(chars: str) -> "frozenset[Any]":
+    """Build a set matching ``chars`` in both ``str`` and ``bytes`` text.
+
+    Args:
+        chars (str): ASCII characters.
+
+    Returns:
+        frozenset: The characters and their byte values.
+    """
+    return frozenset(chars) | frozenset(chars.encode())
+
+
+_ALNUM = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+SCHEME_CHARS = _charset(_ALNUM + "._-")
+LOCAL_PART_CHARS = _charset(_ALNUM + "._+-")
+DOMAIN_CHARS = _charset(_ALNUM + ".-")
+DIGITS_AND_DOTS = _charset("0123456789.")
+EDGE_CHARS = _charset(".-")
+DOTS = _charset(".")
+
+MAX_LABEL_LENGTH = 63
+"""Maximum length of a single domain label."""
+
+
+class ScanMatch(NamedTuple):
+    """A candidate indicator found by :func:`scan`.
+
+    Attributes:
+        kind (str): ``"url"``, ``"email"``, ``"ipv6"``, ``"ipv4"`` or
+            ``"domain"``.
+        start (int): Offset of the first character in the scanned text.
+        end (int): Offset just past the last character.
+        host_kind (Optional[str]): Kind of the host embedded in a URL,
+            e-mail address or IPv4-suffixed IPv6 address, if any.
+        host_start (int): Offset of the embedded host, or ``-1``.
+        host_end (int): Offset just past the embedded host, or ``-1``.
+    """
+
+    kind: str
+    start: int
+    end: int
+    host_kind: Optional[str] = None
+    host_start: int = -1
+    host_end: int = -1
+
+
+def _syntax(text: Any) -> _Syntax:
+    """Return the patterns and literals matching the type of ``text``.
+
+    Args:
+        text (ScanText): Scanned text or buffer.
+
+    Returns:
+        _Syntax: ``str`` or ``bytes`` syntax.
+    """
+    return _STR_SYNTAX if isinstance(text, str) else _BYTES_SYNTAX
+
+
+def _is_label(label: Any, syntax: _Syntax) -> bool:
+    """Check whether ``label`` is a valid domain label.
+
+    Args:
+        label (Union[str, bytes]): Text between two dots.
+        syntax (_Syntax): Syntax of ``label``.
+
+    Returns:
+        bool: True for 1 to 63 letters, digits and inner hyphens.
+    """
+    return (
+        0 < len(label) <= MAX_LABEL_LENGTH
+        and label[:1] != syntax.hyphen
+        and label[-1:] != syntax.hyphen
+        and label.replace(syntax.hyphen, syntax.empty).isalnum()
+        and label.isascii()
+    )
+
+
+def _is_tld(label: Any) -> bool:
+    """Check whether ``label`` can end a domain name.
+
+    Args:
+        label (Union[str, bytes]): Last label of a candidate domain.
+
+    Returns:
+        bool: True for 2 to 63 ASCII letters.
+    """
+    return (
+        2 <= len(label) <= MAX_LABEL_LENGTH
+        and label.isalpha()
+        and label.isascii()
+    )
+
+
+def _is_ipv4(text: Any, syntax: _Syntax) -> bool:
+    """Check whether ``text`` is a dotted-quad IPv4 address.
+
+    Args:
+        text (Union[str, bytes]): Candidate address.
+        syntax (_Syntax): Syntax of ``text``.
+
+    Returns:
+        bool: True for four decimal octets of at most three digits each.
+    """
+    octets = text.split(syntax.dot)
+    return len(octets) == 4 and all(
+        0 < len(octet) <= 3 and octet.isdigit() and int(octet) <= 255
+        for octet in octets
+    )
+
+
+def _is_ipv6(text: Any) -> bool:
+    """Check whether ``text`` is an IPv6 address.
+
+    Args:
+        text (Union[str, bytes]): Candidate address made of host characters.
+
+    Returns:
+        bool: True if it parses as an IPv6 address.
+    """
+    if not isinstance(text, str):
+        text = text.decode("ascii")
+    ip = IPAddr.parse(text)
+    return ip is not None and ip.version == 6
+
+
+def host_kind(host: Union[str, bytes]) -> Optional[str]:
+    """Classify a complete host name or address.
+
+    Args:
+        host (Union[str, bytes]): Host text, e.g. the authority of a URL
+            without its port.
+
+    Returns:
+        Optional[str]: ``"ipv4"``, ``"ipv6"`` or ``"domain"``, or ``None``
+        if ``host`` is none of them.
+
+    Example:
+        >>> from valkyrie_tools.scanner import host_kind
+        >>> host_kind("10.0.0.1"), host_kind("::1"), host_kind(b"a.example")
+        ('ipv4', 'ipv6', 'domain')
+        >>> host_kind("localhost") is None
+        True
+    """
+    syntax = _syntax(host)
+    if syntax.colon in host:
+        return "ipv6" if _is_ipv6(host) else None
+    if _is_ipv4(host, syntax):
+        return "ipv4"
+    labels = host.split(syntax.dot)
+    if (
+        len(labels) > 1
+        and _is_tld(labels[-1])
+        and all(_is_label(label, syntax) for label in labels)
+    ):
+        return "domain"
+    return None
+
+
+def _scan_domains(
+    text: Any, syntax: _Syntax, start: int, end: int
+) -> Iterator[ScanMatch]:
+    """Find the longest valid domain names in a run of domain characters.
+
+    Args:
+        text (ScanText): Scanned text or buffer.
+        syntax (_Syntax): Syntax of ``text``.
+        start (int): Offset of the run.
+        end (int): Offset just past the run.
+
+    Yields:
+        ScanMatch: Domains, in order.
+    """
+    first = start  # Offset of the first label of the current name.
+    last = -1  # End of the longest valid name starting at ``first``.
+    labels = 0
+    pos = start
+    while pos <= end:
+        dot = text.find(syntax.dot, pos, end)
+        stop = end if dot < 0 else dot
+        label = text[pos:stop]
+        if _is_label(label, syntax):
+            labels += 1
+            if labels > 1 and _is_tld(label):
+                last = stop
+        else:
+            if last >= 0:
+                yield ScanMatch("domain", first, last)
+            first, last, labels = stop + 1, -1, 0
+        pos = stop + 1
+    if last >= 0:
+        yield ScanMatch("domain", first, last)
+
+
+def _scan_host_piece(
+    text: Any, syntax: _Syntax, start: int, end: int
+) -> Iterator[ScanMatch]:
+    """Find an IPv4 address or domain names in a colon-free run.
+
+    Args:
+        text (ScanText): Scanned text or buffer.
+        syntax (_Syntax): Syntax of ``text``.
+        start (int): Offset of the run.
+        end (int): Offset just past the run.
+
+    Yields:
+        ScanMatch: IPv4 addresses and domains, in order.
+    """
+    while start < end and text[start] in EDGE_CHARS:
+        start += 1
+    while end > start and text[end - 1] in EDGE_CHARS:
+        end -= 1
+    if start == end:
+        return
+    piece = text[start:end]
+    if DIGITS_AND_DOTS.issuperset(piece):
+        if _is_ipv4(piece, syntax):
+            yield ScanMatch("ipv4", start, end)
+        return
+    yield from _scan_domains(text, syntax, start, end)
+
+
+def _scan_hosts(
+    text: Any, syntax: _Syntax, start: int, end: int
+) -> Iterator[ScanMatch]:
+    """Find IP addresses and domains between ``start`` and ``end``.
+
+    Args:
+        text (ScanText): Scanned text or buffer.
+        syntax (_Syntax): Syntax of ``text``.
+        start (int): Offset of the region.
+        end (int): Offset just past the region.
+
+    Yields:
+        ScanMatch: IPv6 and IPv4 addresses and domains, in order.
+    """
+    for run in syntax.host_run.finditer(text, start, end):
+        run_start, run_end = run.span()
+        if syntax.colon in run.group():
+            # Trailing punctuation such as "addr 2001:db8::1." is dropped.
+            stripped_end = run_end
+            while text[stripped_end - 1] in EDGE_CHARS:
+                stripped_end -= 1
+            candidate = text[run_start:stripped_end]
+            if candidate.count(syntax.colon) > 1 and _is_ipv6(candidate):
+                if candidate.rfind(syntax.dot) < 0:
+                    yield ScanMatch("ipv6", run_start, stripped_end)
+                else:
+                    colon = candidate.rfind(syntax.colon)
+                    yield ScanMatch(
+                        "ipv6",
+                        run_start,
+                        stripped_end,
+                        "ipv4",
+                        run_start + colon + 1,
+                        stripped_end,
+                    )
+                continue
+
+        # Not an IPv6 address: "host:port", "12:30:45" and the like.
+        pos = run_start
+        while pos < run_end:
+            colon = text.find(syntax.colon, pos, run_end)
+            stop = run_end if colon < 0 else colon
+            yield from _scan_host_piece(text, syntax, pos, stop)
+            pos = stop + 1
+
+
+def _scan_plain(
+    text: Any, syntax: _Syntax, start: int, end: int
+) -> Iterator[ScanMatch]:
+    """Find e-mail addresses, IP addresses and domains outside URLs.
+
+    Args:
+        text (ScanText): Scanned text or buffer.
+        syntax (_Syntax): Syntax of ``text``.
+        start (int): Offset of the region.
+        end (int): Offset just past the region.
+
+    Yields:
+        ScanMatch: Indicators, in order.
+    """
+    cursor = start
+    at = text.find(syntax.at, start, end)
+    while at >= 0:
+        local = at
+        while local > cursor and text[local - 1] in LOCAL_PART_CHARS:
+            local -= 1
+        while local < at and text[local] in DOTS:
+            local += 1
+        domain_end = at + 1
+        while domain_end < end and text[domain_end] in DOMAIN_CHARS:
+            domain_end += 1
+        domains = _scan_domains(text, syntax, at + 1, domain_end)
+        domain = next(domains, None)
+        if local < at and domain is not None and domain.start == at + 1:
+            yield from _scan_hosts(text, syntax, cursor, local)
+            yield ScanMatch(
+                "email", local, domain.end, "domain", domain.start, domain.end
+            )
+            cursor = domain.end
+        at = text.find(syntax.at, max(at + 1, cursor), end)
+    yield from _scan_hosts(text, syntax, cursor, end)
+
+
+def _scan_url(
+    text: Any, syntax: _Syntax, start: int, sep: int, end: int
+) -> Optional[ScanMatch]:
+    """Validate the URL whose ``://`` separator is at ``sep``.
+
+    Args:
+        text (ScanText): Scanned text or buffer.
+        syntax (_Syntax): Syntax of ``text``.
+        start (int): Offset of the scheme.
+        sep (int): Offset of ``://``.
+        end (int): End of the token holding the URL.
+
+    Returns:
+        Optional[ScanMatch]: The URL, or ``None`` if its host is invalid.
+    """
+    authority = sep + 3
+    found = syntax.authority_end.search(text, authority, end)
+    authority_end = end if found is None else found.start()
+    host_start = text.rfind(syntax.at, authority, authority_end) + 1
+    host_start = host_start or authority
+    host_end = authority_end
+    colon = text.rfind(syntax.colon, host_start, authority_end)
+    if colon >= 0 and text.find(syntax.colon, host_start, colon) < 0:
+        # A single colon separates the port; more colons make an IPv6 host.
+        if not text[colon + 1 : authority_end].isdigit():
+            return None
+        host_end = colon
+    kind = host_kind(text[host_start:host_end])
+    if kind is None:
+        return None
+    found = syntax.uri_end.search(text, authority_end, end)
+    uri_end = end if found is None else found.start()
+    return ScanMatch("url", start, uri_end, kind, host_start, host_end)
+
+
+def _scan_token(
+    text: Any, syntax: _Syntax, start: int, end: int
+) -> Iterator[ScanMatch]:
+    """Find the indicators in one token.
+
+    Args:
+        text (ScanText): Scanned text or buffer.
+        syntax (_Syntax): Syntax of ``text``.
+        start (int): Offset of the token.
+        end (int): Offset just past the token.
+
+    Yields:
+        ScanMatch: Indicators, in order.
+    """
+    cursor = start
+    sep = text.find(syntax.sep, start, end)
+    while sep >= 0:
+        scheme = sep
+        while scheme > cursor and text[scheme - 1] in SCHEME_CHARS:
+            scheme -= 1
+        url = None
+        if scheme < sep:
+            url = _scan_url(text, syntax, scheme, sep, end)
+        if url is not None:
+            yield from _scan_plain(text, syntax, cursor, scheme)
+            yield url
+            cursor = url.end
+        sep = text.find(syntax.sep, max(sep + 3, cursor), end)
+    yield from _scan_plain(text, syntax, cursor, end)
+
+
+def scan(
+    text: ScanText, start: int = 0, end: Optional[int] = None
+) -> List[ScanMatch]:
+    """Find every indicator in ``text`` in linear time.
+
+    Overlaps are resolved while scanning: a URL holds its host, an e-mail
+    address its domain and an IPv6 address its IPv4 suffix, and the
+    embedded host is reported through ``host_kind``, ``host_start`` and
+    ``host_end`` rather than as a separate match.  A URL ends at the first
+    whitespace, quote, bracket, comma, semicolon, ``?`` or ``#``.
+
+    ``text`` may also be ``bytes`` or a :class:`mmap.mmap`, in which case
+    it is scanned in place with ``bytes`` patterns and the offsets are byte
+    offsets; only the matched spans need decoding.  ``start`` and ``end``
+    restrict the scan to a window without copying it.
+
+    Args:
+        text (ScanText): Text or buffer to scan.
+        start (int): Offset where scanning starts.  Defaults to 0.
+        end (Optional[int]): Offset where scanning stops.  Defaults to the
+            end of ``text``.
+
+    Returns:
+        List[ScanMatch]: Matches in order of appearance.
+
+    Example:
+        >>> from valkyrie_tools.scanner import scan
+        >>> text = 'a "https://x.example/p?q=1" b@c.example'
+        >>> [(m.kind, text[m.start : m.end]) for m in scan(text)]
+        [('url', 'https://x.example/p'), ('email', 'b@c.example')]
+        >>> [(m.kind, m.start) for m in scan(b"mail b@c.example", 4)]
+        [('email', 5)]
+    """
+    syntax = _syntax(text)
+    if end is None:
+        end = len(text)
+    found: List[ScanMatch] = []
+    if all(text.find(anchor, start, end) < 0 for anchor in syntax.anchors):
+        return found
+    for token in syntax.token.finditer(text, start, end):
+        found.extend(_scan_token(text, syntax, *token.span()))
+    return found
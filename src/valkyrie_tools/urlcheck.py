@@ -2,17 +2,20 @@
 
 import re
 import sys
-from typing import Any, Dict, List, Tuple, Union, cast
+from typing import Any, Dict, List, Optional, Tuple, Union, cast
 
 import click
 import requests
 from requests import Response
 
 from .commons import (
+    MappedChunk,
     common_options,
-    emit_json,
-    extract_urls,
-    parse_input_methods,
+    emit_json_stream,
+    extract_indicators,
+    iter_extract,
+    iter_input_lines,
+    peek_iter,
 )
 from .constants import (  # URL_REGEX,
     DEFAULT_CATEGORIZED_HEADERS,
@@ -45,6 +48,18 @@ OUTPUT_FILE = None
 """  # pragma: no cover
 
 
+def _extract_urls(line: Union[str, MappedChunk]) -> List[str]:
+    """Extract the URLs of one input line.
+
+    Args:
+        line (Union[str, MappedChunk]): Input line or file window.
+
+    Returns:
+        List[str]: URLs in order of appearance.
+    """
+    return [found.value for found in extract_indicators(line, ["url"])]
+
+
 def json_extractor_urlcheck(data: List[Any]) -> Tuple[str, ...]:
     """Extract target URLs from upstream valkyrie-tools JSON.
 
@@ -96,6 +111,58 @@ def _get_error_message(response: Exception) -> str:
     return str(response)
 
 
+def _build_url_json_entry(url: str, show_headers: bool) -> Dict[str, Any]:
+    """Follow the redirect chain of ``url`` and describe each hop.
+
+    Args:
+        url (str): URL to check.
+        show_headers (bool): When ``True``, includes all response headers
+            instead of only the curated CDN/proxy subset.
+
+    Returns:
+        Dict[str, Any]: Dict with an ``"input"`` key and a ``"chain"`` list
+        of hop dicts; error hops carry an ``"error"`` key instead of the
+        status and header fields.
+    """
+    chain_results: List[Any] = list(
+        build_redirect_chain("GET", url, 30, {}, None, True)
+    )
+    chain: List[Dict[str, Any]] = []
+    for hop_url, response in chain_results:
+        hop_url = cast(str, hop_url)
+        response = cast(Union[Response, Exception, None], response)
+        if isinstance(response, Exception):
+            chain.append(
+                {"url": hop_url, "error": _get_error_message(response)}
+            )
+        elif isinstance(response, Response):
+            http_version = get_http_version_text(response.raw.version)
+            resp_headers = cast(Dict[str, str], dict(response.headers))
+            if show_headers:
+                resp_headers = filter_headers(resp_headers, [])
+            else:
+                resp_headers = filter_headers(
+                    resp_headers,
+                    [
+                        v
+                        for vv in (DEFAULT_CATEGORIZED_HEADERS.values())
+                        for v in vv
+                    ],
+                )
+            chain.append(
+                {
+                    "url": hop_url,
+                    "http_version": http_version,
+                    "status_code": response.status_code,
+                    "reason": response.reason,
+                    "headers": resp_headers,
+                }
+            )
+        else:
+            chain.append({"url": hop_url})
+    return {"input": url, "chain": chain}
+
+
 @common_options(
     cmd_type=click.command,
     name="urlcheck",
@@ -124,6 +191,10 @@ def cli(  # noqa: C901
     values: Tuple[str, ...],
     interactive: bool,
     output_json: bool,
+    output_jsonl: bool,
+    jobs: int,
+    exclude: Tuple[str, ...],
+    max_file_size: Optional[int],
     no_truncate: bool,
     show_headers: bool,
 ) -> None:
@@ -152,81 +223,53 @@ def cli(  # noqa: C901
             interactive mode.
         output_json (bool): When ``True``, emits results as a JSON array
             instead of human-readable text.
+        output_jsonl (bool): When ``True``, emits results as newline-delimited
+            JSON instead, one object per line.
+        jobs (int): Number of processes extracting indicators from the
+            input.
+        exclude (Tuple[str, ...]): Patterns of files and directories to skip
+            in input directories and globs.
+        max_file_size (Optional[int]): Size limit in bytes for files in
+            input directories and globs.
         no_truncate (bool): When ``True``, disables truncation of long
             header values.
         show_headers (bool): When ``True``, displays all response headers
             instead of only the curated CDN/proxy subset.
     """
-    args = parse_input_methods(
-        values,
-        interactive,
-        ctx,
-        output_json=output_json,
-        json_extractor=json_extractor_urlcheck,
+    lines = peek_iter(
+        iter_input_lines(
+            values,
+            interactive,
+            ctx,
+            output_json=output_json,
+            json_extractor=json_extractor_urlcheck,
+            exclude=exclude,
+            max_file_size=max_file_size,
+        )
     )
 
-    if len(args) == 0:
+    if lines is None:
         if output_json:
-            emit_json([])
+            emit_json_stream([], jsonl=output_jsonl)
             sys.exit(0)
         click.echo("Error: %s" % NO_ARGS_TEXT, err=True)
         click.echo(HELP_SHORT_TEXT.format(name=ctx.command.name), err=True)
         sys.exit(1)
 
-    urls = []
-    for arg in args:
-        for url in extract_urls(arg):
-            if url not in urls:
-                urls.append(url)
+    urls = iter_extract(lines, _extract_urls, jobs=jobs)
 
     if output_json:
-        json_results: List[Dict[str, Any]] = []
-        for url in urls:
-            chain_results: List[Any] = list(
-                build_redirect_chain("GET", url, 30, {}, None, True)
-            )
-            chain: List[Dict[str, Any]] = []
-            for hop_url, response in chain_results:
-                hop_url = cast(str, hop_url)
-                response = cast(Union[Response, Exception, None], response)
-                if isinstance(response, Exception):
-                    chain.append(
-                        {
-                            "url": hop_url,
-                            "error": _get_error_message(response),
-                        }
-                    )
-                elif isinstance(response, Response):
-                    http_version = get_http_version_text(response.raw.version)
-                    resp_headers = cast(Dict[str, str], dict(response.headers))
-                    if show_headers:
-                        resp_headers = filter_headers(resp_headers, [])
-                    else:
-                        resp_headers = filter_headers(
-                            resp_headers,
-                            [
-                                v
-                                for vv in (DEFAULT_CATEGORIZED_HEADERS.values())
-                                for v in vv
-                            ],
-                        )
-                    chain.append(
-                        {
-                            "url": hop_url,
-                            "http_version": http_version,
-                            "status_code": response.status_code,
-                            "reason": response.reason,
-                            "headers": resp_headers,
-                        }
-                    )
-                else:
-                    chain.append({"url": hop_url})
-            json_results.append({"input": url, "chain": chain})
-        emit_json(json_results)
+        emit_json_stream(
+            (_build_url_json_entry(url, show_headers) for url in urls),
+            jsonl=output_jsonl,
+        )
         return
 
-    for u in range(len(urls)):
-        url = urls[u]
+    for u, url in enumerate(urls):
+        # Add a newline between URLs, but not after the last one
+        if u > 0:
+            click.echo("")
+
         results = build_redirect_chain("GET", url, 30, {}, None, True)
 
         for r in range(len(results)):
@@ -320,10 +363,6 @@ def cli(  # noqa: C901
 
                     click.echo(val)
 
-        # Add a newline between URLs, but not after the last one
-        if u < len(urls) - 1:
-            click.echo("")
-
 
 if __name__ == "__main__":  # pragma: no cover
     cli()
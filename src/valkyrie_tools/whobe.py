@@ -1,21 +1,48 @@
 """Whobe command-line script."""
 
 import sys
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+from collections import deque
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import click
 
 from .commons import (
     common_options,
-    emit_json,
-    extract_domains,
-    extract_ip_addrs,
-    parse_input_methods,
+    emit_json_stream,
+    extract_hosts,
+    iter_extract,
+    iter_input_lines,
+    peek_iter,
 )
 from .constants import HELP_SHORT_TEXT, NO_ARGS_TEXT
-from .ipaddr import get_net_size, is_valid_ip_addr
-from .whois import get_ip_whois, get_whois
+from .ipaddr import IPAddr, get_net_size
+from .publicsuffix import registered_domain
+from .rdap import get_domain_rdap, get_ip_rdap
+from .whois import (
+    DEFAULT_RETRY_POLICY,
+    DEFAULT_SERVER_CONCURRENCY,
+    SINGLE_ATTEMPT,
+    WhoisScheduler,
+    get_bulk_asn,
+    get_ip_whois,
+    get_whois,
+    whois_client,
+)
 
+BACKENDS = ("whois", "native", "rdap")
+"""Lookup backends selectable with ``--backend``."""
 NO_WHOIS_MSG = "No whois data"
 """Message printed to stderr when :func:`get_whois` returns
 ``None``.
@@ -289,18 +316,216 @@ def print_whois(whois: Optional[Dict[str, Any]]) -> None:  # pragma: no cover
             click.echo(f"     - {name_servers}")
 
 
+def _lookup_whois(
+    arg: Union[str, IPAddr],
+    backend: str = "whois",
+    fresh: bool = False,
+    bulk: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Any:
+    """Run the WHOIS lookup matching the type of ``arg``.
+
+    WHOIS queries make a single attempt; retries are scheduled by the
+    :class:`~valkyrie_tools.whois.WhoisScheduler` running the lookups.
+
+    Args:
+        arg (Union[str, IPAddr]): Parsed IP address or domain name.
+        backend (str): ``"whois"`` for port-43 WHOIS through
+            :mod:`whois`, ``"native"`` for port-43 WHOIS through the shared
+            :class:`~valkyrie_tools.whois.WhoisClient`, or ``"rdap"`` for
+            RDAP.  Defaults to ``"whois"``.
+        fresh (bool): Bypass the IP WHOIS netblock cache.  Defaults to
+            False.
+        bulk (Optional[Dict[str, Dict[str, Any]]]): Pre-fetched
+            :func:`get_bulk_asn` records answering IP addresses instead of
+            a lookup.  Defaults to None.
+
+    Returns:
+        Any: Result of :func:`get_ip_whois` or :func:`get_whois`, or of
+        their RDAP counterparts :func:`get_ip_rdap` and
+        :func:`get_domain_rdap`.
+    """
+    if bulk is not None and isinstance(arg, IPAddr):
+        return bulk.get(str(arg))
+    if backend == "rdap":
+        if isinstance(arg, IPAddr):
+            return get_ip_rdap(arg)
+        return get_domain_rdap(arg)
+    if isinstance(arg, IPAddr):
+        return get_ip_whois(arg, fresh=fresh, retry=SINGLE_ATTEMPT)
+    if backend == "native":
+        return get_whois(arg, retry=SINGLE_ATTEMPT, client=whois_client)
+    return get_whois(arg, retry=SINGLE_ATTEMPT)
+
+
+def _whois_query(arg: Union[str, IPAddr]) -> Union[str, IPAddr]:
+    """Return what to actually look up for ``arg``.
+
+    WHOIS records exist only for registrable domains, so subdomains are
+    looked up through their registrable domain (eTLD+1).
+
+    Args:
+        arg (Union[str, IPAddr]): Parsed IP address or domain name.
+
+    Returns:
+        Union[str, IPAddr]: ``arg`` itself for IP addresses and public
+        suffixes, otherwise its registrable domain.
+    """
+    if isinstance(arg, IPAddr):
+        return arg
+    return registered_domain(arg) or arg
+
+
+def _share_results(
+    args: Iterable[Union[str, IPAddr]],
+    run: Callable[
+        [Iterable[Union[str, IPAddr]]],
+        Iterator[Tuple[Union[str, IPAddr], Any]],
+    ],
+) -> Iterator[Tuple[Union[str, IPAddr], Any]]:
+    """Pair every input with the result of its shared lookup.
+
+    ``run`` receives the unique queries of ``args`` and pulls them as it
+    needs them (possibly from another thread).  Every input it pulls is
+    held until the result of its query is available; a run of repeats of
+    the same input is held as one entry with a count, so repeated inputs
+    behind a slow lookup do not accumulate.  Distinct inputs sharing a
+    query (such as the subdomains of one domain) are held individually.
+
+    Args:
+        args (Iterable[Union[str, IPAddr]]): Inputs in output order.
+        run (Callable[[Iterable[Union[str, IPAddr]]], Iterator[Tuple[Union[
+            str, IPAddr], Any]]]): Looks up the queries it is given,
+            yielding ``(query, result)`` pairs in the same order.
+
+    Yields:
+        Tuple[Union[str, IPAddr], Any]: ``(arg, result)`` pairs, streamed
+        as soon as the result of each input's query is available.
+    """
+    pending: Deque[List[Any]] = deque()
+    lock = threading.Lock()
+    done: Dict[Union[str, IPAddr], Any] = {}
+
+    def track(arg: Union[str, IPAddr]) -> List[Union[str, IPAddr]]:
+        """Hold ``arg`` for output and return its query.
+
+        Args:
+            arg (Union[str, IPAddr]): Input pulled by ``run``.
+
+        Returns:
+            List[Union[str, IPAddr]]: The query of ``arg``.
+        """
+        with lock:
+            if pending and pending[-1][0] == arg:
+                pending[-1][1] += 1
+            else:
+                pending.append([arg, 1])
+        return [_whois_query(arg)]
+
+    def ready(finished: bool) -> List[List[Any]]:
+        """Release the held inputs whose results are available.
+
+        Args:
+            finished (bool): Whether every lookup is done.
+
+        Returns:
+            List[List[Any]]: ``[arg, repeats]`` entries in input order.
+        """
+        released = []
+        with lock:
+            while pending and (finished or _whois_query(pending[0][0]) in done):
+                released.append(pending.popleft())
+        return released
+
+    def emit(finished: bool) -> Iterator[Tuple[Union[str, IPAddr], Any]]:
+        """Yield the released inputs with their results.
+
+        Args:
+            finished (bool): Whether every lookup is done.
+
+        Yields:
+            Tuple[Union[str, IPAddr], Any]: ``(arg, result)`` pairs.
+        """
+        for arg, repeats in ready(finished):
+            for _ in range(repeats):
+                yield arg, done[_whois_query(arg)]
+
+    for query, whois in run(iter_extract(args, track)):
+        done[query] = whois
+        yield from emit(False)
+    yield from emit(True)  # inputs read after the last new query
+
+
+def _whois_to_dict(arg: Union[str, IPAddr], whois: Any) -> Dict[str, Any]:
+    """Convert a WHOIS result to a JSON-serialisable dict.
+
+    Args:
+        arg (Union[str, IPAddr]): Parsed IP address or domain name.
+        whois (Any): Result returned by :func:`_lookup_whois`.
+
+    Returns:
+        Dict[str, Any]: Output of :func:`ip_whois_to_dict` or
+        :func:`domain_whois_to_dict`.
+    """
+    if isinstance(arg, IPAddr):
+        return ip_whois_to_dict(str(arg), whois)
+    return domain_whois_to_dict(arg, whois)
+
+
 @common_options(
     cmd_type=click.command,
     name="whobe",
     description="Check whois on domains and ip addresses.",
     version="0.1.0",
 )
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of WHOIS lookups to run concurrently.",
+)
+@click.option(
+    "--per-server",
+    type=click.IntRange(min=1),
+    default=DEFAULT_SERVER_CONCURRENCY,
+    show_default=True,
+    help="Maximum concurrent lookups against a single WHOIS server.",
+)
+@click.option(
+    "--backend",
+    type=click.Choice(BACKENDS),
+    default="whois",
+    show_default=True,
+    help="Query port-43 WHOIS, port-43 WHOIS with cached referrals, or RDAP.",
+)
+@click.option(
+    "--fresh",
+    is_flag=True,
+    default=False,
+    help="Query every IP address, ignoring cached netblock records.",
+)
+@click.option(
+    "--bulk-asn",
+    is_flag=True,
+    default=False,
+    help="Only map IP addresses to ASN, prefix and country, in one query.",
+)
 @click.pass_context
 def cli(
     ctx: click.Context,
     values: Tuple[str, ...],
     interactive: bool,
     output_json: bool,
+    output_jsonl: bool,
+    jobs: int,
+    exclude: Tuple[str, ...],
+    max_file_size: Optional[int],
+    workers: int,
+    per_server: int,
+    backend: str,
+    fresh: bool,
+    bulk_asn: bool,
 ) -> None:
     """Check whois on domains and ip addresses.
 
@@ -311,6 +536,28 @@ def cli(
     entry has ``"input"`` and ``"type"`` keys plus the relevant WHOIS fields,
     or an ``"error"`` key when no data is available.
 
+    With ``--workers`` greater than one, lookups run concurrently through a
+    :class:`~valkyrie_tools.whois.WhoisScheduler`, which caps the number of
+    in-flight queries per authoritative WHOIS server at ``--per-server``.
+    Output order always matches the input order.  Subdomains share the
+    single lookup of their registrable domain, e.g. ``www.example.com`` and
+    ``mail.example.com`` both report the record of ``example.com``.
+
+    IP addresses inside a netblock already returned by an earlier lookup
+    reuse that record (see :func:`~valkyrie_tools.whois.get_ip_whois`);
+    ``--fresh`` queries every address instead.
+
+    ``--bulk-asn`` skips the per-address WHOIS lookups and instead maps all
+    IP addresses to their ASN, announced prefix and country with one bulk
+    query (see :func:`~valkyrie_tools.whois.get_bulk_asn`); IP entries then
+    carry no network details.
+
+    ``--backend rdap`` queries RDAP servers instead, located through the
+    cached IANA bootstrap registries; results are printed the same way.
+    ``--backend native`` keeps port-43 WHOIS but remembers each TLD's
+    registry server and each domain's registrar server, so repeated lookups
+    skip the referral hops (see :class:`~valkyrie_tools.whois.WhoisClient`).
+
     Args:
         ctx (click.Context): Click context object (injected by
             :func:`click.pass_context`).
@@ -320,53 +567,80 @@ def cli(
             interactive mode.
         output_json (bool): When ``True``, emits results as a JSON array
             instead of human-readable text.
+        output_jsonl (bool): When ``True``, emits results as newline-delimited
+            JSON instead, one object per line.
+        jobs (int): Number of processes extracting indicators from the
+            input.
+        exclude (Tuple[str, ...]): Patterns of files and directories to skip
+            in input directories and globs.
+        max_file_size (Optional[int]): Size limit in bytes for files in
+            input directories and globs.
+        workers (int): Number of WHOIS lookups to run concurrently.
+        per_server (int): Maximum concurrent lookups per WHOIS server.
+        backend (str): Lookup backend, one of :data:`BACKENDS`.
+        fresh (bool): When ``True``, bypasses the IP WHOIS netblock cache.
+        bulk_asn (bool): When ``True``, resolves IP addresses with a single
+            bulk ASN query instead of full WHOIS lookups.
     """
-    values = parse_input_methods(
-        values,
-        interactive,
-        ctx,
-        output_json=output_json,
-        json_extractor=json_extractor_whobe,
+    lines = peek_iter(
+        iter_input_lines(
+            values,
+            interactive,
+            ctx,
+            output_json=output_json,
+            json_extractor=json_extractor_whobe,
+            exclude=exclude,
+            max_file_size=max_file_size,
+        )
     )
-    if len(values) == 0:
+    if lines is None:
         if output_json:
-            emit_json([])
+            emit_json_stream([], jsonl=output_jsonl)
             sys.exit(0)
         click.echo("Error: %s" % NO_ARGS_TEXT, err=True)
         click.echo(HELP_SHORT_TEXT.format(name=ctx.command.name), err=True)
         sys.exit(1)
 
-    ip_addrs = extract_ip_addrs("\n".join(values), unique=True)
-    domains = extract_domains("\n".join(values), unique=True)
-    args = ip_addrs + domains
+    args: Iterable[Union[str, IPAddr]] = iter_extract(
+        lines, extract_hosts, jobs=jobs
+    )
+
+    scheduler: WhoisScheduler[Union[str, IPAddr], Any] = WhoisScheduler(
+        workers=workers, per_server=per_server, retry=DEFAULT_RETRY_POLICY
+    )
+    bulk: Optional[Dict[str, Dict[str, Any]]] = None
+    if bulk_asn:
+        args = list(args)
+        try:
+            bulk = get_bulk_asn(arg for arg in args if isinstance(arg, IPAddr))
+        except OSError as exc:
+            click.echo(f"Error: bulk ASN lookup failed: {exc}", err=True)
+            bulk = {}
+    results = _share_results(
+        args,
+        lambda queries: scheduler.run(
+            lambda query: _lookup_whois(query, backend, fresh, bulk), queries
+        ),
+    )
 
     if output_json:
-        json_results: List[Dict[str, Any]] = []
-        for arg in args:
-            if is_valid_ip_addr(arg):
-                whois: Any = get_ip_whois(arg)
-                json_results.append(ip_whois_to_dict(arg, whois))
-            else:
-                domain_whois: Any = get_whois(arg)
-                json_results.append(domain_whois_to_dict(arg, domain_whois))
-        emit_json(json_results)
+        emit_json_stream(
+            (_whois_to_dict(arg, whois) for arg, whois in results),
+            jsonl=output_jsonl,
+        )
         return
 
-    for a in range(len(args)):
-        arg = args[a]
-        click.echo(f"> {arg}".format(arg))
+    for a, (arg, whois) in enumerate(results):
+        # Print separating newline
+        if a > 0:
+            click.echo()
 
-        if is_valid_ip_addr(arg):
-            whois = get_ip_whois(arg)
+        click.echo(f"> {arg}")
+        if isinstance(arg, IPAddr):
             print_ip_whois(whois)
         else:
-            whois = get_whois(arg)
             print_whois(whois)
 
-        # Print trailing newline
-        if a < len(args) - 1:
-            click.echo()
-
 
 if __name__ == "__main__":  # pragma: no cover
     cli()
@@ -1,41 +1,423 @@
-"""Whois utility functions."""
+"""Whois utility functions.
 
-from time import sleep
-from typing import Any, Dict, Optional, Union
+Besides the single-target lookups (:func:`get_whois`, :func:`get_ip_whois`),
+provides :class:`WhoisScheduler`, which runs many lookups concurrently while
+limiting the concurrency and query rate against each authoritative WHOIS
+server (see :func:`whois_server_key`).
+"""
+
+import random
+import re
+import socket
+import threading
+from collections import deque
+from queue import Empty, Queue
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from heapq import heappop, heappush
+from time import monotonic, sleep
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import ipwhois  # type: ignore[import-untyped]
 import whois  # type: ignore[import-untyped]
 from ipwhois import IPWhois
 
+from .ipaddr import IPAddr, PrefixIndex, parse_network, to_ip_addr
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
 __all__ = [
     "get_whois",
     "get_ip_whois",
+    "RetryPolicy",
+    "TransientWhoisError",
+    "whois_server_key",
+    "WhoisScheduler",
+    "ip_whois_cache",
+    "get_bulk_asn",
+    "WhoisRecord",
+    "WhoisTemplate",
+    "get_whois_template",
+    "parse_whois_text",
+    "WhoisClient",
+    "WhoisHop",
+    "WhoisResponse",
+    "whois_client",
 ]
 
 WHOIS_MAX_RETRIES = 3
-"""Maximum number of WHOIS query attempts in :func:`get_whois`.
+"""Maximum number of WHOIS query attempts made by the default
+:class:`RetryPolicy`.
+"""
+WHOIS_RETRY_BASE_DELAY = 0.5
+"""Base delay in seconds of the default :class:`RetryPolicy` back-off."""
+WHOIS_RETRY_MAX_DELAY = 8.0
+"""Upper bound in seconds for a single :class:`RetryPolicy` back-off."""
+WHOIS_RETRY_DEADLINE = 30.0
+"""Seconds after the first attempt past which no retry is started."""
+TRANSIENT_WHOIS_MARKERS = (
+    "socket not responding",
+    "limit exceeded",
+    "rate limit",
+    "too many requests",
+    "try again later",
+    "quota exceeded",
+    "temporarily unavailable",
+)
+"""Lowercase phrases marking a WHOIS response as a transient failure."""
+IP_WHOIS_CACHE_TTL = 86400
+"""Seconds an IP WHOIS record stays in :data:`ip_whois_cache`."""
+DEFAULT_SERVER_CONCURRENCY = 2
+"""Default maximum number of in-flight queries per WHOIS server in
+:class:`WhoisScheduler`.
+"""
+DEFAULT_SERVER_INTERVAL = 0.5
+"""Default minimum number of seconds between the start of two queries to the
+same WHOIS server in :class:`WhoisScheduler`.
+"""
+SCHEDULER_READ_AHEAD = 4
+"""Number of targets per worker that :class:`WhoisScheduler` reads ahead of
+the results it has yielded.
+"""
+BULK_ASN_SERVER = "whois.cymru.com"
+"""Default server for :func:`get_bulk_asn` (Team Cymru IP to ASN mapping)."""
+BULK_ASN_PORT = 43
+"""Default TCP port for :func:`get_bulk_asn`."""
+BULK_ASN_TIMEOUT = 60.0
+"""Default socket timeout in seconds for :func:`get_bulk_asn`."""
+
+IANA_WHOIS_SERVER = "whois.iana.org"
+"""WHOIS server answering which registry serves a top-level domain."""
+WHOIS_PORT = 43
+"""TCP port of WHOIS servers."""
+WHOIS_TIMEOUT = 10.0
+"""Default socket timeout in seconds for :class:`WhoisClient` queries."""
+WHOIS_REFERRAL_TTL = 86400
+"""Seconds :class:`WhoisClient` reuses a domain's registrar server."""
+WHOIS_QUERY_FORMATS = {
+    "whois.denic.de": "-T dn,ace -C UTF-8 %s",
+    "whois.dk-hostmaster.dk": "--show-handles %s",
+}
+"""Query templates of WHOIS servers that need more than the bare name."""
+WHOIS_REFERRAL_PATTERN = re.compile(
+    r"^\s*(?:registrar whois server|whois server|whois|refer|referralserver)"
+    r":[ \t]*(\S+)",
+    re.IGNORECASE | re.MULTILINE,
+)
+"""Matches the line of a WHOIS response naming the next server to ask."""
+IANA_TLD_PATTERN = re.compile(r"^domain:[ \t]*\S", re.IGNORECASE | re.MULTILINE)
+"""Matches the ``domain:`` line of an IANA answer describing a TLD."""
 
-On each attempt the result is checked for the queried domain name; if the
-check fails the function sleeps ``0.25 * attempt`` seconds before retrying.
+IPV4_RIR_BLOCKS = {
+    "afrinic": "41 102 105 154 196-197",
+    "apnic": "1 14 27 36 39 42-43 49 58-61 101 103 106 110-126 133 150 153 "
+    "163 171 175 180 182-183 202-203 210-211 218-223",
+    "lacnic": "177 179 181 186-187 189-191 200-201",
+    "ripencc": "2 5 25 31 37 46 51 53 57 62 77-95 109 141 145 151 176 178 "
+    "185 188 193-195 212-213 217",
+}
+"""First octets of the IPv4 ``/8`` blocks whose WHOIS service IANA delegates
+to each RIR other than ARIN, which serves every other block.
 """
+IPV6_RIR_BLOCKS = {
+    "afrinic": ("2001:4200::/23", "2c00::/12"),
+    "apnic": ("2001:200::/23", "2001:c00::/23", "2001:e00::/23", "2400::/12"),
+    "arin": (
+        "2001:400::/23",
+        "2001:1800::/23",
+        "2001:4800::/23",
+        "2600::/12",
+        "2610::/23",
+        "2620::/23",
+        "2630::/12",
+    ),
+    "lacnic": ("2001:1200::/23", "2800::/12"),
+    "ripencc": (
+        "2001:600::/23",
+        "2001:800::/22",
+        "2001:1400::/22",
+        "2003::/18",
+        "2a00::/12",
+        "2a10::/12",
+    ),
+}
+"""IPv6 blocks IANA allocated to each RIR, whose WHOIS server answers them."""
 
+ip_whois_cache = PrefixIndex(ttl=IP_WHOIS_CACHE_TTL)
+"""IP WHOIS records cached by :func:`get_ip_whois`, keyed by netblock."""
 
-def get_whois(
+
+class TransientWhoisError(Exception):
+    """A WHOIS query failed in a way that may succeed when repeated.
+
+    Attributes:
+        result (Any): Value to return if no further attempt is made.
+        retry_after (Optional[float]): Delay requested by the server, if
+            any.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        result: Any = None,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        """Initialize the TransientWhoisError object.
+
+        Args:
+            message (str): Description of the failure.
+            result (Any): Value to return if no further attempt is made.
+                Defaults to None.
+            retry_after (Optional[float]): Delay requested by the server.
+                Defaults to None.
+        """
+        super().__init__(message, result, retry_after)
+        self.result = result
+        self.retry_after = retry_after
+
+    def __str__(self) -> str:
+        """Return the failure description."""
+        return str(self.args[0])
+
+
+class RetryPolicy:
+    """When and how often to repeat a failed WHOIS query.
+
+    Only :class:`TransientWhoisError` (timeouts, connection errors, rate
+    limiting, empty answers) triggers a retry; any other outcome, including
+    "no match" answers, is definitive.  Retries wait a random "full jitter"
+    delay between zero and ``base_delay * 2 ** (attempt - 1)`` seconds
+    (capped at ``max_delay``) so that concurrent clients do not retry in
+    lock-step, and no retry starts once ``deadline`` seconds have passed
+    since the first attempt.
+
+    :meth:`call` sleeps between attempts in the calling thread.
+    :class:`WhoisScheduler` instead re-queues the target with a start time,
+    so a waiting retry never occupies a worker thread.
+
+    Attributes:
+        max_attempts (int): Maximum number of attempts, including the first.
+        base_delay (float): Back-off base delay in seconds.
+        max_delay (float): Upper bound in seconds for a single delay.
+        deadline (Optional[float]): Seconds after the first attempt past
+            which no retry is started, or None for no limit.
+        reraise (bool): Whether to raise the last
+            :class:`TransientWhoisError` instead of returning its ``result``
+            once retries are exhausted.
+
+    Example:
+        >>> from valkyrie_tools.whois import RetryPolicy
+        >>> policy = RetryPolicy(max_attempts=4, base_delay=1, max_delay=3)
+        >>> 0 <= policy.backoff(3) <= 3
+        True
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = WHOIS_MAX_RETRIES,
+        base_delay: float = WHOIS_RETRY_BASE_DELAY,
+        max_delay: float = WHOIS_RETRY_MAX_DELAY,
+        deadline: Optional[float] = WHOIS_RETRY_DEADLINE,
+        reraise: bool = False,
+    ) -> None:
+        """Initialize the RetryPolicy object.
+
+        Args:
+            max_attempts (int): Maximum number of attempts, including the
+                first.  Defaults to :data:`WHOIS_MAX_RETRIES`.
+            base_delay (float): Back-off base delay in seconds.  Defaults
+                to :data:`WHOIS_RETRY_BASE_DELAY`.
+            max_delay (float): Upper bound in seconds for a single delay.
+                Defaults to :data:`WHOIS_RETRY_MAX_DELAY`.
+            deadline (Optional[float]): Seconds after the first attempt past
+                which no retry is started.  Defaults to
+                :data:`WHOIS_RETRY_DEADLINE`.
+            reraise (bool): Whether to raise the last transient error once
+                retries are exhausted.  Defaults to False.
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.reraise = reraise
+
+    def backoff(self, attempt: int) -> float:
+        """Return a jittered delay to wait after failed attempt ``attempt``.
+
+        Args:
+            attempt (int): Number of the attempt that failed, from 1.
+
+        Returns:
+            float: Delay in seconds.
+        """
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)  # noqa: S311
+
+    def next_delay(
+        self, attempt: int, started: float, error: TransientWhoisError
+    ) -> Optional[float]:
+        """Decide whether to retry after a transient failure.
+
+        Args:
+            attempt (int): Number of the attempt that failed, from 1.
+            started (float): :func:`time.monotonic` time of the first
+                attempt.
+            error (TransientWhoisError): The failure.
+
+        Returns:
+            Optional[float]: Seconds to wait before the next attempt, or
+            None to give up.
+        """
+        if attempt >= self.max_attempts:
+            return None
+        delay = error.retry_after
+        if delay is None:
+            delay = self.backoff(attempt)
+        if self.deadline is not None:
+            if monotonic() + delay - started > self.deadline:
+                return None
+        return delay
+
+    def give_up(self, error: TransientWhoisError) -> Any:
+        """Return the final outcome once no retry will be made.
+
+        Args:
+            error (TransientWhoisError): The last failure.
+
+        Returns:
+            Any: ``error.result``.
+
+        Raises:
+            TransientWhoisError: ``error`` itself, if :attr:`reraise` is set.
+        """
+        if self.reraise:
+            raise error
+        return error.result
+
+    def call(self, func: Callable[..., _R], *args: Any, **kwargs: Any) -> _R:
+        """Call ``func``, retrying transient failures in the calling thread.
+
+        Args:
+            func (Callable[..., _R]): Single-attempt query function raising
+                :class:`TransientWhoisError` on transient failures.
+            *args: Positional arguments for ``func``.
+            **kwargs: Keyword arguments for ``func``.
+
+        Returns:
+            _R: The first definitive result, or the outcome of
+            :meth:`give_up`.
+        """
+        started = monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return func(*args, **kwargs)
+            except TransientWhoisError as exc:
+                delay = self.next_delay(attempt, started, exc)
+                if delay is None:
+                    return self.give_up(exc)  # type: ignore[no-any-return]
+                sleep(delay)
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+"""Retry policy used by :func:`get_whois` and :func:`get_ip_whois`."""
+SINGLE_ATTEMPT = RetryPolicy(max_attempts=1, reraise=True)
+"""Policy making one attempt and raising :class:`TransientWhoisError` on a
+transient failure, for callers such as :class:`WhoisScheduler` that schedule
+retries themselves.
+"""
+
+
+def _is_transient_whois_text(text: Any) -> bool:
+    """Check whether a raw WHOIS response signals a transient failure.
+
+    Args:
+        text (Any): Raw response text.
+
+    Returns:
+        bool: True if the response is empty or contains one of
+        :data:`TRANSIENT_WHOIS_MARKERS`.
+    """
+    if not isinstance(text, str):
+        return False
+    head = text[:2048].lower()
+    if not head.strip():
+        return True
+    return any(marker in head for marker in TRANSIENT_WHOIS_MARKERS)
+
+
+def _whois_attempt(
     domain: str,
 ) -> Optional[Union[whois.parser.WhoisCom, whois.parser.WhoisEntry]]:
+    """Make a single domain WHOIS query.
+
+    Args:
+        domain (str): Domain name to look up.
+
+    Returns:
+        Optional[Union[whois.parser.WhoisCom, whois.parser.WhoisEntry]]:
+        Parsed record, or None if the registry has no record.
+
+    Raises:
+        TransientWhoisError: If the query failed transiently.
+    """
+    try:
+        w = whois.whois(domain)
+    except whois.parser.PywhoisError:
+        return None
+    except OSError as exc:
+        raise TransientWhoisError(str(exc)) from exc
+
+    if w is None:
+        raise TransientWhoisError("No WHOIS response for %s" % domain)
+    if _is_transient_whois_text(getattr(w, "text", None)):
+        raise TransientWhoisError("Transient WHOIS failure", result=w)
+    return w
+
+
+def get_whois(
+    domain: str,
+    retry: Optional[RetryPolicy] = None,
+    client: Optional["WhoisClient"] = None,
+) -> Optional[
+    Union[whois.parser.WhoisCom, whois.parser.WhoisEntry, "WhoisRecord"]
+]:
     """Get WHOIS information for a domain name.
 
-    Queries the WHOIS service for the given domain.  The lookup is retried up
-    to :data:`WHOIS_MAX_RETRIES` times with an exponential back-off of
-    ``0.25 * attempt`` seconds between retries, stopping early when the
-    returned record confirms the queried domain name.
+    Queries the WHOIS service for the given domain.  Timeouts, connection
+    errors, empty and rate-limited responses are retried according to
+    ``retry``; a parsed record or a "no match" answer is returned at once.
+
+    By default the query and parsing are done by :mod:`whois`.  With a
+    ``client`` the query goes through its cached referral chain and the
+    answer is parsed by :func:`parse_whois_text`.
 
     Args:
         domain (str): The fully-qualified domain name to look up
             (e.g. ``"example.com"``).
+        retry (Optional[RetryPolicy]): Retry policy.  Defaults to
+            :data:`DEFAULT_RETRY_POLICY`.
+        client (Optional[WhoisClient]): Client making the query, e.g.
+            :data:`whois_client`.  Defaults to None.
 
     Returns:
-        Optional[Union[whois.parser.WhoisCom, whois.parser.WhoisEntry]]:
+        Optional[Union[whois.parser.WhoisCom, whois.parser.WhoisEntry, WhoisRecord]]:
         A parsed WHOIS record on success, or ``None`` if the domain could not
         be resolved or the WHOIS service returned an error
         (:class:`whois.parser.PywhoisError` is caught silently).
@@ -46,42 +428,859 @@ def get_whois(
         >>> result is not None  # doctest: +SKIP
         True
     """
-    w = None
-    try:
-        attempts = 0
-        while attempts < WHOIS_MAX_RETRIES:
-            attempts += 1
-            w = whois.whois(domain)
+    policy = retry or DEFAULT_RETRY_POLICY
+    if client is not None:
+        return policy.call(_client_whois_attempt, domain, client)
+    return policy.call(_whois_attempt, domain)
+
 
-            if w is not None and domain in w.get("domain", []):
+WHOIS_FIELD_ALIASES: Dict[str, str] = {
+    "domain name": "domain_name",
+    "domain": "domain_name",
+    "registrar": "registrar",
+    "registrar name": "registrar",
+    "sponsoring registrar": "registrar",
+    "registrant": "name",
+    "registrant name": "name",
+    "registrant organization": "org",
+    "registrant organisation": "org",
+    "registrant street": "address",
+    "registrant address": "address",
+    "registrant's address": "address",
+    "registrant city": "city",
+    "registrant state/province": "state",
+    "registrant state": "state",
+    "registrant country": "country",
+    "registrant postal code": "registrant_postal_code",
+    "creation date": "creation_date",
+    "created": "creation_date",
+    "created on": "creation_date",
+    "registered on": "creation_date",
+    "registration time": "creation_date",
+    "registry expiry date": "expiration_date",
+    "registrar registration expiration date": "expiration_date",
+    "expiration date": "expiration_date",
+    "expiry date": "expiration_date",
+    "expires on": "expiration_date",
+    "paid-till": "expiration_date",
+    "updated date": "updated_date",
+    "last updated": "updated_date",
+    "last update": "updated_date",
+    "last modified": "updated_date",
+    "changed": "updated_date",
+    "name server": "name_servers",
+    "name servers": "name_servers",
+    "nameserver": "name_servers",
+    "nserver": "name_servers",
+    "domain status": "status",
+    "status": "status",
+    "registrar abuse contact email": "emails",
+    "registrant email": "emails",
+    "admin email": "emails",
+    "tech email": "emails",
+    "email": "emails",
+    "e-mail": "emails",
+}
+"""Normalised WHOIS field names mapped to the record fields consumed by
+:func:`~valkyrie_tools.whobe.domain_whois_to_dict`.
+"""
+WHOIS_LIST_FIELDS = ("emails", "name_servers", "status")
+"""Record fields that are always lists."""
+WHOIS_DATE_FIELDS = ("creation_date", "expiration_date", "updated_date")
+"""Record fields converted to :class:`~datetime.datetime` on first access."""
+WHOIS_DATE_FORMATS = (
+    "%d-%b-%Y",
+    "%d-%b-%Y %H:%M:%S",
+    "%Y.%m.%d",
+    "%Y.%m.%d %H:%M:%S",
+    "%Y/%m/%d",
+    "%Y/%m/%d %H:%M:%S",
+    "%d.%m.%Y",
+    "%b-%Y",
+    "%Y-%m-%dT%H:%M:%S%z",
+    "%Y-%m-%dT%H:%M:%S.%f%z",
+)
+"""Date formats tried after ISO 8601 when parsing WHOIS dates."""
+WHOIS_TIMEZONES = {"UTC": 0, "GMT": 0, "JST": 9}
+"""UTC offsets in hours of the time zone names found in WHOIS dates."""
+WHOIS_KEY_MAX_LENGTH = 48
+"""Longest text before a separator that is still treated as a field name."""
+
+
+def _parse_whois_date(value: str) -> Union[datetime, str]:
+    """Parse a WHOIS date, keeping the text if no known format matches.
+
+    Naive dates are taken to be UTC, as :mod:`whois` does.
+
+    Args:
+        value (str): Date text, e.g. ``"2023-08-14T07:01:31Z"`` or
+            ``"2001/02/03 01:05:03 (JST)"`` or ``"before Aug-1996"``.
+
+    Returns:
+        Union[datetime, str]: Time zone aware datetime, or ``value``.
+    """
+    text, _, zone = value.partition("(")
+    text = text.strip()
+    if text.lower().startswith("before "):
+        text = text[7:].strip()
+    offset = WHOIS_TIMEZONES.get(zone.rstrip(") ").upper(), 0)
+    try:
+        parsed = datetime.fromisoformat(
+            text[:-1] + "+00:00" if text.endswith("Z") else text
+        )
+    except ValueError:
+        for fmt in WHOIS_DATE_FORMATS:
+            try:
+                parsed = datetime.strptime(text, fmt)
                 break
+            except ValueError:
+                continue
+        else:
+            return value
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone(timedelta(hours=offset)))
+    return parsed
 
-            sleep(0.25 * attempts)
-    except whois.parser.PywhoisError:
-        w = None
 
-    return w
+class WhoisRecord(Dict[str, Any]):
+    """A domain WHOIS record produced by :class:`WhoisTemplate`.
+
+    Date fields hold their raw text until first read through ``[]``,
+    :meth:`get`, :meth:`items` or :meth:`values`, so records whose dates are
+    never used skip date parsing entirely.  A single distinct value is
+    returned as is, several as a list, like :class:`whois.parser.WhoisEntry`.
+
+    Attributes:
+        domain (Optional[str]): Queried domain name.
+        text (str): Raw WHOIS response.
+        hops (List[WhoisHop]): Queries made by the :class:`WhoisClient`
+            lookup that produced the record, if any.
+    """
 
+    def __init__(self, domain: Optional[str], text: str) -> None:
+        """Initialize the WhoisRecord object.
+
+        Args:
+            domain (Optional[str]): Queried domain name.
+            text (str): Raw WHOIS response.
+        """
+        super().__init__()
+        self.domain = domain
+        self.text = text
+        self.hops: List["WhoisHop"] = []
+        self._raw_dates: Dict[str, List[str]] = {}
+
+    def set_raw_date(self, field: str, values: List[str]) -> None:
+        """Store unparsed date text for ``field``.
+
+        Args:
+            field (str): One of :data:`WHOIS_DATE_FIELDS`.
+            values (List[str]): Distinct raw date values.
+        """
+        self._raw_dates[field] = values
+        super().__setitem__(field, values[0] if len(values) == 1 else values)
+
+    def _resolve(self, key: Any) -> None:
+        """Parse the raw dates of ``key`` if they are still pending.
+
+        Args:
+            key (Any): Field name.
+        """
+        raw = self._raw_dates.pop(key, None)
+        if raw is None:
+            return
+        dates: List[Union[datetime, str]] = []
+        for value in raw:
+            parsed = _parse_whois_date(value)
+            if parsed not in dates:
+                dates.append(parsed)
+        super().__setitem__(key, dates[0] if len(dates) == 1 else dates)
+
+    def __getitem__(self, key: Any) -> Any:
+        """Return a field, parsing pending dates first.
+
+        Args:
+            key (Any): Field name.
+
+        Returns:
+            Any: Field value.
+        """
+        self._resolve(key)
+        return super().__getitem__(key)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Return a field, or ``default`` if it is missing.
+
+        Args:
+            key (Any): Field name.
+            default (Any): Value returned for missing fields.
+
+        Returns:
+            Any: Field value or ``default``.
+        """
+        self._resolve(key)
+        return super().get(key, default)
+
+    def items(self) -> Any:
+        """Return the fields with all dates parsed.
+
+        Returns:
+            Any: Dict items view.
+        """
+        for key in list(self._raw_dates):
+            self._resolve(key)
+        return super().items()
+
+    def values(self) -> Any:
+        """Return the field values with all dates parsed.
+
+        Returns:
+            Any: Dict values view.
+        """
+        for key in list(self._raw_dates):
+            self._resolve(key)
+        return super().values()
+
+
+class WhoisTemplate:
+    r"""Field extraction rules for one registry's WHOIS response format.
+
+    A response is read line by line.  Each line is split once into a field
+    name and a value, the name is normalised (lowercase, single spaces) and
+    looked up in the alias table; lines of unknown fields are skipped
+    without further work.  A field name with an empty value opens a section
+    whose indented lines are values of that field, as in the Nominet
+    (``.uk``) format.
+
+    Attributes:
+        aliases (Dict[str, str]): Normalised field name to record field.
+        line_pattern (Optional[Pattern[str]]): Regex with ``(name, value)``
+            groups for formats that do not use ``name: value`` lines.
+        not_found (Tuple[str, ...]): Phrases marking a "no match" answer.
+
+    Example:
+        >>> from valkyrie_tools.whois import WhoisTemplate
+        >>> record = WhoisTemplate().parse(
+        ...     "Domain Name: EXAMPLE.COM\n"
+        ...     "Name Server: A.IANA-SERVERS.NET\n"
+        ...     "Creation Date: 1995-08-14T04:00:00Z\n"
+        ... )
+        >>> record["name_servers"]
+        ['A.IANA-SERVERS.NET']
+        >>> record["creation_date"].year
+        1995
+    """
+
+    def __init__(
+        self,
+        aliases: Optional[Dict[str, str]] = None,
+        line_pattern: Optional[str] = None,
+        not_found: Iterable[str] = ('No match for "',),
+    ) -> None:
+        """Initialize the WhoisTemplate object.
+
+        Args:
+            aliases (Optional[Dict[str, str]]): Aliases added to, or
+                overriding, :data:`WHOIS_FIELD_ALIASES`.  Defaults to None.
+            line_pattern (Optional[str]): Regex splitting a line into
+                ``(name, value)`` groups.  Defaults to splitting on the first
+                colon.
+            not_found (Iterable[str]): Phrases marking a "no match" answer.
+                Defaults to the Verisign-style ``No match for "``.
+        """
+        self.aliases = {**WHOIS_FIELD_ALIASES, **(aliases or {})}
+        self.line_pattern = re.compile(line_pattern) if line_pattern else None
+        self.not_found = tuple(not_found)
+
+    def split(self, line: str) -> Tuple[Optional[str], str]:
+        """Split a stripped line into a normalised field name and a value.
+
+        Args:
+            line (str): Line without surrounding whitespace.
+
+        Returns:
+            Tuple[Optional[str], str]: Field name, or None for a line that
+            is not a ``name: value`` pair, and the value (the whole line
+            when there is no field name).
+        """
+        if self.line_pattern is not None:
+            match = self.line_pattern.match(line)
+            if match is None:
+                return None, line
+            key, value = match.group(1, 2)
+        else:
+            key, sep, value = line.partition(":")
+            if not sep or len(key) > WHOIS_KEY_MAX_LENGTH:
+                return None, line
+        return " ".join(key.lower().split()), value.strip()
+
+    def collect(self, text: str) -> Dict[str, List[str]]:
+        """Collect the distinct raw values of each known field.
+
+        Args:
+            text (str): Raw WHOIS response.
+
+        Returns:
+            Dict[str, List[str]]: Record field to values, in order of
+            appearance and deduplicated case-insensitively.
+        """
+        values: Dict[str, List[str]] = {}
+        seen: Dict[str, Set[str]] = {}
+        section: Optional[str] = None
+        for line in text.splitlines():
+            line = line.strip()
+            if not line or line[0] in "%#>":
+                section = None
+                continue
+            key, value = self.split(line)
+            if key is None:
+                field = section
+            else:
+                field = self.aliases.get(key)
+                section = None if value else field
+            if field is None or not value:
+                continue
+            if field == "name_servers":
+                value = value.split()[0]
+            folded = value.lower()
+            if folded not in seen.setdefault(field, set()):
+                seen[field].add(folded)
+                values.setdefault(field, []).append(value)
+        return values
+
+    def parse(
+        self, text: str, domain: Optional[str] = None
+    ) -> Optional[WhoisRecord]:
+        """Parse a raw WHOIS response.
+
+        Args:
+            text (str): Raw WHOIS response.
+            domain (Optional[str]): Queried domain name.  Defaults to None.
+
+        Returns:
+            Optional[WhoisRecord]: Parsed record, or None for a "no match"
+            answer or a response without a domain name.
+        """
+        if any(marker in text for marker in self.not_found):
+            return None
+        values = self.collect(text)
+        if "domain_name" not in values:
+            return None
+
+        record = WhoisRecord(domain, text)
+        for field, found in values.items():
+            if field == "emails":
+                found = [v for v in found if "@" in v and " " not in v]
+            if field in WHOIS_DATE_FIELDS:
+                record.set_raw_date(field, found)
+            elif field in WHOIS_LIST_FIELDS:
+                record[field] = found
+            elif field == "registrar":
+                record[field] = found[-1]
+            else:
+                record[field] = found[0] if len(found) == 1 else found
+        return record
+
+
+DEFAULT_WHOIS_TEMPLATE = WhoisTemplate()
+"""Template for the ICANN gTLD format and other ``name: value`` formats."""
+WHOIS_TEMPLATES: Dict[str, WhoisTemplate] = {
+    "de": WhoisTemplate(not_found=("Status: free",)),
+    "jp": WhoisTemplate(
+        aliases={"registrant": "org", "organization": "org", "name": "name"},
+        line_pattern=r"(?:[a-z]\.\s*)?\[([^\]]+)\]\s*(.*)",
+        not_found=("No match!!",),
+    ),
+    "ru": WhoisTemplate(
+        aliases={"org": "org", "person": "name", "state": "status"},
+        not_found=("No entries found",),
+    ),
+}
+"""Registry-specific templates keyed by top-level domain."""
+WHOIS_TEMPLATES["su"] = WHOIS_TEMPLATES["ru"]
+
+
+def get_whois_template(domain: str) -> WhoisTemplate:
+    """Return the template matching the registry of ``domain``.
+
+    Args:
+        domain (str): Domain name.
+
+    Returns:
+        WhoisTemplate: Registry template, or :data:`DEFAULT_WHOIS_TEMPLATE`.
+    """
+    tld = domain.lower().rstrip(".").rpartition(".")[2]
+    return WHOIS_TEMPLATES.get(tld, DEFAULT_WHOIS_TEMPLATE)
+
+
+def parse_whois_text(text: str, domain: str) -> Optional[WhoisRecord]:
+    r"""Parse a raw domain WHOIS response with the registry's template.
+
+    A fast replacement for :meth:`whois.parser.WhoisEntry.load` that only
+    extracts the fields used by
+    :func:`~valkyrie_tools.whobe.domain_whois_to_dict`.
+
+    Args:
+        text (str): Raw WHOIS response.
+        domain (str): Queried domain name.
+
+    Returns:
+        Optional[WhoisRecord]: Parsed record, or None if the registry has no
+        record.
+
+    Example:
+        >>> from valkyrie_tools.whois import parse_whois_text
+        >>> record = parse_whois_text(
+        ...     "Domain name:\n    example.co.uk\n\n"
+        ...     "Registrant:\n    Example Ltd\n",
+        ...     "example.co.uk",
+        ... )
+        >>> record["name"]
+        'Example Ltd'
+        >>> parse_whois_text('No match for "NOPE.COM".', "nope.com") is None
+        True
+    """
+    return get_whois_template(domain).parse(text, domain)
+
+
+class WhoisHop:
+    """One query made by :class:`WhoisClient`.
+
+    Attributes:
+        server (str): WHOIS server queried.
+        query (str): Query sent.
+        seconds (float): Time from connecting to the end of the response.
+        cached (bool): Whether ``server`` was taken from the client's cache
+            rather than discovered during this lookup.
+    """
+
+    __slots__ = ("server", "query", "seconds", "cached")
+
+    def __init__(
+        self, server: str, query: str, seconds: float, cached: bool
+    ) -> None:
+        """Initialize the WhoisHop object.
+
+        Args:
+            server (str): WHOIS server queried.
+            query (str): Query sent.
+            seconds (float): Duration of the query.
+            cached (bool): Whether ``server`` came from the cache.
+        """
+        self.server = server
+        self.query = query
+        self.seconds = seconds
+        self.cached = cached
+
+    def __repr__(self) -> str:
+        """Return a debug representation of the hop.
+
+        Returns:
+            str: Representation showing the server and duration.
+        """
+        return "WhoisHop(%r, %.3fs%s)" % (
+            self.server,
+            self.seconds,
+            ", cached" if self.cached else "",
+        )
+
+
+class WhoisResponse:
+    """The result of a :meth:`WhoisClient.lookup`.
+
+    Attributes:
+        domain (str): Queried domain name.
+        text (str): Response text; the registry and registrar answers
+            concatenated when both were queried.
+        server (Optional[str]): Server that gave the last answer, or None
+            if no WHOIS server is known for the domain's TLD.
+        hops (List[WhoisHop]): Queries made, in order.
+    """
+
+    def __init__(self, domain: str) -> None:
+        """Initialize the WhoisResponse object.
+
+        Args:
+            domain (str): Queried domain name.
+        """
+        self.domain = domain
+        self.text = ""
+        self.server: Optional[str] = None
+        self.hops: List[WhoisHop] = []
+
+    @property
+    def elapsed(self) -> float:
+        """Total seconds spent in WHOIS queries.
+
+        Returns:
+            float: Sum of the hop durations.
+        """
+        return sum(hop.seconds for hop in self.hops)
+
+
+def _referral_host(text: str) -> Optional[str]:
+    """Find the WHOIS server a response refers the query to.
+
+    Args:
+        text (str): WHOIS response.
+
+    Returns:
+        Optional[str]: Host name of the referred server, or None.
+    """
+    match = WHOIS_REFERRAL_PATTERN.search(text)
+    if match is None:
+        return None
+    host = match.group(1).rpartition("://")[2].split("/")[0].split(":")[0]
+    return host.lower().rstrip(".") or None
+
+
+class WhoisClient:
+    """A port-43 WHOIS client that remembers where records live.
+
+    A domain lookup normally takes up to three hops: IANA for the TLD's
+    registry server, the registry, then the registrar server the registry
+    refers to.  The client caches the TLD to registry server map for its
+    lifetime and the registrar server of each domain for
+    ``referral_ttl`` seconds, so a repeated lookup connects straight to the
+    registrar.  If that direct query fails the cached entry is dropped and
+    the full chain is walked again.  Every lookup reports the time spent on
+    each hop.
+
+    Attributes:
+        root (str): Server answering TLD queries.
+        port (int): TCP port of all WHOIS servers.
+        timeout (float): Socket timeout in seconds.
+        referral_ttl (float): Seconds a registrar referral is reused.
+
+    Example:
+        >>> from valkyrie_tools.whois import WhoisClient
+        >>> client = WhoisClient()
+        >>> response = client.lookup("example.com")  # doctest: +SKIP
+        >>> [hop.server for hop in response.hops]  # doctest: +SKIP
+        ['whois.iana.org', 'whois.verisign-grs.com', 'whois.iana.org']
+        >>> response = client.lookup("example.com")  # doctest: +SKIP
+        >>> [hop.server for hop in response.hops]  # doctest: +SKIP
+        ['whois.iana.org']
+    """
 
-def get_ip_whois(ipaddr: str) -> Optional[Dict[str, Any]]:
+    def __init__(
+        self,
+        root: str = IANA_WHOIS_SERVER,
+        port: int = WHOIS_PORT,
+        timeout: float = WHOIS_TIMEOUT,
+        referral_ttl: float = WHOIS_REFERRAL_TTL,
+    ) -> None:
+        """Initialize the WhoisClient object.
+
+        Args:
+            root (str): Server answering TLD queries.  Defaults to
+                :data:`IANA_WHOIS_SERVER`.
+            port (int): TCP port of all WHOIS servers.  Defaults to
+                :data:`WHOIS_PORT`.
+            timeout (float): Socket timeout in seconds.  Defaults to
+                :data:`WHOIS_TIMEOUT`.
+            referral_ttl (float): Seconds a registrar referral is reused.
+                Defaults to :data:`WHOIS_REFERRAL_TTL`.
+        """
+        self.root = root
+        self.port = port
+        self.timeout = timeout
+        self.referral_ttl = referral_ttl
+        self._lock = threading.Lock()
+        self._tld_servers: Dict[str, str] = {}
+        self._referrals: Dict[str, Tuple[str, float]] = {}
+
+    def query(self, server: str, query: str) -> str:
+        """Send one query to a WHOIS server and read the whole answer.
+
+        Args:
+            server (str): WHOIS server host name.
+            query (str): Query text.
+
+        Returns:
+            str: Response text.
+        """
+        if server in WHOIS_QUERY_FORMATS:
+            query = WHOIS_QUERY_FORMATS[server] % query
+        elif server.endswith(".jp"):
+            query += "/e"
+        chunks = []
+        with socket.create_connection(
+            (server, self.port), timeout=self.timeout
+        ) as sock:
+            sock.sendall(query.encode("utf-8") + b"\r\n")
+            while True:
+                chunk = sock.recv(4096)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        return b"".join(chunks).decode("utf-8", "replace")
+
+    def _hop(
+        self, response: WhoisResponse, server: str, query: str, cached: bool
+    ) -> str:
+        """Run :meth:`query` and record it as a hop of ``response``.
+
+        Args:
+            response (WhoisResponse): Lookup being built.
+            server (str): WHOIS server host name.
+            query (str): Query text.
+            cached (bool): Whether ``server`` came from the cache.
+
+        Returns:
+            str: Response text.
+        """
+        started = monotonic()
+        text = self.query(server, query)
+        response.hops.append(
+            WhoisHop(server, query, monotonic() - started, cached)
+        )
+        response.server = server
+        return text
+
+    def registry_server(
+        self, tld: str, response: WhoisResponse
+    ) -> Optional[str]:
+        """Return the registry WHOIS server of ``tld``, asking IANA once.
+
+        Args:
+            tld (str): Lowercase top-level domain.
+            response (WhoisResponse): Lookup recording the IANA hop, if one
+                is made.
+
+        Only referrals are cached: an IANA record of a TLD without a WHOIS
+        server is asked again by later lookups, and any other answer (rate
+        limit text, a truncated reply) is treated as a transient failure.
+
+        Returns:
+            Optional[str]: Registry server, or None if the TLD has none.
+
+        Raises:
+            TransientWhoisError: If IANA answered with neither a referral
+                nor a record of the TLD.
+        """
+        with self._lock:
+            if tld in self._tld_servers:
+                return self._tld_servers[tld]
+        text = self._hop(response, self.root, tld, False)
+        server = _referral_host(text)
+        if server is None:
+            if IANA_TLD_PATTERN.search(text) is None:
+                raise TransientWhoisError("No registry referral from IANA")
+            return None
+        with self._lock:
+            self._tld_servers[tld] = server
+        return server
+
+    def referral_server(self, domain: str) -> Optional[str]:
+        """Return the cached registrar server of ``domain``, if still fresh.
+
+        Args:
+            domain (str): Lowercase domain name.
+
+        Returns:
+            Optional[str]: Registrar server, or None.
+        """
+        with self._lock:
+            cached = self._referrals.get(domain)
+            if cached is None:
+                return None
+            if monotonic() - cached[1] >= self.referral_ttl:
+                del self._referrals[domain]
+                return None
+            return cached[0]
+
+    def forget(self, domain: str) -> None:
+        """Drop the cached registrar server of ``domain``.
+
+        Args:
+            domain (str): Domain name.
+        """
+        with self._lock:
+            self._referrals.pop(domain.lower().rstrip("."), None)
+
+    def lookup(self, domain: str) -> WhoisResponse:
+        """Look up a domain, following registry to registrar referrals.
+
+        Args:
+            domain (str): Registrable domain name.
+
+        Returns:
+            WhoisResponse: Response text, answering server and hop timings.
+
+        Raises:
+            OSError: If the IANA or registry server cannot be queried.
+            TransientWhoisError: If IANA gave no usable answer (see
+                :meth:`registry_server`).
+        """
+        domain = domain.lower().rstrip(".")
+        response = WhoisResponse(domain)
+
+        referral = self.referral_server(domain)
+        if referral is not None:
+            try:
+                response.text = self._hop(response, referral, domain, True)
+                return response
+            except OSError:
+                self.forget(domain)
+
+        hops = len(response.hops)
+        registry = self.registry_server(domain.rpartition(".")[2], response)
+        if registry is None:
+            response.server = None
+            return response
+        cached = len(response.hops) == hops
+        response.text = self._hop(response, registry, domain, cached)
+
+        referral = _referral_host(response.text)
+        if referral is None or referral == registry:
+            return response
+        try:
+            text = self._hop(response, referral, domain, False)
+        except OSError:
+            response.server = registry
+            return response
+        with self._lock:
+            self._referrals[domain] = (referral, monotonic())
+        response.text += "\n" + text
+        return response
+
+
+whois_client = WhoisClient()
+"""Shared :class:`WhoisClient` used by ``whobe --backend native``."""
+
+
+def _client_whois_attempt(
+    domain: str, client: WhoisClient
+) -> Optional[WhoisRecord]:
+    """Make a single domain WHOIS query through a :class:`WhoisClient`.
+
+    Args:
+        domain (str): Domain name to look up.
+        client (WhoisClient): Client making the query.
+
+    Returns:
+        Optional[WhoisRecord]: Parsed record, with the lookup's hops in
+        :attr:`WhoisRecord.hops`, or None if the registry has no record.
+
+    Raises:
+        TransientWhoisError: If the query failed transiently.
+    """
+    try:
+        response = client.lookup(domain)
+    except OSError as exc:
+        raise TransientWhoisError(str(exc)) from exc
+
+    if response.server is None:
+        return None
+    if _is_transient_whois_text(response.text):
+        raise TransientWhoisError("Transient WHOIS failure")
+    record = parse_whois_text(response.text, domain)
+    if record is not None:
+        record.hops = response.hops
+    return record
+
+
+def _record_netblock(ip: IPAddr, record: Dict[str, Any]) -> Optional[str]:
+    """Find the netblock a WHOIS record is valid for.
+
+    The record lists every registered network containing ``ip`` (from the
+    RIR allocation down to the customer assignment) plus the announced BGP
+    prefix.  Other addresses share the whole record only inside the most
+    specific of these, so that is the block returned.
+
+    Args:
+        ip (IPAddr): Address the record was looked up for.
+        record (Dict[str, Any]): Result of ``IPWhois.lookup_whois()``.
+
+    Returns:
+        Optional[str]: Most specific CIDR containing ``ip``, or None if the
+        record names none.
+    """
+    cidrs = [record.get("asn_cidr")]
+    for net in record.get("nets", []) or []:
+        if isinstance(net, dict) and net.get("cidr"):
+            cidrs.extend(str(net["cidr"]).split(","))
+
+    best: Optional[str] = None
+    best_mask = -1
+    for cidr in cidrs:
+        network = parse_network(str(cidr).strip()) if cidr else None
+        if network is None or not ip.in_network(network):
+            continue
+        if network[2] > best_mask:
+            best, best_mask = str(cidr).strip(), network[2]
+    return best
+
+
+def _ip_whois_attempt(ipaddr: Union[str, IPAddr]) -> Optional[Dict[str, Any]]:
+    """Make a single IP WHOIS query.
+
+    Args:
+        ipaddr (Union[str, IPAddr]): IP address to look up.
+
+    Returns:
+        Optional[Dict[str, Any]]: ``IPWhois.lookup_whois()`` result, or None
+        if the address is invalid or reserved.
+
+    Raises:
+        TransientWhoisError: If the ASN or WHOIS query failed.
+    """
+    try:
+        ipw = IPWhois(str(ipaddr))
+        results: Dict[str, Any] = ipw.lookup_whois(
+            retry_count=0, asn_methods=["dns", "whois", "http"]
+        )
+        # results = ipw.lookup_rdap()
+    except (ValueError, ipwhois.exceptions.IPDefinedError):
+        return None
+    except (
+        ipwhois.exceptions.ASNRegistryError,
+        ipwhois.exceptions.WhoisLookupError,
+        ipwhois.exceptions.WhoisRateLimitError,
+        ipwhois.exceptions.HTTPLookupError,
+        ipwhois.exceptions.HTTPRateLimitError,
+        OSError,
+    ) as exc:
+        raise TransientWhoisError(str(exc)) from exc
+    return results
+
+
+def get_ip_whois(
+    ipaddr: Union[str, IPAddr],
+    fresh: bool = False,
+    retry: Optional[RetryPolicy] = None,
+) -> Optional[Dict[str, Any]]:
     """Get WHOIS information for an IP address.
 
     Performs a WHOIS lookup via :class:`ipwhois.IPWhois`, querying ASN data
     through DNS, WHOIS, and HTTP fallbacks in that order.
 
+    Successful results are kept in :data:`ip_whois_cache` for
+    :data:`IP_WHOIS_CACHE_TTL` seconds under the most specific netblock they
+    describe (see :func:`_record_netblock`).  Any later address inside that
+    block is answered from the cache without network traffic; only the
+    ``query`` field is adjusted to the new address.
+
     Args:
-        ipaddr (str): A valid public IPv4 or IPv6 address to look up.
+        ipaddr (Union[str, IPAddr]): A valid public IPv4 or IPv6 address to
+            look up.
             Private and reserved addresses (as defined by
             :data:`~valkyrie_tools.ipaddr.PRIVATE_IP_CIDR_RANGES`) will
             cause an :class:`ipwhois.exceptions.IPDefinedError` which is
             caught and returns ``None``.
+        fresh (bool): Bypass the cache and always query WHOIS; the fresh
+            result still replaces the cached one.  Defaults to False.
+        retry (Optional[RetryPolicy]): Policy for retrying failed ASN and
+            WHOIS queries.  Defaults to :data:`DEFAULT_RETRY_POLICY`.
 
     Returns:
         Optional[dict]: A dictionary containing ASN details, network ranges,
         and contact information as returned by
         ``IPWhois.lookup_whois()``, or ``None`` if ``ipaddr`` is invalid
-        (:class:`ValueError`) or is a defined/reserved address
-        (:class:`ipwhois.exceptions.IPDefinedError`).
+        (:class:`ValueError`), is a defined/reserved address
+        (:class:`ipwhois.exceptions.IPDefinedError`), or the lookup kept
+        failing.
 
     Example:
         >>> from valkyrie_tools.whois import get_ip_whois
@@ -91,14 +1290,553 @@ def get_ip_whois(ipaddr: str) -> Optional[Dict[str, Any]]:
         >>> result.get("asn_description") is not None  # doctest: +SKIP
         True
     """
-    results = None
-    try:
-        ipw = IPWhois(ipaddr)
-        results = ipw.lookup_whois(
-            retry_count=0, asn_methods=["dns", "whois", "http"]
-        )
-        # results = ipw.lookup_rdap()
-    except (ValueError, ipwhois.exceptions.IPDefinedError):
-        results = None
+    ip = to_ip_addr(ipaddr)
+    if ip is not None and not fresh:
+        cached = ip_whois_cache.lookup(ip)
+        if cached is not None:
+            return {**cached, "query": str(ip)}
+
+    results = (retry or DEFAULT_RETRY_POLICY).call(_ip_whois_attempt, ipaddr)
+
+    if ip is not None and isinstance(results, dict):
+        netblock = _record_netblock(ip, results)
+        if netblock is not None:
+            ip_whois_cache.insert(netblock, results)
+
+    return results
+
+
+def _parse_bulk_asn_line(line: str) -> Optional[Dict[str, Any]]:
+    """Parse one verbose bulk-mode answer line.
+
+    The line has the form ``AS | IP | BGP Prefix | CC | Registry |
+    Allocated | AS Name``.
+
+    Args:
+        line (str): Response line.
+
+    Returns:
+        Optional[Dict[str, Any]]: Record with the queried ``query`` address
+        and ``asn*`` fields, or None for banner, error and malformed lines.
+    """
+    fields = [field.strip() for field in line.split("|")]
+    if len(fields) < 7:
+        return None
+
+    def value(text: str) -> Optional[str]:
+        return None if text in ("", "NA") else text
+
+    ip = to_ip_addr(fields[1])
+    if ip is None:
+        return None
+    return {
+        "query": str(ip),
+        "asn": value(fields[0]),
+        "asn_cidr": value(fields[2]),
+        "asn_country_code": value(fields[3]),
+        "asn_registry": value(fields[4]),
+        "asn_date": value(fields[5]),
+        "asn_description": value("|".join(fields[6:])),
+        "nets": [],
+    }
+
+
+def get_bulk_asn(
+    ipaddrs: Iterable[Union[str, IPAddr]],
+    server: str = BULK_ASN_SERVER,
+    port: int = BULK_ASN_PORT,
+    timeout: float = BULK_ASN_TIMEOUT,
+) -> Dict[str, Dict[str, Any]]:
+    """Map many IP addresses to their origin ASN over one WHOIS session.
+
+    Uses the ``begin`` / ``verbose`` / ``end`` bulk protocol of Team Cymru's
+    IP to ASN service: every address is written to a single TCP connection
+    and the answers are read back as they stream in, so thousands of
+    addresses cost one round trip instead of a full
+    :func:`get_ip_whois` lookup each.  Queries are written from a helper
+    thread so that a large batch cannot deadlock against the server's
+    output.
+
+    The records carry the same ``asn``, ``asn_cidr`` and
+    ``asn_country_code`` fields as :func:`get_ip_whois` results (plus
+    ``asn_registry``, ``asn_date`` and ``asn_description``) and an empty
+    ``nets`` list, so they can be passed to
+    :func:`~valkyrie_tools.whobe.ip_whois_to_dict` as is.
 
+    Args:
+        ipaddrs (Iterable[Union[str, IPAddr]]): Addresses to map; invalid
+            ones are skipped.
+        server (str): Bulk WHOIS server host.  Defaults to
+            :data:`BULK_ASN_SERVER`.
+        port (int): Bulk WHOIS server port.  Defaults to
+            :data:`BULK_ASN_PORT`.
+        timeout (float): Socket timeout in seconds.  Defaults to
+            :data:`BULK_ASN_TIMEOUT`.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Records keyed by canonical address text.
+        Addresses the server did not answer are missing.
+
+    Example:
+        >>> from valkyrie_tools.whois import get_bulk_asn
+        >>> records = get_bulk_asn(["8.8.8.8", "1.1.1.1"])
+        >>> records["8.8.8.8"]["asn"]  # doctest: +SKIP
+        '15169'
+    """
+    queries = {str(ip) for ip in map(to_ip_addr, ipaddrs) if ip is not None}
+    if not queries:
+        return {}
+
+    request = "begin\nverbose\n%s\nend\n" % "\n".join(sorted(queries))
+    results: Dict[str, Dict[str, Any]] = {}
+    with socket.create_connection((server, port), timeout=timeout) as sock:
+        writer = threading.Thread(
+            target=sock.sendall, args=(request.encode("ascii"),), daemon=True
+        )
+        writer.start()
+        with sock.makefile("r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                record = _parse_bulk_asn_line(line)
+                if record is not None and record["query"] in queries:
+                    results[record["query"]] = record
+        writer.join()
     return results
+
+
+def _ipv4_rirs() -> List[str]:
+    """Expand :data:`IPV4_RIR_BLOCKS` into a table indexed by first octet.
+
+    Returns:
+        List[str]: The RIR serving each IPv4 ``/8``.
+    """
+    table = ["arin"] * 256
+    for rir, blocks in IPV4_RIR_BLOCKS.items():
+        for block in blocks.split():
+            first, _, last = block.partition("-")
+            for octet in range(int(first), int(last or first) + 1):
+                table[octet] = rir
+    return table
+
+
+_IPV4_RIRS = _ipv4_rirs()
+
+
+def _ipv6_rirs() -> PrefixIndex:
+    """Index :data:`IPV6_RIR_BLOCKS` by network.
+
+    Returns:
+        PrefixIndex: The RIR serving each IPv6 block.
+    """
+    index = PrefixIndex()
+    for rir, blocks in IPV6_RIR_BLOCKS.items():
+        for block in blocks:
+            index.insert(block, rir)
+    return index
+
+
+_IPV6_RIRS = _ipv6_rirs()
+
+
+def whois_server_key(target: Union[str, IPAddr]) -> str:
+    """Identify the authoritative WHOIS server that will answer ``target``.
+
+    Domains are grouped by TLD, since every name under a TLD is answered by
+    the same registry server.  IP addresses are grouped by the RIR whose
+    WHOIS server IANA delegates their block to (see
+    :data:`IPV4_RIR_BLOCKS` and :data:`IPV6_RIR_BLOCKS`); IPv6 addresses
+    outside those blocks share one group per address family.
+
+    Args:
+        target (Union[str, IPAddr]): Domain name or IP address.
+
+    Returns:
+        str: Grouping key, e.g. ``"tld:com"`` or ``"rir:arin"``.
+
+    Example:
+        >>> from valkyrie_tools.whois import whois_server_key
+        >>> whois_server_key("www.Example.COM")
+        'tld:com'
+        >>> whois_server_key("8.8.8.8")
+        'rir:arin'
+        >>> whois_server_key("193.0.6.139")
+        'rir:ripencc'
+    """
+    ip = to_ip_addr(target)
+    if ip is None:
+        return "tld:" + str(target).rstrip(".").rsplit(".", 1)[-1].lower()
+    if ip.version == 4:
+        return "rir:" + _IPV4_RIRS[ip.value >> 24]
+    rir = _IPV6_RIRS.lookup(ip)
+    return f"rir:{rir}" if rir is not None else "ip:6"
+
+
+class WhoisScheduler(Generic[_T, _R]):
+    """Concurrent WHOIS lookups with per-server concurrency and rate limits.
+
+    Targets are grouped by :func:`whois_server_key` into one queue per
+    authoritative server.  A single dispatcher (running in the consuming
+    thread) starts a lookup only when a worker is free, the target's server
+    has fewer than ``per_server`` queries in flight, and at least
+    ``interval`` seconds have passed since the last query to that server
+    started.  Many servers are therefore queried in parallel while none of
+    them is hammered, so total time scales with the slowest registry rather
+    than the sum of all lookups.
+
+    With a ``retry`` policy, a lookup raising :class:`TransientWhoisError`
+    is put back on its server's queue to start again after the policy's
+    back-off.  Neither rate-limit waits nor retry back-offs ever occupy a
+    worker thread.
+
+    Attributes:
+        workers (int): Maximum number of lookups running at once.
+        per_server (int): Maximum concurrent lookups per WHOIS server.
+        interval (float): Minimum seconds between query starts per server.
+        key (Callable[[_T], str]): Function mapping a target to its server
+            grouping key.
+        retry (Optional[RetryPolicy]): Policy for transient failures, or
+            None to let :class:`TransientWhoisError` propagate.
+
+    Example:
+        >>> from valkyrie_tools.whois import WhoisScheduler
+        >>> scheduler = WhoisScheduler(workers=4, interval=0)
+        >>> list(scheduler.run(str.upper, ["a.com", "b.org"]))
+        [('a.com', 'A.COM'), ('b.org', 'B.ORG')]
+    """
+
+    def __init__(
+        self,
+        workers: int = 8,
+        per_server: int = DEFAULT_SERVER_CONCURRENCY,
+        interval: float = DEFAULT_SERVER_INTERVAL,
+        key: Callable[[_T], str] = whois_server_key,  # type: ignore[assignment]  # noqa: B950
+        retry: Optional[RetryPolicy] = None,
+    ) -> None:
+        """Initialize the WhoisScheduler object.
+
+        Args:
+            workers (int): Maximum number of lookups running at once.
+                Defaults to 8.
+            per_server (int): Maximum concurrent lookups per WHOIS server.
+                Defaults to :data:`DEFAULT_SERVER_CONCURRENCY`.
+            interval (float): Minimum seconds between query starts per
+                server.  Defaults to :data:`DEFAULT_SERVER_INTERVAL`.
+            key (Callable[[_T], str]): Function mapping a target to its
+                server grouping key.  Defaults to :func:`whois_server_key`.
+            retry (Optional[RetryPolicy]): Policy for transient failures.
+                Defaults to None.
+        """
+        self.workers = max(1, workers)
+        self.per_server = max(1, per_server)
+        self.interval = max(0.0, interval)
+        self.key = key
+        self.retry = retry
+
+    def run(
+        self,
+        func: Callable[[_T], _R],
+        targets: Iterable[_T],
+        ordered: bool = True,
+    ) -> Iterator[Tuple[_T, _R]]:
+        """Look up every target, yielding results as they become available.
+
+        ``targets`` is read lazily by one reader thread into a queue of
+        ``workers *`` :data:`SCHEDULER_READ_AHEAD` targets, so an input
+        which blocks (such as a pipe) never holds back the results already
+        available.  The dispatcher takes targets from the queue while it
+        holds fewer than that many unyielded ones.  Lookups therefore start
+        as the targets arrive, and memory stays bounded however long the
+        input is.
+
+        With a single worker the lookups simply run serially in the calling
+        thread, exactly as a plain loop would (retries then sleep in the
+        calling thread, see :meth:`RetryPolicy.call`).
+
+        Args:
+            func (Callable[[_T], _R]): Single-attempt lookup function, e.g.
+                :func:`get_whois` with ``retry=SINGLE_ATTEMPT``.  Exceptions
+                it raises propagate to the consumer, except for
+                :class:`TransientWhoisError` handled by :attr:`retry`.
+            targets (Iterable[_T]): Domains and/or IP addresses to look up.
+            ordered (bool): Whether to yield results in input order rather
+                than completion order.  Defaults to True.
+
+        Yields:
+            Tuple[_T, _R]: ``(target, result)`` pairs.
+        """
+        if self.workers == 1:
+            yield from self._run_serial(func, targets)
+            return
+
+        limit = self.workers * SCHEDULER_READ_AHEAD
+        inputs: "Queue[Tuple[Any, Optional[Exception]]]" = Queue(limit)
+        wakeup = threading.Event()
+        threading.Thread(
+            target=_feed, args=(targets, inputs, wakeup), daemon=True
+        ).start()
+
+        items: Dict[int, _T] = {}
+        servers: Dict[str, _ServerQueue] = {}
+        futures: Dict["Future[_R]", Tuple[int, _ServerQueue, float]] = {}
+        results: Dict[int, _R] = {}
+        failures: Dict[int, Tuple[int, float]] = {}
+        exhausted = False
+        count = next_index = 0
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while not exhausted or items:
+                if not exhausted:
+                    count, exhausted = self._take_inputs(
+                        inputs, count, limit, items, servers
+                    )
+                timeout = self._start_ready(
+                    executor, func, items, servers, futures, wakeup
+                )
+                done = {future for future in futures if future.done()}
+                if not done:
+                    wakeup.wait(timeout)
+                    wakeup.clear()
+                    continue
+
+                for index in self._collect(done, futures, failures, results):
+                    if not ordered:
+                        yield items.pop(index), results.pop(index)
+
+                while ordered and next_index in results:
+                    yield items.pop(next_index), results.pop(next_index)
+                    next_index += 1
+
+    def _take_inputs(
+        self,
+        inputs: "Queue[Tuple[Any, Optional[Exception]]]",
+        count: int,
+        limit: int,
+        items: Dict[int, _T],
+        servers: Dict[str, "_ServerQueue"],
+    ) -> Tuple[int, bool]:
+        """Queue the targets read so far on their servers' queues.
+
+        Targets are taken while fewer than ``limit`` are held.
+
+        Args:
+            inputs (Queue[Tuple[Any, Optional[Exception]]]): Targets read
+                by :func:`_feed`.
+            count (int): Number of targets taken so far.
+            limit (int): Maximum number of targets held in ``items``.
+            items (Dict[int, _T]): Targets taken but not yet yielded, keyed
+                by input position; updated in place.
+            servers (Dict[str, _ServerQueue]): Pending lookups per server;
+                updated in place.
+
+        Returns:
+            Tuple[int, bool]: The new number of targets taken and whether
+            the input is exhausted.
+
+        Raises:
+            Exception: Whatever reading the targets raised.
+        """
+        while len(items) < limit:
+            try:
+                target, error = inputs.get_nowait()
+            except Empty:
+                break
+            if error is not None:
+                raise error
+            if target is _END:
+                return count, True
+            items[count] = target
+            key = self.key(target)
+            servers.setdefault(key, _ServerQueue()).pending.append(count)
+            count += 1
+        return count, False
+
+    def _collect(
+        self,
+        done: Set["Future[Any]"],
+        futures: Dict["Future[_R]", Tuple[int, "_ServerQueue", float]],
+        failures: Dict[int, Tuple[int, float]],
+        results: Dict[int, _R],
+    ) -> List[int]:
+        """Settle the finished lookups among ``done``.
+
+        Args:
+            done (Set[Future[Any]]): Finished futures.
+            futures (Dict[Future[_R], Tuple[int, _ServerQueue, float]]):
+                In-flight lookups; the finished ones are removed.
+            failures (Dict[int, Tuple[int, float]]): Failed attempt count
+                and first start time per target, updated in place.
+            results (Dict[int, _R]): Results by input position, updated
+                with the settled lookups.
+
+        Returns:
+            List[int]: Input positions of the newly settled targets.
+        """
+        settled_indexes = []
+        for future in done & futures.keys():
+            index, server, submitted = futures.pop(future)
+            server.in_flight -= 1
+            settled, result = self._settle(
+                future, index, server, submitted, failures
+            )
+            if settled:
+                results[index] = result
+                settled_indexes.append(index)
+        return settled_indexes
+
+    def _run_serial(
+        self, func: Callable[[_T], _R], items: Iterable[_T]
+    ) -> Iterator[Tuple[_T, _R]]:
+        """Look up every target in turn in the calling thread.
+
+        Args:
+            func (Callable[[_T], _R]): Lookup function.
+            items (Iterable[_T]): Targets to look up.
+
+        Yields:
+            Tuple[_T, _R]: ``(target, result)`` pairs in input order.
+        """
+        for target in items:
+            if self.retry is None:
+                yield target, func(target)
+            else:
+                yield target, self.retry.call(func, target)
+
+    def _settle(
+        self,
+        future: "Future[_R]",
+        index: int,
+        server: "_ServerQueue",
+        submitted: float,
+        failures: Dict[int, Tuple[int, float]],
+    ) -> Tuple[bool, Any]:
+        """Handle a finished lookup, re-queueing it after transient failures.
+
+        Args:
+            future (Future[_R]): The finished lookup.
+            index (int): Position of its target.
+            server (_ServerQueue): Queue of its server.
+            submitted (float): :func:`time.monotonic` time it was started.
+            failures (Dict[int, Tuple[int, float]]): Failed attempt count
+                and first start time per target, updated in place.
+
+        Returns:
+            Tuple[bool, Any]: ``(True, result)`` once the target is done,
+            or ``(False, None)`` if it was queued for a retry.
+
+        Raises:
+            TransientWhoisError: If the lookup failed transiently and there
+                is no :attr:`retry` policy.
+        """
+        try:
+            return True, future.result()
+        except TransientWhoisError as exc:
+            if self.retry is None:
+                raise
+            attempt, started = failures.get(index, (0, submitted))
+            failures[index] = (attempt + 1, started)
+            delay = self.retry.next_delay(attempt + 1, started, exc)
+            if delay is None:
+                return True, self.retry.give_up(exc)
+            heappush(server.retries, (monotonic() + delay, index))
+            return False, None
+
+    def _start_ready(
+        self,
+        executor: ThreadPoolExecutor,
+        func: Callable[[_T], _R],
+        items: Dict[int, _T],
+        servers: Dict[str, "_ServerQueue"],
+        futures: Dict["Future[_R]", Tuple[int, "_ServerQueue", float]],
+        wakeup: threading.Event,
+    ) -> Optional[float]:
+        """Submit every lookup whose server and the pool allow it to start.
+
+        Args:
+            executor (ThreadPoolExecutor): Pool running the lookups.
+            func (Callable[[_T], _R]): Lookup function.
+            items (Dict[int, _T]): Targets keyed by the queued positions.
+            servers (Dict[str, _ServerQueue]): Pending lookups per server.
+            futures (Dict[Future[_R], Tuple[int, _ServerQueue, float]]):
+                In-flight lookups, updated with the newly submitted ones.
+            wakeup (threading.Event): Set when a submitted lookup finishes.
+
+        Returns:
+            Optional[float]: Seconds until a waiting lookup may start, or
+            None if only a completion can unblock the remaining work.
+        """
+        now = monotonic()
+        timeout: Optional[float] = None
+        for server in servers.values():
+            while server.retries and server.retries[0][0] <= now:
+                server.pending.appendleft(heappop(server.retries)[1])
+
+            while (
+                server.pending
+                and len(futures) < self.workers
+                and server.in_flight < self.per_server
+                and server.next_start <= now
+            ):
+                index = server.pending.popleft()
+                future = executor.submit(func, items[index])
+                future.add_done_callback(lambda _: wakeup.set())
+                futures[future] = (index, server, now)
+                server.in_flight += 1
+                server.next_start = now + self.interval
+
+            if server.in_flight >= self.per_server:
+                continue
+            if server.pending:
+                ready = server.next_start
+            elif server.retries:
+                ready = max(server.next_start, server.retries[0][0])
+            else:
+                continue
+            if ready <= now and len(futures) >= self.workers:
+                continue
+            wait_for = max(0.0, ready - now)
+            timeout = wait_for if timeout is None else min(timeout, wait_for)
+        return timeout
+
+
+_END = object()
+"""Marks the end of the targets read by :func:`_feed`."""
+
+
+def _feed(
+    targets: Iterable[Any],
+    inputs: "Queue[Tuple[Any, Optional[Exception]]]",
+    wakeup: threading.Event,
+) -> None:
+    """Read ``targets`` into ``inputs``, for :meth:`WhoisScheduler.run`.
+
+    Runs on a daemon thread, so that a consumer abandoning the results is
+    never held up by an input that blocks, such as an idle pipe.  Blocks
+    while ``inputs`` is full.
+
+    Args:
+        targets (Iterable[Any]): Targets to read.
+        inputs (Queue[Tuple[Any, Optional[Exception]]]): Receives
+            ``(target, None)`` pairs, then ``(_END, None)`` or, if reading
+            failed, ``(None, exception)``.
+        wakeup (threading.Event): Set after every pair is queued.
+    """
+    try:
+        for target in targets:
+            inputs.put((target, None))
+            wakeup.set()
+        inputs.put((_END, None))
+    except Exception as exc:
+        inputs.put((None, exc))
+    wakeup.set()
+
+
+class _ServerQueue:
+    """Pending lookups and rate-limit state for one WHOIS server."""
+
+    __slots__ = ("pending", "retries", "in_flight", "next_start")
+
+    def __init__(self) -> None:
+        """Initialize the _ServerQueue object."""
+        self.pending: Deque[int] = deque()
+        self.retries: List[Tuple[float, int]] = []
+        self.in_flight = 0
+        self.next_start = 0.0
@@ -45,12 +45,12 @@ class BaseCommandTest(unittest.TestCase):
         """Test --interactive flag."""
         if self.command is None:
             self.skipTest("BaseCommandTest requires a subclass to set command")
-        # Mock the sys.stdin read method to simulate user input.
+        # Mock the sys.stdin readline method to simulate user input.
         with patch("valkyrie_tools.commons.sys") as mock_sys:
             # Override isatty to simulate a terminal and simulate
             # user input.
             mock_sys.stdin.isatty.return_value = True
-            mock_sys.stdin.read.side_effect = [
+            mock_sys.stdin.readline.side_effect = [
                 " ",  # Empty value
                 "",  # Simulates CTRL+d
             ]
@@ -1,22 +1,188 @@
 """Cache module tests."""
 
+import threading
+from functools import partial
 import unittest
 from time import sleep
-from typing import Any
+from typing import Any, Callable, List
+from unittest.mock import patch
 
-from valkyrie_tools.cache import _ttl_hash_gen, cache
+from valkyrie_tools.cache import SingleFlight, TTLCache, approx_sizeof, cache
 
 
-class TestTTLHashGen(unittest.TestCase):
-    """Test case for the _ttl_hash_gen function."""
+class _Clock:
+    """Manually advanced clock."""
 
-    def test_ttl_hash_gen(self) -> None:
-        """Test _ttl_hash_gen function."""
-        gen = _ttl_hash_gen(1)
-        first = next(gen)
-        sleep(1)
-        second = next(gen)
-        self.assertGreater(second, first)
+    def __init__(self) -> None:
+        """Start at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+def _run_concurrently(fn: Callable[[], Any], count: int = 8) -> List[Any]:
+    """Call ``fn`` from ``count`` threads at once.
+
+    Args:
+        fn (Callable[[], Any]): Function to call.
+        count (int): Number of threads.
+
+    Returns:
+        List[Any]: The results, or the exceptions raised.
+    """
+    results: List[Any] = []
+
+    def call() -> None:
+        """Record the result of one call."""
+        try:
+            results.append(fn())
+        except Exception as exc:
+            results.append(exc)
+
+    threads = [threading.Thread(target=call) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+class _SlowCall:
+    """Counts calls, blocking each one until released."""
+
+    def __init__(self, error: bool = False) -> None:
+        """Set up the release event.
+
+        Args:
+            error (bool): Whether calls raise instead of returning.
+        """
+        self.calls = 0
+        self.error = error
+        self.release = threading.Event()
+        threading.Timer(0.2, self.release.set).start()
+
+    def __call__(self, *args: Any, **kwargs: Any) -> int:
+        """Wait for the release, then return the number of calls.
+
+        Args:
+            *args: Ignored.
+            **kwargs: Ignored.
+
+        Returns:
+            int: Number of calls so far.
+
+        Raises:
+            RuntimeError: If set up to fail.
+        """
+        self.calls += 1
+        self.release.wait(5)
+        if self.error:
+            raise RuntimeError("failed")
+        return self.calls
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test case for the SingleFlight class."""
+
+    def test_concurrent_callers_share_one_call(self) -> None:
+        """Test concurrent callers of one key wait for a single call."""
+        flight = SingleFlight()
+        slow = _SlowCall()
+        self.assertEqual(
+            _run_concurrently(lambda: flight.do("k", slow)), [1] * 8
+        )
+        self.assertEqual(slow.calls, 1)
+        self.assertEqual(flight.do("k", lambda: "again"), "again")
+
+    def test_errors_are_shared(self) -> None:
+        """Test every waiting caller receives the exception."""
+        flight = SingleFlight()
+        slow = _SlowCall(error=True)
+        results = _run_concurrently(lambda: flight.do("k", slow))
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+        self.assertEqual(slow.calls, 1)
+
+
+class TestTTLCache(unittest.TestCase):
+    """Test case for the TTLCache class."""
+
+    def setUp(self) -> None:
+        """Set up a clock."""
+        self.clock = _Clock()
+
+    def test_entries_expire_individually(self) -> None:
+        """Test every entry lives for ttl seconds from when it was stored."""
+        store = TTLCache(ttl=10, timer=self.clock)
+        store.set("a", 1)
+        self.clock.now = 6
+        store.set("b", 2)
+        self.clock.now = 10
+        self.assertIsNone(store.lookup("a"))
+        self.assertEqual(store.lookup("b"), (2, False))
+        self.clock.now = 16
+        self.assertIsNone(store.lookup("b"))
+        self.assertEqual(len(store), 0)
+
+    def test_lru_eviction(self) -> None:
+        """Test the least recently used entry is evicted first."""
+        store = TTLCache(maxsize=2, timer=self.clock)
+        store.set("a", 1)
+        store.set("b", 2)
+        store.lookup("a")
+        store.set("c", 3)
+        self.assertIsNone(store.lookup("b"))
+        self.assertEqual(store.lookup("a"), (1, False))
+        self.assertEqual(store.lookup("c"), (3, False))
+
+    def test_expired_entries_free_their_slots(self) -> None:
+        """Test expired entries are purged before live ones are evicted."""
+        store = TTLCache(maxsize=2, ttl=10, timer=self.clock)
+        store.set("old", 0)
+        self.clock.now = 5
+        store.set("a", 1)
+        self.clock.now = 11
+        store.set("b", 2)
+        self.assertEqual(store.lookup("a"), (1, False))
+        self.assertEqual(len(store), 2)
+
+    def test_stale_window(self) -> None:
+        """Test expired entries are served as stale until the window ends."""
+        store = TTLCache(ttl=10, stale_ttl=5, timer=self.clock)
+        store.set("a", 1)
+        self.clock.now = 12
+        self.assertEqual(store.lookup("a"), (1, True))
+        self.assertTrue(store.claim_refresh("a"))
+        self.assertFalse(store.claim_refresh("a"))
+        store.set("a", 2)
+        self.assertEqual(store.lookup("a"), (2, False))
+        self.assertTrue(store.claim_refresh("a"))
+        store.release_refresh("a")
+        self.assertTrue(store.claim_refresh("a"))
+
+    def test_max_bytes(self) -> None:
+        """Test the size bound evicts old entries and skips huge values."""
+        small = approx_sizeof("x" * 100)
+        store = TTLCache(maxsize=None, max_bytes=small * 2, timer=self.clock)
+        for key in "abc":
+            store.set(key, key * 100)
+        self.assertIsNone(store.lookup("a"))
+        self.assertEqual(len(store), 2)
+        store.set("huge", "x" * small * 3)
+        self.assertIsNone(store.lookup("huge"))
+        self.assertEqual(len(store), 2)
+
+    def test_no_caching_and_clear(self) -> None:
+        """Test a zero maxsize stores nothing and clear empties the cache."""
+        store = TTLCache(maxsize=0)
+        store.set("a", 1)
+        self.assertIsNone(store.lookup("a"))
+        store = TTLCache()
+        store.set("a", 1)
+        store.clear()
+        self.assertIsNone(store.lookup("a"))
 
 
 class TestCache(unittest.TestCase):
@@ -33,6 +199,34 @@ class TestCache(unittest.TestCase):
         # should return cached result
         self.assertEqual(add(1, 2), 3)
 
+    def test_memoize_bounded(self) -> None:
+        """Test memoize evicts old results and keys on keyword arguments."""
+        calls: List[Any] = []
+
+        @cache.memoize(maxsize=2)
+        def scale(value: int, factor: int = 1) -> int:
+            """Record the call and return the scaled value."""
+            calls.append((value, factor))
+            return value * factor
+
+        self.assertEqual(scale(1), 1)
+        self.assertEqual(scale(1, factor=2), 2)
+        self.assertEqual(scale(1, factor=2), 2)
+        self.assertEqual(scale(3), 3)
+        self.assertEqual(scale(1), 1)
+        self.assertEqual(len(calls), 4)
+        scale.clear_cache()  # type: ignore[attr-defined]
+        self.assertEqual(scale(3), 3)
+        self.assertEqual(len(calls), 5)
+
+    def test_single_flight(self) -> None:
+        """Test concurrent misses of both decorators share one call."""
+        for decorate in (cache.memoize, cache.ttl_cache(ttl=60)):
+            slow = _SlowCall()
+            fetch = decorate(slow)
+            self.assertEqual(_run_concurrently(partial(fetch, "x")), [1] * 8)
+            self.assertEqual(slow.calls, 1)
+
     def test_ttl_cache(self) -> None:
         """Test ttl_cache function."""
 
@@ -45,6 +239,50 @@ class TestCache(unittest.TestCase):
         # should compute result again after ttl
         self.assertEqual(add(1, 2), 3)
 
+    def test_ttl_cache_keys(self) -> None:
+        """Test keyword and typed arguments are part of the key."""
+        calls: List[Any] = []
+
+        @cache.ttl_cache(typed=True)
+        def ident(value: Any, scale: int = 1) -> Any:
+            """Record the call and return the value."""
+            calls.append(value)
+            return value * scale
+
+        self.assertEqual(ident(2, scale=3), 6)
+        self.assertEqual(ident(2, scale=3), 6)
+        self.assertEqual(ident(2.0), 2.0)
+        self.assertEqual(ident(2), 2)
+        self.assertEqual(calls, [2, 2.0, 2])
+
+    def test_stale_while_revalidate(self) -> None:
+        """Test stale results are returned while refreshed in the background."""
+        clock = _Clock()
+        refreshed = threading.Event()
+        calls: List[int] = []
+
+        with patch("valkyrie_tools.cache.monotonic", clock):
+
+            @cache.ttl_cache(ttl=10, stale_ttl=60)
+            def fetch() -> int:
+                """Return the number of calls so far."""
+                calls.append(len(calls) + 1)
+                if len(calls) > 1:
+                    refreshed.set()
+                return len(calls)
+
+            self.assertEqual(fetch(), 1)
+            clock.now = 11
+            self.assertEqual(fetch(), 1)
+            self.assertTrue(refreshed.wait(5))
+            for _ in range(100):  # wait for the refresh to be stored
+                if fetch() == 2:
+                    break
+                sleep(0.01)
+            self.assertEqual(fetch(), 2)
+            clock.now = 100
+            self.assertEqual(fetch(), 3)
+
     def test_clear_cache(self) -> None:
         """Test clear_cache function."""
 
@@ -1,7 +1,12 @@
 """Commons module tests."""
 
+import io
+import json
+import os
+import pickle
+import tempfile
 import unittest
-from typing import Any, List, Tuple
+from typing import Any, Iterator, List, Tuple, Union
 from unittest.mock import MagicMock, patch
 
 import click
@@ -9,18 +14,32 @@ from art import text2art  # type: ignore[import-untyped]  # noqa: F401
 from click.testing import CliRunner
 
 from valkyrie_tools.commons import (
+    MappedChunk,
     common_options,
     emit_json,
+    emit_json_stream,
     extract_domains,
     extract_emails,
+    extract_hosts,
+    extract_indicators,
     extract_ip_addrs,
     extract_ipv4_addrs,
     extract_ipv6_addrs,
     extract_urls,
     handle_file_input,
+    indicator_key,
+    iter_extract,
+    iter_input_lines,
+    iter_input_paths,
+    iter_json_stdin,
+    iter_json_values,
+    iter_mapped_chunks,
+    map_concurrent,
     parse_input_methods,
     parse_json_stdin,
+    peek_iter,
     print_version,
+    read_lines,
 )
 
 
@@ -128,6 +147,7 @@ class TestHandleFileInput(unittest.TestCase):
 
     @patch("sys.stdin.isatty", return_value=True)
     @patch("os.path.exists", return_value=True)
+    @patch("valkyrie_tools.commons.compression_format", return_value=None)
     @patch("valkyrie_tools.commons.is_binary_file", return_value=False)
     @patch("os.path.isdir", return_value=False)
     @patch("os.path.isfile", return_value=True)
@@ -237,6 +257,7 @@ class TestParseInputMethods(unittest.TestCase):
         )
         self.assertEqual(result, ("non_file_path",))
 
+    @patch("valkyrie_tools.commons.compression_format", return_value=None)
     @patch("sys.stdin.isatty", return_value=True)
     @patch("os.path.exists", return_value=True)
     @patch("valkyrie_tools.commons.is_binary_file", return_value=False)
@@ -251,6 +272,7 @@ class TestParseInputMethods(unittest.TestCase):
         mock_is_binary_file: MagicMock,
         mock_exists: MagicMock,
         mock_isatty: MagicMock,
+        mock_compression_format: MagicMock,
     ) -> None:
         """Test that function reads from file if file path is provided."""
         mock_open.return_value.__enter__.return_value.read.return_value = (
@@ -307,6 +329,365 @@ class TestParseInputMethods(unittest.TestCase):
         self.assertEqual(result, ("     ",))
 
 
+class TestReadLines(unittest.TestCase):
+    """Test read_lines."""
+
+    def test_line_endings_stripped(self) -> None:
+        """Test LF and CRLF endings are removed and the last line kept."""
+        stream = io.StringIO("a.com\r\nb.com\n\nc.com")
+        self.assertEqual(
+            list(read_lines(stream)), ["a.com", "b.com", "", "c.com"]
+        )
+
+    def test_long_line_split_at_whitespace(self) -> None:
+        """Test long lines are cut between words, never inside one."""
+        stream = io.StringIO("one.com two.com three.com\n")
+        self.assertEqual(
+            list(read_lines(stream, size=10)),
+            ["one.com", "two.com", "three.com"],
+        )
+
+    def test_long_word_kept_whole_per_chunk(self) -> None:
+        """Test a chunk without whitespace is yielded as it is."""
+        stream = io.StringIO("abcdefgh")
+        self.assertEqual(list(read_lines(stream, size=4)), ["abcd", "efgh"])
+
+
+class TestIterInputLines(unittest.TestCase):
+    """Test iter_input_lines."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures, if any."""
+        self.ctx = click.Context(click.Command("test"))
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _write(self, name: str, data: bytes) -> str:
+        """Write a file in the temporary directory."""
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    @patch("sys.stdin", new_callable=MagicMock)
+    def test_values_files_then_stdin(self, mock_stdin: MagicMock) -> None:
+        """Test arguments, file lines and piped stdin are streamed in order."""
+        path = self._write("targets.txt", b"a.com\n\nb.com\n")
+        mock_stdin.isatty.return_value = False
+        mock_stdin.readline.side_effect = ["c.com\n", ""]
+        lines = iter_input_lines(("x.com\ny.com", path, "-"), False, self.ctx)
+        self.assertEqual(next(lines), "x.com")
+        mock_stdin.readline.assert_not_called()
+        hosts = [host for line in lines for host in extract_hosts(line)]
+        self.assertEqual(hosts, ["y.com", "a.com", "b.com", "c.com"])
+
+    @patch("sys.stdin.isatty", return_value=True)
+    def test_regular_files_are_mapped(self, mock_isatty: MagicMock) -> None:
+        """Test regular files are yielded as memory-mapped windows."""
+        path = self._write("targets.txt", b"a.com\n")
+        empty = self._write("empty.txt", b"")
+        chunks = list(iter_input_lines((path, empty), False, self.ctx))
+        self.assertEqual(len(chunks), 1)
+        self.assertIsInstance(chunks[0], MappedChunk)
+
+    @patch("sys.stdin.isatty", return_value=True)
+    def test_compressed_files_are_streamed(
+        self, mock_isatty: MagicMock
+    ) -> None:
+        """Test compressed files are decompressed line by line."""
+        import bz2
+        import gzip
+        import lzma
+
+        text = b"a.example.com\n\nmail b@c.example\n"
+        paths = [
+            self._write("targets.gz", gzip.compress(text)),
+            self._write("targets.bz2", bz2.compress(text)),
+            self._write("targets", lzma.compress(text)),
+        ]
+        lines = list(iter_input_lines(tuple(paths), False, self.ctx))
+        self.assertEqual(lines, ["a.example.com", "mail b@c.example"] * 3)
+        self.assertEqual(
+            handle_file_input(paths[0]), "a.example.com\n\nmail b@c.example"
+        )
+
+    @patch("sys.stdin.isatty", return_value=True)
+    def test_file_descriptor(self, mock_isatty: MagicMock) -> None:
+        """Test /dev/fd/N paths are read like files."""
+        read_fd, write_fd = os.pipe()
+        self.addCleanup(os.close, read_fd)
+        os.write(write_fd, b"fd.example.com\n")
+        os.close(write_fd)
+        path = "/dev/fd/%d" % read_fd
+        if not os.path.exists(path):  # pragma: no cover
+            self.skipTest("/dev/fd is not available")
+        lines = iter_input_lines((path,), False, self.ctx)
+        self.assertEqual(list(lines), ["fd.example.com"])
+
+    @patch("sys.stdin.isatty", return_value=True)
+    def test_rejects_binary_files_and_directories(
+        self, mock_isatty: MagicMock
+    ) -> None:
+        """Test named binary files raise OSError, walked ones are skipped."""
+        path = self._write("blob.bin", b"\x00\x01\x02")
+        with self.assertRaises(OSError):
+            list(iter_input_lines((path,), False, self.ctx))
+        self.assertEqual(
+            list(iter_input_lines((self.tmp.name,), False, self.ctx)), []
+        )
+
+    def _tree(self) -> None:
+        """Write a small incident folder."""
+        import gzip
+
+        os.makedirs(os.path.join(self.tmp.name, "sub"))
+        os.makedirs(os.path.join(self.tmp.name, ".git"))
+        self._write("a.txt", b"a.example.com\n")
+        self._write("big.txt", b"big.example.com " * 100)
+        self._write(
+            os.path.join("sub", "b.log.gz"), gzip.compress(b"b.example.com")
+        )
+        self._write(os.path.join("sub", "blob.bin"), b"\x00c.example.com")
+        self._write(os.path.join(".git", "d.txt"), b"d.example.com\n")
+
+    def _hosts(self, *values: str, **kwargs: Any) -> List[Any]:
+        """Extract the hosts of iter_input_lines over ``values``."""
+        lines = iter_input_lines(values, False, self.ctx, **kwargs)
+        return [host for line in lines for host in extract_hosts(line)]
+
+    @patch("sys.stdin.isatty", return_value=True)
+    def test_directories(self, mock_isatty: MagicMock) -> None:
+        """Test directories are walked with exclusions and size limits."""
+        self._tree()
+        for workers in (1, 4):
+            with self.subTest(workers=workers):
+                self.assertEqual(
+                    self._hosts(
+                        self.tmp.name,
+                        exclude=(".git",),
+                        max_file_size=1000,
+                        workers=workers,
+                    ),
+                    ["a.example.com", "b.example.com"],
+                )
+        hosts = self._hosts(self.tmp.name)
+        self.assertEqual(len(hosts), 103)
+        self.assertEqual(hosts[-2:], ["d.example.com", "b.example.com"])
+
+    @patch("sys.stdin.isatty", return_value=True)
+    def test_globs(self, mock_isatty: MagicMock) -> None:
+        """Test matching globs are expanded and others kept as text."""
+        self._tree()
+        pattern = os.path.join(self.tmp.name, "**", "*.gz")
+        self.assertEqual(self._hosts(pattern), ["b.example.com"])
+        self.assertEqual(
+            list(iter_input_lines(("*.example.invalid",), False, self.ctx)),
+            ["*.example.invalid"],
+        )
+
+    @patch("sys.stdin.isatty", return_value=True)
+    @patch("valkyrie_tools.commons.INPUT_PREFETCH_SIZE", 8)
+    def test_large_walked_files_are_streamed(
+        self, mock_isatty: MagicMock
+    ) -> None:
+        """Test files too large to read ahead are memory-mapped."""
+        self._write("a.txt", b"a.example.com\n")
+        lines = list(iter_input_lines((self.tmp.name,), False, self.ctx))
+        self.assertEqual(len(lines), 1)
+        self.assertIsInstance(lines[0], MappedChunk)
+
+    @patch("sys.stdin", new_callable=MagicMock)
+    @patch("click.echo", new_callable=MagicMock)
+    def test_interactive_mode(
+        self, mock_echo: MagicMock, mock_stdin: MagicMock
+    ) -> None:
+        """Test interactive mode prints the prompt and reads stdin."""
+        mock_stdin.readline.side_effect = ["user input\n", "  \n", ""]
+        lines = list(iter_input_lines((), True, self.ctx))
+        self.assertEqual(lines, ["user input"])
+        mock_echo.assert_called()
+
+    @patch("sys.stdin", new_callable=MagicMock)
+    def test_json_mode(self, mock_stdin: MagicMock) -> None:
+        """Test piped JSON goes through the extractor, empty pipes do not."""
+        mock_stdin.isatty.return_value = False
+        mock_stdin.readline.side_effect = ['[{"input": "1.2.3.4"}]', ""]
+        lines = iter_input_lines(
+            (),
+            False,
+            self.ctx,
+            output_json=True,
+            json_extractor=lambda data: tuple(e["input"] for e in data),
+        )
+        self.assertEqual(list(lines), ["1.2.3.4"])
+
+        mock_stdin.readline.reset_mock()
+        mock_stdin.readline.side_effect = [""]
+        lines = iter_input_lines(
+            ("a.com",),
+            False,
+            self.ctx,
+            output_json=True,
+            json_extractor=lambda data: (),
+        )
+        self.assertEqual(list(lines), ["a.com"])
+        self.assertEqual(mock_stdin.readline.call_count, 1)
+
+
+class TestIterInputPaths(unittest.TestCase):
+    """Test iter_input_paths."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures, if any."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        for name in ("a.txt", "sub/b.txt", "sub/c.bin", "sub/deep/d.txt"):
+            path = os.path.join(self.tmp.name, *name.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(name)
+
+    def _relative(self, value: str, *exclude: str) -> List[str]:
+        """Return the paths found, relative to the temporary directory."""
+        return [
+            os.path.relpath(path, self.tmp.name).replace(os.sep, "/")
+            for path in iter_input_paths(value, exclude)
+        ]
+
+    def test_walk_is_sorted(self) -> None:
+        """Test directories are walked depth first in sorted order."""
+        self.assertEqual(
+            self._relative(self.tmp.name),
+            ["a.txt", "sub/b.txt", "sub/c.bin", "sub/deep/d.txt"],
+        )
+
+    def test_exclude(self) -> None:
+        """Test names and relative paths are excluded, directories pruned."""
+        self.assertEqual(
+            self._relative(self.tmp.name, "*.bin", "deep"),
+            ["a.txt", "sub/b.txt"],
+        )
+        self.assertEqual(self._relative(self.tmp.name, "sub/*"), ["a.txt"])
+
+    def test_glob_files_are_unique(self) -> None:
+        """Test overlapping glob matches yield every file once."""
+        pattern = os.path.join(self.tmp.name, "**")
+        self.assertEqual(
+            sorted(self._relative(pattern)),
+            ["a.txt", "sub/b.txt", "sub/c.bin", "sub/deep/d.txt"],
+        )
+        pattern = os.path.join(self.tmp.name, "*", "*.txt")
+        self.assertEqual(self._relative(pattern, "b.*"), [])
+
+
+class TestIterMappedChunks(unittest.TestCase):
+    """Test iter_mapped_chunks and extraction from mapped files."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures, if any."""
+        tmp = tempfile.NamedTemporaryFile(delete=False)
+        tmp.write(
+            "caf\u00e9 a.example\n"
+            "mail b@c.example http://d.example/\u00fcber\n"
+            "203.0.113.9 e.example\n".encode()
+        )
+        tmp.close()
+        self.path = tmp.name
+        self.addCleanup(os.unlink, self.path)
+
+    def test_windows_end_at_line_breaks(self) -> None:
+        """Test windows cover the file and end after a line break."""
+        spans = []
+        for chunk in iter_mapped_chunks(self.path, size=48):
+            spans.append((chunk.start, chunk.end))
+            self.assertEqual(chunk.buffer[chunk.end - 1 : chunk.end], b"\n")
+        self.assertEqual(spans[0][0], 0)
+        self.assertEqual(spans[-1][1], os.path.getsize(self.path))
+        self.assertEqual(len(spans), 3)
+        for i in range(1, len(spans)):
+            self.assertEqual(spans[i - 1][1], spans[i][0])
+
+    def test_extract_from_mapped_chunks(self) -> None:
+        """Test only matched spans are decoded, with byte offsets."""
+        found = [
+            indicator
+            for chunk in iter_mapped_chunks(self.path, size=30)
+            for indicator in extract_indicators(chunk)
+        ]
+        self.assertEqual(
+            [(i.kind, i.value) for i in found],
+            [
+                ("domain", "a.example"),
+                ("email", "b@c.example"),
+                ("url", "http://d.example/\u00fcber"),
+                ("ipv4", "203.0.113.9"),
+                ("domain", "e.example"),
+            ],
+        )
+        self.assertEqual(found[0].start, 6)
+
+    def test_chunks_pickle_as_offsets(self) -> None:
+        """Test a pickled window carries its path and offsets only."""
+        for chunk in iter_mapped_chunks(self.path, size=48):
+            data = pickle.dumps(chunk)
+            self.assertNotIn(b"example", data)
+            copy = pickle.loads(data)
+            self.assertEqual(
+                copy.buffer[copy.start : copy.end],
+                chunk.buffer[chunk.start : chunk.end],
+            )
+
+    def test_parallel_extraction(self) -> None:
+        """Test extraction on several processes keeps order and dedupe."""
+
+        def lines() -> Iterator[Union[str, MappedChunk]]:
+            """Yield a text line followed by the windows of the file."""
+            yield "e.example z.example"
+            yield from iter_mapped_chunks(self.path, size=48)
+
+        expected = list(iter_extract(lines(), extract_hosts))
+        self.assertEqual(
+            list(iter_extract(lines(), extract_hosts, jobs=2)), expected
+        )
+        self.assertEqual(len(expected), 6)
+
+
+class TestIterHelpers(unittest.TestCase):
+    """Test peek_iter and iter_extract."""
+
+    def test_peek_iter(self) -> None:
+        """Test the first item is kept and empty inputs give None."""
+        items = peek_iter(x for x in [1, 2, 3])
+        assert items is not None
+        self.assertEqual(list(items), [1, 2, 3])
+        empty: Iterator[str] = iter([])
+        self.assertIsNone(peek_iter(empty))
+
+    def test_iter_extract(self) -> None:
+        """Test matches stream in input order, deduplicated by default."""
+        lines = ["a.com 1.2.3.4", "b.com a.com"]
+        self.assertEqual(
+            list(iter_extract(lines, extract_domains)), ["a.com", "b.com"]
+        )
+        self.assertEqual(
+            list(iter_extract(lines, extract_domains, unique=False)),
+            ["a.com", "b.com", "a.com"],
+        )
+
+    def test_iter_extract_is_lazy(self) -> None:
+        """Test lines are consumed only as matches are requested."""
+        consumed: List[str] = []
+
+        def lines() -> Any:
+            for line in ["a.com", "b.com"]:
+                consumed.append(line)
+                yield line
+
+        matches = iter_extract(lines(), extract_domains)
+        self.assertEqual(next(matches), "a.com")
+        self.assertEqual(consumed, ["a.com"])
+
+
 class TestRegexExtraction(unittest.TestCase):
     """Test regex extraction functions."""
 
@@ -349,6 +730,15 @@ class TestRegexExtraction(unittest.TestCase):
             extract_ip_addrs(self.text, unique=True), expected_result
         )
 
+    def test_extract_ip_addrs_parsed(self) -> None:
+        """Test extract_ip_addrs returns parsed values when requested."""
+        text = self.text + " 12:30:45 2001:db8:85a3:0:0:8a2e:370:7334"
+        result = extract_ip_addrs(text, unique=True, parsed=True)
+        self.assertEqual(
+            [str(ip) for ip in result],
+            ["192.168.0.1", "2001:db8:85a3::8a2e:370:7334"],
+        )
+
     def test_extract_emails(self) -> None:
         """Test extract_emails."""
         expected_result = ["test@domain.com"]
@@ -361,6 +751,107 @@ class TestRegexExtraction(unittest.TestCase):
         expected_result = ["http://domain.com"]
         self.assertEqual(extract_urls(self.text, unique=True), expected_result)
 
+    def test_unique_keeps_first_appearance_order(self) -> None:
+        """Test unique matches keep the order of their first appearance."""
+        text = " ".join("h%d.com" % (i % 50) for i in range(5000))
+        self.assertEqual(
+            extract_domains(text, unique=True),
+            ["h%d.com" % i for i in range(50)],
+        )
+
+    def test_normalized_unique(self) -> None:
+        """Test the normalized mode folds case and IPv6 spellings."""
+        text = (
+            "A.com a.COM 2001:DB8:0:0:0:0:0:1 2001:0db8:0000:0:0:0:0:1 "
+            "Bob@A.COM bob@a.com"
+        )
+        self.assertEqual(
+            extract_domains(text, unique=True, normalize=True),
+            ["A.com"],
+        )
+        self.assertEqual(
+            extract_ipv6_addrs(text, unique=True, normalize=True),
+            ["2001:DB8:0:0:0:0:0:1"],
+        )
+        self.assertEqual(
+            extract_emails(text, unique=True, normalize=True),
+            ["Bob@A.COM", "bob@a.com"],
+        )
+        self.assertEqual(len(extract_domains(text, unique=True)), 4)
+
+    def test_indicator_key(self) -> None:
+        """Test normalized keys per kind."""
+        self.assertEqual(indicator_key("domain", "Ex.COM"), "ex.com")
+        self.assertEqual(indicator_key("ipv6", "::FFFF:0:1"), "::ffff:0:1")
+        self.assertEqual(indicator_key("ipv6", "1:2:"), "1:2:")
+        self.assertEqual(indicator_key("email", "Me@Ex.COM"), "Me@ex.com")
+        self.assertEqual(indicator_key("url", "HTTP://X.com"), "HTTP://X.com")
+
+
+class TestExtractIndicators(unittest.TestCase):
+    """Test the single-pass indicator extractor."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures, if any."""
+        self.text = (
+            "Test text with domain.com, 192.168.0.1, "
+            "2001:0db8:85a3:0000:0000:8a2e:0370:7334, test@domain.com, "
+            "and http://domain.com/page.html ::ffff:10.0.0.1"
+        )
+
+    def test_all_kinds(self) -> None:
+        """Test every kind is found once, with its position."""
+        result = extract_indicators(self.text)
+        self.assertEqual(
+            [(i.kind, i.value) for i in result],
+            [
+                ("domain", "domain.com"),
+                ("ipv4", "192.168.0.1"),
+                ("ipv6", "2001:0db8:85a3:0000:0000:8a2e:0370:7334"),
+                ("email", "test@domain.com"),
+                ("url", "http://domain.com/page.html"),
+                ("ipv6", "::ffff:10.0.0.1"),
+            ],
+        )
+        for indicator in result:
+            self.assertEqual(
+                self.text[indicator.start : indicator.end], indicator.value
+            )
+
+    def test_embedded_hosts(self) -> None:
+        """Test hosts of unrequested containers are reported on their own."""
+        result = extract_indicators(self.text, ["domain", "ipv4"], unique=True)
+        self.assertEqual(
+            [(i.kind, i.value) for i in result],
+            [
+                ("domain", "domain.com"),
+                ("ipv4", "192.168.0.1"),
+                ("ipv4", "10.0.0.1"),
+            ],
+        )
+
+    def test_url_ends_at_whitespace(self) -> None:
+        """Test a URL does not swallow the rest of the line."""
+        result = extract_indicators("get http://a.com/x then b.org", ["url"])
+        self.assertEqual([i.value for i in result], ["http://a.com/x"])
+
+    def test_unknown_kind(self) -> None:
+        """Test unknown kinds are rejected."""
+        with self.assertRaises(ValueError):
+            extract_indicators(self.text, ["hash"])
+
+    def test_extract_hosts(self) -> None:
+        """Test hosts are parsed and deduplicated in input order."""
+        self.assertEqual(
+            [str(h) for h in extract_hosts(self.text, unique=True)],
+            [
+                "domain.com",
+                "192.168.0.1",
+                "2001:db8:85a3::8a2e:370:7334",
+                "::ffff:a00:1",
+            ],
+        )
+
 
 class TestEmitJson(unittest.TestCase):
     """Test suite for emit_json helper."""
@@ -406,6 +897,111 @@ class TestEmitJson(unittest.TestCase):
         self.assertIsInstance(data["ts"], str)
 
 
+class TestEmitJsonStream(unittest.TestCase):
+    """Test suite for emit_json_stream helper."""
+
+    def _capture(self, items: Any, jsonl: bool = False) -> str:
+        """Run emit_json_stream and return everything it printed."""
+        from io import StringIO
+
+        buf = StringIO()
+        with patch(
+            "click.echo",
+            side_effect=lambda s, nl=True: buf.write(s + ("\n" if nl else "")),
+        ):
+            emit_json_stream(items, jsonl=jsonl)
+        return buf.getvalue()
+
+    def test_matches_emit_json(self) -> None:
+        """Test that streamed output is identical to emit_json output."""
+        import json
+
+        items = [{"input": "1.2.3.4", "nested": {"a": [1, 2]}}, {"b": None}]
+        expected = json.dumps(items, indent=2, default=str) + "\n"
+        self.assertEqual(self._capture(iter(items)), expected)
+
+    def test_empty(self) -> None:
+        """Test that an empty iterable produces an empty JSON array."""
+        self.assertEqual(self._capture(iter([])), "[]\n")
+
+    def test_compact(self) -> None:
+        """Test that the compact array matches compact emit_json output."""
+        items = [{"input": "1.2.3.4", "nested": {"a": [1, 2]}}, {"b": None}]
+        buf = io.StringIO()
+        with patch(
+            "click.echo",
+            side_effect=lambda s, nl=True: buf.write(s + ("\n" if nl else "")),
+        ):
+            emit_json_stream(iter(items), compact=True)
+            emit_json_stream(iter([]), compact=True)
+            emit_json(items, compact=True)
+        streamed, empty, whole = buf.getvalue().splitlines()
+        self.assertEqual(streamed, whole)
+        self.assertEqual(json.loads(streamed), items)
+        self.assertEqual(empty, "[]")
+
+    def test_jsonl(self) -> None:
+        """Test that NDJSON output writes one compact document per line."""
+        import json
+
+        items = [{"input": "1.2.3.4", "nested": {"a": [1, 2]}}, {"b": None}]
+        lines = self._capture(iter(items), jsonl=True).splitlines()
+        self.assertEqual([json.loads(line) for line in lines], items)
+        self.assertEqual(self._capture(iter([]), jsonl=True), "")
+
+    def test_jsonl_is_incremental(self) -> None:
+        """Test that each NDJSON line is written before the next item."""
+        written: List[str] = []
+
+        def items() -> Iterator[int]:
+            """Yield items, recording how much was written beforehand."""
+            for item in range(3):
+                self.assertEqual(len(written), item)
+                yield item
+
+        with patch("click.echo", side_effect=written.append):
+            emit_json_stream(items(), jsonl=True)
+        self.assertEqual(written, ["0", "1", "2"])
+
+
+class TestMapConcurrent(unittest.TestCase):
+    """Test suite for map_concurrent helper."""
+
+    def test_serial(self) -> None:
+        """Test that a single worker maps in order."""
+        self.assertEqual(list(map_concurrent(str, [1, 2, 3])), ["1", "2", "3"])
+
+    def test_ordered_with_workers(self) -> None:
+        """Test that ordered results follow input order."""
+        from time import sleep
+
+        def slow(x: int) -> int:
+            sleep(0.01 * (5 - x))
+            return x * 10
+
+        result = list(map_concurrent(slow, range(5), workers=3))
+        self.assertEqual(result, [0, 10, 20, 30, 40])
+
+    def test_unordered_yields_every_result(self) -> None:
+        """Test that unordered mode yields each result exactly once."""
+        result = map_concurrent(lambda x: x, range(20), 4, ordered=False)
+        self.assertEqual(sorted(result), list(range(20)))
+
+    def test_exception_propagates(self) -> None:
+        """Test that an exception raised by func reaches the consumer."""
+
+        def boom(x: int) -> int:
+            raise RuntimeError(x)
+
+        with self.assertRaises(RuntimeError):
+            list(map_concurrent(boom, [1, 2], workers=2))
+
+    def test_processes(self) -> None:
+        """Test picklable work runs on a process pool in order."""
+        result = map_concurrent(abs, [-1, -2, -3], workers=2, processes=True)
+        self.assertEqual(list(result), [1, 2, 3])
+
+
 class TestParseJsonStdin(unittest.TestCase):
     """Test suite for parse_json_stdin helper."""
 
@@ -444,6 +1040,80 @@ class TestParseJsonStdin(unittest.TestCase):
             parse_json_stdin('[{"foo": "bar"}]', bad_extractor)
 
 
+class TestIterJsonValues(unittest.TestCase):
+    """Test suite for iter_json_values helper."""
+
+    def test_shapes(self) -> None:
+        """Test NDJSON, arrays and pretty-printed arrays are all accepted."""
+        for text in (
+            '{"a": 1}\n{"a": 2}\n',
+            '[{"a": 1}, {"a": 2}]',
+            json.dumps([{"a": 1}, {"a": 2}], indent=2),
+            '[{"a": 1}]\n\n[]\n{"a": 2}',
+        ):
+            with self.subTest(text=text):
+                values = list(iter_json_values(io.StringIO(text), size=4))
+                self.assertEqual(values, [{"a": 1}, {"a": 2}])
+
+    def test_scalars_split_across_reads(self) -> None:
+        """Test values cut by the read size are joined back together."""
+        text = '[12345, "a long string", [1, [2]], null]\n67890'
+        self.assertEqual(
+            list(iter_json_values(io.StringIO(text), size=3)),
+            [12345, "a long string", [1, [2]], None, 67890],
+        )
+
+    def test_incremental(self) -> None:
+        """Test each element is yielded before the rest is read."""
+        stream = MagicMock()
+        stream.readline.side_effect = ['[{"a": 1},\n', OSError("blocked")]
+        values = iter_json_values(stream)
+        self.assertEqual(next(values), {"a": 1})
+        with self.assertRaises(OSError):
+            next(values)
+
+    def test_invalid(self) -> None:
+        """Test malformed input raises JSONDecodeError."""
+        for text in ("[1 2]", "[1,", "[1,]", "]", "{", "nope"):
+            with self.subTest(text=text):
+                with self.assertRaises(json.JSONDecodeError):
+                    list(iter_json_values(io.StringIO(text)))
+
+
+class TestIterJsonStdin(unittest.TestCase):
+    """Test suite for iter_json_stdin helper."""
+
+    def test_extracts_each_object(self) -> None:
+        """Test the extractor is applied object by object."""
+        calls: List[List[Any]] = []
+
+        def extractor(data: List[Any]) -> Tuple[str, ...]:
+            """Record the call and return the input fields."""
+            calls.append(data)
+            return tuple(str(e["input"]) for e in data)
+
+        stream = io.StringIO('{"input": "a.com"}\n{"input": "b.com"}\n')
+        self.assertEqual(
+            list(iter_json_stdin(stream, extractor)), ["a.com", "b.com"]
+        )
+        self.assertEqual(calls, [[{"input": "a.com"}], [{"input": "b.com"}]])
+
+    def test_errors_raise_usage_error(self) -> None:
+        """Test invalid JSON and unrecognised schemas raise UsageError."""
+
+        def bad_extractor(data: List[Any]) -> Tuple[str, ...]:
+            """Reject every object."""
+            raise ValueError("unrecognised schema")
+
+        for text, extractor in (
+            ("not json", lambda data: ()),
+            ('[{"foo": "bar"}]', bad_extractor),
+        ):
+            with self.subTest(text=text):
+                with self.assertRaises(click.UsageError):
+                    list(iter_json_stdin(io.StringIO(text), extractor))
+
+
 class TestParseInputMethodsJsonMode(unittest.TestCase):
     """Tests for parse_input_methods JSON-piping path."""
 
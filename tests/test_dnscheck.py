@@ -98,6 +98,30 @@ class TestDnscheckJson(unittest.TestCase):
         self.assertIn("A", records)
         self.assertIn("MX", records)
 
+    @patch("valkyrie_tools.dnscheck.get_dns_records")
+    def test_jsonl_output(self, mock_get_dns_records: MagicMock) -> None:
+        """Test --jsonl writes one JSON object per line."""
+        mock_get_dns_records.return_value = [("A", "1.2.3.4")]
+        result = self.runner.invoke(
+            cli, ["--jsonl", "example.com", "example.org"]
+        )
+        self.assertEqual(result.exit_code, 0)
+        data = [json.loads(line) for line in result.output.splitlines()]
+        self.assertEqual(
+            [entry["input"] for entry in data], ["example.com", "example.org"]
+        )
+
+    @patch("valkyrie_tools.dnscheck.get_dns_records")
+    def test_jsonl_piped_input_extractor(
+        self, mock_get_dns_records: MagicMock
+    ) -> None:
+        """Test --jsonl reads upstream JSON like --json does."""
+        mock_get_dns_records.return_value = [("A", "5.6.7.8")]
+        upstream = json.dumps([{"input": "example.com"}])
+        result = self.runner.invoke(cli, ["--jsonl"], input=upstream)
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(json.loads(result.output)["input"], "example.com")
+
     @patch("valkyrie_tools.dnscheck.get_dns_records")
     def test_json_piped_input_extractor(
         self, mock_get_dns_records: MagicMock
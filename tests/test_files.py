@@ -11,13 +11,30 @@ from unittest.mock import Mock, patch
 from click.testing import CliRunner
 
 from valkyrie_tools.files import (
+    compression_format,
+    get_cache_dir,
     is_binary_file,
     is_file_descriptor,
+    open_compressed,
     path_exists,
     read_file,
 )
 
 
+class TestGetCacheDirFunction(unittest.TestCase):
+    """Test get_cache_dir function."""
+
+    def test_creates_directory(self) -> None:
+        """Test the cache directory is created on demand."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache")
+            with patch(
+                "valkyrie_tools.files.user_cache_dir", return_value=path
+            ):
+                self.assertEqual(get_cache_dir(), path)
+            self.assertTrue(os.path.isdir(path))
+
+
 class TestPathExistsFunction(unittest.TestCase):
     """Test path exists function."""
 
@@ -168,6 +185,69 @@ class TestBinaryFileFunction(unittest.TestCase):
             self.assertFalse(is_binary_file(tmp_dir_name))
 
 
+class TestCompressedFileFunctions(unittest.TestCase):
+    """Test compressed file functions."""
+
+    TEXT = "café 192.0.2.1\n" * 3
+
+    def setUp(self) -> None:
+        """Setup fixtures."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def _write(self, data: bytes) -> str:
+        """Write ``data`` to a file without an extension."""
+        path = os.path.join(self.tmp_dir.name, "archive%d" % len(data))
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_formats(self) -> None:
+        """Test every format is detected and streamed back as text."""
+        import bz2
+        import gzip
+        import lzma
+
+        data = self.TEXT.encode()
+        for name, packed, copies in (
+            ("gzip", gzip.compress(data) + gzip.compress(data), 2),
+            ("bzip2", bz2.compress(data), 1),
+            ("xz", lzma.compress(data), 1),
+        ):
+            with self.subTest(name=name):
+                path = self._write(packed)
+                self.assertEqual(compression_format(path), name)
+                with open_compressed(path) as f:
+                    self.assertEqual(f.read(), self.TEXT * copies)
+
+    def test_zstd(self) -> None:
+        """Test Zstandard frames are read one after the other."""
+        try:
+            import zstandard  # type: ignore[import-not-found,unused-ignore]
+        except ImportError:  # pragma: no cover
+            self.skipTest("zstandard is not installed")
+
+        frame = zstandard.ZstdCompressor().compress(self.TEXT.encode())
+        path = self._write(frame + frame)
+        self.assertEqual(compression_format(path), "zstd")
+        with open_compressed(path) as f:
+            self.assertEqual(f.read(), self.TEXT * 2)
+
+    @patch("importlib.import_module", side_effect=ImportError)
+    def test_zstd_missing(self, mock_import: Mock) -> None:
+        """Test a missing zstandard package raises OSError."""
+        path = self._write(b"\x28\xb5\x2f\xfd" + b"\x00" * 8)
+        with self.assertRaises(OSError):
+            open_compressed(path)
+
+    def test_not_compressed(self) -> None:
+        """Test plain and unreadable files are not treated as compressed."""
+        self.assertIsNone(compression_format(__file__))
+        self.assertIsNone(compression_format(self.tmp_dir.name))
+        with self.assertRaises(OSError):
+            open_compressed(__file__)
+
+
 class TestFileDescriptorFunction(unittest.TestCase):
     """Test file descriptor functions."""
 
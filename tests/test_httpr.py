@@ -9,6 +9,7 @@ from requests.exceptions import ConnectionError
 
 from valkyrie_tools.httpr import (
     DEFAULT_REQUEST_HEADERS,
+    MAX_BACKOFF,
     DEFAULT_USER_AGENT,
     USER_AGENT_LIST,
     build_full_url,
@@ -18,7 +19,9 @@ from valkyrie_tools.httpr import (
     get_http_version,
     get_http_version_text,
     get_next_url,
+    get_with_retry,
     make_request,
+    parse_retry_after,
 )
 
 META_REFRESH_HTML = '<html><head><meta http-equiv="refresh" content="0;URL=\'%s\'" /> </head></html>'  # noqa: B950
@@ -548,3 +551,82 @@ class TestBuildRedirectChain(unittest.TestCase):
         self.assertEqual(result[0][0], url)
         self.assertIsInstance(result[0][1], ConnectionError)
         self.assertEqual(str(result[0][1]), "Failed to resolve")
+
+
+class TestParseRetryAfter(unittest.TestCase):
+    """Test for valkyrie_tools.httpr.parse_retry_after function."""
+
+    def test_seconds(self) -> None:
+        """Test a delay expressed in seconds."""
+        self.assertEqual(parse_retry_after("3"), 3.0)
+
+    def test_http_date_in_past(self) -> None:
+        """Test an HTTP-date in the past is clamped to zero."""
+        self.assertEqual(
+            parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0
+        )
+
+    def test_missing_or_invalid(self) -> None:
+        """Test that missing and garbage values return None."""
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("later"))
+
+
+class TestGetWithRetry(unittest.TestCase):
+    """Test for valkyrie_tools.httpr.get_with_retry function."""
+
+    @staticmethod
+    def _response(status_code: int, retry_after: Any = None) -> Mock:
+        """Build a mock response."""
+        response = Mock()
+        response.status_code = status_code
+        response.headers = (
+            {} if retry_after is None else {"Retry-After": retry_after}
+        )
+        return response
+
+    @patch("valkyrie_tools.httpr.sleep")
+    @patch("valkyrie_tools.httpr.requests.get")
+    def test_honours_retry_after(
+        self, mock_get: Mock, mock_sleep: Mock
+    ) -> None:
+        """Test that a 429 is retried after the Retry-After delay."""
+        mock_get.side_effect = [self._response(429, "2"), self._response(200)]
+        response = get_with_retry("https://example.com", timeout=5)
+        self.assertEqual(response.status_code, 200)
+        mock_sleep.assert_called_once_with(2.0)
+        mock_get.assert_called_with("https://example.com", timeout=5)
+
+    @patch("valkyrie_tools.httpr.sleep")
+    @patch("valkyrie_tools.httpr.requests.get")
+    def test_exponential_backoff(
+        self, mock_get: Mock, mock_sleep: Mock
+    ) -> None:
+        """Test exponential back-off without Retry-After, capped and bounded."""
+        mock_get.return_value = self._response(429)
+        response = get_with_retry("https://example.com", max_retries=2)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(
+            [c.args[0] for c in mock_sleep.call_args_list], [1.0, 2.0]
+        )
+
+    @patch("valkyrie_tools.httpr.sleep")
+    @patch("valkyrie_tools.httpr.requests.get")
+    def test_backoff_is_capped(self, mock_get: Mock, mock_sleep: Mock) -> None:
+        """Test that a huge Retry-After is capped at MAX_BACKOFF."""
+        mock_get.side_effect = [
+            self._response(429, "86400"),
+            self._response(200),
+        ]
+        get_with_retry("https://example.com")
+        mock_sleep.assert_called_once_with(MAX_BACKOFF)
+
+    @patch("valkyrie_tools.httpr.requests.get")
+    def test_uses_session(self, mock_get: Mock) -> None:
+        """Test that a given session is used instead of requests.get."""
+        session = Mock()
+        session.get.return_value = self._response(200)
+        get_with_retry("https://example.com", session=session, timeout=5)
+        session.get.assert_called_once_with("https://example.com", timeout=5)
+        mock_get.assert_not_called()
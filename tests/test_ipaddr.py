@@ -13,12 +13,16 @@ from valkyrie_tools.ipaddr import (
     FASTLY_IP_RANGES_ENDPOINT,
     IPINFO_API_ENDPOINT,
     TOR_PROJECT_NODE_ENDPOINT,
+    IPAddr,
+    PrefixIndex,
     get_aws_ip_ranges,
     get_cloudflare_ip_ranges,
     get_cloudflare_range,
     get_fastly_ip_ranges,
     get_ip_info,
+    get_ip_prefix_info,
     get_net_size,
+    ip_info_prefix_cache,
     get_tor_node_ip_addrs,
     is_aws_ip_addr,
     is_cloudflare_ip_addr,
@@ -29,9 +33,91 @@ from valkyrie_tools.ipaddr import (
     is_ipv6_addr,
     is_private_ip,
     is_valid_ip_addr,
+    parse_network,
+    to_ip_addr,
 )
 
 
+class TestIPAddr(unittest.TestCase):
+    """Test case class for the `IPAddr` value type."""
+
+    def test_parse_ipv4(self) -> None:
+        """Parses an IPv4 address into an integer and family."""
+        ip = IPAddr.parse("192.168.1.1")
+        assert ip is not None
+        self.assertEqual(ip.version, 4)
+        self.assertEqual(int(ip), 3232235777)
+        self.assertEqual(str(ip), "192.168.1.1")
+        self.assertTrue(ip.is_ipv4)
+        self.assertFalse(ip.is_ipv6)
+
+    def test_parse_ipv6_is_canonical(self) -> None:
+        """Different spellings of an IPv6 address compare equal."""
+        a = IPAddr.parse("2001:0db8:0000:0000:0000:0000:0000:0001")
+        b = IPAddr.parse("2001:db8::1")
+        self.assertEqual(a, b)
+        self.assertEqual(hash(a), hash(b))
+        self.assertEqual(str(a), "2001:db8::1")
+        self.assertEqual(repr(a), "IPAddr('2001:db8::1')")
+
+    def test_parse_invalid(self) -> None:
+        """Returns None for invalid input."""
+        self.assertIsNone(IPAddr.parse("foobar"))
+        self.assertIsNone(IPAddr.parse(12345))  # type: ignore[arg-type]
+
+    def test_is_slotted(self) -> None:
+        """Instances do not carry a per-instance dict."""
+        ip = IPAddr.parse("1.1.1.1")
+        self.assertFalse(hasattr(ip, "__dict__"))
+
+    def test_ordering_and_equality(self) -> None:
+        """Orders by family then value; never equals a plain string."""
+        v4 = IPAddr.parse("10.0.0.1")
+        v6 = IPAddr.parse("::1")
+        assert v4 is not None and v6 is not None
+        self.assertLess(v4, v6)
+        self.assertNotEqual(v4, "10.0.0.1")
+
+    def test_classification(self) -> None:
+        """Private and reverse pointer properties use the parsed value."""
+        ip = IPAddr.parse("10.1.2.3")
+        assert ip is not None
+        self.assertTrue(ip.is_private)
+        self.assertEqual(ip.reverse_pointer, "3.2.1.10.in-addr.arpa")
+
+    def test_in_network(self) -> None:
+        """Checks membership against a parsed network."""
+        ip = IPAddr.parse("192.0.2.10")
+        assert ip is not None
+        network = parse_network("192.0.2.0/24")
+        other_family = parse_network("2001:db8::/32")
+        assert network is not None and other_family is not None
+        self.assertTrue(ip.in_network(network))
+        self.assertFalse(ip.in_network(other_family))
+
+    def test_to_ip_addr_passthrough(self) -> None:
+        """Already-parsed values are returned unchanged."""
+        ip = IPAddr.parse("8.8.8.8")
+        self.assertIs(to_ip_addr(ip), ip)  # type: ignore[arg-type]
+        self.assertEqual(to_ip_addr("8.8.8.8"), ip)
+
+    def test_helpers_accept_parsed_values(self) -> None:
+        """Validators accept IPAddr values without re-parsing."""
+        ip = IPAddr.parse("2001:db8::1")
+        assert ip is not None
+        with patch("valkyrie_tools.ipaddr.ipaddress.ip_address") as mock_parse:
+            self.assertTrue(is_valid_ip_addr(ip))
+            self.assertTrue(is_ipv6_addr(ip))
+            self.assertFalse(is_ipv4_addr(ip))
+            self.assertFalse(is_private_ip(ip))
+            self.assertTrue(is_ip_in_cidr(ip, "2001:db8::/32"))
+        mock_parse.assert_not_called()
+
+    def test_parse_network_invalid(self) -> None:
+        """Returns None for an invalid network."""
+        self.assertIsNone(parse_network("192.168.1.1/24"))
+
+
 class TestIsIpv4Addr(unittest.TestCase):
     """Test case class for testing the `is_ipv4_addr` function."""
 
@@ -393,6 +479,108 @@ class TestGetIpInfo(unittest.TestCase):
         mock_response.raise_for_status.assert_called_once()
 
 
+class TestPrefixIndex(unittest.TestCase):
+    """Test suite for the PrefixIndex class."""
+
+    def test_longest_prefix_wins(self) -> None:
+        """The most specific containing network is returned."""
+        index = PrefixIndex()
+        self.assertTrue(index.insert("10.0.0.0/8", "wide"))
+        self.assertTrue(index.insert("10.1.0.0/16", "narrow"))
+        self.assertEqual(index.lookup("10.1.2.3"), "narrow")
+        self.assertEqual(index.lookup("10.2.0.1"), "wide")
+        self.assertIsNone(index.lookup("11.0.0.1"))
+        self.assertEqual(len(index), 2)
+
+    def test_families_are_separate(self) -> None:
+        """IPv4 and IPv6 networks never match each other."""
+        index = PrefixIndex()
+        index.insert("::/0", "v6")
+        self.assertIsNone(index.lookup("1.2.3.4"))
+        self.assertEqual(index.lookup("2001:db8::1"), "v6")
+
+    def test_invalid_input(self) -> None:
+        """Invalid networks are rejected and invalid IPs never match."""
+        index = PrefixIndex()
+        self.assertFalse(index.insert("not-a-cidr", "x"))
+        self.assertIsNone(index.lookup("not-an-ip"))
+
+    @patch("valkyrie_tools.ipaddr.monotonic")
+    def test_ttl_expiry(self, mock_monotonic: MagicMock) -> None:
+        """Entries expire after the configured ttl."""
+        index = PrefixIndex(ttl=10)
+        mock_monotonic.return_value = 100.0
+        index.insert("192.0.2.0/24", "x")
+        mock_monotonic.return_value = 105.0
+        self.assertEqual(index.lookup("192.0.2.1"), "x")
+        mock_monotonic.return_value = 111.0
+        self.assertIsNone(index.lookup("192.0.2.1"))
+        self.assertEqual(len(index), 0)
+
+    def test_clear(self) -> None:
+        """clear() removes every network."""
+        index = PrefixIndex()
+        index.insert("192.0.2.0/24", "x")
+        index.clear()
+        self.assertIsNone(index.lookup("192.0.2.1"))
+
+
+class TestGetIpPrefixInfo(unittest.TestCase):
+    """Test suite for the get_ip_prefix_info function."""
+
+    def setUp(self) -> None:
+        """Start each test with an empty prefix cache."""
+        ip_info_prefix_cache.clear()
+
+    @patch("valkyrie_tools.ipaddr.get_ip_info")
+    def test_siblings_share_lookup(self, mock_get_ip_info: MagicMock) -> None:
+        """Addresses in the same /24 reuse the first lookup."""
+        mock_get_ip_info.return_value = {
+            "ip": "8.8.8.8",
+            "hostname": "dns.google",
+            "org": "AS15169 Google LLC",
+            "country": "US",
+        }
+        first = get_ip_prefix_info("8.8.8.8")
+        second = get_ip_prefix_info("8.8.8.4")
+        mock_get_ip_info.assert_called_once()
+        self.assertEqual(
+            second,
+            {
+                "ip": "8.8.8.4",
+                "org": "AS15169 Google LLC",
+                "country": "US",
+                "prefix": "8.8.8.0/24",
+            },
+        )
+        assert first is not None
+        self.assertNotIn("hostname", first)
+
+    @patch("valkyrie_tools.ipaddr.get_ip_info")
+    def test_uses_announced_route(self, mock_get_ip_info: MagicMock) -> None:
+        """The ipinfo asn.route is used as the cache key when present."""
+        mock_get_ip_info.return_value = {
+            "asn": {"asn": "AS13335", "route": "1.0.0.0/16"},
+            "country": "AU",
+        }
+        info = get_ip_prefix_info("1.0.200.1")
+        assert info is not None
+        self.assertEqual(info["prefix"], "1.0.0.0/16")
+        get_ip_prefix_info("1.0.3.3")
+        mock_get_ip_info.assert_called_once()
+
+    @patch("valkyrie_tools.ipaddr.get_ip_info")
+    def test_uncached_and_missing(self, mock_get_ip_info: MagicMock) -> None:
+        """cached=False refetches; invalid or empty results return None."""
+        mock_get_ip_info.return_value = {"country": "US"}
+        get_ip_prefix_info("2001:db8::1")
+        get_ip_prefix_info("2001:db8::2", cached=False)
+        self.assertEqual(mock_get_ip_info.call_count, 2)
+        self.assertIsNone(get_ip_prefix_info("foo"))
+        mock_get_ip_info.return_value = None
+        self.assertIsNone(get_ip_prefix_info("9.9.9.9"))
+
+
 class TestGetTorNodeIpAddrs(unittest.TestCase):
     """Test the get_tor_node_ip_addrs function."""
 
@@ -603,6 +791,28 @@ class TestIsAwsIpAddr(unittest.TestCase):
         # Assert
         self.assertTrue(result)
 
+    @patch("valkyrie_tools.ipaddr.get_aws_ip_ranges")
+    def test_is_aws_ip_addr_parses_ranges_once(
+        self, mock_get_aws_ip_ranges: MagicMock
+    ) -> None:
+        """Test a large range list is parsed once per download."""
+        # Arrange
+        ranges = [
+            {"prefix": "3.%d.%d.0/24" % (i >> 8, i & 255), "region": "x"}
+            for i in range(10000)
+        ]
+        mock_get_aws_ip_ranges.return_value = ranges
+        self.assertTrue(is_aws_ip_addr("3.0.5.1"))
+        misses = parse_network.cache_info().misses
+        # Act
+        found = [is_aws_ip_addr("3.39.%d.1" % i) for i in range(16)]
+        # Assert
+        self.assertEqual(found, [True] * 16)
+        self.assertFalse(is_aws_ip_addr("3.40.0.1"))
+        self.assertEqual(parse_network.cache_info().misses, misses)
+        mock_get_aws_ip_ranges.return_value = [{"prefix": "3.40.0.0/16"}]
+        self.assertTrue(is_aws_ip_addr("3.40.0.1"))
+
     @patch("valkyrie_tools.ipaddr.get_aws_ip_ranges")
     def test_is_aws_invalid_ip_addr(
         self, mock_get_aws_ip_ranges: MagicMock
@@ -799,7 +1009,7 @@ class TestGetFastlyIpRanges(unittest.TestCase):
         # Act
         result = get_fastly_ip_ranges()
         # Assert
-        self.assertEqual(result, list(self.mock_results.values()))
+        self.assertEqual(result, self.mock_ipv4_result + self.mock_ipv6_result)
 
     @patch("valkyrie_tools.ipaddr.requests.get")
     def test_get_fastly_ip_ranges_failure(self, mock_get: MagicMock) -> None:
@@ -867,6 +1077,21 @@ class TestIsFastlyIpAddr(unittest.TestCase):
         # Assert
         self.assertTrue(result)
 
+    @patch("valkyrie_tools.ipaddr.requests.get")
+    def test_is_fastly_ip_addr_published_payload(
+        self, mock_get: MagicMock
+    ) -> None:
+        """Test addresses are checked against the published JSON shape."""
+        # Arrange
+        mock_get.return_value.json.return_value = {
+            "addresses": ["23.235.32.0/20", "43.249.72.0/22"],
+            "ipv6_addresses": ["2a04:4e40::/32"],
+        }
+        # Act / Assert
+        self.assertTrue(is_fastly_ip_addr("23.235.33.1"))
+        self.assertTrue(is_fastly_ip_addr("2a04:4e40::1"))
+        self.assertFalse(is_fastly_ip_addr("8.8.8.8"))
+
     @patch("valkyrie_tools.ipaddr.get_fastly_ip_ranges")
     def test_is_fastly_invalid_ip_addr(
         self, mock_get_fastly_ip_ranges: MagicMock
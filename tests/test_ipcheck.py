@@ -2,8 +2,11 @@
 
 import json
 import unittest
+from typing import Any, Dict
 from unittest.mock import MagicMock, patch
 
+import requests
+
 from valkyrie_tools.ipcheck import (
     PRIVATE_IP_SKIP_MESSAGE,
     cli,
@@ -57,7 +60,7 @@ class TestIpcheck(BaseCommandTest, unittest.TestCase):
             "98.76.54.32": {"baz": "qux"},
         }
         mock_ips = list(mock_result.keys())
-        mock_get_ip_info.side_effect = lambda ip: mock_result[ip]
+        mock_get_ip_info.side_effect = lambda ip: mock_result[str(ip)]
         # Run the command
         result = self.runner.invoke(self.command, mock_ips)
 
@@ -101,6 +104,59 @@ class TestIpcheckJson(unittest.TestCase):
         self.assertEqual(data[0]["input"], "1.1.1.1")
         self.assertEqual(data[0]["hostname"], "one.one.one.one")
 
+    @patch("valkyrie_tools.ipcheck.get_rdns_record")
+    @patch("valkyrie_tools.ipaddr.get_ip_info")
+    def test_json_share_prefix(
+        self, mock_get_ip_info: MagicMock, mock_get_rdns_record: MagicMock
+    ) -> None:
+        """Test --share-prefix performs one ipinfo lookup per prefix."""
+        from valkyrie_tools.ipaddr import ip_info_prefix_cache
+
+        ip_info_prefix_cache.clear()
+        mock_get_ip_info.return_value = {"org": "AS64500 Example", "city": "X"}
+        mock_get_rdns_record.return_value = [("PTR", "host.example.")]
+        result = self.runner.invoke(
+            cli, ["--json", "-p", "-H", "203.0.113.1", "203.0.113.2"]
+        )
+        self.assertEqual(result.exit_code, 0)
+        data = json.loads(result.output)
+        mock_get_ip_info.assert_called_once()
+        self.assertEqual(data[1]["input"], "203.0.113.2")
+        self.assertEqual(data[1]["org"], "AS64500 Example")
+        self.assertEqual(data[1]["hostname"], "host.example")
+        self.assertNotIn("city", data[1])
+
+    @patch("valkyrie_tools.ipcheck.get_ip_info")
+    def test_json_request_error_is_per_entry(
+        self, mock_get_ip_info: MagicMock
+    ) -> None:
+        """Test that a failed lookup becomes an error entry, not an abort."""
+
+        def lookup(ip: object) -> Dict[str, Any]:
+            if str(ip) == "1.2.3.4":
+                raise requests.exceptions.HTTPError("429 Too Many Requests")
+            return {"city": "X"}
+
+        mock_get_ip_info.side_effect = lookup
+        result = self.runner.invoke(
+            cli, ["--json", "-w", "4", "1.2.3.4", "5.6.7.8"]
+        )
+        self.assertEqual(result.exit_code, 0)
+        data = json.loads(result.output)
+        self.assertEqual([d["input"] for d in data], ["1.2.3.4", "5.6.7.8"])
+        self.assertEqual(data[0]["error"], "429 Too Many Requests")
+        self.assertEqual(data[1]["city"], "X")
+
+    @patch("valkyrie_tools.ipcheck.get_ip_info")
+    def test_unordered_text_output(self, mock_get_ip_info: MagicMock) -> None:
+        """Test that --unordered prints every address."""
+        mock_get_ip_info.return_value = {"city": "X"}
+        ips = ["1.2.3.%d" % i for i in range(1, 9)]
+        result = self.runner.invoke(cli, ["-w", "3", "-u", *ips])
+        self.assertEqual(result.exit_code, 0)
+        for ip in ips:
+            self.assertIn("> %s" % ip, result.output)
+
     def test_json_private_ip_becomes_error_entry(self) -> None:
         """Test that a private IP produces an error entry in JSON mode."""
         result = self.runner.invoke(cli, ["--json", "192.168.1.1"])
@@ -137,6 +193,19 @@ class TestIpcheckJson(unittest.TestCase):
         data = json.loads(result.output)
         self.assertEqual(data[0]["input"], "1.2.3.4")
 
+    def test_jsonl_piped_dnscheck_output(self) -> None:
+        """Test that dnscheck --jsonl lines piped to ipcheck are handled."""
+        upstream = "\n".join(
+            json.dumps({"input": name, "records": {"A": [ip]}})
+            for name, ip in (("a.example", "1.2.3.4"), ("b.example", "5.6.7.8"))
+        )
+        with patch("valkyrie_tools.ipcheck.get_ip_info") as mock_info:
+            mock_info.return_value = {"city": "NYC"}
+            result = self.runner.invoke(cli, ["--jsonl"], input=upstream)
+        self.assertEqual(result.exit_code, 0)
+        data = [json.loads(line) for line in result.output.splitlines()]
+        self.assertEqual([e["input"] for e in data], ["1.2.3.4", "5.6.7.8"])
+
     def test_json_piped_unrecognised_schema_raises(self) -> None:
         """Test that unrecognised piped JSON raises a UsageError."""
         upstream = json.dumps([{"foo": "bar"}])
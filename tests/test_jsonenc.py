@@ -0,0 +1,93 @@
+"""Test suite for the jsonenc module."""
+
+import dataclasses
+import ipaddress
+import json
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, List
+
+from valkyrie_tools.ipaddr import IPAddr
+from valkyrie_tools.jsonenc import BACKEND, BACKENDS, dumps, json_default
+
+
+@dataclasses.dataclass
+class _Record:
+    """Dataclass fixture."""
+
+    name: str
+    addrs: List[Any]
+
+
+SAMPLE = [
+    {
+        "input": "example.com",
+        "creation_date": datetime(1995, 8, 14, 4, tzinfo=timezone.utc),
+        "updated_date": datetime(2024, 1, 2, 3, 4, 5, 678),
+        "expiration_date": date(2030, 1, 1),
+        "local": datetime(2001, 2, 3, tzinfo=timezone(timedelta(hours=9))),
+        "ips": [IPAddr.parse("192.0.2.1"), ipaddress.ip_address("2001:db8::1")],
+        "network": ipaddress.ip_network("198.51.100.0/24"),
+        "record": _Record("ns1.example.com", [IPAddr.parse("203.0.113.7")]),
+        "names": {"café.example", "x"} - {"x"},
+        1: None,
+        "nested": {"empty": [], "also": {}, "float": 1.5, "flag": True},
+    }
+]
+
+
+class TestDumps(unittest.TestCase):
+    """Test dumps."""
+
+    def test_native_values(self) -> None:
+        """Test dates, addresses and dataclasses are encoded natively."""
+        data = json.loads(dumps(SAMPLE, compact=True))[0]
+        self.assertEqual(data["creation_date"], "1995-08-14T04:00:00+00:00")
+        self.assertEqual(data["updated_date"], "2024-01-02T03:04:05.000678")
+        self.assertEqual(data["expiration_date"], "2030-01-01")
+        self.assertEqual(data["ips"], ["192.0.2.1", "2001:db8::1"])
+        self.assertEqual(data["network"], "198.51.100.0/24")
+        self.assertEqual(
+            data["record"],
+            {"name": "ns1.example.com", "addrs": ["203.0.113.7"]},
+        )
+        self.assertEqual(data["names"], "{'café.example'}")
+        self.assertIsNone(data["1"])
+
+    def test_backends_agree(self) -> None:
+        """Test every backend produces the same text in both layouts."""
+        for compact in (False, True):
+            with self.subTest(compact=compact):
+                texts = {
+                    dumps(SAMPLE, compact=compact, backend=backend)
+                    for backend in BACKENDS
+                }
+                self.assertEqual(len(texts), 1)
+
+    def test_layouts(self) -> None:
+        """Test the indented layout matches json.dumps(indent=2)."""
+        data = {"input": "example.com", "records": {"A": ["192.0.2.1"]}}
+        self.assertEqual(dumps(data), json.dumps(data, indent=2))
+        self.assertEqual(
+            dumps(data, compact=True),
+            '{"input":"example.com","records":{"A":["192.0.2.1"]}}',
+        )
+
+    def test_wide_integers_fall_back(self) -> None:
+        """Test values orjson rejects are encoded by the stdlib."""
+        self.assertEqual(dumps([1 << 70], compact=True), "[%d]" % (1 << 70))
+
+    def test_unknown_backend(self) -> None:
+        """Test an unavailable backend raises ValueError."""
+        with self.assertRaises(ValueError):
+            dumps([], backend="simplejson")
+        self.assertIn(BACKEND, BACKENDS)
+
+
+class TestJsonDefault(unittest.TestCase):
+    """Test json_default."""
+
+    def test_fallback_to_str(self) -> None:
+        """Test unknown values are converted with str."""
+        self.assertEqual(json_default(b"x"), "b'x'")
+        self.assertEqual(json_default(_Record), str(_Record))
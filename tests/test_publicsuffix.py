@@ -0,0 +1,144 @@
+"""Test suite for the valkyrie_tools.publicsuffix module."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from valkyrie_tools import publicsuffix
+from valkyrie_tools.publicsuffix import (
+    BUNDLED_PUBLIC_SUFFIX_LIST,
+    PublicSuffixList,
+    get_public_suffix_list,
+    refresh_public_suffix_list,
+    registered_domain,
+)
+
+RULES = """\
+// ===BEGIN ICANN DOMAINS===
+com
+uk
+co.uk
+jp
+*.kawasaki.jp
+!city.kawasaki.jp
+рф
+// ===END ICANN DOMAINS===
+// ===BEGIN PRIVATE DOMAINS===
+github.io
+// ===END PRIVATE DOMAINS===
+"""
+
+
+class TestPublicSuffixList(unittest.TestCase):
+    """Test suite for the PublicSuffixList class."""
+
+    def setUp(self) -> None:
+        """Compile the sample rules."""
+        self.psl = PublicSuffixList(RULES.splitlines())
+
+    def test_registered_domain(self) -> None:
+        """Test normal rules, including multi-label suffixes."""
+        self.assertEqual(
+            self.psl.registered_domain("www.Example.COM."), "example.com"
+        )
+        self.assertEqual(
+            self.psl.registered_domain("a.b.example.co.uk"), "example.co.uk"
+        )
+
+    def test_wildcard_and_exception_rules(self) -> None:
+        """Test wildcard rules and the exceptions overriding them."""
+        self.assertEqual(
+            self.psl.registered_domain("www.foo.kawasaki.jp"),
+            "www.foo.kawasaki.jp",
+        )
+        self.assertEqual(
+            self.psl.registered_domain("www.city.kawasaki.jp"),
+            "city.kawasaki.jp",
+        )
+        self.assertEqual(
+            self.psl.public_suffix("foo.kawasaki.jp"), "foo.kawasaki.jp"
+        )
+
+    def test_unlisted_tld_uses_implicit_rule(self) -> None:
+        """Test names under unknown TLDs fall back to the ``*`` rule."""
+        self.assertEqual(
+            self.psl.registered_domain("a.example.internal"),
+            "example.internal",
+        )
+
+    def test_public_suffix_has_no_registered_domain(self) -> None:
+        """Test a bare public suffix has no registrable domain."""
+        self.assertIsNone(self.psl.registered_domain("co.uk"))
+        self.assertIsNone(self.psl.registered_domain("com"))
+
+    def test_idn_rules_matched_as_punycode(self) -> None:
+        """Test internationalised rules match punycode input."""
+        self.assertEqual(
+            self.psl.registered_domain("www.example.xn--p1ai"),
+            "example.xn--p1ai",
+        )
+
+    def test_private_section(self) -> None:
+        """Test private suffixes apply only when requested."""
+        self.assertEqual(
+            self.psl.registered_domain("user.github.io"), "github.io"
+        )
+        private = PublicSuffixList(RULES.splitlines(), include_private=True)
+        self.assertEqual(
+            private.registered_domain("user.github.io"), "user.github.io"
+        )
+
+    def test_bundled_list(self) -> None:
+        """Test the bundled list compiles and resolves common names."""
+        psl = PublicSuffixList.from_file(BUNDLED_PUBLIC_SUFFIX_LIST)
+        self.assertEqual(psl.registered_domain("static.bbc.co.uk"), "bbc.co.uk")
+        self.assertEqual(registered_domain("mail.google.com"), "google.com")
+
+
+class TestRefreshPublicSuffixList(unittest.TestCase):
+    """Test suite for refresh_public_suffix_list."""
+
+    def setUp(self) -> None:
+        """Point the cache directory at a temporary directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = patch(
+            "valkyrie_tools.publicsuffix.get_cache_dir",
+            return_value=self.tmp.name,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(setattr, publicsuffix, "_default_list", None)
+
+    def test_refresh_from_local_file(self) -> None:
+        """Test an offline refresh from a local copy is used afterwards."""
+        source = os.path.join(self.tmp.name, "new.dat")
+        with open(source, "w", encoding="utf-8") as f:
+            f.write("example\n")
+
+        path = refresh_public_suffix_list(source)
+        self.assertTrue(os.path.isfile(path))
+        self.assertEqual(registered_domain("a.b.example"), "b.example")
+
+        publicsuffix._default_list = None
+        self.assertEqual(
+            get_public_suffix_list().registered_domain("a.b.example"),
+            "b.example",
+        )
+
+    @patch("valkyrie_tools.publicsuffix.requests.get")
+    def test_refresh_from_url(self, mock_get: MagicMock) -> None:
+        """Test the list is downloaded when given a URL."""
+        mock_get.return_value.text = "com\n"
+        refresh_public_suffix_list("https://example.com/psl.dat")
+        mock_get.return_value.raise_for_status.assert_called_once()
+        self.assertEqual(registered_domain("a.b.com"), "b.com")
+
+    def test_refresh_rejects_empty_list(self) -> None:
+        """Test a source without rules is rejected."""
+        source = os.path.join(self.tmp.name, "empty.dat")
+        with open(source, "w", encoding="utf-8") as f:
+            f.write("// nothing here\n")
+        with self.assertRaises(ValueError):
+            refresh_public_suffix_list(source)
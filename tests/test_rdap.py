@@ -0,0 +1,328 @@
+"""Test suite for the valkyrie_tools.rdap module."""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from unittest.mock import Mock, patch
+
+import requests
+
+from valkyrie_tools.rdap import (
+    BOOTSTRAP_RETRY_DELAY,
+    RDAPBootstrap,
+    domain_rdap_to_whois,
+    get_domain_rdap,
+    get_ip_rdap,
+    get_session,
+    ip_rdap_to_whois,
+    rdap_query,
+)
+
+DNS_SERVICES = [
+    [["com", "net"], ["http://rdap.verisign.com/com/v1/"]],
+    [["co.uk", "uk"], ["https://rdap.nominet.uk/uk/"]],
+]
+IPV4_SERVICES = [
+    [
+        ["8.0.0.0/8"],
+        ["http://rdap.arin.net/registry/", "https://rdap.arin.net/registry/"],
+    ],
+    [["8.8.0.0/16"], ["https://rdap.example.net"]],
+]
+
+IP_NETWORK = {
+    "objectClassName": "ip network",
+    "handle": "NET-8-8-8-0-2",
+    "name": "GOGL",
+    "startAddress": "8.8.8.0",
+    "endAddress": "8.8.8.255",
+    "cidr0_cidrs": [{"v4prefix": "8.8.8.0", "length": 24}],
+    "arin_originas0_originautnums": [15169],
+    "entities": [
+        {
+            "roles": ["registrant"],
+            "vcardArray": [
+                "vcard",
+                [
+                    ["version", {}, "text", "4.0"],
+                    ["fn", {}, "text", "Google LLC"],
+                    [
+                        "adr",
+                        {"label": "1600 Amphitheatre Parkway"},
+                        "text",
+                        [
+                            "",
+                            "",
+                            "1600 Amphitheatre Parkway",
+                            "Mountain View",
+                            "CA",
+                            "94043",
+                            "US",
+                        ],
+                    ],
+                ],
+            ],
+            "entities": [
+                {
+                    "roles": ["abuse"],
+                    "vcardArray": [
+                        "vcard",
+                        [["email", {}, "text", "network-abuse@google.com"]],
+                    ],
+                }
+            ],
+        }
+    ],
+}
+
+DOMAIN = {
+    "objectClassName": "domain",
+    "ldhName": "EXAMPLE.COM",
+    "status": ["client delete prohibited"],
+    "events": [
+        {"eventAction": "registration", "eventDate": "1995-08-14T04:00:00Z"},
+        {"eventAction": "expiration", "eventDate": "2030-08-13T04:00:00Z"},
+        {"eventAction": "last changed", "eventDate": "not a date"},
+    ],
+    "nameservers": [{"ldhName": "A.IANA-SERVERS.NET"}, {"handle": "x"}],
+    "entities": [
+        {
+            "roles": ["registrar"],
+            "vcardArray": ["vcard", [["fn", {}, "text", "RESERVED-IANA"]]],
+        },
+        {
+            "roles": ["registrant"],
+            "vcardArray": [
+                "vcard",
+                [
+                    ["fn", {}, "text", "Example Holder"],
+                    ["org", {}, "text", "Example Org"],
+                    ["email", {}, "text", "holder@example.com"],
+                    ["adr", {"label": "1 Main St\nSpringfield"}, "text", ""],
+                ],
+            ],
+        },
+    ],
+}
+
+
+def _response(
+    status_code: int, body: Any = None, headers: Optional[Dict[str, str]] = None
+) -> Mock:
+    """Build a mock HTTP response."""
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = body
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError()
+    return response
+
+
+class TestGetSession(unittest.TestCase):
+    """Test suite for the get_session function."""
+
+    def test_session_is_shared(self) -> None:
+        """Test the same pooled session is returned every time."""
+        session = get_session()
+        self.assertIs(session, get_session())
+        self.assertIn("rdap+json", session.headers["Accept"])
+
+
+class TestRDAPBootstrap(unittest.TestCase):
+    """Test suite for the RDAPBootstrap class."""
+
+    def setUp(self) -> None:
+        """Set up a temporary cache file path."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "rdap-dns.json")
+
+    def tearDown(self) -> None:
+        """Remove the temporary cache directory."""
+        self.tmp.cleanup()
+
+    def _write_cache(self, services: Any, age: float = 0) -> None:
+        """Write a cache file of the given age."""
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"etag": '"v1"', "data": {"services": services}}, f)
+        mtime = time.time() - age
+        os.utime(self.path, (mtime, mtime))
+
+    def test_domain_longest_suffix(self) -> None:
+        """Test domains match the longest registered suffix."""
+        bootstrap = RDAPBootstrap("dns", path=self.path)
+        bootstrap.load_services(DNS_SERVICES)
+        self.assertEqual(
+            bootstrap.server_for("www.Example.COM."),
+            "http://rdap.verisign.com/com/v1/",
+        )
+        self.assertEqual(
+            bootstrap.server_for("bbc.co.uk"), "https://rdap.nominet.uk/uk/"
+        )
+        self.assertIsNone(bootstrap.server_for("example.invalid"))
+
+    def test_ip_longest_prefix_prefers_https(self) -> None:
+        """Test addresses match the most specific network, HTTPS first."""
+        bootstrap = RDAPBootstrap("ipv4", path=self.path)
+        bootstrap.load_services(IPV4_SERVICES)
+        self.assertEqual(
+            bootstrap.server_for("8.8.8.8"), "https://rdap.example.net/"
+        )
+        self.assertEqual(
+            bootstrap.server_for("8.1.1.1"), "https://rdap.arin.net/registry/"
+        )
+        self.assertIsNone(bootstrap.server_for("1.1.1.1"))
+
+    @patch("valkyrie_tools.rdap.get_with_retry")
+    def test_fresh_cache_skips_network(self, mock_get: Mock) -> None:
+        """Test a fresh cached registry is used without any request."""
+        self._write_cache(DNS_SERVICES)
+        bootstrap = RDAPBootstrap("dns", path=self.path)
+        self.assertIsNotNone(bootstrap.server_for("example.com"))
+        mock_get.assert_not_called()
+
+    @patch("valkyrie_tools.rdap.get_with_retry")
+    def test_stale_cache_revalidated(self, mock_get: Mock) -> None:
+        """Test a stale cache is revalidated and kept on 304."""
+        self._write_cache(DNS_SERVICES, age=2 * 86400)
+        mock_get.return_value = _response(304)
+        bootstrap = RDAPBootstrap("dns", path=self.path)
+        self.assertIsNotNone(bootstrap.server_for("example.com"))
+        headers = mock_get.call_args.kwargs["headers"]
+        self.assertEqual(headers["If-None-Match"], '"v1"')
+        self.assertLess(time.time() - os.path.getmtime(self.path), 60)
+
+    @patch("valkyrie_tools.rdap.get_with_retry")
+    def test_missing_cache_downloaded(self, mock_get: Mock) -> None:
+        """Test the registry is downloaded and cached when absent."""
+        mock_get.return_value = _response(
+            200, {"services": DNS_SERVICES}, {"ETag": '"v2"'}
+        )
+        bootstrap = RDAPBootstrap("dns", path=self.path)
+        self.assertIsNotNone(bootstrap.server_for("example.net"))
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["etag"], '"v2"')
+
+    @patch("valkyrie_tools.rdap.get_with_retry")
+    def test_failed_refresh_uses_stale_cache(self, mock_get: Mock) -> None:
+        """Test a stale cache is still used when the refresh fails."""
+        self._write_cache(DNS_SERVICES, age=2 * 86400)
+        mock_get.side_effect = requests.exceptions.ConnectionError()
+        bootstrap = RDAPBootstrap("dns", path=self.path)
+        self.assertIsNotNone(bootstrap.server_for("example.com"))
+
+    @patch("valkyrie_tools.rdap.monotonic")
+    @patch("valkyrie_tools.rdap.get_with_retry")
+    def test_failed_download_retried(
+        self, mock_get: Mock, mock_monotonic: Mock
+    ) -> None:
+        """Test a failed first download is retried after a back-off."""
+        mock_get.side_effect = [
+            requests.exceptions.ConnectionError(),
+            _response(200, {"services": DNS_SERVICES}),
+        ]
+        mock_monotonic.return_value = 100.0
+        bootstrap = RDAPBootstrap("dns", path=self.path)
+        self.assertIsNone(bootstrap.server_for("example.com"))
+        self.assertIsNone(bootstrap.server_for("example.com"))
+        self.assertEqual(mock_get.call_count, 1)
+        mock_monotonic.return_value = 100.0 + BOOTSTRAP_RETRY_DELAY
+        self.assertEqual(
+            bootstrap.server_for("example.com"),
+            "http://rdap.verisign.com/com/v1/",
+        )
+        self.assertEqual(mock_get.call_count, 2)
+
+
+class TestRdapQuery(unittest.TestCase):
+    """Test suite for the rdap_query function."""
+
+    @patch("valkyrie_tools.rdap.get_with_retry")
+    def test_success(self, mock_get: Mock) -> None:
+        """Test a successful response is decoded."""
+        mock_get.return_value = _response(200, DOMAIN)
+        self.assertEqual(rdap_query("https://rdap.test/domain/x"), DOMAIN)
+
+    @patch("valkyrie_tools.rdap.get_with_retry")
+    def test_not_found(self, mock_get: Mock) -> None:
+        """Test a 404 yields None."""
+        mock_get.return_value = _response(404)
+        self.assertIsNone(rdap_query("https://rdap.test/domain/x"))
+
+
+class TestRdapToWhois(unittest.TestCase):
+    """Test suite for the RDAP to WHOIS conversion functions."""
+
+    def test_ip_rdap_to_whois(self) -> None:
+        """Test IP network conversion to the ipwhois dict shape."""
+        whois = ip_rdap_to_whois(IP_NETWORK)
+        self.assertEqual(whois["asn"], "15169")
+        self.assertEqual(whois["asn_cidr"], "8.8.8.0/24")
+        self.assertEqual(whois["asn_country_code"], "US")
+        net = whois["nets"][0]
+        self.assertEqual(net["handle"], "NET-8-8-8-0-2")
+        self.assertEqual(net["range"], "8.8.8.0 - 8.8.8.255")
+        self.assertEqual(net["city"], "Mountain View")
+        self.assertEqual(net["postal_code"], "94043")
+        self.assertEqual(net["emails"], ["network-abuse@google.com"])
+
+    def test_domain_rdap_to_whois(self) -> None:
+        """Test domain conversion to the python-whois dict shape."""
+        whois = domain_rdap_to_whois(DOMAIN)
+        self.assertEqual(whois["domain_name"], "example.com")
+        self.assertEqual(whois["registrar"], "RESERVED-IANA")
+        self.assertEqual(whois["org"], "Example Org")
+        self.assertEqual(whois["name"], "Example Holder")
+        self.assertEqual(whois["address"], "1 Main St Springfield")
+        self.assertEqual(whois["emails"], ["holder@example.com"])
+        self.assertEqual(
+            whois["creation_date"],
+            datetime(1995, 8, 14, 4, tzinfo=timezone.utc),
+        )
+        self.assertIsNone(whois["updated_date"])
+        self.assertEqual(whois["name_servers"], ["a.iana-servers.net"])
+
+
+class TestGetRdap(unittest.TestCase):
+    """Test suite for get_ip_rdap and get_domain_rdap."""
+
+    @patch("valkyrie_tools.rdap.rdap_query")
+    @patch("valkyrie_tools.rdap.get_bootstrap")
+    def test_get_ip_rdap(self, mock_bootstrap: Mock, mock_query: Mock) -> None:
+        """Test IP queries go to the bootstrap server of the family."""
+        mock_bootstrap.return_value.server_for.return_value = "https://r/"
+        mock_query.return_value = IP_NETWORK
+        whois = get_ip_rdap("8.8.8.8")
+        self.assertIsNotNone(whois)
+        mock_bootstrap.assert_called_once_with("ipv4")
+        mock_query.assert_called_once_with("https://r/ip/8.8.8.8")
+
+    def test_get_ip_rdap_invalid(self) -> None:
+        """Test an invalid address yields None."""
+        self.assertIsNone(get_ip_rdap("not-an-ip"))
+
+    @patch("valkyrie_tools.rdap.rdap_query")
+    @patch("valkyrie_tools.rdap.get_bootstrap")
+    def test_get_domain_rdap(
+        self, mock_bootstrap: Mock, mock_query: Mock
+    ) -> None:
+        """Test domain queries go to the TLD's bootstrap server."""
+        mock_bootstrap.return_value.server_for.return_value = "https://r/"
+        mock_query.return_value = DOMAIN
+        whois = get_domain_rdap("Example.com")
+        self.assertEqual(whois and whois["registrar"], "RESERVED-IANA")
+        mock_query.assert_called_once_with("https://r/domain/example.com")
+
+    @patch("valkyrie_tools.rdap.rdap_query")
+    @patch("valkyrie_tools.rdap.get_bootstrap")
+    def test_get_domain_rdap_unknown_tld(
+        self, mock_bootstrap: Mock, mock_query: Mock
+    ) -> None:
+        """Test a TLD without RDAP service yields None without querying."""
+        mock_bootstrap.return_value.server_for.return_value = None
+        self.assertIsNone(get_domain_rdap("example.invalid"))
+        mock_query.assert_not_called()
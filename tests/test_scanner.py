@@ -0,0 +1,143 @@
+"""Test suite for the scanner module."""
+
+import time
+import unittest
+from typing import List, Tuple
+
+from valkyrie_tools.scanner import ScanMatch, host_kind, scan
+
+
+def _found(text: str) -> List[Tuple[str, str]]:
+    """Scan ``text`` and return ``(kind, value)`` pairs."""
+    return [(m.kind, text[m.start : m.end]) for m in scan(text)]
+
+
+class TestScan(unittest.TestCase):
+    """Test scan."""
+
+    def test_kinds(self) -> None:
+        """Test every kind is found in order of appearance."""
+        text = (
+            "from 203.0.113.5 via mx.example.org: "
+            "mail bob+x@Mail.Example.co.uk 2001:db8::1, "
+            "see http://user:pw@www.example.com:8080/a/b.html?q=1#top"
+        )
+        self.assertEqual(
+            _found(text),
+            [
+                ("ipv4", "203.0.113.5"),
+                ("domain", "mx.example.org"),
+                ("email", "bob+x@Mail.Example.co.uk"),
+                ("ipv6", "2001:db8::1"),
+                ("url", "http://user:pw@www.example.com:8080/a/b.html"),
+            ],
+        )
+
+    def test_embedded_hosts(self) -> None:
+        """Test URLs, e-mails and IPv6 addresses report their host span."""
+        text = "http://10.0.0.1/x a@b.example ::ffff:192.0.2.1"
+        hosts = [
+            (m.host_kind, text[m.host_start : m.host_end]) for m in scan(text)
+        ]
+        self.assertEqual(
+            hosts,
+            [
+                ("ipv4", "10.0.0.1"),
+                ("domain", "b.example"),
+                ("ipv4", "192.0.2.1"),
+            ],
+        )
+
+    def test_invalid_candidates(self) -> None:
+        """Test near misses are not reported."""
+        for text in (
+            "localhost",
+            "v1.2.3",
+            "1.2.3.4.5",
+            "256.1.1.1",
+            "12:30:45",
+            "http://localhost/",
+            "a" * 64 + ".com",
+            "-a-.com",
+            "sshd:",
+        ):
+            with self.subTest(text=text):
+                self.assertEqual(scan(text), [])
+
+    def test_punctuation_and_ports(self) -> None:
+        """Test surrounding punctuation and ports are not included."""
+        self.assertEqual(
+            _found('("example.com"), example.net. host.example:443'),
+            [
+                ("domain", "example.com"),
+                ("domain", "example.net"),
+                ("domain", "host.example"),
+            ],
+        )
+        self.assertEqual(
+            _found("addr 2001:db8::1. [192.0.2.7]"),
+            [("ipv6", "2001:db8::1"), ("ipv4", "192.0.2.7")],
+        )
+
+    def test_invalid_container_keeps_host(self) -> None:
+        """Test the host of an invalid URL or e-mail is still reported."""
+        self.assertEqual(
+            _found("http://example.com:http/ @example.org"),
+            [("domain", "example.com"), ("domain", "example.org")],
+        )
+
+    def test_longest_domain(self) -> None:
+        """Test a domain stops at its last valid top-level label."""
+        self.assertEqual(
+            _found("www.example.com.x1 " + "a" * 70 + ".example.org"),
+            [("domain", "www.example.com"), ("domain", "example.org")],
+        )
+
+    def test_match_defaults(self) -> None:
+        """Test plain matches carry no embedded host."""
+        self.assertEqual(scan("a.example"), [ScanMatch("domain", 0, 9)])
+
+    def test_anchor_free_input(self) -> None:
+        """Test windows and words without ".", ":" or "@" are skipped."""
+        self.assertEqual(scan("worker 7 finished batch 1812 in 12s"), [])
+        self.assertEqual(scan(b"no anchors here"), [])
+        self.assertEqual(scan("ssh2. done: ok"), [])
+        self.assertEqual(
+            _found("end. host.example:"),
+            [("domain", "host.example")],
+        )
+
+    def test_window_bounds(self) -> None:
+        """Test the pre-filter only looks inside the scanned window."""
+        self.assertEqual(scan("a.example words", 9), [])
+        self.assertEqual(
+            scan("a.example words", 0, 9), [ScanMatch("domain", 0, 9)]
+        )
+
+    def test_linear_time(self) -> None:
+        """Test inputs that make the regexes backtrack are scanned quickly."""
+        for text in (
+            "a" * 200_000,
+            "a." * 100_000,
+            "1.2." * 50_000,
+            "http://" + "a." * 100_000,
+            "de:ad:be:ef:" * 20_000,
+            "a@" * 100_000,
+        ):
+            with self.subTest(text=text[:12]):
+                start = time.perf_counter()
+                scan(text)
+                self.assertLess(time.perf_counter() - start, 5.0)
+
+
+class TestHostKind(unittest.TestCase):
+    """Test host_kind."""
+
+    def test_host_kind(self) -> None:
+        """Test complete hosts are classified."""
+        self.assertEqual(host_kind("192.0.2.1"), "ipv4")
+        self.assertEqual(host_kind("2001:db8::1"), "ipv6")
+        self.assertEqual(host_kind("xn--bcher-kva.example"), "domain")
+        self.assertIsNone(host_kind("1:2"))
+        self.assertIsNone(host_kind("example"))
+        self.assertIsNone(host_kind("exa_mple.com"))
@@ -175,12 +175,12 @@ class TestURLCheckCLI(BaseCommandTest, unittest.TestCase):
         url = cast(str, mock_chain_link[0])
         mock_make_request.return_value = mock_chain_link
 
-        # Mock the sys.stdin read method to simulate user input.
+        # Mock the sys.stdin readline method to simulate user input.
         with patch("valkyrie_tools.commons.sys") as mock_sys:
             # Override isatty to simulate a terminal and simulate
             # user input.
             mock_sys.stdin.isatty.return_value = True
-            mock_sys.stdin.read.side_effect = [
+            mock_sys.stdin.readline.side_effect = [
                 url,
                 "",  # Simulates CTRL+d
             ]
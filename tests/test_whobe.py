@@ -1,18 +1,23 @@
 """Unittests for the whobe cli command."""
 
 import json
+import threading
+import tracemalloc
 import unittest
-from typing import Any, Dict, Generator
+from functools import partial
+from typing import Any, Dict, Generator, Iterable, Iterator, List, Tuple
 from unittest.mock import MagicMock, patch
 
 from valkyrie_tools.whobe import (
     NO_WHOIS_MSG,
+    _share_results,
     cli,
     domain_whois_to_dict,
     ip_whois_to_dict,
     json_extractor_whobe,
     print_ip_whois,
 )
+from valkyrie_tools.whois import whois_client
 
 from .test_base_command import BaseCommandTest
 
@@ -139,6 +144,76 @@ class TestWhobe(BaseCommandTest, unittest.TestCase):
         self.assertIn("Hello, World!", result.output)
         self.assertEqual(result.exit_code, 0)
 
+    @patch("valkyrie_tools.whobe.get_whois")
+    def test_subdomains_share_registered_domain_lookup(
+        self, mock_get_whois: MagicMock
+    ) -> None:
+        """Test subdomains reuse one lookup of their registrable domain."""
+        mock_get_whois.return_value = self.mock_whois_data
+        args = ["www.example.co.uk", "mail.example.co.uk", "example.org"]
+        result = self.runner.invoke(cli, args)
+        self.assertEqual(result.exit_code, 0)
+        for arg in args:
+            self.assertIn("> %s" % arg, result.output)
+        self.assertEqual(
+            [c.args[0] for c in mock_get_whois.call_args_list],
+            ["example.co.uk", "example.org"],
+        )
+
+    @patch("valkyrie_tools.whobe.get_ip_whois")
+    @patch("valkyrie_tools.whobe.get_whois")
+    def test_workers_preserve_input_order(
+        self, mock_get_whois: MagicMock, mock_get_ip_whois: MagicMock
+    ) -> None:
+        """Test concurrent lookups print results in input order."""
+        mock_get_whois.return_value = self.mock_whois_data
+        mock_get_ip_whois.return_value = self.mock_whois_ip_data
+        args = ["example.com", "example.org", "8.8.8.8"]
+        result = self.runner.invoke(cli, ["--workers", "3", *args])
+        self.assertEqual(result.exit_code, 0)
+        positions = [result.output.index("> %s" % arg) for arg in args]
+        self.assertEqual(positions, sorted(positions))
+        self.assertEqual(mock_get_whois.call_count, 2)
+        mock_get_ip_whois.assert_called_once()
+
+    @patch("valkyrie_tools.whobe.get_whois")
+    @patch("valkyrie_tools.whobe.iter_input_lines")
+    def test_lookups_start_before_end_of_input(
+        self, mock_iter_input_lines: MagicMock, mock_get_whois: MagicMock
+    ) -> None:
+        """Test each input is looked up as soon as it is read."""
+        for workers in ("1", "4"):
+            with self.subTest(workers=workers):
+                first_lookup = threading.Event()
+                mock_iter_input_lines.return_value = self._blocking_lines(
+                    first_lookup
+                )
+                mock_get_whois.side_effect = partial(
+                    self._record_lookup, first_lookup
+                )
+                mock_get_whois.reset_mock()
+                result = self.runner.invoke(cli, ["--workers", workers])
+                self.assertEqual(result.exit_code, 0, result.output)
+                args = ["example.com", "example.org", "www.example.com"]
+                positions = [result.output.index("> %s\n" % a) for a in args]
+                self.assertEqual(positions, sorted(positions))
+                self.assertEqual(mock_get_whois.call_count, 2)
+
+    def _record_lookup(
+        self, first_lookup: threading.Event, *args: Any, **kwargs: Any
+    ) -> Dict[str, Any]:
+        """Signal that a lookup started and return the WHOIS data."""
+        first_lookup.set()
+        return self.mock_whois_data
+
+    @staticmethod
+    def _blocking_lines(first_lookup: threading.Event) -> Iterator[str]:
+        """Yield one line, then block like an idle pipe until a lookup."""
+        yield "example.com"
+        if not first_lookup.wait(5):
+            raise AssertionError("input read before the first lookup")
+        yield "example.org www.example.com"
+
     @patch("valkyrie_tools.whobe.click.echo")
     def test_print_ip_whois_with_no_data(self, mock_echo: MagicMock) -> None:
         """Test print_ip_whois with no data."""
@@ -151,6 +226,45 @@ class TestWhobe(BaseCommandTest, unittest.TestCase):
         mock_echo.assert_called_once_with(mock_expected_output, err=True)
 
 
+class TestShareResults(unittest.TestCase):
+    """Test suite for the _share_results function."""
+
+    @staticmethod
+    def _slow_run(queries: Iterable[Any]) -> Iterator[Tuple[Any, str]]:
+        """Read every query before answering, like a slow first lookup."""
+        for query in list(queries):
+            yield query, str(query).upper()
+
+    def test_inputs_share_query_results_in_order(self) -> None:
+        """Test repeated and sibling inputs keep their input order."""
+        args = ["a.com", "www.a.com", "a.com", "a.com", "b.org", "a.com"]
+        self.assertEqual(
+            list(_share_results(args, self._slow_run)),
+            [(arg, arg.rpartition("www.")[2].upper()) for arg in args],
+        )
+
+    def test_repeats_are_counted(self) -> None:
+        """Test a long run of repeats behind a slow lookup is not stored."""
+
+        def args() -> Iterator[str]:
+            """Yield one input, then many repeats of another."""
+            yield "slow.com"
+            for _ in range(50000):
+                yield "dup.com"
+
+        tracemalloc.start()
+        try:
+            results: List[Tuple[Any, Any]] = []
+            for pair in _share_results(args(), self._slow_run):
+                if not results:
+                    results.append(pair)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(results, [("slow.com", "SLOW.COM")])
+        self.assertLess(peak, 128 << 10)
+
+
 class TestWhobeJson(unittest.TestCase):
     """JSON output tests for whobe command."""
 
@@ -210,6 +324,80 @@ class TestWhobeJson(unittest.TestCase):
         data = json.loads(result.output)
         self.assertIn("error", data[0])
 
+    @patch("valkyrie_tools.whobe.get_whois")
+    def test_json_workers(self, mock_get_whois: MagicMock) -> None:
+        """Test --json output with concurrent lookups keeps input order."""
+        mock_get_whois.side_effect = lambda d, **kwargs: {
+            "registrar": d.upper()
+        }
+        domains = ["a.com", "b.com", "c.org"]
+        result = self.runner.invoke(
+            cli, ["--json", "-w", "4", "--per-server", "1", *domains]
+        )
+        self.assertEqual(result.exit_code, 0)
+        data = json.loads(result.output)
+        self.assertEqual([entry["input"] for entry in data], domains)
+        self.assertEqual(data[2]["registrar"], "C.ORG")
+
+    @patch("valkyrie_tools.whobe.get_ip_whois")
+    def test_json_fresh(self, mock_get_ip_whois: MagicMock) -> None:
+        """Test --fresh is passed through to get_ip_whois."""
+        mock_get_ip_whois.return_value = None
+        result = self.runner.invoke(cli, ["--json", "--fresh", "8.8.8.8"])
+        self.assertEqual(result.exit_code, 0)
+        self.assertTrue(mock_get_ip_whois.call_args.kwargs["fresh"])
+
+    @patch("valkyrie_tools.whobe.get_ip_whois")
+    @patch("valkyrie_tools.whobe.get_bulk_asn")
+    def test_json_bulk_asn(
+        self, mock_get_bulk_asn: MagicMock, mock_get_ip_whois: MagicMock
+    ) -> None:
+        """Test --bulk-asn answers IP addresses from one bulk query."""
+        mock_get_bulk_asn.return_value = {
+            "8.8.8.8": {"asn": "15169", "asn_cidr": "8.8.8.0/24", "nets": []}
+        }
+        result = self.runner.invoke(
+            cli, ["--json", "--bulk-asn", "8.8.8.8", "1.1.1.1"]
+        )
+        self.assertEqual(result.exit_code, 0)
+        data = json.loads(result.output)
+        self.assertEqual(data[0]["asn_cidr"], "8.8.8.0/24")
+        self.assertIn("error", data[1])
+        mock_get_bulk_asn.assert_called_once()
+        mock_get_ip_whois.assert_not_called()
+
+    @patch("valkyrie_tools.whobe.get_domain_rdap")
+    @patch("valkyrie_tools.whobe.get_ip_rdap")
+    @patch("valkyrie_tools.whobe.get_whois")
+    def test_json_rdap_backend(
+        self,
+        mock_get_whois: MagicMock,
+        mock_get_ip_rdap: MagicMock,
+        mock_get_domain_rdap: MagicMock,
+    ) -> None:
+        """Test --backend rdap routes lookups to the RDAP client."""
+        mock_get_ip_rdap.return_value = {"asn": "15169", "nets": []}
+        mock_get_domain_rdap.return_value = {"registrar": "Example"}
+        result = self.runner.invoke(
+            cli, ["--json", "--backend", "rdap", "8.8.8.8", "example.com"]
+        )
+        self.assertEqual(result.exit_code, 0)
+        data = json.loads(result.output)
+        self.assertEqual(data[0]["asn"], "15169")
+        self.assertEqual(data[1]["registrar"], "Example")
+        mock_get_whois.assert_not_called()
+
+    @patch("valkyrie_tools.whobe.get_whois")
+    def test_json_native_backend(self, mock_get_whois: MagicMock) -> None:
+        """Test --backend native passes the shared client to get_whois."""
+        mock_get_whois.return_value = {"registrar": "Example"}
+        result = self.runner.invoke(
+            cli, ["--json", "--backend", "native", "example.com"]
+        )
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(json.loads(result.output)[0]["registrar"], "Example")
+        self.assertIs(mock_get_whois.call_args.kwargs["client"], whois_client)
+
     @patch("valkyrie_tools.whobe.get_whois")
     def test_json_piped_input_extractor(
         self, mock_get_whois: MagicMock
@@ -1,11 +1,42 @@
 """Test suite for the valkyrie_tools.whois module."""
 
+import os
+import socketserver
+import threading
+import time
 import unittest
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional
 from unittest.mock import MagicMock, patch
 
+import ipwhois  # type: ignore[import-untyped]
 import whois  # type: ignore[import-untyped]
 
-from valkyrie_tools.whois import WHOIS_MAX_RETRIES, get_ip_whois, get_whois
+from valkyrie_tools.ipaddr import IPAddr
+from valkyrie_tools.whois import (
+    SCHEDULER_READ_AHEAD,
+    WHOIS_MAX_RETRIES,
+    SINGLE_ATTEMPT,
+    RetryPolicy,
+    TransientWhoisError,
+    WhoisClient,
+    WhoisScheduler,
+    get_bulk_asn,
+    get_ip_whois,
+    get_whois,
+    get_whois_template,
+    ip_whois_cache,
+    parse_whois_text,
+    whois_server_key,
+)
+
+WHOIS_CORPUS = os.path.join(os.path.dirname(__file__), "data", "whois")
+
+
+def _read_response(domain: str) -> str:
+    """Read a stored raw WHOIS response from the test corpus."""
+    with open(os.path.join(WHOIS_CORPUS, domain + ".txt")) as f:
+        return f.read()
 
 
 class TestGetWhois(unittest.TestCase):
@@ -66,8 +97,198 @@ class TestGetWhois(unittest.TestCase):
         result = get_whois("example.com")
         # Assert
         self.assertIsNone(result)
-        # mock_sleep.assert_called()
-        self.assertEqual(mock_sleep.call_count, WHOIS_MAX_RETRIES)
+        self.assertEqual(mock_whois.call_count, WHOIS_MAX_RETRIES)
+        self.assertEqual(mock_sleep.call_count, WHOIS_MAX_RETRIES - 1)
+
+    @patch("valkyrie_tools.whois.whois.whois")
+    @patch("valkyrie_tools.whois.sleep", return_value=None)
+    def test_get_whois_definitive_not_retried(
+        self, mock_sleep: MagicMock, mock_whois: MagicMock
+    ) -> None:
+        """Test a record for another name (e.g. a subdomain) is kept."""
+        record = MagicMock(text="Domain Name: EXAMPLE.COM\n")
+        mock_whois.return_value = record
+        self.assertIs(get_whois("www.example.com"), record)
+        mock_whois.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    @patch("valkyrie_tools.whois.whois.whois")
+    @patch("valkyrie_tools.whois.sleep", return_value=None)
+    def test_get_whois_transient_retried(
+        self, mock_sleep: MagicMock, mock_whois: MagicMock
+    ) -> None:
+        """Test timeouts and rate-limit answers are retried."""
+        limited = MagicMock(text="Query rate limit exceeded\n")
+        record = MagicMock(text="Domain Name: EXAMPLE.COM\n")
+        mock_whois.side_effect = [OSError("timed out"), limited, record]
+        self.assertIs(get_whois("example.com"), record)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    @patch("valkyrie_tools.whois.whois.whois")
+    @patch("valkyrie_tools.whois.sleep", return_value=None)
+    def test_get_whois_gives_up_with_last_answer(
+        self, mock_sleep: MagicMock, mock_whois: MagicMock
+    ) -> None:
+        """Test the last partial answer is returned when retries run out."""
+        limited = MagicMock(text="Socket not responding: timed out")
+        mock_whois.return_value = limited
+        self.assertIs(get_whois("example.com"), limited)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """Test suite for the RetryPolicy class."""
+
+    def test_backoff_is_jittered_and_capped(self) -> None:
+        """Test delays stay within the exponential, capped ceiling."""
+        policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+        for attempt, ceiling in [(1, 1.0), (2, 2.0), (3, 4.0), (8, 5.0)]:
+            for _ in range(20):
+                self.assertTrue(0 <= policy.backoff(attempt) <= ceiling)
+
+    def test_retry_after_honoured(self) -> None:
+        """Test a server-requested delay replaces the back-off."""
+        policy = RetryPolicy()
+        error = TransientWhoisError("slow down", retry_after=2.5)
+        self.assertEqual(policy.next_delay(1, time.monotonic(), error), 2.5)
+
+    def test_deadline_stops_retries(self) -> None:
+        """Test no retry is scheduled past the deadline."""
+        policy = RetryPolicy(max_attempts=10, deadline=1.0)
+        error = TransientWhoisError("timeout", retry_after=0.5)
+        self.assertIsNone(policy.next_delay(1, time.monotonic() - 0.9, error))
+        self.assertEqual(policy.next_delay(1, time.monotonic(), error), 0.5)
+
+    def test_max_attempts_stops_retries(self) -> None:
+        """Test no retry is scheduled after the last attempt."""
+        policy = RetryPolicy(max_attempts=2)
+        error = TransientWhoisError("timeout")
+        self.assertIsNone(policy.next_delay(2, time.monotonic(), error))
+
+    def test_single_attempt_reraises(self) -> None:
+        """Test SINGLE_ATTEMPT surfaces the transient error."""
+
+        def attempt() -> None:
+            raise TransientWhoisError("timeout")
+
+        with self.assertRaises(TransientWhoisError):
+            SINGLE_ATTEMPT.call(attempt)
+
+
+class TestParseWhoisText(unittest.TestCase):
+    """Test suite for the compiled-template WHOIS parser."""
+
+    def test_registry_and_registrar_response(self) -> None:
+        """Test a .com registry answer followed by the registrar's."""
+        record = parse_whois_text(_read_response("google.com"), "google.com")
+        assert record is not None
+        self.assertEqual(record["domain_name"], "GOOGLE.COM")
+        self.assertEqual(record["registrar"], "MarkMonitor, Inc.")
+        self.assertEqual(record["org"], "Google LLC")
+        self.assertEqual(record["state"], "CA")
+        self.assertEqual(record["country"], "US")
+        self.assertEqual(record["emails"], ["abusecomplaints@markmonitor.com"])
+        self.assertEqual(
+            record["name_servers"],
+            [
+                "NS1.GOOGLE.COM",
+                "NS2.GOOGLE.COM",
+                "NS3.GOOGLE.COM",
+                "NS4.GOOGLE.COM",
+            ],
+        )
+        self.assertEqual(len(record["creation_date"]), 2)
+
+    def test_registrant_fields(self) -> None:
+        """Test the registrant contact fields of an ICANN record."""
+        record = parse_whois_text(
+            _read_response("wikipedia.org"), "wikipedia.org"
+        )
+        assert record is not None
+        self.assertEqual(record["org"], "Wikimedia Foundation, Inc.")
+        self.assertEqual(record["name"], "REDACTED FOR PRIVACY")
+        self.assertEqual(record["address"], "REDACTED FOR PRIVACY")
+        self.assertEqual(
+            record["registrant_postal_code"], "REDACTED FOR PRIVACY"
+        )
+        self.assertEqual(
+            record["expiration_date"],
+            datetime(2025, 1, 13, 0, 12, 14, tzinfo=timezone.utc),
+        )
+
+    def test_sectioned_response(self) -> None:
+        """Test the multi-line sections of the Nominet format."""
+        record = parse_whois_text(_read_response("bbc.co.uk"), "bbc.co.uk")
+        assert record is not None
+        self.assertEqual(record["domain_name"], "bbc.co.uk")
+        self.assertEqual(
+            record["registrar"], "British Broadcasting Corporation [Tag = BBC]"
+        )
+        self.assertEqual(record["name_servers"][0], "dns0.bbc.co.uk")
+        self.assertEqual(len(record["name_servers"]), 4)
+        self.assertEqual(
+            record["creation_date"], datetime(1996, 8, 1, tzinfo=timezone.utc)
+        )
+        self.assertEqual(
+            record["expiration_date"],
+            datetime(2025, 12, 13, tzinfo=timezone.utc),
+        )
+
+    def test_bracketed_keys(self) -> None:
+        """Test the JPRS format and its time zone suffix."""
+        record = parse_whois_text(_read_response("nic.jp"), "nic.jp")
+        assert record is not None
+        self.assertEqual(record["org"], "Japan Registry Services Co., Ltd.")
+        self.assertEqual(record["name_servers"], ["ns1.jprs.jp", "ns2.jprs.jp"])
+        self.assertEqual(
+            record["updated_date"],
+            datetime(2024, 4, 1, 1, 5, 8, tzinfo=timezone(timedelta(hours=9))),
+        )
+
+    def test_registry_aliases(self) -> None:
+        """Test the .ru and .de field names."""
+        ru = parse_whois_text(_read_response("yandex.ru"), "yandex.ru")
+        assert ru is not None
+        self.assertEqual(ru["org"], "YANDEX, LLC.")
+        self.assertEqual(ru["status"], ["REGISTERED, DELEGATED, VERIFIED"])
+        self.assertEqual(ru["name_servers"][0], "ns1.yandex.ru.")
+        de = parse_whois_text(_read_response("denic.de"), "denic.de")
+        assert de is not None
+        self.assertEqual(de["status"], ["connect"])
+        self.assertEqual(len(de["updated_date"]), 2)
+
+    def test_no_match(self) -> None:
+        """Test "no match" answers and responses without a domain."""
+        self.assertIsNone(
+            parse_whois_text(_read_response("nomatch.com"), "nomatch.com")
+        )
+        self.assertIsNone(
+            parse_whois_text("Domain: x.de\nStatus: free", "x.de")
+        )
+        self.assertIsNone(parse_whois_text("Registrar: Foo", "foo.com"))
+
+    def test_lazy_dates(self) -> None:
+        """Test that dates are parsed on first access only."""
+        record = parse_whois_text(
+            "Domain Name: X.COM\nCreation Date: 2001-02-03\n"
+            "Updated Date: not a date\n",
+            "x.com",
+        )
+        assert record is not None
+        self.assertEqual(dict.get(record, "creation_date"), "2001-02-03")
+        self.assertEqual(
+            record.get("creation_date"),
+            datetime(2001, 2, 3, tzinfo=timezone.utc),
+        )
+        self.assertEqual(dict(record.items())["updated_date"], "not a date")
+        self.assertIn("not a date", list(record.values()))
+
+    def test_get_whois_template(self) -> None:
+        """Test that templates are picked by top-level domain."""
+        self.assertIs(get_whois_template("a.jp"), get_whois_template("NIC.JP."))
+        self.assertIs(get_whois_template("a.su"), get_whois_template("a.ru"))
+        self.assertIsNot(
+            get_whois_template("a.com"), get_whois_template("a.jp")
+        )
 
 
 class TestGetIPWhois(unittest.TestCase):
@@ -100,3 +321,570 @@ class TestGetIPWhois(unittest.TestCase):
         mock_lookup_whois.assert_called_once_with(
             retry_count=0, asn_methods=["dns", "whois", "http"]
         )
+
+
+class TestGetIPWhoisRetry(unittest.TestCase):
+    """Test suite for the get_ip_whois retry behaviour."""
+
+    @patch("valkyrie_tools.whois.sleep", return_value=None)
+    @patch("ipwhois.IPWhois.lookup_whois")
+    def test_transient_errors_retried(
+        self, mock_lookup_whois: MagicMock, mock_sleep: MagicMock
+    ) -> None:
+        """Test ASN/WHOIS lookup errors are retried, then give None."""
+        mock_lookup_whois.side_effect = ipwhois.exceptions.ASNRegistryError()
+        self.assertIsNone(get_ip_whois("8.8.8.8", fresh=True))
+        self.assertEqual(mock_lookup_whois.call_count, WHOIS_MAX_RETRIES)
+
+    @patch("ipwhois.IPWhois.lookup_whois")
+    def test_single_attempt_raises(self, mock_lookup_whois: MagicMock) -> None:
+        """Test SINGLE_ATTEMPT leaves retrying to the caller."""
+        mock_lookup_whois.side_effect = ipwhois.exceptions.WhoisLookupError()
+        with self.assertRaises(TransientWhoisError):
+            get_ip_whois("8.8.8.8", fresh=True, retry=SINGLE_ATTEMPT)
+
+
+class TestIPWhoisCache(unittest.TestCase):
+    """Test suite for the get_ip_whois netblock cache."""
+
+    record = {
+        "asn": "15169",
+        "asn_cidr": "8.8.8.0/24",
+        "query": "8.8.8.8",
+        "nets": [
+            {"cidr": "8.0.0.0/9", "name": "LVLT-ORG-8-8"},
+            {"cidr": "8.8.8.0/24, 8.8.9.0/24", "name": "GOGL"},
+        ],
+    }
+
+    def setUp(self) -> None:
+        """Start every test with an empty cache."""
+        ip_whois_cache.clear()
+        self.addCleanup(ip_whois_cache.clear)
+
+    @patch("ipwhois.IPWhois.lookup_whois")
+    def test_same_netblock_served_from_cache(
+        self, mock_lookup_whois: MagicMock
+    ) -> None:
+        """Test an address in a cached netblock needs no lookup."""
+        mock_lookup_whois.return_value = self.record
+        get_ip_whois("8.8.8.8")
+        result = get_ip_whois("8.8.8.4")
+        self.assertEqual(mock_lookup_whois.call_count, 1)
+        self.assertEqual(result and result["asn"], "15169")
+        self.assertEqual(result and result["query"], "8.8.8.4")
+
+    @patch("ipwhois.IPWhois.lookup_whois")
+    def test_keyed_by_most_specific_netblock(
+        self, mock_lookup_whois: MagicMock
+    ) -> None:
+        """Test addresses outside the most specific block are queried."""
+        mock_lookup_whois.return_value = self.record
+        get_ip_whois("8.8.8.8")
+        get_ip_whois("8.8.4.4")
+        self.assertEqual(mock_lookup_whois.call_count, 2)
+
+    @patch("ipwhois.IPWhois.lookup_whois")
+    def test_fresh_bypasses_cache(self, mock_lookup_whois: MagicMock) -> None:
+        """Test fresh=True always performs the lookup."""
+        mock_lookup_whois.return_value = self.record
+        get_ip_whois("8.8.8.8")
+        get_ip_whois("8.8.8.8", fresh=True)
+        self.assertEqual(mock_lookup_whois.call_count, 2)
+
+    @patch("ipwhois.IPWhois.lookup_whois")
+    def test_failed_lookup_not_cached(
+        self, mock_lookup_whois: MagicMock
+    ) -> None:
+        """Test failed lookups leave the cache empty."""
+        mock_lookup_whois.side_effect = ValueError("Test error")
+        self.assertIsNone(get_ip_whois("8.8.8.8"))
+        self.assertEqual(len(ip_whois_cache), 0)
+
+
+class _FakeBulkHandler(socketserver.StreamRequestHandler):
+    """Minimal bulk ASN server answering from a fixed table."""
+
+    table = {
+        "8.8.8.8": "15169   | 8.8.8.8 | 8.8.8.0/24 | US | arin | 2023-12-28 "
+        "| GOOGLE, US",
+        "192.0.2.1": "NA      | 192.0.2.1 | NA | | other | | NA",
+    }
+
+    def handle(self) -> None:
+        """Read queries until ``end`` and answer each one."""
+        self.server.requests.append([])  # type: ignore[attr-defined]
+        self.wfile.write(b"Bulk mode; whois.cymru.com [2024-01-01]\n")
+        for raw in self.rfile:
+            line = raw.decode().strip()
+            self.server.requests[-1].append(line)  # type: ignore[attr-defined]
+            if line == "end":
+                break
+            if line in self.table:
+                self.wfile.write(self.table[line].encode() + b"\n")
+            elif line not in ("begin", "verbose"):
+                self.wfile.write(b"Error: no ASN or IP match on line 4.\n")
+
+
+class TestGetBulkAsn(unittest.TestCase):
+    """Test suite for the get_bulk_asn function."""
+
+    def setUp(self) -> None:
+        """Start a fake bulk ASN server on a free local port."""
+        self.server = socketserver.ThreadingTCPServer(
+            ("127.0.0.1", 0), _FakeBulkHandler
+        )
+        self.server.requests = []  # type: ignore[attr-defined]
+        thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.01}
+        )
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.port = self.server.server_address[1]
+
+    def test_single_session(self) -> None:
+        """Test every address is sent in one begin/end session."""
+        records = get_bulk_asn(
+            ["8.8.8.8", "192.0.2.1", "203.0.113.5", "bogus", "8.8.8.8"],
+            server="127.0.0.1",
+            port=self.port,
+        )
+        self.assertEqual(len(self.server.requests), 1)  # type: ignore[attr-defined]
+        lines = self.server.requests[0]  # type: ignore[attr-defined]
+        self.assertEqual(lines[:2], ["begin", "verbose"])
+        self.assertEqual(lines[-1], "end")
+        self.assertEqual(len(lines), 6)
+        self.assertEqual(set(records), {"8.8.8.8", "192.0.2.1"})
+
+    def test_record_fields(self) -> None:
+        """Test answers map to the ip_whois_to_dict fields."""
+        records = get_bulk_asn(
+            ["8.8.8.8", "192.0.2.1"], server="127.0.0.1", port=self.port
+        )
+        google = records["8.8.8.8"]
+        self.assertEqual(google["asn"], "15169")
+        self.assertEqual(google["asn_cidr"], "8.8.8.0/24")
+        self.assertEqual(google["asn_country_code"], "US")
+        self.assertEqual(google["asn_description"], "GOOGLE, US")
+        self.assertEqual(google["nets"], [])
+        self.assertIsNone(records["192.0.2.1"]["asn"])
+        self.assertIsNone(records["192.0.2.1"]["asn_country_code"])
+
+    def test_no_valid_addresses(self) -> None:
+        """Test no connection is made without valid addresses."""
+        self.assertEqual(
+            get_bulk_asn(["bogus"], server="127.0.0.1", port=self.port), {}
+        )
+        self.assertEqual(self.server.requests, [])  # type: ignore[attr-defined]
+
+
+class _FakeWhoisHandler(socketserver.StreamRequestHandler):
+    """Minimal WHOIS server echoing the query it received."""
+
+    def handle(self) -> None:
+        """Answer a single query line."""
+        query = self.rfile.readline().decode().strip()
+        self.wfile.write(("Domain Name: %s\n" % query).encode())
+
+
+class TestWhoisClient(unittest.TestCase):
+    """Test suite for the WhoisClient class."""
+
+    answers = {
+        ("whois.iana.org", "com"): "refer: whois.registry.test\n"
+        "domain: COM\nwhois: whois.registry.test\n",
+        ("whois.iana.org", "zz"): "domain: ZZ\nstatus: ACTIVE\n",
+        ("whois.registry.test", "example.com"): "Domain Name: EXAMPLE.COM\n"
+        "Registrar WHOIS Server: http://whois.registrar.test/\n",
+        ("whois.registry.test", "thick.com"): "Domain Name: THICK.COM\n"
+        "Registrar WHOIS Server: whois.registry.test\n",
+        ("whois.registrar.test", "example.com"): "Domain Name: example.com\n"
+        "Registrar: Example Registrar\n",
+    }
+
+    def setUp(self) -> None:
+        """Route client queries to the fixed answer table."""
+        self.client = WhoisClient()
+        self.calls: List[str] = []
+        patcher = patch.object(self.client, "query", side_effect=self._query)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _query(self, server: str, query: str) -> str:
+        """Answer a query from the table, failing for unknown pairs."""
+        self.calls.append(server)
+        if (server, query) not in self.answers:
+            raise ConnectionRefusedError(server)
+        return self.answers[server, query]
+
+    def test_full_chain_then_cached(self) -> None:
+        """Test the referral chain is walked once and then skipped."""
+        first = self.client.lookup("Example.COM.")
+        self.assertEqual(
+            [hop.server for hop in first.hops],
+            ["whois.iana.org", "whois.registry.test", "whois.registrar.test"],
+        )
+        self.assertEqual([hop.cached for hop in first.hops], [False] * 3)
+        self.assertIn("EXAMPLE.COM", first.text)
+        self.assertIn("Example Registrar", first.text)
+        self.assertEqual(first.server, "whois.registrar.test")
+        self.assertGreaterEqual(first.elapsed, 0.0)
+
+        second = self.client.lookup("example.com")
+        self.assertEqual(
+            [(hop.server, hop.cached) for hop in second.hops],
+            [("whois.registrar.test", True)],
+        )
+        self.assertNotIn("EXAMPLE.COM", second.text)
+        self.assertIn("cached", repr(second.hops[0]))
+
+    def test_cached_registry_server(self) -> None:
+        """Test the TLD registry server is only asked of IANA once."""
+        self.client.lookup("thick.com")
+        response = self.client.lookup("thick.com")
+        self.assertEqual(
+            [(hop.server, hop.cached) for hop in response.hops],
+            [("whois.registry.test", True)],
+        )
+        self.assertEqual(self.calls.count("whois.iana.org"), 1)
+
+    def test_failed_referral_falls_back(self) -> None:
+        """Test a failing cached registrar restarts from the registry."""
+        self.client.lookup("example.com")
+        with patch.dict(self.answers):
+            del self.answers["whois.registrar.test", "example.com"]
+            response = self.client.lookup("example.com")
+        self.assertEqual(response.server, "whois.registry.test")
+        self.assertEqual(
+            [hop.server for hop in response.hops], ["whois.registry.test"]
+        )
+        self.assertIsNone(self.client.referral_server("example.com"))
+
+    def test_referral_expiry(self) -> None:
+        """Test referrals are dropped after referral_ttl seconds."""
+        self.client.referral_ttl = 0
+        self.client.lookup("example.com")
+        self.assertIsNone(self.client.referral_server("example.com"))
+
+    def test_unknown_tld(self) -> None:
+        """Test a TLD without a WHOIS server yields no answering server."""
+        response = self.client.lookup("example.zz")
+        self.assertIsNone(response.server)
+        self.assertEqual(response.text, "")
+
+    def test_unknown_tld_not_cached(self) -> None:
+        """Test a TLD record without a WHOIS server is asked again."""
+        self.client.lookup("example.zz")
+        self.client.lookup("example.zz")
+        self.assertEqual(self.calls.count("whois.iana.org"), 2)
+
+    def test_iana_failure_not_cached(self) -> None:
+        """Test a non-referral IANA answer is transient and not cached."""
+        with patch.dict(self.answers):
+            self.answers["whois.iana.org", "com"] = (
+                "% Query rate limit exceeded\n"
+            )
+            with self.assertRaises(TransientWhoisError):
+                self.client.lookup("example.com")
+        response = self.client.lookup("example.com")
+        self.assertEqual(response.server, "whois.registrar.test")
+        self.assertEqual(self.calls.count("whois.iana.org"), 2)
+
+    def test_query_over_tcp(self) -> None:
+        """Test a real query against a local WHOIS server."""
+        server = socketserver.ThreadingTCPServer(
+            ("127.0.0.1", 0), _FakeWhoisHandler
+        )
+        thread = threading.Thread(
+            target=server.serve_forever, kwargs={"poll_interval": 0.01}
+        )
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        client = WhoisClient(port=server.server_address[1])
+        self.assertEqual(
+            client.query("127.0.0.1", "example.com"),
+            "Domain Name: example.com\n",
+        )
+
+    @patch("valkyrie_tools.whois.socket.create_connection")
+    def test_query_formats(self, mock_connect: MagicMock) -> None:
+        """Test registry-specific query syntax."""
+        sock = mock_connect.return_value.__enter__.return_value
+        sock.recv.return_value = b""
+        client = WhoisClient()
+        client.query("whois.jprs.jp", "nic.jp")
+        sock.sendall.assert_called_with(b"nic.jp/e\r\n")
+        client.query("whois.denic.de", "denic.de")
+        sock.sendall.assert_called_with(b"-T dn,ace -C UTF-8 denic.de\r\n")
+
+
+class TestGetWhoisClient(unittest.TestCase):
+    """Test suite for get_whois with a WhoisClient."""
+
+    def setUp(self) -> None:
+        """Create a client with a mocked lookup."""
+        self.client = WhoisClient()
+        patcher = patch.object(self.client, "lookup")
+        self.lookup = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _response(self, text: str, server: Optional[str] = "w.test") -> Any:
+        """Build a lookup result."""
+        return MagicMock(text=text, server=server, hops=["hop"])
+
+    def test_parsed_record(self) -> None:
+        """Test the answer is parsed and carries the lookup hops."""
+        self.lookup.return_value = self._response("Domain Name: X.COM\n")
+        record = get_whois("x.com", retry=SINGLE_ATTEMPT, client=self.client)
+        assert record is not None
+        self.assertEqual(record["domain_name"], "X.COM")
+        self.assertEqual(record.hops, ["hop"])
+
+    def test_no_record(self) -> None:
+        """Test unknown TLDs and "no match" answers give None."""
+        self.lookup.return_value = self._response("", server=None)
+        self.assertIsNone(get_whois("x.zz", client=self.client))
+        self.lookup.return_value = self._response('No match for "X.COM".')
+        self.assertIsNone(get_whois("x.com", client=self.client))
+
+    def test_transient(self) -> None:
+        """Test socket errors and rate limits are transient."""
+        self.lookup.side_effect = OSError("timed out")
+        with self.assertRaises(TransientWhoisError):
+            get_whois("x.com", retry=SINGLE_ATTEMPT, client=self.client)
+        self.lookup.side_effect = None
+        self.lookup.return_value = self._response("Rate limit exceeded")
+        with self.assertRaises(TransientWhoisError):
+            get_whois("x.com", retry=SINGLE_ATTEMPT, client=self.client)
+
+
+class TestWhoisServerKey(unittest.TestCase):
+    """Test suite for the whois_server_key function."""
+
+    def test_domains_grouped_by_tld(self) -> None:
+        """Test domains are keyed by their lowercased TLD."""
+        self.assertEqual(whois_server_key("www.Example.COM"), "tld:com")
+        self.assertEqual(whois_server_key("example.org."), "tld:org")
+
+    def test_ip_addrs_grouped_by_rir(self) -> None:
+        """Test IP addresses are keyed by the RIR serving their block."""
+        self.assertEqual(whois_server_key("8.8.8.8"), "rir:arin")
+        self.assertEqual(whois_server_key("193.0.6.139"), "rir:ripencc")
+        self.assertEqual(whois_server_key("1.1.1.1"), "rir:apnic")
+        self.assertEqual(whois_server_key("200.160.2.3"), "rir:lacnic")
+        self.assertEqual(whois_server_key("41.0.0.1"), "rir:afrinic")
+        self.assertEqual(whois_server_key("2001:4860::8888"), "rir:arin")
+        self.assertEqual(whois_server_key("2a00:1450::1"), "rir:ripencc")
+        self.assertEqual(whois_server_key(IPAddr(1, 6)), "ip:6")
+
+    def test_rirs_scheduled_independently(self) -> None:
+        """Test ARIN and RIPE addresses do not share a rate limit."""
+        starts: Dict[str, float] = {}
+
+        def lookup(target: str) -> None:
+            starts[target] = time.monotonic()
+
+        scheduler: WhoisScheduler[str, None] = WhoisScheduler(
+            workers=2, per_server=1, interval=1
+        )
+        list(scheduler.run(lookup, ["8.8.8.8", "193.0.6.139"]))
+        self.assertLess(abs(starts["8.8.8.8"] - starts["193.0.6.139"]), 0.5)
+
+
+class TestWhoisScheduler(unittest.TestCase):
+    """Test suite for the WhoisScheduler class."""
+
+    def test_single_worker_runs_serially(self) -> None:
+        """Test a single worker runs lookups in order in the caller."""
+        calls: List[str] = []
+
+        def lookup(target: str) -> int:
+            calls.append(target)
+            return len(target)
+
+        scheduler: WhoisScheduler[str, int] = WhoisScheduler(workers=1)
+        results = list(scheduler.run(lookup, ["a.com", "bb.org", "c.net"]))
+        self.assertEqual(calls, ["a.com", "bb.org", "c.net"])
+        self.assertEqual(results, [("a.com", 5), ("bb.org", 6), ("c.net", 5)])
+
+    def test_results_in_input_order(self) -> None:
+        """Test ordered results follow input order despite timing."""
+        delays = {"slow.com": 0.05, "fast.org": 0.0, "mid.net": 0.02}
+
+        def lookup(target: str) -> str:
+            time.sleep(delays[target])
+            return target.upper()
+
+        scheduler: WhoisScheduler[str, str] = WhoisScheduler(
+            workers=3, interval=0
+        )
+        results = list(scheduler.run(lookup, list(delays)))
+        self.assertEqual([r[0] for r in results], list(delays))
+        self.assertEqual(results[0][1], "SLOW.COM")
+
+    def test_results_before_end_of_input(self) -> None:
+        """Test lookups start and yield while the input is still open."""
+        end_of_input = threading.Event()
+
+        def targets() -> Iterator[str]:
+            """Yield one target, then block like an idle pipe."""
+            yield "a.com"
+            if not end_of_input.wait(5):
+                raise AssertionError("input read before the first result")
+            yield "b.org"
+
+        scheduler: WhoisScheduler[str, str] = WhoisScheduler(
+            workers=2, interval=0
+        )
+        results = scheduler.run(str.upper, targets())
+        self.assertEqual(next(results), ("a.com", "A.COM"))
+        self.assertFalse(end_of_input.is_set())
+        end_of_input.set()
+        self.assertEqual(list(results), [("b.org", "B.ORG")])
+
+    def test_bounded_read_ahead(self) -> None:
+        """Test targets are read at most a bounded distance ahead."""
+        read: List[int] = []
+
+        def targets() -> Iterator[str]:
+            """Yield many targets, recording how many were read."""
+            for i in range(1000):
+                read.append(i)
+                yield f"d{i}.com"
+
+        scheduler: WhoisScheduler[str, str] = WhoisScheduler(
+            workers=2, interval=0
+        )
+        results = scheduler.run(str.upper, targets())
+        self.assertEqual(next(results), ("d0.com", "D0.COM"))
+        # the held targets, the full queue and the one the reader holds
+        self.assertLessEqual(len(read), 4 * SCHEDULER_READ_AHEAD + 1)
+        self.assertEqual(len(list(results)), 999)
+
+    def test_single_reader_thread(self) -> None:
+        """Test the input is read by one thread however long it is."""
+        readers = set()
+
+        def targets() -> Iterator[str]:
+            """Yield many targets, recording the reading threads."""
+            for i in range(200):
+                readers.add(threading.get_ident())
+                yield f"d{i}.com"
+
+        scheduler: WhoisScheduler[str, str] = WhoisScheduler(
+            workers=2, interval=0
+        )
+        self.assertEqual(len(list(scheduler.run(str.upper, targets()))), 200)
+        self.assertEqual(len(readers), 1)
+
+    def test_input_errors_propagate(self) -> None:
+        """Test an exception reading the input reaches the consumer."""
+
+        def targets() -> Iterator[str]:
+            """Yield one target, then fail."""
+            yield "a.com"
+            raise ValueError("bad input")
+
+        scheduler: WhoisScheduler[str, str] = WhoisScheduler(
+            workers=2, interval=0
+        )
+        with self.assertRaises(ValueError):
+            list(scheduler.run(str.upper, targets()))
+
+    def test_per_server_concurrency_cap(self) -> None:
+        """Test no server ever exceeds its in-flight limit."""
+        lock = threading.Lock()
+        active: Dict[str, int] = {}
+        peak: Dict[str, int] = {}
+
+        def lookup(target: str) -> None:
+            server = whois_server_key(target)
+            with lock:
+                active[server] = active.get(server, 0) + 1
+                peak[server] = max(peak.get(server, 0), active[server])
+            time.sleep(0.01)
+            with lock:
+                active[server] -= 1
+
+        targets = [f"d{i}.com" for i in range(6)]
+        targets += [f"d{i}.org" for i in range(6)]
+        scheduler: WhoisScheduler[str, None] = WhoisScheduler(
+            workers=8, per_server=2, interval=0
+        )
+        self.assertEqual(len(list(scheduler.run(lookup, targets))), 12)
+        self.assertEqual(peak, {"tld:com": 2, "tld:org": 2})
+
+    def test_per_server_interval(self) -> None:
+        """Test query starts against one server are spaced by interval."""
+        starts: List[float] = []
+
+        def lookup(target: str) -> None:
+            starts.append(time.monotonic())
+
+        scheduler: WhoisScheduler[str, None] = WhoisScheduler(
+            workers=4, per_server=4, interval=0.03
+        )
+        list(scheduler.run(lookup, ["a.com", "b.com", "c.com"]))
+        starts.sort()
+        for i in range(1, len(starts)):
+            self.assertGreaterEqual(starts[i] - starts[i - 1], 0.025)
+
+    def test_unordered_yields_all(self) -> None:
+        """Test unordered mode yields every target exactly once."""
+        scheduler: WhoisScheduler[str, str] = WhoisScheduler(
+            workers=4, interval=0
+        )
+        targets = ["a.com", "b.org", "c.net", "d.com"]
+        results = dict(scheduler.run(str.upper, targets, ordered=False))
+        self.assertEqual(results, {t: t.upper() for t in targets})
+
+    def test_exception_propagates(self) -> None:
+        """Test exceptions raised by the lookup reach the consumer."""
+
+        def lookup(target: str) -> None:
+            raise RuntimeError(target)
+
+        scheduler: WhoisScheduler[str, None] = WhoisScheduler(
+            workers=2, interval=0
+        )
+        with self.assertRaises(RuntimeError):
+            list(scheduler.run(lookup, ["a.com"]))
+
+    def test_transient_failures_requeued(self) -> None:
+        """Test transient failures are retried without blocking workers."""
+        calls: Dict[str, int] = {}
+        lock = threading.Lock()
+
+        def lookup(target: str) -> str:
+            with lock:
+                calls[target] = calls.get(target, 0) + 1
+                count = calls[target]
+            if target == "flaky.com" and count < 3:
+                raise TransientWhoisError("timeout", retry_after=0.01)
+            return target
+
+        scheduler: WhoisScheduler[str, str] = WhoisScheduler(
+            workers=2, interval=0, retry=RetryPolicy(max_attempts=5)
+        )
+        results = list(scheduler.run(lookup, ["flaky.com", "ok.org"]))
+        self.assertEqual(
+            results, [("flaky.com", "flaky.com"), ("ok.org", "ok.org")]
+        )
+        self.assertEqual(calls, {"flaky.com": 3, "ok.org": 1})
+
+    def test_gives_up_with_error_result(self) -> None:
+        """Test exhausted retries yield the error's fallback result."""
+
+        def lookup(target: str) -> str:
+            raise TransientWhoisError("down", result="fallback", retry_after=0)
+
+        scheduler: WhoisScheduler[str, str] = WhoisScheduler(
+            workers=2, interval=0, retry=RetryPolicy(max_attempts=2)
+        )
+        self.assertEqual(
+            list(scheduler.run(lookup, ["a.com"])), [("a.com", "fallback")]
+        )